@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark für die Vergabestrategien der Warteliste (promotion.py)
+Spielt Wartelisten mit allen Strategien nach und vergleicht Auslastung,
+Fairness und Laufzeit. Die Wartelisten stammen entweder aus gespeicherten
+Eventdaten (Snapshot/Journal oder SQLite-Datenbank) oder werden synthetisch
+erzeugt.
+
+In jedem Schritt meldet sich ein angemeldetes Team ab, mit der angegebenen
+Wahrscheinlichkeit kommt ein neues Team auf die Warteliste, danach rücken
+Teams nach der jeweiligen Strategie nach. Alle Strategien erhalten dieselbe Zufallsfolge.
+
+Ausführen mit: python3 Test/benchmark_allocation.py [--state event_data.pkl | --db event_data.db] [--steps N] [--arrival P]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# models.py, promotion.py und storage.py liegen im übergeordneten Verzeichnis
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Event, Team, WaitlistEntry, events_from_dicts
+from promotion import POLICIES, promote_waitlist
+from storage import read_state, read_sqlite_state
+
+def make_synthetic_event(seed, max_slots=100, waitlist_length=40):
+    """Erstellt ein volles Event mit Warteliste (Teamgrößen 1-9 wie im Bot)"""
+    rng = random.Random(seed)
+    teams = {}
+    used = 0
+    while used < max_slots:
+        size = min(rng.randint(1, 9), max_slots - used)
+        name = f"team_{len(teams)}"
+        teams[name] = Team(name, size, f"t{len(teams):07x}")
+        used += size
+    waitlist = [WaitlistEntry(f"wait_{i}", rng.randint(1, 9), f"w{i:07x}") for i in range(waitlist_length)]
+    return Event("synthetic", "Synthetisch", "01.01.2030", max_slots=max_slots, max_team_size=9,
+                 slots_used=used, teams=teams, waitlist=waitlist)
+
+def load_recorded_events(state_file=None, db_file=None):
+    """Lädt gespeicherte Events, die eine Warteliste haben"""
+    if db_file:
+        state = read_sqlite_state(db_file)
+    else:
+        journal_file = os.path.splitext(state_file)[0] + ".journal"
+        state, _ = read_state(state_file, journal_file if os.path.exists(journal_file) else None)
+    events = events_from_dicts(state.get("event_data", {}))
+    return [event for event in events.values() if event.waitlist and event.max_slots > 0]
+
+def replay(event, policy, steps, seed, arrival):
+    """
+    Spielt eine Warteliste mit einer Strategie nach
+
+    Parameters:
+    - event: Ausgangszustand (wird kopiert)
+    - policy: Name der Vergabestrategie
+    - steps: Anzahl der Abmeldungen
+    - seed: Startwert der Zufallsfolge
+    - arrival: Wahrscheinlichkeit für ein neues Team auf der Warteliste je Schritt
+
+    Returns:
+    - Dictionary mit den Kennzahlen
+    """
+    event = Event.from_dict(event.id, event.to_dict())
+    event.allocation_policy = policy
+    rng = random.Random(seed)
+    sizes = [entry.size for entry in event.waitlist] or [1]
+
+    # Ankunftsreihenfolge je Team-ID, um Überholungen zu zählen
+    order = {}
+    for entry in event.waitlist:
+        order.setdefault(entry.team_id, len(order))
+    overtaken = {}
+
+    utilization = 0.0
+    idle_slots = 0
+    splits = 0
+    promoted = 0
+    elapsed = 0.0
+    for step in range(steps):
+        if event.teams:
+            names = list(event.teams)
+            team = event.teams.pop(names[rng.randrange(len(names))])
+            event.slots_used -= team.size
+        if rng.random() < arrival:
+            team_id = f"n{step:07x}"
+            order[team_id] = len(order)
+            event.waitlist.append(WaitlistEntry(f"new_{step}", rng.choice(sizes), team_id))
+
+        start = time.perf_counter()
+        promotions = promote_waitlist(event)
+        elapsed += time.perf_counter() - start
+
+        waiting = [order[entry.team_id] for entry in event.waitlist]
+        for promotion in promotions:
+            promoted += 1
+            splits += not promotion.complete
+            # Alle noch wartenden, früher eingetragenen Teams wurden überholt
+            rank = order[promotion.team_id]
+            for earlier in waiting:
+                if earlier < rank:
+                    overtaken[earlier] = overtaken.get(earlier, 0) + 1
+
+        utilization += event.slots_used / event.max_slots
+        if event.waitlist:
+            idle_slots += event.max_slots - event.slots_used
+
+    return {
+        "utilization": utilization / steps,
+        "idle_slots": idle_slots,
+        "splits": splits,
+        "promoted": promoted,
+        "overtakes": sum(overtaken.values()),
+        "max_overtaken": max(overtaken.values(), default=0),
+        "runtime_us": elapsed / steps * 1e6
+    }
+
+def run_benchmark(events, steps, seed, arrival):
+    """Führt alle Strategien für alle Events aus und gibt die Ergebnisse aus"""
+    for event in events:
+        print(f"=== Vergabestrategien: {event.name} ({event.max_slots} Plätze, {len(event.waitlist)} auf der Warteliste, {steps} Schritte) ===")
+        print(f"{'Strategie':<15}{'Auslastung':>11}{'Leerlauf':>10}{'Teilungen':>11}{'Nachrücker':>12}{'Überholt':>10}{'Max.':>6}{'µs/Lauf':>10}")
+        for policy in POLICIES:
+            result = replay(event, policy, steps, seed, arrival)
+            print(f"{policy:<15}{result['utilization']:>10.1%} {result['idle_slots']:>9}{result['splits']:>11}"
+                  f"{result['promoted']:>12}{result['overtakes']:>10}{result['max_overtaken']:>6}{result['runtime_us']:>10.1f}")
+        print()
+    print("Leerlauf: Summe freier Plätze, während Teams warten; Überholt/Max.: Überholungen gesamt bzw. für ein einzelnes Team")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Vergleicht die Vergabestrategien der Warteliste.')
+    parser.add_argument('--state', help='Snapshot-Datei mit gespeicherten Events (Journal daneben wird mitgelesen)')
+    parser.add_argument('--db', help='SQLite-Datenbank mit gespeicherten Events')
+    parser.add_argument('--steps', type=int, default=500, help='Anzahl der Abmeldungen je Lauf')
+    parser.add_argument('--arrival', type=float, default=1.0, help='Wahrscheinlichkeit für ein neues Wartelisten-Team je Schritt')
+    parser.add_argument('--seed', type=int, default=1, help='Startwert der Zufallsfolge')
+    args = parser.parse_args()
+
+    if args.state or args.db:
+        events = load_recorded_events(args.state, args.db)
+        if not events:
+            print("Keine Events mit Warteliste gefunden.")
+            sys.exit(1)
+    else:
+        events = [make_synthetic_event(args.seed)]
+    run_benchmark(events, args.steps, args.seed, args.arrival)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark für das typisierte Datenmodell (models.py)
+Vergleicht Speicherbedarf und Zugriffszeiten von Dictionary-Events mit den
+__slots__-Klassen bei einer großen Anzahl von Teams.
+
+Ausführen mit: python3 Test/benchmark_models.py [--teams N]
+"""
+
+import os
+import sys
+import timeit
+import argparse
+import tracemalloc
+
+# models.py liegt im übergeordneten Verzeichnis
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Event, Team
+
+def make_event_dict(team_count):
+    """Erstellt ein Event im kanonischen Dictionary-Layout"""
+    teams = {f"team_{i}": {"size": 1 + i % 9, "id": f"{i:08x}"} for i in range(team_count)}
+    return {
+        "id": "benchmark",
+        "name": "Benchmark",
+        "date": "01.01.2030",
+        "time": "20:00",
+        "description": "",
+        "teams": teams,
+        "waitlist": [(f"wait_{i}", 1 + i % 9, f"w{i:07x}") for i in range(team_count // 10)],
+        "max_slots": 10 * team_count,
+        "slots_used": sum(team["size"] for team in teams.values()),
+        "max_team_size": 9
+    }
+
+def measure_memory(factory):
+    """Misst den Speicherbedarf der von factory erzeugten Struktur in Bytes"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = factory()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return after - before
+
+def run_benchmark(team_count):
+    """Führt den Vergleich aus und gibt die Ergebnisse aus"""
+    data = make_event_dict(team_count)
+    event = Event.from_dict("benchmark", data)
+
+    # Speicher: nur die Team-Einträge (Namen und IDs sind in beiden Varianten dieselben Objekte)
+    dict_bytes = measure_memory(lambda: {name: dict(team) for name, team in data["teams"].items()})
+    model_bytes = measure_memory(lambda: {name: Team(name, team["size"], team["id"]) for name, team in data["teams"].items()})
+
+    # Zugriffszeiten der häufigsten Pfade (Teamgröße summieren, Team nachschlagen)
+    number = 200
+    dict_sum = timeit.timeit(lambda: sum(team["size"] for team in data["teams"].values()), number=number)
+    model_sum = timeit.timeit(lambda: sum(team.size for team in event.teams.values()), number=number)
+    names = list(data["teams"])
+    dict_lookup = timeit.timeit(lambda: [data["teams"][name]["size"] for name in names], number=number)
+    model_lookup = timeit.timeit(lambda: [event.teams[name].size for name in names], number=number)
+
+    print(f"=== Datenmodell-Benchmark ({team_count} Teams) ===")
+    print(f"Speicher Teams (Dictionary): {dict_bytes / 1024:.1f} KiB")
+    print(f"Speicher Teams (__slots__):  {model_bytes / 1024:.1f} KiB")
+    print(f"Summe der Teamgrößen: Dictionary {dict_sum / number * 1e6:.1f} µs, __slots__ {model_sum / number * 1e6:.1f} µs")
+    print(f"Team-Lookup:          Dictionary {dict_lookup / number * 1e6:.1f} µs, __slots__ {model_lookup / number * 1e6:.1f} µs")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Vergleicht Dictionary-Events mit dem typisierten Datenmodell.')
+    parser.add_argument('--teams', type=int, default=5000, help='Anzahl der Teams im Benchmark-Event')
+    args = parser.parse_args()
+    run_benchmark(args.teams)
@@ -8,12 +8,18 @@ Testet insbesondere Wartelisten-Funktionalität und Edge Cases
 
 import os
 import sys
-import pickle
 import logging
 import random
 import string
 from datetime import datetime
 
+# storage.py, models.py und promotion.py liegen im übergeordneten Verzeichnis
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import read_state, write_snapshot
+from models import Event
+from promotion import promote_waitlist
+
 # Logging konfigurieren
 logging.basicConfig(
     level=logging.INFO,
@@ -60,17 +66,17 @@ def reset_test_data():
     logger.info("Test-Daten zurückgesetzt")
 
 def save_data():
-    """Speichert die Testdaten"""
-    with open(TEST_DATA_FILE, 'wb') as f:
-        pickle.dump((event_data, None, user_team_assignments), f)
+    """Speichert die Testdaten (gleiches Format wie der Bot, ohne ältere Generationen)"""
+    state = {"event_data": event_data, "channel_id": None, "user_team_assignments": user_team_assignments}
+    write_snapshot(TEST_DATA_FILE, state, generations=1)
 
 def load_data():
-    """Lädt die Testdaten"""
+    """Lädt die Testdaten (ältere Pickle-Dateien werden dabei migriert)"""
     global event_data, user_team_assignments
     
     if os.path.exists(TEST_DATA_FILE):
-        with open(TEST_DATA_FILE, 'rb') as f:
-            event_data, _, user_team_assignments = pickle.load(f)
+        state, _ = read_state(TEST_DATA_FILE, generations=1)
+        event_data, user_team_assignments = state["event_data"], state["user_team_assignments"]
     else:
         reset_test_data()
 
@@ -108,12 +114,7 @@ def register_team(team_name, team_size, user_id=None):
         return False, f"Ein Team mit dem Namen '{team_name}' ist bereits registriert.", None
     
     # Check if team is on waitlist
-    for i, entry in enumerate(event["waitlist"]):
-        if len(entry) >= 3:  # Neues Format mit IDs
-            wl_team, wl_size, _ = entry
-        else:
-            wl_team, wl_size = entry
-            
+    for wl_team, wl_size, _ in event["waitlist"]:
         if wl_team.lower() == team_name_lower:
             return False, f"Ein Team mit dem Namen '{team_name}' steht bereits auf der Warteliste.", None
             
@@ -174,12 +175,7 @@ def unregister_team(team_name, user_id=None):
     team_removed = False
     for name in list(event["teams"].keys()):
         if name.lower() == team_name_lower:
-            team_data = event["teams"][name]
-            
-            if isinstance(team_data, dict):
-                team_size = team_data.get("size", 0)
-            else:
-                team_size = team_data
+            team_size = event["teams"][name]["size"]
                 
             # Slot-Zähler aktualisieren
             event["slots_used"] -= team_size
@@ -195,12 +191,7 @@ def unregister_team(team_name, user_id=None):
     
     # Suche Team in der Warteliste
     waitlist_indices = []
-    for i, entry in enumerate(event["waitlist"]):
-        if len(entry) >= 3:  # Format: (team_name, size, team_id)
-            wl_team, wl_size, _ = entry
-        else:
-            wl_team, wl_size = entry
-            
+    for i, (wl_team, wl_size, _) in enumerate(event["waitlist"]):
         if wl_team.lower() == team_name_lower:
             waitlist_indices.append(i)
             logger.info(f"Team '{wl_team}' ({wl_size} Plätze) von der Warteliste entfernt")
@@ -263,25 +254,14 @@ def update_team_size(team_name, new_size, user_id=None):
         if name.lower() == team_name_lower:
             team_in_event = True
             real_team_name = name
-            
-            if isinstance(data, dict):
-                old_size = data.get("size", 0)
-            else:
-                old_size = data
-            
+            old_size = data["size"]
             break
     
     # Team in Warteliste suchen
     team_in_waitlist = False
     waitlist_entries = []
     
-    for i, entry in enumerate(event["waitlist"]):
-        if len(entry) >= 3:  # Format: (team_name, size, team_id)
-            wl_team, wl_size, wl_team_id = entry
-        else:
-            wl_team, wl_size = entry
-            wl_team_id = None
-            
+    for i, (wl_team, wl_size, wl_team_id) in enumerate(event["waitlist"]):
         if wl_team.lower() == team_name_lower:
             team_in_waitlist = True
             waitlist_entries.append((i, wl_team, wl_size, wl_team_id))
@@ -310,11 +290,7 @@ def update_team_size(team_name, new_size, user_id=None):
         if team_in_event:
             # Passt direkt ins Event
             if available_slots >= size_diff:
-                if isinstance(event["teams"][real_team_name], dict):
-                    event["teams"][real_team_name]["size"] = new_size
-                else:
-                    event["teams"][real_team_name] = new_size
-                
+                event["teams"][real_team_name]["size"] = new_size
                 event["slots_used"] += size_diff
                 logger.info(f"Team '{real_team_name}' von {old_size} auf {new_size} vergrößert")
                 save_data()
@@ -323,24 +299,12 @@ def update_team_size(team_name, new_size, user_id=None):
                 # Teilweise ins Event, Rest auf Warteliste
                 if available_slots > 0:
                     new_event_size = old_size + available_slots
-                    if isinstance(event["teams"][real_team_name], dict):
-                        event["teams"][real_team_name]["size"] = new_event_size
-                    else:
-                        event["teams"][real_team_name] = new_event_size
-                    
+                    event["teams"][real_team_name]["size"] = new_event_size
                     event["slots_used"] += available_slots
                     
-                    # Rest auf Warteliste
+                    # Rest auf Warteliste (mit der ID des Teams)
                     waitlist_size = size_diff - available_slots
-                    
-                    # Team-ID ermitteln/generieren
-                    if isinstance(event["teams"][real_team_name], dict):
-                        team_id = event["teams"][real_team_name].get("id")
-                        if not team_id:
-                            team_id = generate_team_id(real_team_name)
-                            event["teams"][real_team_name]["id"] = team_id
-                    else:
-                        team_id = generate_team_id(real_team_name)
+                    team_id = event["teams"][real_team_name]["id"]
                     
                     # Auf Warteliste setzen
                     event["waitlist"].append((real_team_name, waitlist_size, team_id))
@@ -350,13 +314,7 @@ def update_team_size(team_name, new_size, user_id=None):
                     return True, f"Team '{real_team_name}' wurde teilweise vergrößert: {old_size} -> {new_event_size} im Event, {waitlist_size} auf Warteliste.", -available_slots
                 else:
                     # Komplett auf die Warteliste
-                    team_id = None
-                    if isinstance(event["teams"][real_team_name], dict):
-                        team_id = event["teams"][real_team_name].get("id")
-                    
-                    if not team_id:
-                        team_id = generate_team_id(real_team_name)
-                    
+                    team_id = event["teams"][real_team_name]["id"]
                     event["waitlist"].append((real_team_name, size_diff, team_id))
                     
                     logger.info(f"Team '{real_team_name}' bleibt bei {old_size}, zusätzliche {size_diff} auf Warteliste")
@@ -382,11 +340,7 @@ def update_team_size(team_name, new_size, user_id=None):
         
         # Team im Event verkleinern
         if team_in_event:
-            if isinstance(event["teams"][real_team_name], dict):
-                event["teams"][real_team_name]["size"] = new_size
-            else:
-                event["teams"][real_team_name] = new_size
-            
+            event["teams"][real_team_name]["size"] = new_size
             event["slots_used"] -= size_diff_abs
             
             logger.info(f"Team '{real_team_name}' von {old_size} auf {new_size} verkleinert")
@@ -410,80 +364,27 @@ def process_waitlist(free_slots=0):
     """
     Verarbeitet die Warteliste, nachdem Slots frei geworden sind
     
+    Verwendet dieselbe Nachrück-Engine wie der Bot (promotion.py).
+    
     Parameters:
-    - free_slots: Anzahl der frei gewordenen Slots (optional)
+    - free_slots: Anzahl der frei gewordenen Slots (optional, maßgeblich sind die tatsächlich freien Slots)
     
     Returns:
     - Liste mit verarbeiteten Teams: [(team_name, moved_size), ...]
     """
-    event = event_data["event"]
-    if not event["waitlist"]:
+    event = Event.from_dict("event", event_data["event"])
+    promotions = promote_waitlist(event)
+    if not promotions:
         return []
     
-    # Berechne tatsächlich verfügbare Slots
-    available_slots = event["max_slots"] - event["slots_used"]
-    if available_slots <= 0:
-        return []
-    
-    processed_teams = []
-    waitlist_to_remove = []
-    
-    # Verarbeite die Warteliste in Reihenfolge
-    for i, entry in enumerate(event["waitlist"]):
-        if available_slots <= 0:
-            break
-            
-        if len(entry) >= 3:  # Format: (team_name, size, team_id)
-            team_name, team_size, team_id = entry
-        else:
-            team_name, team_size = entry
-            team_id = generate_team_id(team_name)
-        
-        # Bestimme, wie viele Slots vom Team aufgerückt werden können
-        slots_to_move = min(team_size, available_slots)
-        
-        # Prüfe, ob das Team bereits im Event ist
-        team_in_event = False
-        for name in event["teams"]:
-            if name.lower() == team_name.lower():
-                team_in_event = True
-                # Erhöhe die Teamgröße im Event
-                if isinstance(event["teams"][name], dict):
-                    event["teams"][name]["size"] += slots_to_move
-                else:
-                    event["teams"][name] += slots_to_move
-                break
-        
-        # Füge Team zum Event hinzu, wenn es noch nicht existiert
-        if not team_in_event:
-            event["teams"][team_name] = {"size": slots_to_move, "id": team_id}
-        
-        # Aktualisiere die Slot-Zähler
-        event["slots_used"] += slots_to_move
-        available_slots -= slots_to_move
-        
-        # Verarbeite den Wartelisten-Eintrag
-        remaining_size = team_size - slots_to_move
-        
-        if remaining_size > 0:
-            # Teilweise aufgerückt, Rest bleibt auf Warteliste
-            event["waitlist"][i] = (team_name, remaining_size, team_id)
-        else:
-            # Komplett aufgerückt, entferne von Warteliste
-            waitlist_to_remove.append(i)
-        
-        processed_teams.append((team_name, slots_to_move))
-        logger.info(f"Team '{team_name}': {slots_to_move} Mitglieder von der Warteliste aufgerückt")
-    
-    # Entferne Einträge von der Warteliste (in umgekehrter Reihenfolge)
-    for i in sorted(waitlist_to_remove, reverse=True):
-        event["waitlist"].pop(i)
+    event_data["event"] = event.to_dict()
+    for promotion in promotions:
+        logger.info(f"Team '{promotion.team_name}': {promotion.size} Mitglieder von der Warteliste aufgerückt")
     
     # Daten speichern
-    if processed_teams:
-        save_data()
+    save_data()
     
-    return processed_teams
+    return [(promotion.team_name, promotion.size) for promotion in promotions]
 
 def expand_event_capacity(new_max_slots):
     """
@@ -592,24 +493,12 @@ def print_event_summary():
     logger.info(f"\nANGEMELDETE TEAMS ({len(event['teams'])}): ")
     
     for i, (name, data) in enumerate(event['teams'].items(), 1):
-        if isinstance(data, dict):
-            team_size = data.get("size", 0)
-            team_id = data.get("id", "N/A")
-        else:
-            team_size = data
-            team_id = "N/A (altes Format)"
-            
-        logger.info(f"{i}. {name} (Größe: {team_size}, ID: {team_id})")
+        logger.info(f"{i}. {name} (Größe: {data['size']}, ID: {data['id']})")
     
     logger.info(f"\nWARTELISTE ({len(event['waitlist'])}): ")
-    for i, entry in enumerate(event['waitlist'], 1):
-        if len(entry) >= 3:  # Format: (team_name, size, team_id)
-            team_name, team_size, team_id = entry
-        else:
-            team_name, team_size = entry
-            team_id = "N/A (altes Format)"
-            
+    for i, (team_name, team_size, team_id) in enumerate(event['waitlist'], 1):
         logger.info(f"{i}. {team_name} (Größe: {team_size}, ID: {team_id})")
+
     
     logger.info(f"\nBENUTZER-TEAM-ZUWEISUNGEN ({len(user_team_assignments)}): ")
     for user_id, team_name in user_team_assignments.items():
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testsuite für das typisierte Datenmodell (models.py)
+Testet die Validierung beim Laden, den Namensindex, die Warteschlange, den Rückwärtsindex der Zuweisungen, die Vergabe der Team-IDs, die Vergabestrategien (promotion.py) und die Anzeige-Nachrichten
+"""
+
+import os
+import sys
+import logging
+
+# models.py liegt im übergeordneten Verzeichnis
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Event, ModelError, TeamAssignments, TeamIdAllocator, WaitlistEntry, events_from_dicts
+from promotion import plan_promotions, promote_waitlist
+
+# Logging konfigurieren
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("event_bot_models_test")
+
+def make_event_data():
+    """Erstellt ein Beispiel-Event im gespeicherten Layout"""
+    return {
+        "id": "event",
+        "name": "Model Test",
+        "date": "01.04.2025",
+        "time": "20:00",
+        "description": "Test",
+        "teams": {"Alpha": {"size": 5, "id": "a1"}, "Beta": {"size": 4, "id": "b1"}},
+        "waitlist": [("Gamma", 3, "g1"), ("Delta", 2, "d1")],
+        "max_slots": 9,
+        "slots_used": 9,
+        "max_team_size": 9
+    }
+
+def check_validation():
+    """Validierung: kanonisches Layout, korrigierte Slot-Belegung und abgelehnte Einträge"""
+    event_data = make_event_data()
+    event = events_from_dicts({"event": event_data})["event"]
+    assert event.teams["Alpha"].size == 5 and event.waitlist[0].name == "Gamma", f"Unerwartetes Modell: {event}"
+    assert event.to_dict() == event_data, "to_dict liefert nicht das kanonische Layout"
+
+    # Abweichende Slot-Belegung wird korrigiert, ungültige Einträge abgelehnt
+    assert Event.from_dict("event", dict(event_data, slots_used=3)).slots_used == 9, "slots_used nicht korrigiert"
+    try:
+        Event.from_dict("event", dict(event_data, waitlist=[("Gamma", 0, "g1")]))
+        raise AssertionError("Wartelisten-Eintrag mit Größe 0 wurde akzeptiert")
+    except ModelError:
+        pass
+    logger.info("Validierung erfolgreich getestet")
+
+def check_name_index():
+    """Namensindex: Teams und Wartelisten-Einträge ohne Beachtung der Schreibweise finden"""
+    event = Event.from_dict("event", make_event_data())
+    assert event.teams.find(" alpha ") is event.teams["Alpha"], "Team-Index liefert falsches Team"
+    event.teams.pop("Beta")
+    assert event.teams.find("BETA") is None, "Entferntes Team noch im Index"
+
+    # Index bleibt bei Änderungen an der Warteliste aktuell
+    event.waitlist.append(WaitlistEntry("GAMMA", 1, "g1"))
+    assert [entry.size for entry in event.waitlist.entries_for("gamma")] == [3, 1], "Wartelisten-Index unvollständig"
+    event.waitlist.pop(0)
+    event.waitlist.remove(WaitlistEntry("GAMMA", 1, "g1"))
+    assert not event.waitlist.entries_for("gamma"), "Wartelisten-Index nicht aktualisiert"
+    event.waitlist.append(WaitlistEntry("Gamma", 3, "g1"))
+    assert event.waitlist.entries_for("GAMMA") == (event.waitlist[-1],), "Wartelisten-Index nach append falsch"
+    logger.info("Namensindex erfolgreich getestet")
+
+def check_waitlist_queue():
+    """Warteschlange: Positionen und Spieler davor nach Anhängen, Entfernen und Nachrücken"""
+    waitlist = Event.from_dict("event", make_event_data()).waitlist
+    waitlist.append(WaitlistEntry("GAMMA", 1, "g1"))
+    assert waitlist.position(waitlist[-1]) == 2, "Position am Ende der Warteliste falsch"
+    assert waitlist.players_ahead(waitlist[-1]) == 5, "Spieler vor dem Eintrag falsch gezählt"
+    waitlist.remove(WaitlistEntry("Delta", 2, "d1"))
+    assert waitlist.position(waitlist[1]) == 1 and waitlist.players_ahead(waitlist[1]) == 3, \
+        "Position nach dem Entfernen falsch"
+    gamma = waitlist.popleft()
+    waitlist.remove(WaitlistEntry("GAMMA", 1, "g1"))
+    assert not waitlist and waitlist.total_size() == 0, "Warteliste nicht geleert"
+    waitlist.extend([gamma, WaitlistEntry("Delta", 2, "d1")])
+    assert waitlist.players_ahead(waitlist[1]) == 3 and list(waitlist)[0] is gamma, "Reihenfolge nach extend falsch"
+    logger.info("Warteschlange erfolgreich getestet")
+
+def check_assignment_index():
+    """Rückwärtsindex der Zuweisungen: folgt Neuzuweisungen und dem Entfernen ganzer Teams"""
+    assignments = TeamAssignments({"1": "Alpha", "2": "Beta"})
+    assignments["3"] = "ALPHA"
+    assert assignments.members("alpha") == ("1", "3") and assignments.leader("Alpha") == "1", "Team-Mitglieder falsch"
+    assignments["1"] = "Beta"
+    assert assignments.leader("alpha") == "3" and assignments.members("beta") == ("2", "1"), "Neuzuweisung nicht indiziert"
+    assert assignments.remove_team("beta") == ["2", "1"] and assignments == {"3": "ALPHA"}, "Team nicht vollständig entfernt"
+    logger.info("Rückwärtsindex der Zuweisungen erfolgreich getestet")
+
+def check_team_ids():
+    """Team-IDs: ID-Index und monotone Vergabe (gleiche Millisekunde, Neustart mit zurückgestellter Uhr)"""
+    event = Event.from_dict("event", make_event_data())
+    assert event.find_team_name("a1") == "Alpha" and event.find_team_name("d1") == "Delta", "ID-Index falsch"
+    allocator = TeamIdAllocator(clock=lambda: 1750000000.0)
+    first, second = allocator.next_id(), allocator.next_id()
+    restarted = TeamIdAllocator(clock=lambda: 1740000000.0)
+    restarted.observe(second)
+    assert int(first) < int(second) < int(restarted.next_id()), "Team-IDs nicht monoton"
+    logger.info("Team-IDs erfolgreich getestet")
+
+def check_allocation_policies():
+    """Vergabestrategien: Teilnachrücken, nur ganze Teams, beste Auslastung mit Überholen"""
+    queue = [WaitlistEntry("A", 6, "a"), WaitlistEntry("B", 3, "b"), WaitlistEntry("C", 2, "c")]
+    sample = Event("policy", "Policy", "01.01.2030", max_slots=5, waitlist=queue)
+    plans = {policy: [(p.team_name, p.size) for p in plan_promotions(sample, policy)]
+             for policy in ("fifo", "fifo_no_split", "best_fit")}
+    assert plans == {"fifo": [("A", 5)], "fifo_no_split": [], "best_fit": [("B", 3), ("C", 2)]}, \
+        f"Vergabestrategien planen falsch: {plans}"
+    assert "allocation_policy" not in sample.to_dict(), "Standard-Strategie wird unnötig gespeichert"
+    sample.allocation_policy = "best_fit"
+    sample = Event.from_dict("policy", sample.to_dict())
+    assert sample.allocation_policy == "best_fit" and len(promote_waitlist(sample)) == 2, "Strategie nicht übernommen"
+    assert list(sample.waitlist) == [queue[0]] and sample.slots_used == 5, f"Nachrücken außer der Reihe fehlerhaft: {sample}"
+    logger.info("Vergabestrategien erfolgreich getestet")
+
+def check_display_messages():
+    """Anzeige-Nachrichten: je Kanal gespeichert, leer nicht im Layout"""
+    event = Event.from_dict("event", make_event_data())
+    assert "display_messages" not in event.to_dict(), "Leere Anzeige-Nachrichten werden unnötig gespeichert"
+    event.display_messages = {123: 456}
+    assert Event.from_dict("event", event.to_dict()).display_messages == {123: 456}, "Anzeige-Nachricht nicht übernommen"
+    logger.info("Anzeige-Nachrichten erfolgreich getestet")
+
+def run_test_suite():
+    """Führt alle Tests des Datenmodells aus"""
+    tests = [
+        check_validation, check_name_index, check_waitlist_queue, check_assignment_index,
+        check_team_ids, check_allocation_policies, check_display_messages
+    ]
+    for test in tests:
+        logger.info(f"\n=== {test.__doc__} ===")
+        test()
+    logger.info("\n=== MODELL-TESTSUITE ABGESCHLOSSEN ===")
+
+if __name__ == "__main__":
+    try:
+        run_test_suite()
+        print("\nTests erfolgreich abgeschlossen.")
+    except AssertionError as e:
+        logger.error(f"Test fehlgeschlagen: {e}")
+        print(f"FEHLER: {e}")
+        sys.exit(1)
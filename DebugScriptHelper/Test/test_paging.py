@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testsuite für gerenderte Listen
+Testet den versionierten Render-Cache (render_cache.py) und die Seitenaufteilung nach den Discord-Grenzen (paging.py)
+"""
+
+import os
+import sys
+import logging
+
+# Die Module liegen im übergeordneten Verzeichnis
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from render_cache import RenderCache
+from paging import chunk_lines, paginate_sections, FIELD_LIMIT
+from models import Event, Team
+
+# Logging konfigurieren
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("event_bot_paging_test")
+
+def check_render_cache():
+    """Render-Cache: Ansichten bis zur nächsten Änderung des Events wiederverwenden"""
+    event = Event("event", "Turnier", "01.01.2030")
+    event.teams["Alpha"] = Team("Alpha", 3, "a1")
+    builds = []
+
+    def build():
+        builds.append(event.slots_used)
+        return "\n".join(f"{name}: {team.size}" for name, team in event.teams.items())
+
+    cache = RenderCache()
+    first = cache.get("event", "details", build)
+    assert cache.get("event", "details", build) is first and len(builds) == 1, "Ansicht neu gerendert ohne Änderung"
+    cache.get("event", "details", build, page=2)
+    cache.get("other", "details", build)
+    assert len(builds) == 3 and len(cache) == 3, f"Seiten und Events nicht getrennt: {len(cache)}"
+
+    # Änderung: nur die Ansichten des geänderten Events werden verworfen
+    event.teams["Beta"] = Team("Beta", 2, "b1")
+    cache.bump(("event",))
+    assert cache.version("event") == 1 and cache.version("other") == 0, "Version falsch"
+    assert cache.get("event", "details", build) == "Alpha: 3\nBeta: 2", "Veraltete Ansicht geliefert"
+    cache.get("other", "details", build)
+    assert len(builds) == 4 and cache.stats["invalidated"] == 2, f"Falsche Ansichten verworfen: {cache.stats}"
+    cache.bump()
+    assert len(cache) == 0 and cache.version("other") == 1, "Nicht alle Ansichten verworfen"
+    stats = cache.stats
+    logger.info(f"Render-Cache erfolgreich getestet ({stats['hits']} Treffer, {stats['misses']} gerendert)")
+
+def check_paging():
+    """Seitenaufteilung: Stücke und Seiten innerhalb der Discord-Grenzen, keine Zeile verloren"""
+    lines = [f"**{index}.** Team {index} - {index % 7} Mitglieder | ID: `t{index:05d}`" for index in range(2000)]
+    chunks = chunk_lines(lines, FIELD_LIMIT)
+    assert all(len(chunk) <= FIELD_LIMIT for chunk in chunks), "Stück zu lang"
+    assert "\n".join(chunks).split("\n") == lines, "Zeilen verloren oder getrennt"
+    assert chunk_lines([], 100) == [] and chunk_lines(["x" * 50], 10) == ["x" * 9 + "…"], "Sonderfälle falsch"
+
+    pages = paginate_sections([("Teams", lines, "keine"), ("Warteliste", [], "leer")], page_budget=5000, max_fields=24)
+    for page in pages:
+        assert len(page) <= 24 and sum(len(name) + len(value) for name, value in page) <= 5000, "Seite zu groß"
+    fields = [field for page in pages for field in page]
+    assert fields[0][0] == "Teams" and fields[1][0] == "Teams (Forts.)", f"Feldnamen falsch: {fields[:2]}"
+    assert fields[-1] == ("Warteliste", "leer"), f"Leerer Abschnitt fehlt: {fields[-1]}"
+    assert sum(value.count("\n") + 1 for name, value in fields[:-1]) == len(lines), "Zeilen auf Seiten verloren"
+    logger.info(f"Seitenaufteilung erfolgreich getestet ({len(lines)} Zeilen auf {len(pages)} Seiten)")
+
+def run_test_suite():
+    """Führt alle Listen-Tests aus"""
+    tests = [check_render_cache, check_paging]
+    for test in tests:
+        logger.info(f"\n=== {test.__doc__} ===")
+        test()
+    logger.info("\n=== LISTEN-TESTSUITE ABGESCHLOSSEN ===")
+
+if __name__ == "__main__":
+    try:
+        run_test_suite()
+        print("\nTests erfolgreich abgeschlossen.")
+    except AssertionError as e:
+        logger.error(f"Test fehlgeschlagen: {e}")
+        print(f"FEHLER: {e}")
+        sys.exit(1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testsuite für die Planer des Bots
+Testet die entprellte Anzeige-Aktualisierung (refresh.py) und den Planer für ausgehende Nachrichten (outbound.py)
+"""
+
+import os
+import sys
+import asyncio
+import logging
+
+# Die Module liegen im übergeordneten Verzeichnis
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from refresh import RefreshScheduler
+from outbound import OutboundScheduler, PRIORITY_RESPONSE, PRIORITY_DM, PRIORITY_LOG
+
+# Logging konfigurieren
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("event_bot_scheduling_test")
+
+def check_refresh_scheduler():
+    """Anzeige-Aktualisierung: höchstens einmal je Intervall und Kanal, letzter Stand wird immer gezeigt"""
+    state = {"wert": 0}
+    rendered = []
+
+    async def render(channel_id, event_ids):
+        rendered.append((channel_id, tuple(event_ids), state["wert"]))
+
+    scheduler = RefreshScheduler(render, interval=0.05)
+
+    async def scenario():
+        for value in range(1, 21):
+            state["wert"] = value
+            scheduler.mark("kanal", "event")
+            scheduler.mark("kanal", "anderes")
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.2)
+        state["wert"] = 99
+        scheduler.mark("kanal", "event")
+        await scheduler.close()
+
+    asyncio.run(scenario())
+    assert len(rendered) <= 5, f"Zu viele Aktualisierungen: {rendered}"
+    assert rendered[0] == ("kanal", ("event", "anderes"), 1), f"Erste Aktualisierung nicht sofort: {rendered}"
+    assert rendered[-2][2] == 20 and rendered[-1] == ("kanal", ("event",), 99), f"Letzter Stand fehlt: {rendered}"
+    stats = scheduler.stats
+    assert stats["marked"] == 41 and stats["skipped"] > 0, f"Kennzahlen falsch: {stats}"
+    logger.info(f"Anzeige-Aktualisierung erfolgreich getestet ({stats['refreshes']} gerendert, {stats['skipped']} übersprungen)")
+
+def check_outbound_scheduler():
+    """Ausgehende Nachrichten: Priorität vor Reihenfolge, Routen-Limit, Zusammenfassen von Log-Texten"""
+    sent = []
+
+    async def send(text):
+        sent.append(text)
+        return text
+
+    def call(text):
+        return lambda: send(text)
+
+    scheduler = OutboundScheduler(route_limit=1, route_period=0.05, global_limit=100)
+
+    async def scenario():
+        logs = [scheduler.submit(PRIORITY_LOG, "log", send, text=f"log {i}") for i in range(3)]
+        dms = [scheduler.submit(PRIORITY_DM, "dm", call(f"dm {i}")) for i in range(2)]
+        response = scheduler.submit(PRIORITY_RESPONSE, None, call("antwort"))
+        depths = scheduler.depths()
+        results = await asyncio.gather(response, *dms, *logs)
+        await scheduler.close()
+        return depths, results
+
+    depths, results = asyncio.run(scenario())
+    assert depths == {"Antworten": 1, "Anzeigen": 0, "DMs": 2, "Log-Kanal": 1}, f"Falsche Warteschlangen: {depths}"
+    assert sent == ["antwort", "dm 0", "log 0\nlog 1\nlog 2", "dm 1"], f"Falsche Reihenfolge: {sent}"
+    assert results[-1] == results[-3] == "log 0\nlog 1\nlog 2", f"Zusammengefasste Nachricht fehlt: {results}"
+    stats = scheduler.stats
+    assert stats["merged"] == 2 and stats["sent"] == 4 and stats["throttled"] > 0, f"Kennzahlen falsch: {stats}"
+    logger.info(f"Nachrichten-Planer erfolgreich getestet ({stats['sent']} gesendet, {stats['merged']} zusammengefasst)")
+
+def run_test_suite():
+    """Führt alle Planer-Tests aus"""
+    tests = [check_refresh_scheduler, check_outbound_scheduler]
+    for test in tests:
+        logger.info(f"\n=== {test.__doc__} ===")
+        test()
+    logger.info("\n=== PLANER-TESTSUITE ABGESCHLOSSEN ===")
+
+if __name__ == "__main__":
+    try:
+        run_test_suite()
+        print("\nTests erfolgreich abgeschlossen.")
+    except AssertionError as e:
+        logger.error(f"Test fehlgeschlagen: {e}")
+        print(f"FEHLER: {e}")
+        sys.exit(1)
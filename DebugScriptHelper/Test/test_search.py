@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testsuite für die Suche (/find)
+Testet den Zwischenspeicher für Benutzerprofile (profiles.py) und den Suchindex (search.py)
+"""
+
+import os
+import sys
+import asyncio
+import logging
+import tempfile
+
+# Die Module liegen im übergeordneten Verzeichnis
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transaction import ChangeScope
+from profiles import ProfileCache
+from search import EventSearch, MATCH_EXACT, MATCH_FUZZY, MATCH_PREFIX, MATCH_SUBSTRING
+from models import Event, Team, TeamAssignments, WaitlistEntry
+
+# Logging konfigurieren
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("event_bot_search_test")
+
+def check_profile_cache():
+    """Benutzerprofile: lokaler Cache zuerst, begrenzt parallele Abrufe, Ablauf und Speichern"""
+    class User:
+        def __init__(self, user_id):
+            self.id = user_id
+            self.name = f"user{user_id}"
+            self.display_name = f"Spieler {user_id}"
+
+    local = {1: User(1)}
+    running = {"now": 0, "max": 0}
+
+    async def fetch(user_id):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        if user_id == 99:
+            raise LookupError("unbekannt")
+        return User(user_id)
+
+    cache = ProfileCache(local.get, fetch, ttl=3600, max_concurrency=2)
+    cache.remember(User(2))
+    profiles = asyncio.run(cache.resolve(["1", "2", "3", "4", "5", "99"]))
+    assert sorted(profiles) == ["1", "2", "3", "4", "5"], f"Falsche Profile: {sorted(profiles)}"
+    assert profiles["4"].display_name == "Spieler 4", f"Anzeigename fehlt: {profiles['4']}"
+    stats = cache.stats
+    assert stats["hits"] == 1 and stats["local"] == 1 and stats["fetched"] == 3 and stats["failed"] == 1, \
+        f"Kennzahlen falsch: {stats}"
+    assert running["max"] == 2, f"Abrufe nicht begrenzt: {running}"
+
+    # Fehlgeschlagene Abrufe werden bis retry_after nicht wiederholt
+    assert asyncio.run(cache.resolve(["99"])) == {} and cache.missing(["99", "6"]) == ["6"], \
+        "Fehlgeschlagener Abruf wird sofort wiederholt"
+    assert stats["failed"] == 1 and stats["skipped"] == 2, f"Kennzahlen falsch: {stats}"
+
+    # Veraltete Profile werden im Hintergrund neu abgerufen und gemeldet
+    updated = []
+    cache.on_update = updated.extend
+    cache.ttl = -1
+
+    async def refresh():
+        cache.get("3")
+        await asyncio.sleep(0.05)
+
+    asyncio.run(refresh())
+    cache.ttl = 3600
+    assert updated == ["3"], f"Aktualisierung nicht gemeldet: {updated}"
+
+    # Speichern (im Worker-Thread) und Laden; veraltete Profile nicht zugewiesener Benutzer werden entfernt
+    with tempfile.TemporaryDirectory(prefix="event_profiles_test_") as directory:
+        path = os.path.join(directory, "user_profiles.json")
+        asyncio.run(cache.flush(path))
+        assert not cache.dirty and os.path.exists(path), "Profile nicht geschrieben"
+        loaded = ProfileCache(local.get, fetch, ttl=3600)
+        loaded.load(path)
+        assert len(loaded) == 5 and loaded.get("3") == cache.get("3"), "Profile nicht gespeichert"
+        loaded.ttl = -1
+        assert loaded.prune(keep=["2"]) == 4 and len(loaded) == 1, "Veraltete Profile nicht entfernt"
+    logger.info(f"Benutzerprofile erfolgreich getestet ({stats['fetched']} abgerufen, {stats['local']} lokal)")
+
+def check_search_index():
+    """Suchindex: Rangfolge, Tippfehler, Seiten, Vorschläge und inkrementelle Aktualisierung"""
+    class User:
+        def __init__(self, user_id, name):
+            self.id = user_id
+            self.name = name
+            self.display_name = name.title()
+
+    event = Event("event", "Turnier", "01.01.2030", max_slots=99)
+    for index, name in enumerate(["Wolf", "Wolfpack", "Alpha Wolves", "Lone Wolf Clan", "Bären"]):
+        event.teams[name] = Team(name, 1, f"t{index}")
+    event.waitlist.append(WaitlistEntry("Wolfsrudel", 2, "w1"))
+    other = Event("other", "Anderes", "02.01.2030")
+    other.teams["Wolf Other"] = Team("Wolf Other", 1, "o1")
+    events = {"event": event, "other": other}
+    assignments = TeamAssignments({"1": "Wolf", "2": "Wolf Other"})
+    profiles = ProfileCache(lambda user_id: None, None)
+    profiles.remember(User(1, "wolfgang"))
+    profiles.remember(User(2, "wolfram"))
+    search = EventSearch(events, assignments, profiles)
+    search.update()
+
+    # Exakt vor Präfix vor Teilstring; Teams anderer Events und deren Benutzer fehlen
+    hits, total = search.search(event, "wolf", limit=10)
+    names = [hit.text for hit in hits]
+    assert [hit.match for hit in hits] == sorted(hit.match for hit in hits), f"Rangfolge falsch: {hits}"
+    assert hits[0].match == MATCH_EXACT and names[0] == "wolf", f"Exakter Treffer nicht zuerst: {names}"
+    assert {"wolfpack", "wolfsrudel", "wolfgang"} <= set(names), f"Präfixe fehlen: {names}"
+    assert any(hit.match == MATCH_SUBSTRING and hit.key[2] == "lone wolf clan" for hit in hits), f"Teilstring fehlt: {hits}"
+    assert total == 5 and ("user", "2") not in {hit.key for hit in hits}, f"Falsche Treffer: {names}"
+
+    # Tippfehler in einem Wort eines Teamnamens
+    hits, _ = search.search(event, "wolvs")
+    assert hits and hits[0].key[2] == "alpha wolves" and hits[0].match == MATCH_FUZZY, f"Tippfehler nicht gefunden: {hits}"
+    assert search.search(event, "xyz")[1] == 0, "Unpassender Begriff liefert Treffer"
+
+    # Seiten
+    first, total = search.search(event, "wolf", limit=3)
+    second, _ = search.search(event, "wolf", limit=3, offset=3)
+    assert len(first) == 3 and not {hit.key for hit in first} & {hit.key for hit in second}, "Seiten überschneiden sich"
+    # Die Gesamtzahl enthält ähnliche Treffer auch, wenn die direkten Treffer die Seite füllen
+    totals = {search.search(event, "wolfs", limit=limit)[1] for limit in (1, 10)}
+    assert len(totals) == 1 and totals.pop() > 1, "Gesamtzahl hängt von der Seite ab"
+
+    # Inkrementell: umbenanntes Team und neuer Benutzer über einen ChangeScope
+    event.teams.pop("Wolfpack")
+    event.teams["Rudel"] = Team("Rudel", 1, "t1")
+    assignments["3"] = "Rudel"
+    profiles.remember(User(3, "wolfine"))
+    search.update(ChangeScope(("event",), ("3",)))
+    hits, _ = search.search(event, "wolfpack")
+    assert all(hit.key[2] != "wolfpack" for hit in hits), f"Entferntes Team gefunden: {hits}"
+    hits, _ = search.search(event, "wolfi")
+    assert hits and hits[0].key == ("user", "3") and hits[0].match == MATCH_PREFIX, f"Neuer Benutzer fehlt: {hits}"
+    # Vorschläge: Präfixe alphabetisch, dann Teilstrings; ohne Eingabe alle Teams
+    assert search.complete("event", "wo") == [("Wolf", "t0"), ("Wolfsrudel", "w1")], \
+        f"Vorschläge falsch: {search.complete('event', 'wo')}"
+    assert search.complete("event", "wolf")[-1] == ("Lone Wolf Clan", "t3"), "Teilstring fehlt in den Vorschlägen"
+    assert len(search.complete("event", "", limit=4)) == 4 and search.complete("fehlt", "wo") == [], "Begrenzung falsch"
+
+    del events["other"]
+    search.update(ChangeScope(("other",), ()))
+    assert "other" not in search.teams, "Index des gelöschten Events nicht entfernt"
+    logger.info(f"Suchindex erfolgreich getestet ({total} Treffer für 'wolf')")
+
+def run_test_suite():
+    """Führt alle Such-Tests aus"""
+    tests = [check_profile_cache, check_search_index]
+    for test in tests:
+        logger.info(f"\n=== {test.__doc__} ===")
+        test()
+    logger.info("\n=== SUCH-TESTSUITE ABGESCHLOSSEN ===")
+
+if __name__ == "__main__":
+    try:
+        run_test_suite()
+        print("\nTests erfolgreich abgeschlossen.")
+    except AssertionError as e:
+        logger.error(f"Test fehlgeschlagen: {e}")
+        print(f"FEHLER: {e}")
+        sys.exit(1)
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Testsuite für die Persistenz-Schicht (storage.py)
+Testet Journal-Modus, Wiederherstellung nach Abstürzen, Kompaktierung, Snapshot-Generationen,
+SQLite-Backend, Binärformat mit Migration alter Layouts, mehrere Events, das typisierte Datenmodell,
+den Hintergrund-Speicherdienst, Transaktionen und die Command-Warteschlange
+
+Weitere Teile haben eigene Testsuiten (test_models.py, test_scheduling.py, test_search.py, test_paging.py)
+"""
+
+import os
+import sys
+import shutil
+import asyncio
+import logging
+import tempfile
+
+# storage.py liegt im übergeordneten Verzeichnis
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pickle
+from datetime import datetime
+
+from storage import JournalStorage, PickleStorage, SqliteStorage, read_journal, read_sqlite_state, read_state
+from serialization import encode_value, decode_value, legacy_team_id
+from saver import BackgroundSaver
+from command_queue import CommandQueue
+from transaction import ChangeScope, ChangeSet, EMPTY_SCOPE
+from models import Event, Team, TeamAssignments, WaitlistEntry, events_from_dicts
+
+# Logging konfigurieren
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("event_bot_storage_test")
+
+def make_state():
+    """Erstellt einen Beispiel-Zustand"""
+    event_data = {
+        "event": {
+            "id": "event",
+            "name": "Storage Test",
+            "date": "01.04.2025",
+            "time": "20:00",
+            "description": "Test",
+            "teams": {"Alpha": {"size": 5, "id": "a1"}, "Beta": {"size": 4, "id": "b1"}},
+            "waitlist": [("Gamma", 3, "g1"), ("Delta", 2, "d1")],
+            "max_slots": 9,
+            "slots_used": 9,
+            "max_team_size": 9
+        }
+    }
+    return event_data, 123, {"1": "Alpha", "2": "Beta"}
+
+def new_storage(directory, compact_interval=200):
+    """Erstellt ein Journal-Backend in einem temporären Verzeichnis"""
+    return JournalStorage(
+        os.path.join(directory, "event_data.pkl"),
+        os.path.join(directory, "event_data.journal"),
+        compact_interval
+    )
+
+def check_journal_roundtrip(directory):
+    """Änderungen werden als Journal angehängt und beim Laden wieder abgespielt"""
+    storage = new_storage(directory)
+    storage.load()
+    event_data, channel_id, assignments = make_state()
+    storage.save(event_data, channel_id, assignments)
+
+    # Typische Änderungen: Größe ändern, Nachrücken, Zuweisung setzen
+    event = event_data["event"]
+    event["teams"]["Alpha"]["size"] = 3
+    event["slots_used"] = 7
+    event["teams"]["Gamma"] = {"size": 2, "id": "g1"}
+    event["waitlist"][0] = ("Gamma", 1, "g1")
+    event["slots_used"] = 9
+    storage.save(event_data, channel_id, assignments)
+
+    event["waitlist"].pop(0)
+    event["waitlist"].append(("Epsilon", 4, "e1"))
+    assignments["3"] = "Epsilon"
+    del assignments["2"]
+    storage.save(event_data, channel_id, assignments)
+
+    frames, _, _ = read_journal(storage.journal_file)
+    logger.info(f"Journal enthält {len(frames)} Rahmen")
+
+    loaded = new_storage(directory).load()
+    assert loaded == (event_data, channel_id, assignments), "Geladener Zustand weicht ab"
+    logger.info("Journal-Roundtrip erfolgreich")
+
+def check_torn_tail(directory):
+    """Ein abgeschnittener letzter Eintrag wird verworfen, alles davor bleibt erhalten"""
+    storage = new_storage(directory)
+    storage.load()
+    event_data, channel_id, assignments = make_state()
+    storage.save(event_data, channel_id, assignments)
+    event_data["event"]["teams"]["Alpha"]["size"] = 2
+    storage.save(event_data, channel_id, assignments)
+    expected = (
+        {"event": dict(event_data["event"], teams={k: dict(v) for k, v in event_data["event"]["teams"].items()})},
+        channel_id,
+        dict(assignments)
+    )
+
+    event_data["event"]["teams"]["Beta"]["size"] = 1
+    storage.save(event_data, channel_id, assignments)
+
+    # Absturz mitten im Schreiben des letzten Eintrags simulieren
+    size = os.path.getsize(storage.journal_file)
+    with open(storage.journal_file, 'r+b') as f:
+        f.truncate(size - 3)
+
+    reloaded = new_storage(directory)
+    assert reloaded.load() == expected, "Zustand nach abgeschnittenem Eintrag weicht ab"
+
+    # Nach dem Abschneiden müssen neue Einträge wieder lesbar sein
+    event_data["event"]["teams"]["Beta"]["size"] = 1
+    reloaded.save(event_data, channel_id, assignments)
+    assert new_storage(directory).load() == (event_data, channel_id, assignments)
+    logger.info("Abgeschnittener Journal-Eintrag korrekt behandelt")
+
+def check_compaction(directory):
+    """Nach compact_interval Einträgen wird ein Snapshot geschrieben und das Journal geleert"""
+    storage = new_storage(directory, compact_interval=3)
+    storage.load()
+    event_data, channel_id, assignments = make_state()
+    for size in range(1, 8):
+        event_data["event"]["teams"]["Alpha"]["size"] = size
+        storage.save(event_data, channel_id, assignments)
+
+    frames, _, _ = read_journal(storage.journal_file)
+    assert len(frames) < 3, "Journal wurde nicht kompaktiert"
+    assert new_storage(directory).load() == (event_data, channel_id, assignments)
+    logger.info(f"Kompaktierung erfolgreich ({len(frames)} Rahmen nach Kompaktierung)")
+
+def check_snapshot_generations(directory):
+    """Beschädigter Snapshot: Rückgriff auf die neueste gültige Generation"""
+    snapshot = os.path.join(directory, "event_data.pkl")
+    storage = PickleStorage(snapshot, generations=3)
+    storage.load()
+    event_data, channel_id, assignments = make_state()
+    for size in (1, 2, 3):
+        event_data["event"]["teams"]["Alpha"]["size"] = size
+        storage.save(event_data, channel_id, assignments)
+
+    assert os.path.exists(f"{snapshot}.1") and os.path.exists(f"{snapshot}.2"), "Generationen fehlen"
+    assert not os.path.exists(f"{snapshot}.3"), "Zu viele Generationen aufbewahrt"
+
+    # Absturz mitten im Schreiben simulieren: aktueller Snapshot abgeschnitten
+    size = os.path.getsize(snapshot)
+    with open(snapshot, 'r+b') as f:
+        f.truncate(size // 2)
+
+    reloaded = PickleStorage(snapshot, generations=3)
+    loaded_event_data, _, _ = reloaded.load()
+    assert loaded_event_data["event"]["teams"]["Alpha"]["size"] == 2, "Falsche Generation geladen"
+    assert reloaded.load_report, "Rückgriff wurde nicht gemeldet"
+    assert any(name.startswith("event_data.pkl.corrupt-") for name in os.listdir(directory)), \
+        "Beschädigter Snapshot wurde nicht zur Seite verschoben"
+    for message in reloaded.load_report:
+        logger.info(f"Meldung: {message}")
+
+    # Journal-Modus: Rückgriff verwirft nicht passende Journal-Einträge und kompaktiert sofort
+    journal_dir = os.path.join(directory, "journal")
+    os.mkdir(journal_dir)
+    storage = new_storage(journal_dir, compact_interval=2)
+    storage.load()
+    event_data, channel_id, assignments = make_state()
+    for size in range(1, 6):
+        event_data["event"]["teams"]["Alpha"]["size"] = size
+        storage.save(event_data, channel_id, assignments)
+    with open(storage.snapshot_file, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    reloaded = new_storage(journal_dir, compact_interval=2)
+    loaded_event_data, _, _ = reloaded.load()
+    assert loaded_event_data["event"]["teams"]["Alpha"]["size"] == 2, "Falsche Generation geladen"
+    assert len(reloaded.load_report) >= 2, "Verworfene Journal-Einträge wurden nicht gemeldet"
+    assert new_storage(journal_dir).load()[0] == loaded_event_data, "Zustand nach Rückgriff nicht gesichert"
+    logger.info("Rückgriff auf ältere Snapshot-Generationen erfolgreich")
+
+def check_sqlite_backend(directory):
+    """SQLite-Backend: Import aus Pickle, Zeilen-Updates und paralleles Lesen"""
+    snapshot = os.path.join(directory, "event_data.pkl")
+    journal = os.path.join(directory, "event_data.journal")
+    db_file = os.path.join(directory, "event_data.db")
+
+    # Bestehende Daten im Journal-Format anlegen, die beim ersten Laden importiert werden
+    legacy = JournalStorage(snapshot, journal)
+    legacy.load()
+    event_data, channel_id, assignments = make_state()
+    event_data["event"]["teams"]["Legacy"] = 2
+    event_data["event"]["waitlist"].append(("Zeta", 1))
+    legacy.save(event_data, channel_id, assignments)
+
+    storage = SqliteStorage(db_file, snapshot, journal)
+    event_data, channel_id, assignments = storage.load()
+    assert event_data["event"]["teams"]["Legacy"] == {"size": 2, "id": legacy_team_id("Legacy")}, "Import aus Pickle fehlerhaft"
+    assert event_data["event"]["waitlist"][-1] == ("Zeta", 1, legacy_team_id("Zeta")), "Import aus Pickle fehlerhaft"
+
+    event = event_data["event"]
+    event["teams"]["Alpha"]["size"] = 1
+    event["teams"]["Gamma"] = {"size": 3, "id": "g1"}
+    event["waitlist"].pop(0)
+    event["waitlist"][0] = ("Delta", 1, "d1")
+    event["waitlist"].append(("Eta", 2, "h1"))
+    event["slots_used"] = 8
+    assignments["3"] = "Gamma"
+    del assignments["1"]
+    storage.save(event_data, channel_id, assignments)
+
+    del event["teams"]["Beta"]
+    event["is_closed"] = True
+    storage.save(event_data, 456, assignments)
+
+    # Lesen über eine zweite Verbindung, während die erste noch offen ist
+    state = read_sqlite_state(db_file)
+    assert state["event_data"] == event_data, "Event-Daten in der Datenbank weichen ab"
+    assert state["channel_id"] == 456
+    assert state["user_team_assignments"] == assignments
+    assert list(state["event_data"]["event"]["teams"]) == list(event["teams"]), "Team-Reihenfolge nicht erhalten"
+    storage.close()
+
+    reopened = SqliteStorage(db_file, snapshot, journal)
+    assert reopened.load() == (event_data, 456, assignments), "Zustand nach erneutem Öffnen weicht ab"
+    reopened.close()
+    logger.info("SQLite-Backend erfolgreich getestet")
+
+def check_legacy_migration(directory):
+    """Binärformat und einmalige Migration alter Pickle-Layouts"""
+    value = {"a": [1, (2, "x"), None], "b": datetime(2025, 4, 1, 20, 0), "c": 1 << 70, "d": 1.5, True: b"\x00"}
+    assert decode_value(encode_value(value)) == value, "Binärformat-Roundtrip fehlerhaft"
+
+    # Altes Layout des Bots: Teams als Zahl, Warteliste als 2-Tupel, Datei ohne Prüfsumme
+    snapshot = os.path.join(directory, "event_data.pkl")
+    event_data, channel_id, assignments = make_state()
+    event = event_data["event"]
+    event["teams"] = {"Alpha": 5, "Beta": {"size": 4, "id": "b1"}}
+    event["waitlist"] = [("Gamma", 3), ("beta", 1), ("Delta", 2, "d1")]
+    event["expiry_date"] = datetime(2025, 4, 2, 12, 0)
+    with open(snapshot, 'wb') as f:
+        pickle.dump({"event_data": event_data, "channel_id": channel_id, "user_team_assignments": assignments}, f)
+
+    loaded_event_data, _, _ = new_storage(directory).load()
+    loaded = loaded_event_data["event"]
+    assert loaded["teams"] == {"Alpha": {"size": 5, "id": legacy_team_id("Alpha")}, "Beta": {"size": 4, "id": "b1"}}
+    assert loaded["waitlist"] == [("Gamma", 3, legacy_team_id("Gamma")), ("beta", 1, "b1"), ("Delta", 2, "d1")]
+    assert loaded["expiry_date"] == event["expiry_date"]
+
+    # Die Migration wurde sofort im neuen Format gesichert und läuft nur einmal
+    with open(snapshot, 'rb') as f:
+        assert f.read(8) == b"EVSNAP2\n", "Migrierter Snapshot nicht im Binärformat gespeichert"
+    state, info = read_state(snapshot, os.path.join(directory, "event_data.journal"))
+    assert info["migrated"] == 0 and state["event_data"] == loaded_event_data
+
+    # Tupel-Layout der Testsuite (Test/test_event_data.pkl)
+    test_file = os.path.join(directory, "test_event_data.pkl")
+    with open(test_file, 'wb') as f:
+        pickle.dump(({"event": {"name": "T", "teams": {"Omega": 2}, "waitlist": []}}, None, {"7": "Omega"}), f)
+    state, info = read_state(test_file)
+    assert state["event_data"]["event"]["teams"]["Omega"] == {"size": 2, "id": legacy_team_id("Omega")}
+    assert state["event_data"]["event"]["id"] == "event", "Event-ID wurde nicht aus dem Schlüssel übernommen"
+    assert state["user_team_assignments"] == {"7": "Omega"} and info["migrated"] == 2
+    logger.info("Binärformat und Migration erfolgreich getestet")
+
+def check_multiple_events(directory):
+    """Mehrere Events: Änderungen an einem Event schreiben nur dessen Datensätze"""
+    storage = new_storage(directory)
+    storage.load()
+    event_data, channel_id, assignments = make_state()
+    second = dict(event_data["event"], id="e2", name="Zweites Event", teams={}, waitlist=[], slots_used=0)
+    event_data["e2"] = second
+    storage.save(event_data, channel_id, assignments)
+
+    second["teams"]["Zeta"] = {"size": 2, "id": "z1"}
+    second["slots_used"] = 2
+    storage.save(event_data, channel_id, assignments)
+
+    frames, _, _ = read_journal(storage.journal_file)
+    _, records = frames[-1]
+    assert records and all(record[1] == "e2" for record in records), f"Unerwartete Datensätze: {records}"
+
+    loaded_event_data, _, _ = new_storage(directory).load()
+    assert loaded_event_data == event_data, "Geladene Events weichen ab"
+    assert list(loaded_event_data) == ["event", "e2"], "Reihenfolge der Events nicht erhalten"
+    logger.info("Mehrere Events erfolgreich getestet")
+
+def check_typed_models(directory):
+    """Typisiertes Datenmodell: Event-Objekte werden im kanonischen Layout gespeichert"""
+    event_data, channel_id, assignments = make_state()
+    events = events_from_dicts(event_data)
+    event = events["event"]
+    assignments = TeamAssignments(assignments)
+
+    storage = new_storage(directory)
+    storage.load()
+    storage.save(events, channel_id, assignments)
+    event.teams.pop("Beta")
+    event.slots_used = 5
+    assignments.remove_team("beta")
+    storage.save(events, channel_id, assignments)
+    loaded_event_data, _, loaded_assignments = new_storage(directory).load()
+    assert events_from_dicts(loaded_event_data) == events, "Gespeicherte Event-Objekte weichen ab"
+    assert loaded_assignments == assignments, "Gespeicherte Zuweisungen weichen ab"
+    logger.info("Typisiertes Datenmodell erfolgreich getestet")
+
+def check_background_saver(directory):
+    """Hintergrund-Speicherdienst: Zusammenfassen von Änderungen und flush()-Barriere"""
+    storage = new_storage(directory)
+    storage.load()
+    event_data, channel_id, assignments = make_state()
+
+    async def scenario():
+        saver = BackgroundSaver(storage, window=60)
+        for size in range(1, 11):
+            event_data["event"]["teams"]["Alpha"]["size"] = size
+            saver.mark_dirty(event_data, channel_id, assignments)
+
+        # Innerhalb des Zeitfensters wurde noch nichts geschrieben
+        assert not os.path.exists(storage.journal_file), "Änderungen wurden nicht zusammengefasst"
+
+        assert await saver.flush(), "flush() fehlgeschlagen"
+        assert saver.stats["written"] == 1, f"Erwartet 1 Schreibvorgang, erhalten {saver.stats['written']}"
+        assert saver.stats["coalesced"] == 9, f"Erwartet 9 zusammengefasste Änderungen, erhalten {saver.stats['coalesced']}"
+
+        event_data["event"]["slots_used"] = 3
+        saver.mark_dirty(event_data, channel_id, assignments)
+        await saver.close()
+        return saver.stats
+
+    stats = asyncio.run(scenario())
+    assert new_storage(directory).load() == (event_data, channel_id, assignments), "Gespeicherter Zustand weicht ab"
+    logger.info(f"Hintergrund-Speicherdienst erfolgreich getestet ({stats})")
+
+def check_transactions(directory):
+    """Transaktionen: Zurücksetzen ohne tiefe Kopie, ChangeScope für das Speichern"""
+    storage = new_storage(directory)
+    storage.load()
+    event_data, channel_id, raw_assignments = make_state()
+    event_data["other"] = dict(event_data["event"], id="other", name="Zweites Event")
+    events = events_from_dicts(event_data)
+    assignments = TeamAssignments(raw_assignments)
+    storage.save(events, channel_id, assignments)
+    event = events["event"]
+    before = event.to_dict()
+
+    # Fehlgeschlagene Änderung: Team, Warteliste, Felder, Zuweisungen und Event-Reihenfolge zurücksetzen
+    requester = {}
+    alpha = event.teams["Alpha"]
+    changes = ChangeSet(events, assignments).touch("event")
+    alpha.size = 1
+    event.teams.pop("Beta")
+    event.waitlist.popleft()
+    event.max_slots = 20
+    assignments.remove_team("alpha")
+    assignments["9"] = "Gamma"
+    changes.set(requester, "Gamma", "nutzer")
+    del events["event"]
+    events["neu"] = Event("neu", "Neu", "01.01.2030")
+    changes.rollback()
+    assert list(events) == ["event", "other"] and events["event"] is event, f"Events nicht wiederhergestellt: {list(events)}"
+    assert event.to_dict() == before and event.teams["Alpha"] is alpha, f"Event nicht zurückgesetzt: {event}"
+    assert event.waitlist.position(WaitlistEntry("Gamma", 3, "g1")) == 0, "Warteliste nicht neu indiziert"
+    assert assignments == {"1": "Alpha", "2": "Beta"} and assignments.members("alpha") == ("1",), "Zuweisungen nicht zurückgesetzt"
+    assert requester == {}, "Gemerkter Nutzer nicht entfernt"
+
+    # Erfolgreiche Änderung: nur die angefassten Teile werden verglichen und gespeichert
+    changes = ChangeSet(events, assignments).touch("event")
+    event.teams["Epsilon"] = Team("Epsilon", 1, "e1")
+    event.slots_used += 1
+    assignments["5"] = "Epsilon"
+    scope = changes.commit()
+    assert scope.events == ("event",) and scope.users == ("5",), f"ChangeScope falsch: {scope}"
+    assert ChangeSet(events, assignments).touch("event").touch("other").commit() == EMPTY_SCOPE, \
+        "Unveränderte Events im ChangeScope"
+    marked = ChangeSet(events, assignments)
+    marked.mark("channel_id")
+    assert marked.commit() == ChangeScope((), (), ("channel_id",)), "Vermerkte Einstellung fehlt im ChangeScope"
+    events["other"].max_slots = 99  # Außerhalb der Transaktion geändert: fällt nicht in den Scope
+    storage.save(events, channel_id, assignments, scope)
+    loaded_event_data, _, loaded_assignments = new_storage(directory).load()
+    loaded = events_from_dicts(loaded_event_data)
+    assert loaded["event"] == event and loaded_assignments == assignments, "Transaktion nicht gespeichert"
+    assert loaded["other"].max_slots == 9, "Nicht angefasstes Event wurde verglichen"
+    logger.info("Transaktionen erfolgreich getestet")
+
+def check_command_queue(directory):
+    """Command-Warteschlange: Stapel in Reihenfolge, einmal speichern, Antworten danach"""
+    trace = []
+    requester = {}
+    events = events_from_dicts(make_state()[0])
+    assignments = TeamAssignments()
+    queue = CommandQueue(
+        lambda scope: trace.append(f"speichern {scope.events}"),
+        begin=lambda event_id: ChangeSet(events, assignments).touch(event_id),
+        refresh=lambda key: trace.append(f"anzeige {key}"),
+        warn_after=60
+    )
+
+    async def reply(text):
+        trace.append(text)
+
+    def change(name):
+        def apply(outbox):
+            trace.append(f"anwenden {name}")
+            events["event"].max_slots += 1
+            outbox.send(reply(f"antwort {name}"))
+            outbox.refresh("event")
+            return name.upper()
+        return apply
+
+    def failing(outbox):
+        events["event"].teams.pop("Alpha")
+        queue.changes.set(requester, "Alpha", "nutzer")
+        outbox.send(reply("nie gesendet"))
+        raise ValueError("Prüfung fehlgeschlagen")
+
+    def unchanged(outbox):
+        events["event"].max_slots = events["event"].max_slots  # angefasst, aber unverändert
+        outbox.send(reply("unverändert"))
+
+    async def scenario():
+        results = await asyncio.gather(
+            queue.submit("event", "a", change("a")),
+            queue.submit("event", "fehler", failing),
+            queue.submit("event", "b", change("b")),
+            return_exceptions=True
+        )
+        batch_trace = list(trace)
+        # Ein Stapel ohne tatsächliche Änderung wird nicht gespeichert, antwortet aber
+        trace.clear()
+        await queue.submit("event", "noop", unchanged)
+        unchanged_trace = list(trace)
+        await queue.close()
+        return results, batch_trace, unchanged_trace
+
+    results, trace, unchanged_trace = asyncio.run(scenario())
+    assert results[0] == "A" and results[2] == "B", f"Falsche Ergebnisse: {results}"
+    assert isinstance(results[1], ValueError), f"Ausnahme nicht weitergereicht: {results[1]}"
+    assert trace == ["anwenden a", "anwenden b", "speichern ('event',)", "anzeige event", "antwort a", "antwort b"], \
+        f"Falsche Reihenfolge: {trace}"
+    assert "Alpha" in events["event"].teams and not requester, "Fehlgeschlagener Command nicht zurückgesetzt"
+    stats = queue.stats
+    assert stats["batches"] == 2 and stats["largest_batch"] == 3 and stats["failed"] == 1, f"Kennzahlen falsch: {stats}"
+    assert stats["refreshes"] == 1 and stats["coalesced_refreshes"] == 1, f"Anzeige nicht zusammengefasst: {stats}"
+    assert unchanged_trace == ["unverändert"] and stats["unchanged"] == 1, \
+        f"Unveränderter Stapel gespeichert: {unchanged_trace}"
+    logger.info(f"Command-Warteschlange erfolgreich getestet ({stats['submitted']} Commands in {stats['batches']} Stapel)")
+
+def run_test_suite():
+    """Führt alle Storage-Tests in jeweils eigenen temporären Verzeichnissen aus"""
+    tests = [
+        check_journal_roundtrip, check_torn_tail, check_compaction, check_snapshot_generations,
+        check_sqlite_backend, check_legacy_migration, check_multiple_events, check_typed_models, check_background_saver,
+        check_transactions, check_command_queue
+    ]
+    for test in tests:
+        directory = tempfile.mkdtemp(prefix="event_storage_test_")
+        try:
+            logger.info(f"\n=== {test.__doc__} ===")
+            test(directory)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    logger.info("\n=== STORAGE-TESTSUITE ABGESCHLOSSEN ===")
+
+if __name__ == "__main__":
+    try:
+        run_test_suite()
+        print("\nTests erfolgreich abgeschlossen.")
+    except AssertionError as e:
+        logger.error(f"Test fehlgeschlagen: {e}")
+        print(f"FEHLER: {e}")
+        sys.exit(1)
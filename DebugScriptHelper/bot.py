@@ -9,7 +9,6 @@ import logging
 import sys
 import csv
 import io
-import copy
 
 import pickle
 
@@ -17,13 +16,24 @@ import pickle
 from config import (
     TOKEN, COMMAND_PREFIX, ORGANIZER_ROLE, CLAN_REP_ROLE, 
     DEFAULT_MAX_SLOTS, DEFAULT_MAX_TEAM_SIZE, EXPANDED_MAX_TEAM_SIZE,
-    WAITLIST_CHECK_INTERVAL, ADMIN_IDS
+    WAITLIST_CHECK_INTERVAL, ADMIN_IDS, COMMAND_WAIT_WARNING, DISPLAY_REFRESH_INTERVAL,
+    USER_PROFILE_FILE, USER_PROFILE_TTL, USER_FETCH_CONCURRENCY, USER_FETCH_RETRY_AFTER, FIND_PAGE_SIZE
 )
 from utils import (
-    load_data, save_data, format_event_details, format_event_list, 
-    has_role, parse_date, logger, send_to_log_channel, discord_handler,
-    generate_team_id, export_log_file, clear_log_file, import_log_file
+    load_data, save_data, flush_data, close_saver, get_outbound, close_outbound, pop_load_report, format_event_details, format_event_list, 
+    format_team_list, format_waitlist, team_list_pages, waitlist_pages,     has_role, parse_date, logger, send_to_log_channel, discord_handler,
+    generate_team_id, generate_event_id, export_log_file, clear_log_file, import_log_file
 )
+from models import Event, Team, WaitlistEntry
+from promotion import promote_waitlist, open_slots, POLICIES
+from command_queue import CommandQueue
+from transaction import ChangeSet, ChangeScope
+from refresh import RefreshScheduler
+from outbound import PRIORITY_RESPONSE, PRIORITY_DISPLAY, PRIORITY_DM, PRIORITY_LOG
+from profiles import ProfileCache
+from search import EventSearch
+from render_cache import RenderCache
+from paging import chunk_lines, DESCRIPTION_LIMIT, MESSAGE_LIMIT
 
 # Check if token is available
 if not TOKEN:
@@ -43,50 +53,203 @@ class EventBot(commands.Bot):
         super().__init__(command_prefix=COMMAND_PREFIX, intents=intents)
         
     async def setup_hook(self):
+        # Persistente Event-Buttons: funktionieren auch auf Nachrichten von vor dem Neustart
+        self.add_view(event_view)
         await self.tree.sync()
         logger.info("Slash commands synced")
+    
+    async def close(self):
+        # Ausstehende Änderungen vor dem Beenden auf die Platte schreiben
+        await command_queue.close()
+        await display_refresher.close()
+        await close_outbound()
+        await close_saver()
+        try:
+            await user_profiles.flush(USER_PROFILE_FILE)
+        except Exception as e:
+            logger.error(f"Fehler beim Speichern der Benutzerprofile: {e}")
+        await super().close()
 
 bot = EventBot()
 
 # Load saved data
 event_data, channel_id, user_team_assignments = load_data()
 team_requester = {}  # Store users who requested waitlist spots
+# Benutzernamen für Suchen ohne Discord-Aufrufe (lokaler Cache des Bots zuerst, dann begrenzt parallel abrufen)
+user_profiles = ProfileCache(bot.get_user, bot.fetch_user, USER_PROFILE_TTL, USER_FETCH_CONCURRENCY, USER_FETCH_RETRY_AFTER)
+user_profiles.load(USER_PROFILE_FILE)
+# Suchindex über Teams und zugewiesene Benutzer für /find (wird beim Speichern abgeglichen)
+search_index = EventSearch(event_data, user_team_assignments, user_profiles)
+search_index.update()
+# Im Hintergrund aktualisierte Namen in den Suchindex übernehmen
+user_profiles.on_update = lambda user_ids: search_index.update(ChangeScope((), tuple(user_ids)))
+# Gerenderte Ansichten je Event bis zur nächsten Änderung (Version wird in persist_state erhöht)
+render_cache = RenderCache()
+
+def persist_state(scope=None):
+    """
+    Speichert den Zustand, gleicht den Suchindex ab und verwirft veraltete Ansichten
+    
+    Parameters:
+    - scope: Optional - ChangeScope der Änderung (siehe transaction.py); ohne scope wird alles abgeglichen
+    """
+    search_index.update(scope)
+    render_cache.bump(scope.events if scope is not None else None)
+    save_data(event_data, channel_id, user_team_assignments, scope)
+
+# Veraltete Event-Anzeigen werden je Kanal höchstens einmal pro Intervall neu gerendert
+display_refresher = RefreshScheduler(
+    lambda target_channel_id, event_ids: refresh_displays(target_channel_id, event_ids),
+    interval=DISPLAY_REFRESH_INTERVAL
+)
+# Einziger Schreiber für alle Zustandsänderungen; jeder Command läuft in einer
+# eigenen Transaktion, gespeichert werden nur die angefassten Teile einmal pro Stapel
+command_queue = CommandQueue(
+    persist_state,
+    begin=lambda event_id: ChangeSet(event_data, user_team_assignments).touch(event_id),
+    refresh=lambda key: display_refresher.mark(*key),
+    warn_after=COMMAND_WAIT_WARNING
+)
+# Zuletzt gerenderter Inhalt je Anzeige {(channel_id, event_id): (Embed, Komponenten)} - nur im Speicher
+display_renders = {}
+display_locks = {}  # {(channel_id, event_id): asyncio.Lock} - eine Aktualisierung je Anzeige gleichzeitig
 
 # Helper functions
-def get_event():
-    """Get the current event data"""
-    # Defensive Programmierung: Stelle sicher, dass event_data existiert und ein Dictionary ist
-    if not isinstance(event_data, dict):
-        logger.error("event_data ist kein Dictionary")
-        return None
+def get_default_event_id():
+    """
+    Ermittelt das Event, das ohne Event-Angabe verwendet wird
     
-    # Greife auf den 'event'-Schlüssel in event_data zu
-    event = event_data.get('event', {})
+    Returns:
+    - ID des zuletzt erstellten Events oder None, wenn es kein Event gibt
+    """
+    # event_data behält die Einfügereihenfolge, das neueste Event steht am Ende
+    return next(reversed(event_data), None)
+
+def get_event(event_id=None):
+    """
+    Get event data by ID
     
-    # Prüfe, ob ein Event existiert (mindestens eine gültige Eigenschaft)
-    if not event:
-        return None
+    Die Events wurden beim Laden bereits validiert (siehe models.py), daher
+    sind hier keine Prüfungen auf fehlende Felder mehr nötig.
     
-    if not event.get('name') and not event.get('date'):
-        return None
+    Parameters:
+    - event_id: Optional - ID des Events; ohne ID wird das zuletzt erstellte Event verwendet
+    
+    Returns:
+    - Event-Objekt oder None, wenn es kein solches Event gibt
+    """
+    if event_id is None:
+        event_id = get_default_event_id()
+    return event_data.get(event_id)
+
+def get_events():
+    """
+    Liefert alle aktiven Events
     
-    # Prüfe, ob das Event alle erwarteten Schlüssel hat
-    required_keys = ['name', 'date', 'time', 'description', 'teams', 'waitlist', 'max_slots', 'slots_used', 'max_team_size']
-    for key in required_keys:
-        if key not in event:
-            logger.warning(f"Event fehlt Schlüssel: {key}")
-            # Stelle default-Werte für wichtige Schlüssel bereit
-            if key == 'teams':
-                event['teams'] = {}
-            elif key == 'waitlist':
-                event['waitlist'] = []
-            elif key in ['max_slots', 'slots_used', 'max_team_size']:
-                event[key] = 0
-            elif key in ['name', 'date', 'time', 'description']:
-                event[key] = ""
+    Returns:
+    - Liste von Event-Objekten in Erstellungsreihenfolge
+    """
+    return list(event_data.values())
+
+def remove_event(event_id):
+    """
+    Entfernt ein Event und die Team-Zuweisungen, die zu keinem anderen Event mehr gehören
     
+    Parameters:
+    - event_id: ID des Events
+    
+    Returns:
+    - Die entfernten Eventdaten oder None, wenn es das Event nicht gab
+    """
+    event = event_data.pop(event_id, None)
+    if event is not None:
+        # Nur die Teams dieses Events prüfen (Rückwärtsindex Team -> Benutzer)
+        team_names = list(event.teams) + [entry.name for entry in event.waitlist]
+        for team_name in team_names:
+            if not is_team_in_any_event(team_name):
+                user_team_assignments.remove_team(team_name)
     return event
 
+def is_team_in_any_event(team_name, exclude_event_id=None):
+    """
+    Prüft, ob ein Team in einem Event angemeldet ist oder auf einer Warteliste steht
+    
+    Parameters:
+    - team_name: Name des Teams (case-insensitive)
+    - exclude_event_id: Optional - ID eines Events, das nicht berücksichtigt wird
+    
+    Returns:
+    - True, wenn das Team in mindestens einem Event vorkommt
+    """
+    for event in get_events():
+        if event.id == exclude_event_id:
+            continue
+        _, _, total_size, _, _ = get_team_total_size(event, team_name)
+        if total_size > 0:
+            return True
+    return False
+
+async def event_autocomplete(interaction: discord.Interaction, current: str):
+    """Autovervollständigung für den optionalen Event-Parameter der Slash-Commands"""
+    current = current.lower()
+    choices = []
+    for event in get_events():
+        label = f"{event.name} ({event.date})"
+        if current in label.lower() or current in event.id.lower():
+            choices.append(app_commands.Choice(name=label[:100], value=event.id))
+    return choices[:25]
+
+def event_id_for_message(message):
+    """
+    Ermittelt das Event, zu dem eine Nachricht mit Event-Buttons gehört
+    
+    Die persistenten Buttons (event_view) sind für alle Events gleich; das Event
+    steht in der Fußzeile des Embeds (siehe format_event_details). Für Anzeigen
+    ohne Embed werden die gespeicherten Anzeige-Nachrichten der Events geprüft.
+    
+    Parameters:
+    - message: Discord-Nachricht der Interaktion (oder None)
+    
+    Returns:
+    - ID des Events (auch eines inzwischen gelöschten, siehe EventActionView.interaction_check)
+      oder None, wenn die Nachricht keinem Event zugeordnet ist (dann wird das zuletzt
+      erstellte Event verwendet)
+    """
+    if message is None:
+        return None
+    for embed in message.embeds:
+        footer = embed.footer.text or ""
+        if "Event-ID: " in footer:
+            return footer.rsplit("Event-ID: ", 1)[1].strip()
+    for event in event_data.values():
+        if event.display_messages.get(message.channel.id) == message.id:
+            return event.id
+    return None
+
+async def team_autocomplete(interaction: discord.Interaction, current: str):
+    """
+    Autovervollständigung für Teamnamen (angemeldet und Warteliste)
+
+    Die Vorschläge kommen aus dem Suchindex (search_index.complete), der nach
+    jeder Änderung abgeglichen wird - ohne Speicherzugriff und ohne Scan der Events.
+    """
+    event = get_event(getattr(interaction.namespace, "event", None))
+    if event is None:
+        return []
+    choices = []
+    for name, team_id in search_index.complete(event.id, current):
+        team = event.teams.find(name)
+        waiting = sum(entry.size for entry in event.waitlist.entries_for(name))
+        if team is not None and waiting:
+            status = f"Angemeldet: {team.size}, Warteliste: {waiting}"
+        elif team is not None:
+            status = f"Angemeldet: {team.size}"
+        else:
+            status = f"Warteliste: {waiting}"
+        label = f"{name} ({status}, ID: {team_id})"
+        choices.append(app_commands.Choice(name=label[:100], value=name[:100]))
+    return choices
+
 def get_user_team(user_id):
     """Get the team name for a user"""
     return user_team_assignments.get(str(user_id))
@@ -105,70 +268,98 @@ def get_team_total_size(event, team_name):
       - waitlist_size: Gesamtgröße auf der Warteliste
       - total_size: Gesamtgröße (Event + Warteliste)
       - registered_name: Der tatsächliche Name im Event (oder None)
-      - waitlist_entries: Liste mit Tupeln (index, team_name, size, team_id) aller Wartelisteneinträge für dieses Team
+      - waitlist_entries: Alle WaitlistEntry-Einträge dieses Teams in Wartelisten-Reihenfolge
     """
-    team_name = team_name.strip().lower()  # Normalisiere Teamnamen
-    
-    # Größe und Name im Event (case-insensitive Lookup)
-    event_size = 0
-    registered_name = None
-    team_id = None
-    
-    # Prüfe, ob das Team-Dictionary jetzt das erweiterte Format mit IDs verwendet
-    using_team_ids = False
-    if event["teams"] and isinstance(next(iter(event["teams"].values())), dict):
-        using_team_ids = True
-    
-    if using_team_ids:
-        # Neues Format mit Team-IDs
-        for name, data in event["teams"].items():
-            if name.lower() == team_name:
-                event_size = data.get("size", 0)
-                registered_name = name
-                team_id = data.get("id")
-                break
-    else:
-        # Altes Format (abwärtskompatibel)
-        for name, size in event["teams"].items():
-            if name.lower() == team_name:
-                event_size = size
-                registered_name = name
-                break
+    # Lookups über den Namensindex von Teams und Warteliste (case-insensitive, ohne Scan)
+    team = event.teams.find(team_name)
+    event_size = team.size if team else 0
+    registered_name = team.name if team else None
     
-    # Suche alle Einträge des Teams auf der Warteliste
-    waitlist_entries = []
-    waitlist_size = 0
-    
-    # Prüfe, ob die Warteliste das erweiterte Format mit IDs verwendet
-    using_waitlist_ids = False
-    if event["waitlist"] and len(event["waitlist"][0]) > 2:
-        using_waitlist_ids = True
-    
-    if using_waitlist_ids:
-        # Neues Format mit Team-IDs
-        for i, entry in enumerate(event["waitlist"]):
-            if len(entry) >= 3:  # Format: (team_name, size, team_id)
-                wl_team, wl_size, wl_team_id = entry[0], entry[1], entry[2]
-                if wl_team.lower() == team_name:
-                    waitlist_entries.append((i, wl_team, wl_size, wl_team_id))
-                    waitlist_size += wl_size
-    else:
-        # Altes Format (abwärtskompatibel)
-        for i, (wl_team, wl_size) in enumerate(event["waitlist"]):
-            if wl_team.lower() == team_name:
-                waitlist_entries.append((i, wl_team, wl_size, None))
-                waitlist_size += wl_size
+    waitlist_entries = event.waitlist.entries_for(team_name)
+    waitlist_size = sum(entry.size for entry in waitlist_entries)
     
     # Gesamtgröße
     total_size = event_size + waitlist_size
     
     return (event_size, waitlist_size, total_size, registered_name, waitlist_entries)
 
+def get_team_id(event, team_name):
+    """
+    Liefert die ID eines Teams aus dem Event oder der Warteliste
+    
+    Parameters:
+    - event: Eventdaten
+    - team_name: Exakter Name des Teams
+    
+    Returns:
+    - Vorhandene Team-ID oder eine neu erzeugte ID, falls das Team noch nicht existiert
+    """
+    if team_name in event.teams:
+        return event.teams[team_name].id
+    for entry in event.waitlist.entries_for(team_name):
+        if entry.name == team_name:
+            return entry.team_id
+    return generate_team_id(team_name)
+
+def resolve_team_reference(event, team_ref):
+    """
+    Löst eine Teamangabe (Name oder Team-ID) in den Teamnamen auf
+    
+    Parameters:
+    - event: Eventdaten
+    - team_ref: Name oder ID des Teams
+    
+    Returns:
+    - Teamname aus dem Event, wenn team_ref eine bekannte ID ist, sonst team_ref selbst
+    """
+    team_ref = team_ref.strip()
+    return event.find_team_name(team_ref) or team_ref
+
+def team_export_rows(event, team_ref=None):
+    """
+    Liefert die Zeilen für Team-Exporte
+    
+    Parameters:
+    - event: Eventdaten
+    - team_ref: Optional - Name oder ID eines einzelnen Teams
+    
+    Returns:
+    - Liste von Tupeln (status, team_name, size, team_id), status ist "Angemeldet" oder "Warteliste"
+    """
+    if team_ref:
+        team_name = resolve_team_reference(event, team_ref)
+        team = event.teams.find(team_name)
+        teams = [team] if team else []
+        waitlist = event.waitlist.entries_for(team_name)
+    else:
+        teams = event.teams.values()
+        waitlist = event.waitlist
+    
+    rows = [("Angemeldet", team.name, team.size, team.id) for team in teams]
+    rows.extend(("Warteliste", entry.name, entry.size, entry.team_id) for entry in waitlist)
+    return rows
+
+def add_team_slots(event, team_name, size):
+    """
+    Erhöht die Größe eines Teams im Event und legt es bei Bedarf an
+    
+    slots_used wird nicht verändert, das übernimmt der Aufrufer.
+    
+    Parameters:
+    - event: Eventdaten
+    - team_name: Exakter Name des Teams
+    - size: Anzahl hinzuzufügender Spieler
+    """
+    if team_name in event.teams:
+        event.teams[team_name].size += size
+    else:
+        event.teams[team_name] = Team(team_name, size, get_team_id(event, team_name))
+
 # ############################# #
 # NEUE HILFSFUNKTIONEN ######### #
 # ############################# #
 
-async def validate_command_context(interaction, required_role=None, check_event=True, team_required=False):
+async def validate_command_context(interaction, required_role=None, check_event=True, team_required=False, event_id=None):
     """
     Validiert den Kontext eines Befehls: Event, Rolle, Team-Zugehörigkeit
     
@@ -177,15 +368,19 @@ async def validate_command_context(interaction, required_role=None, check_event=
     - required_role: Erforderliche Rolle (z.B. ORGANIZER_ROLE oder CLAN_REP_ROLE)
     - check_event: Ob geprüft werden soll, ob ein Event existiert
     - team_required: Ob geprüft werden soll, ob der Benutzer einem Team zugewiesen ist
+    - event_id: Optional - ID des Events (Standard: zuletzt erstelltes Event)
     
     Returns:
     - Tupel (event, team_name) oder (None, None) bei Fehler
     """
     # Prüfen, ob ein Event existiert
     if check_event:
-        event = get_event()
+        event = get_event(event_id)
         if not event:
-            await interaction.response.send_message("Es gibt derzeit kein aktives Event.", ephemeral=True)
+            if event_id:
+                await interaction.response.send_message(f"Es gibt kein Event mit der ID '{event_id}'.", ephemeral=True)
+            else:
+                await interaction.response.send_message("Es gibt derzeit kein aktives Event.", ephemeral=True)
             return None, None
     else:
         event = None
@@ -239,6 +434,45 @@ async def send_feedback(interaction, message, ephemeral=True, embed=None, view=N
     """
     Sendet standardisiertes Feedback an den Benutzer
     
+    Antworten laufen mit höchster Priorität über den Nachrichten-Planer (siehe outbound.py),
+    damit sie bei hoher Last nicht hinter Log- und DM-Nachrichten warten.
+    
+    Parameters:
+    - interaction: Discord-Interaktion
+    - message: Die zu sendende Nachricht
+    - ephemeral: Ob die Nachricht nur für den Benutzer sichtbar sein soll
+    - embed: Optional - Ein Discord-Embed zur Anzeige
+    - view: Optional - Eine View mit Buttons/anderen UI-Elementen
+    
+    Returns:
+    - True bei erfolgreicher Zustellung
+    """
+    return await get_outbound().submit(
+        PRIORITY_RESPONSE, None, lambda: deliver_feedback(interaction, message, ephemeral, embed, view)
+    )
+
+async def send_pages(interaction, message, render, count, ephemeral=True, title="Liste"):
+    """
+    Sendet die erste Seite einer Liste, bei mehreren Seiten mit Blätter-Buttons (PaginationView)
+    
+    Parameters:
+    - interaction: Discord-Interaktion
+    - message: Text über dem Embed
+    - render: Funktion render(page), die das Embed einer Seite (ab 0) liefert
+    - count: Funktion count(), die die Anzahl der Seiten liefert
+    - ephemeral: Ob die Nachricht nur für den Benutzer sichtbar sein soll
+    - title: Bezeichnung der Liste für die Timeout-Meldung
+    
+    Returns:
+    - True bei erfolgreicher Zustellung
+    """
+    view = PaginationView(render, count, title=title) if count() > 1 else None
+    return await send_feedback(interaction, message, ephemeral=ephemeral, embed=render(0), view=view)
+
+async def deliver_feedback(interaction, message, ephemeral=True, embed=None, view=None):
+    """
+    Stellt Feedback als Antwort oder Followup auf eine Interaktion zu (siehe send_feedback)
+    
     Parameters:
     - interaction: Discord-Interaktion
     - message: Die zu sendende Nachricht
@@ -309,7 +543,7 @@ async def send_feedback(interaction, message, ephemeral=True, embed=None, view=N
             logger.error(f"Auch zweiter Versuch fehlgeschlagen: {e2}")
             return False
 
-async def handle_team_unregistration(interaction, team_name, is_admin=False):
+async def handle_team_unregistration(interaction, team_name, is_admin=False, event_id=None):
     """
     Verarbeitet die Abmeldung eines Teams
     
@@ -317,702 +551,86 @@ async def handle_team_unregistration(interaction, team_name, is_admin=False):
     - interaction: Discord-Interaktion
     - team_name: Name des Teams
     - is_admin: Ob die Aktion von einem Admin durchgeführt wird
+    - event_id: Optional - ID des Events (Standard: zuletzt erstelltes Event)
     
-    Returns:
-    - True bei erfolgreicher Abmeldung
-    """
-    event = get_event()
-    if not event:
-        return False
-        
-    team_name = team_name.strip().lower()
-    
-    # Prüfe, ob das Team angemeldet ist oder auf der Warteliste steht
-    team_registered = False
-    team_on_waitlist = False
-    waitlist_indices = []
-    
-    # Verwende Hilfsfunktion zur Formaterkennung
-    from utils import is_using_team_ids, is_using_waitlist_ids
-    using_team_ids = is_using_team_ids(event)
-    using_waitlist_ids = is_using_waitlist_ids(event)
-    
-    if using_team_ids:
-        # Neues Format mit Team-IDs
-        for name in list(event["teams"].keys()):
-            if name.lower() == team_name:
-                team_registered = True
-                break
-    else:
-        # Altes Format
-        for name in list(event["teams"].keys()):
-            if name.lower() == team_name:
-                team_registered = True
-                break
-    
-    # Suche alle Einträge des Teams auf der Warteliste
-    if using_waitlist_ids:
-        for i, entry in enumerate(event["waitlist"]):
-            if len(entry) >= 3:  # Format: (team_name, size, team_id)
-                if entry[0].lower() == team_name:
-                    team_on_waitlist = True
-                    waitlist_indices.append(i)
-    else:
-        for i, (wl_team, _) in enumerate(event["waitlist"]):
-            if wl_team.lower() == team_name:
-                team_on_waitlist = True
-                waitlist_indices.append(i)
-    
-    if not team_registered and not team_on_waitlist:
-        await send_feedback(
-            interaction,
-            f"Team {team_name} ist weder angemeldet noch auf der Warteliste.",
-            ephemeral=True
-        )
-        return False
-    
-    # Bestätigungsdialog anzeigen
-    embed = discord.Embed(
-        title="⚠️ Team wirklich abmelden?",
-        description=f"Bist du sicher, dass du {'das' if is_admin else 'dein'} Team **{team_name}** abmelden möchtest?\n\n"
-                   f"Diese Aktion kann nicht rückgängig gemacht werden!",
-        color=discord.Color.red()
-    )
-    
-    # Erstelle die Bestätigungsansicht
-    view = TeamUnregisterConfirmationView(team_name, is_admin=is_admin)
-    await send_feedback(interaction, "", ephemeral=True, embed=embed, view=view)
-    
-    # Log für Abmeldebestätigungsdialog
-    status = "registriert" if team_registered else "auf der Warteliste"
-    action_by = "Admin " if is_admin else ""
-    await send_to_log_channel(
-        f"🔄 Abmeldungsprozess gestartet: {action_by}{interaction.user.name} ({interaction.user.id}) will Team '{team_name}' abmelden (Status: {status})",
-        level="INFO",
-        guild=interaction.guild
-    )
-    
-    return True
-
-async def handle_team_size_change(interaction, team_name, old_size, new_size, is_admin=False):
-    """
-    Verarbeitet die Änderung der Teamgröße (Erhöhung oder Verringerung)
-    
-    Parameters:
-    - interaction: Discord-Interaktion
-    - team_name: Name des Teams
-    - old_size: Aktuelle Teamgröße
-    - new_size: Neue Teamgröße
-    - is_admin: Ob die Aktion von einem Admin durchgeführt wird
-    
-    Returns:
-    - Eine Statusnachricht als String
-    """
-    event = get_event()
-    if not event:
-        logger.warning(f"Team-Größenänderung für '{team_name}' fehlgeschlagen: Kein aktives Event")
-        return "Es gibt derzeit kein aktives Event."
-        
-    user_id = str(interaction.user.id)
-    size_difference = new_size - old_size
-    
-    # Loggen der Anfrage zur Team-Größenänderung
-    action_by = "Admin " if is_admin else ""
-    logger.info(f"Team-Größenänderung angefordert: {action_by}{interaction.user.name} ({interaction.user.id}) will Team '{team_name}' von {old_size} auf {new_size} ändern (Diff: {size_difference})")
-    
-    # Keine Änderung
-    if size_difference == 0:
-        logger.debug(f"Team-Größenänderung für '{team_name}' übersprungen: Keine Änderung (Größe bleibt {new_size})")
-        return f"Team {team_name} ist bereits mit {new_size} Personen angemeldet."
-    
-    # Abmeldung (size == 0)
-    if new_size == 0:
-        logger.info(f"Team-Abmeldung erkannt für '{team_name}' (Größe: {old_size})")
-        await handle_team_unregistration(interaction, team_name, is_admin)
-        return None  # Rückgabe erfolgt in handle_team_unregistration
-    
-    # Teamgröße erhöhen
-    if size_difference > 0:
-        # Check if enough slots are available
-        if event["slots_used"] + size_difference > event["max_slots"]:
-            available_slots = event["max_slots"] - event["slots_used"]
-            if available_slots > 0:
-                # Teilweise anmelden und Rest auf Warteliste
-                waitlist_size = size_difference - available_slots
-                
-                # Aktualisiere die angemeldete Teamgröße
-                event["slots_used"] += available_slots
-                
-                # Verwende Hilfsfunktion zur Formaterkennung
-                from utils import is_using_team_ids
-                using_team_ids = is_using_team_ids(event)
-                
-                if using_team_ids:
-                    # Neues Format mit Team-IDs
-                    for name, data in event["teams"].items():
-                        if name.lower() == team_name.lower():
-                            event["teams"][name]["size"] = data.get("size", 0) + available_slots
-                            break
-                else:
-                    # Altes Format
-                    for name in event["teams"]:
-                        if name.lower() == team_name.lower():
-                            event["teams"][name] = old_size + available_slots
-                            break
-                
-                # Füge Rest zur Warteliste hinzu
-                # Generiere eine Team-ID, falls noch nicht vorhanden
-                team_id = None
-                for name, data in event["teams"].items():
-                    if name.lower() == team_name.lower():
-                        if isinstance(data, dict) and "id" in data:
-                            team_id = data["id"]
-                        break
-                
-                if team_id is None:
-                    from utils import generate_team_id
-                    team_id = generate_team_id(team_name)
-                
-                # Verwende Hilfsfunktion zur Formaterkennung
-                from utils import is_using_waitlist_ids
-                using_waitlist_ids = is_using_waitlist_ids(event)
-                
-                if using_waitlist_ids:
-                    event["waitlist"].append((team_name, waitlist_size, team_id))
-                else:
-                    event["waitlist"].append((team_name, waitlist_size))
-                
-                # Nutzer diesem Team zuweisen
-                user_team_assignments[user_id] = team_name
-                
-                # Speichere für Benachrichtigungen
-                team_requester[team_name] = interaction.user
-                
-                return (f"Team {team_name} wurde teilweise angemeldet. "
-                        f"{old_size + available_slots} Spieler sind angemeldet und "
-                        f"{waitlist_size} Spieler wurden auf die Warteliste gesetzt (Position {len(event['waitlist'])}).")
-            else:
-                # Komplett auf Warteliste setzen
-                # Generiere eine Team-ID
-                from utils import generate_team_id
-                team_id = generate_team_id(team_name)
-                
-                # Verwende Hilfsfunktion zur Formaterkennung
-                from utils import is_using_waitlist_ids
-                using_waitlist_ids = is_using_waitlist_ids(event)
-                
-                if using_waitlist_ids:
-                    event["waitlist"].append((team_name, new_size, team_id))
-                else:
-                    event["waitlist"].append((team_name, new_size))
-                
-                # Nutzer diesem Team zuweisen
-                user_team_assignments[user_id] = team_name
-                
-                # Speichere für Benachrichtigungen
-                team_requester[team_name] = interaction.user
-                
-                return f"Team {team_name} wurde mit {new_size} Personen auf die Warteliste gesetzt (Position {len(event['waitlist'])})."
-        else:
-            # Genügend Plätze vorhanden, normal anmelden
-            event["slots_used"] += size_difference
-            
-            # Prüfe, ob das Team-Dictionary das erweiterte Format mit IDs verwendet
-            using_team_ids = False
-            if event["teams"] and isinstance(next(iter(event["teams"].values())), dict):
-                using_team_ids = True
-            
-            if using_team_ids:
-                # Neues Format mit Team-IDs
-                team_exists = False
-                for name in event["teams"]:
-                    if name.lower() == team_name.lower():
-                        event["teams"][name]["size"] = new_size
-                        team_exists = True
-                        break
-                
-                if not team_exists:
-                    # Team neu anlegen
-                    from utils import generate_team_id
-                    team_id = generate_team_id(team_name)
-                    event["teams"][team_name] = {"size": new_size, "id": team_id}
-            else:
-                # Altes Format
-                team_exists = False
-                for name in event["teams"]:
-                    if name.lower() == team_name.lower():
-                        event["teams"][name] = new_size
-                        team_exists = True
-                        break
-                
-                if not team_exists:
-                    # Team neu anlegen
-                    event["teams"][team_name] = new_size
-            
-            # Assign user to this team
-            user_team_assignments[user_id] = team_name
-            
-            # Log für Team-Anmeldung
-            action_by = "Admin " if is_admin else ""
-            await send_to_log_channel(
-                f"👥 Team angemeldet: {action_by}{interaction.user.name} hat Team '{team_name}' mit {new_size} Mitgliedern angemeldet",
-                guild=interaction.guild
-            )
-            
-            return f"Team {team_name} wurde mit {new_size} Personen angemeldet."
-    else:  # size_difference < 0
-        # Reduce team size
-        event["slots_used"] += size_difference  # Will be negative
-        
-        # Prüfe, ob das Team-Dictionary das erweiterte Format mit IDs verwendet
-        using_team_ids = False
-        if event["teams"] and isinstance(next(iter(event["teams"].values())), dict):
-            using_team_ids = True
-        
-        if using_team_ids:
-            # Neues Format mit Team-IDs
-            for name in event["teams"]:
-                if name.lower() == team_name.lower():
-                    event["teams"][name]["size"] = new_size
-                    break
-        else:
-            # Altes Format
-            for name in event["teams"]:
-                if name.lower() == team_name.lower():
-                    event["teams"][name] = new_size
-                    break
-        
-        result_message = f"Teamgröße für {team_name} wurde auf {new_size} aktualisiert."
-        
-        # Freie Plätze für Warteliste nutzen
-        free_slots = -size_difference
-        await process_waitlist_after_change(interaction, free_slots)
-        
-        return result_message
-
-async def update_event_displays(interaction=None, channel=None):
-    """
-    Aktualisiert alle Event-Anzeigen im Kanal
-    
-    Parameters:
-    - interaction: Optional - Discord-Interaktion (wenn vorhanden)
-    - channel: Optional - Discord-Kanal (wenn keine Interaktion vorhanden)
-    
-    Returns:
-    - True bei Erfolg, False bei Fehler
-    """
-    try:
-        if not channel and interaction:
-            if channel_id:
-                channel = bot.get_channel(channel_id)
-            else:
-                channel = bot.get_channel(interaction.channel_id)
-        
-        if channel:
-            await send_event_details(channel)
-            return True
-        return False
-    except Exception as e:
-        logger.error(f"Fehler beim Aktualisieren der Event-Anzeigen: {e}")
-        return False
-
-async def process_waitlist_after_change(interaction, free_slots):
-    """
-    Verarbeitet die Warteliste, nachdem Slots frei geworden sind.
-    
-    Parameters:
-    - interaction: Discord-Interaktion
-    - free_slots: Anzahl der frei gewordenen Slots
-    """
-    if free_slots <= 0:
-        logger.debug(f"Keine freien Slots verfügbar für Wartelisten-Verarbeitung (free_slots={free_slots})")
-        return
-    
-    event = get_event()
-    if not event:
-        logger.debug("Kein Event gefunden für Wartelisten-Verarbeitung")
-        return
-        
-    if not event.get('waitlist'):
-        logger.debug("Keine Warteliste im Event vorhanden")
-        return
-        
-    logger.info(f"Wartelisten-Verarbeitung gestartet: {free_slots} freie Slots, {len(event['waitlist'])} Teams auf Warteliste")
-    
-    # Solange freie Plätze vorhanden sind und die Warteliste nicht leer ist
-    while free_slots > 0 and event["waitlist"]:
-        # Nehme den ersten Eintrag von der Warteliste
-        # Prüfe, ob die Warteliste das erweiterte Format mit IDs verwendet
-        using_waitlist_ids = False
-        if event["waitlist"] and len(event["waitlist"][0]) > 2:
-            using_waitlist_ids = True
-        
-        if using_waitlist_ids:
-            # Neues Format mit Team-IDs
-            entry = event["waitlist"][0]
-            wait_team_name, wait_size, wait_team_id = entry
-        else:
-            # Altes Format
-            wait_team_name, wait_size = event["waitlist"][0]
-            wait_team_id = None
-        
-        # Prüfe, ob das gesamte Team Platz hat
-        if wait_size <= free_slots:
-            # Das ganze Team kann nachrücken
-            # Entferne Team von der Warteliste
-            event["waitlist"].pop(0)
-            
-            # Füge Team zum Event hinzu
-            event["slots_used"] += wait_size
-            free_slots -= wait_size
-            
-            # Prüfe, ob das Team bereits im Event ist (mit anderer Größe)
-            team_in_event = False
-            
-            # Prüfe, ob das Team-Dictionary das erweiterte Format mit IDs verwendet
-            using_team_ids = False
-            if event["teams"] and isinstance(next(iter(event["teams"].values())), dict):
-                using_team_ids = True
-            
-            if using_team_ids:
-                # Neues Format mit Team-IDs
-                for name, data in event["teams"].items():
-                    if name.lower() == wait_team_name.lower():
-                        # Erhöhe die Größe des bestehenden Teams
-                        event["teams"][name]["size"] = data.get("size", 0) + wait_size
-                        team_in_event = True
-                        break
-                
-                if not team_in_event:
-                    # Füge neues Team hinzu
-                    if wait_team_id:
-                        event["teams"][wait_team_name] = {"size": wait_size, "id": wait_team_id}
-                    else:
-                        from utils import generate_team_id
-                        team_id = generate_team_id(wait_team_name)
-                        event["teams"][wait_team_name] = {"size": wait_size, "id": team_id}
-            else:
-                # Altes Format
-                for name in event["teams"]:
-                    if name.lower() == wait_team_name.lower():
-                        # Erhöhe die Größe des bestehenden Teams
-                        event["teams"][name] += wait_size
-                        team_in_event = True
-                        break
-                
-                if not team_in_event:
-                    # Füge neues Team hinzu
-                    event["teams"][wait_team_name] = wait_size
-            
-            # Sende Benachrichtigung an den Team-Leiter
-            await send_team_dm_notification(
-                wait_team_name, 
-                f"🎉 Dein Team **{wait_team_name}** ist von der Warteliste ins Event nachgerückt!"
-            )
-            
-            # Team-Channel mit Benachrichtigung
-            await send_to_log_channel(
-                f"⬆️ Team nachgerückt: '{wait_team_name}' mit {wait_size} Mitgliedern ist von der Warteliste ins Event nachgerückt",
-                guild=interaction.guild
-            )
-        else:
-            # Das Team kann nur teilweise nachrücken
-            # Aktualisiere die Größe auf der Warteliste
-            if using_waitlist_ids:
-                event["waitlist"][0] = (wait_team_name, wait_size - free_slots, wait_team_id)
-            else:
-                event["waitlist"][0] = (wait_team_name, wait_size - free_slots)
-            
-            # Prüfe, ob das Team bereits im Event ist
-            team_in_event = False
-            
-            # Prüfe, ob das Team-Dictionary das erweiterte Format mit IDs verwendet
-            using_team_ids = False
-            if event["teams"] and isinstance(next(iter(event["teams"].values())), dict):
-                using_team_ids = True
-            
-            if using_team_ids:
-                # Neues Format mit Team-IDs
-                for name, data in event["teams"].items():
-                    if name.lower() == wait_team_name.lower():
-                        # Erhöhe die Größe des bestehenden Teams
-                        event["teams"][name]["size"] = data.get("size", 0) + free_slots
-                        team_in_event = True
-                        break
-                
-                if not team_in_event:
-                    # Füge neues Team hinzu
-                    if wait_team_id:
-                        event["teams"][wait_team_name] = {"size": free_slots, "id": wait_team_id}
-                    else:
-                        from utils import generate_team_id
-                        team_id = generate_team_id(wait_team_name)
-                        event["teams"][wait_team_name] = {"size": free_slots, "id": team_id}
-            else:
-                # Altes Format
-                for name in event["teams"]:
-                    if name.lower() == wait_team_name.lower():
-                        # Erhöhe die Größe des bestehenden Teams
-                        event["teams"][name] += free_slots
-                        team_in_event = True
-                        break
-                
-                if not team_in_event:
-                    # Füge neues Team hinzu
-                    event["teams"][wait_team_name] = free_slots
-            
-            # Aktualisiere die belegten Slots
-            event["slots_used"] += free_slots
-            
-            # Sende Benachrichtigung an den Team-Leiter
-            await send_team_dm_notification(
-                wait_team_name, 
-                f"🎉 Teile deines Teams **{wait_team_name}** sind von der Warteliste ins Event nachgerückt! "
-                f"{free_slots} Mitglieder sind jetzt angemeldet, {wait_size - free_slots} bleiben auf der Warteliste."
-            )
-            
-            # Team-Channel mit Benachrichtigung
-            await send_to_log_channel(
-                f"⬆️ Team teilweise nachgerückt: '{wait_team_name}' mit {free_slots} Mitgliedern ist teilweise von der Warteliste ins Event nachgerückt "
-                f"({wait_size - free_slots} bleiben auf der Warteliste)",
-                guild=interaction.guild
-            )
-            
-            # Alle freien Plätze sind belegt
-            free_slots = 0
-    
-    # Aktualisiere die Event-Anzeige
-    await update_event_displays(interaction=interaction)
-
-async def send_team_dm_notification(team_name, message):
-    """
-    Sendet eine DM-Benachrichtigung an den Teamleiter.
-    
-    Parameters:
-    - team_name: Name des Teams
-    - message: Nachricht, die gesendet werden soll
-    """
-    try:
-        # Suche den Team-Requester
-        if team_name in team_requester:
-            user = team_requester[team_name]
-            await user.send(message)
-    except Exception as e:
-        logger.error(f"Fehler beim Senden einer DM an den Teamleiter: {e}")
-
-async def update_team_size(interaction, team_name, new_size, is_admin=False, reason=None):
-    """
-    Aktualisiert die Größe eines Teams und verwaltet die Warteliste entsprechend.
-    Behandelt Teams als Einheit, unabhängig von Event/Warteliste-Platzierung.
-    
-    Parameters:
-    - interaction: Discord-Interaktion
-    - team_name: Name des Teams
-    - new_size: Neue Teamgröße
-    - is_admin: Ob die Änderung von einem Admin durchgeführt wird
-    - reason: Optionaler Grund für die Änderung (nur für Admins)
-    
-    Returns:
-    - True bei Erfolg, False bei Fehler
-    """
-    event = get_event()
-    if not event:
-        await send_feedback(interaction, "Es gibt derzeit kein aktives Event.", ephemeral=True)
-        return False
-    
-    # Teamgröße validieren
-    if not await validate_team_size(interaction, new_size, event["max_team_size"]):
-        return False
-    
-    # Team-Details abrufen
-    team_name = team_name.strip()
-    event_size, waitlist_size, total_size, registered_name, waitlist_entries = get_team_total_size(event, team_name)
-    
-    # Team existiert nicht und soll abgemeldet werden
-    if total_size == 0 and new_size == 0:
-        await send_feedback(interaction, f"Team {team_name} ist nicht angemeldet.", ephemeral=True)
-        return False
-    
-    # Keine Änderung
-    if total_size == new_size:
-        await send_feedback(interaction, f"Team {team_name} ist bereits mit {new_size} Spielern angemeldet.", ephemeral=True)
-        return False
-    
-    # Abmeldung
-    if new_size == 0:
-        return await handle_team_unregistration(interaction, team_name, is_admin)
-    
-    # Hier kommt die eigentliche Logik für die Größenänderung
-    if total_size < new_size:
-        # Teamgröße erhöhen
-        size_increase = new_size - total_size
-        
-        # Freie Plätze berechnen
-        free_slots = event["max_slots"] - event["slots_used"]
-        
-        # Wenn genug Platz ist, alle ins Event
-        if free_slots >= size_increase:
-            # Komplett ins Event (entweder neues Team oder Vergrößerung)
-            return await handle_team_size_change(interaction, team_name, total_size, new_size, is_admin)
-        elif free_slots > 0:
-            # Teilweise ins Event, Rest auf Warteliste
-            return await handle_team_size_change(interaction, team_name, total_size, new_size, is_admin)
-        else:
-            # Komplett auf Warteliste
-            return await handle_team_size_change(interaction, team_name, total_size, new_size, is_admin)
-    else:
-        # Teamgröße verringern
-        return await handle_team_size_change(interaction, team_name, total_size, new_size, is_admin)
-    
-    # Wir sollten nie hierher kommen
-    await send_feedback(interaction, "Es ist ein unerwarteter Fehler aufgetreten.", ephemeral=True)
-    return False
-    
-async def admin_add_team(interaction, team_name, size, discord_user_id=None, discord_username=None, force_waitlist=False):
-    """
-    Funktion für Admins, um ein Team hinzuzufügen
-    
-    Parameters:
-    - interaction: Discord-Interaktion
-    - team_name: Name des Teams
-    - size: Größe des Teams
-    - discord_user_id: Optional - Discord-ID des Nutzers, der dem Team zugewiesen wird
-    - discord_username: Optional - Username des Nutzers
-    - force_waitlist: Ob das Team direkt auf die Warteliste gesetzt werden soll
-    
-    Returns:
-    - True bei Erfolg, False bei Fehler
-    """
-    event = get_event()
-    if not event:
-        await send_feedback(interaction, "Es gibt derzeit kein aktives Event.", ephemeral=True)
-        return False
-    
-    # Teamgröße validieren
-    if not await validate_team_size(interaction, size, event["max_team_size"], allow_zero=False):
-        return False
-    
-    team_name = team_name.strip()
-    
-    # Prüfe, ob das Team bereits existiert
-    event_size, waitlist_size, total_size, registered_name, waitlist_entries = get_team_total_size(event, team_name)
-    
-    if total_size > 0:
-        await send_feedback(
-            interaction, 
-            f"Team {team_name} ist bereits registriert (Event: {event_size}, Warteliste: {waitlist_size}).",
-            ephemeral=True
-        )
-        return False
-    
-    # Wenn ein Discord-Nutzer angegeben wurde, prüfe, ob dieser bereits einem Team zugewiesen ist
-    if discord_user_id:
-        user_id = str(discord_user_id)
-        if user_id in user_team_assignments:
-            assigned_team = user_team_assignments[user_id]
-            await send_feedback(
-                interaction,
-                f"Der Nutzer ist bereits dem Team '{assigned_team}' zugewiesen.",
-                ephemeral=True
-            )
-            return False
-    
-    # Prüfe, ob genug Platz im Event ist (es sei denn, force_waitlist ist True)
-    available_slots = event["max_slots"] - event["slots_used"]
-    
-    if not force_waitlist and available_slots >= size:
-        # Genug Platz im Event - füge Team direkt hinzu
-        # Prüfe, ob das Team-Dictionary das erweiterte Format mit IDs verwendet
-        using_team_ids = False
-        if event["teams"] and isinstance(next(iter(event["teams"].values())), dict):
-            using_team_ids = True
-        
-        if using_team_ids:
-            # Neues Format mit Team-IDs
-            from utils import generate_team_id
-            team_id = generate_team_id(team_name)
-            event["teams"][team_name] = {"size": size, "id": team_id}
-        else:
-            # Altes Format
-            event["teams"][team_name] = size
-        
-        # Aktualisiere die belegten Slots
-        event["slots_used"] += size
-        
-        # Wenn ein Discord-Nutzer angegeben wurde, weise ihn diesem Team zu
-        if discord_user_id:
-            user_id = str(discord_user_id)
-            user_team_assignments[user_id] = team_name
-        
-        # Log eintragen
-        admin_action = f"Admin {interaction.user.name} hat"
-        user_info = ""
-        if discord_username:
-            user_info = f" für Nutzer {discord_username}"
-        
-        await send_to_log_channel(
-            f"👥 Team vom Admin hinzugefügt: {admin_action} Team '{team_name}' mit {size} Spielern{user_info} zum Event hinzugefügt",
-            level="INFO",
-            guild=interaction.guild
-        )
-        
-        await send_feedback(
-            interaction,
-            f"Team {team_name} wurde mit {size} Spielern zum Event hinzugefügt.",
-            ephemeral=True
-        )
-    else:
-        # Nicht genug Platz oder force_waitlist ist True - füge Team zur Warteliste hinzu
-        # Generiere eine Team-ID
-        from utils import generate_team_id
-        team_id = generate_team_id(team_name)
-        
-        # Prüfe, ob die Warteliste das erweiterte Format mit IDs verwendet
-        using_waitlist_ids = False
-        if event["waitlist"] and len(event["waitlist"][0]) > 2:
-            using_waitlist_ids = True
-        
-        if using_waitlist_ids:
-            event["waitlist"].append((team_name, size, team_id))
-        else:
-            event["waitlist"].append((team_name, size))
-        
-        # Wenn ein Discord-Nutzer angegeben wurde, weise ihn diesem Team zu
-        if discord_user_id:
-            user_id = str(discord_user_id)
-            user_team_assignments[user_id] = team_name
-        
-        # Log eintragen
-        admin_action = f"Admin {interaction.user.name} hat"
-        user_info = ""
-        if discord_username:
-            user_info = f" für Nutzer {discord_username}"
-        
-        reason = "erzwungen" if force_waitlist else "wegen Platzmangel"
-        
-        await send_to_log_channel(
-            f"👥 Team vom Admin auf Warteliste: {admin_action} Team '{team_name}' mit {size} Spielern{user_info} zur Warteliste hinzugefügt ({reason})",
-            level="INFO",
-            guild=interaction.guild
-        )
+    Returns:
+    - True bei erfolgreicher Abmeldung
+    """
+    event = get_event(event_id)
+    if not event:
+        return False
         
+    team_name = team_name.strip().lower()
+    
+    # Prüfe, ob das Team angemeldet ist oder auf der Warteliste steht
+    event_size, _, total_size, _, _ = get_team_total_size(event, team_name)
+    
+    if total_size == 0:
         await send_feedback(
             interaction,
-            f"Team {team_name} wurde mit {size} Spielern auf die Warteliste gesetzt (Position {len(event['waitlist'])}).",
+            f"Team {team_name} ist weder angemeldet noch auf der Warteliste.",
             ephemeral=True
         )
+        return False
+    
+    # Bestätigungsdialog anzeigen
+    embed = discord.Embed(
+        title="⚠️ Team wirklich abmelden?",
+        description=f"Bist du sicher, dass du {'das' if is_admin else 'dein'} Team **{team_name}** abmelden möchtest?\n\n"
+                   f"Diese Aktion kann nicht rückgängig gemacht werden!",
+        color=discord.Color.red()
+    )
     
-    # Aktualisiere die Event-Anzeige
-    await update_event_displays(interaction=interaction)
+    # Erstelle die Bestätigungsansicht
+    view = TeamUnregisterConfirmationView(team_name, is_admin=is_admin, event_id=event.id)
+    await send_feedback(interaction, "", ephemeral=True, embed=embed, view=view)
+    
+    # Log für Abmeldebestätigungsdialog
+    status = "registriert" if event_size > 0 else "auf der Warteliste"
+    action_by = "Admin " if is_admin else ""
+    await send_to_log_channel(
+        f"🔄 Abmeldungsprozess gestartet: {action_by}{interaction.user.name} ({interaction.user.id}) will Team '{team_name}' abmelden (Status: {status})",
+        level="INFO",
+        guild=interaction.guild
+    )
     
     return True
 
+async def update_event_displays(interaction=None, channel=None, event_id=None):
+    """
+    Aktualisiert alle Event-Anzeigen im Kanal
+    
+    Parameters:
+    - interaction: Optional - Discord-Interaktion (wenn vorhanden)
+    - channel: Optional - Discord-Kanal (wenn keine Interaktion vorhanden)
+    - event_id: Optional - ID des anzuzeigenden Events (Standard: zuletzt erstelltes Event)
+    
+    Returns:
+    - True bei Erfolg, False bei Fehler
+    """
+    try:
+        if not channel and interaction:
+            if channel_id:
+                channel = bot.get_channel(channel_id)
+            else:
+                channel = bot.get_channel(interaction.channel_id)
+        
+        if channel:
+            await send_event_details(channel, get_event(event_id))
+            return True
+        return False
+    except Exception as e:
+        logger.error(f"Fehler beim Aktualisieren der Event-Anzeigen: {e}")
+
+        return False
+
 # UI-Komponenten
 class TeamRegistrationModal(ui.Modal):
     """Modal für die Team-Anmeldung"""
-    def __init__(self, user):
+    def __init__(self, user, event_id=None):
         super().__init__(title="Team anmelden")
         self.user = user
+        self.event_id = event_id
         
         # Felder für Team-Name und -Größe
         self.team_name = ui.TextInput(
@@ -1050,7 +668,7 @@ class TeamRegistrationModal(ui.Modal):
             return
         
         # Hole das aktive Event
-        event = get_event()
+        event = get_event(self.event_id)
         if not event:
             await interaction.response.send_message(
                 "Es gibt derzeit kein aktives Event.",
@@ -1067,11 +685,9 @@ class TeamRegistrationModal(ui.Modal):
             )
             return
         
-        # Speichere den Benutzer für Benachrichtigungen
-        team_requester[team_name] = interaction.user
-        
         # Verwende die zentrale update_team_size Funktion für die eigentliche Logik
-        success = await update_team_size(interaction, team_name, size)
+        # (merkt sich den Benutzer für Benachrichtigungen nur, wenn die Änderung gültig ist)
+        success = await update_team_size(interaction, team_name, size, event_id=event.id, requester=interaction.user)
         
         if success:
             # Die Daten werden bereits von update_team_size gespeichert
@@ -1082,11 +698,12 @@ class TeamRegistrationModal(ui.Modal):
 
 class TeamEditModal(ui.Modal):
     """Modal zum Bearbeiten der Teamgröße"""
-    def __init__(self, team_name, current_size, max_size, is_admin=False):
+    def __init__(self, team_name, current_size, max_size, is_admin=False, event_id=None):
         super().__init__(title=f"Team {team_name} bearbeiten")
         self.team_name = team_name.strip()  # Behalte Originalschreibweise für Anzeige
         self.current_size = current_size
         self.is_admin = is_admin
+        self.event_id = event_id
         
         # Feld für die neue Teamgröße
         self.team_size = ui.TextInput(
@@ -1125,13 +742,15 @@ class TeamEditModal(ui.Modal):
             self.team_name, 
             new_size, 
             is_admin=self.is_admin,
-            reason=self.reason.value if self.is_admin and hasattr(self, 'reason') else None
+            reason=self.reason.value if self.is_admin and hasattr(self, 'reason') else None,
+            event_id=self.event_id
         )
 
 class AdminTeamCreateModal(ui.Modal):
     """Modal für Admins zum Hinzufügen eines Teams"""
-    def __init__(self):
+    def __init__(self, event_id=None):
         super().__init__(title="Team hinzufügen")
+        self.event_id = event_id
         
         # Felder für Team-Name und -Größe
         self.team_name = ui.TextInput(
@@ -1202,7 +821,7 @@ class AdminTeamCreateModal(ui.Modal):
             try:
                 # Versuche als ID zu interpretieren
                 if discord_user_input.isdigit():
-                    user = await bot.fetch_user(int(discord_user_input))
+                    user = await user_profiles.user(discord_user_input)
                     discord_user_id = str(user.id)
                     discord_username = user.display_name
                 else:
@@ -1238,9 +857,11 @@ class AdminTeamCreateModal(ui.Modal):
             size, 
             discord_user_id, 
             discord_username,
-            force_waitlist
+            force_waitlist,
+            event_id=self.event_id
         )
 
+
 class BaseView(ui.View):
     """Basis-View für alle Discord-UI-Komponenten mit erweitertem Timeout-Handling und Fehlerbehandlung"""
     def __init__(self, timeout=900, title="Interaktion"):
@@ -1318,12 +939,69 @@ class BaseConfirmationView(BaseView):
         super().__init__(timeout=timeout, title=title)
 
 
+class PaginationView(BaseView):
+    """
+    Blättert mit Buttons durch die Seiten einer Liste
+    
+    Die Seiten werden erst beim Anzeigen gerendert (render), die Anzahl der Seiten
+    wird bei jedem Klick neu abgefragt (count), sodass nach Änderungen die
+    aktuelle Liste angezeigt wird.
+    """
+    def __init__(self, render, count, title="Liste"):
+        """
+        Parameters:
+        - render: Funktion render(page), die das Embed einer Seite (ab 0) liefert
+        - count: Funktion count(), die die Anzahl der Seiten liefert
+        - title: Bezeichnung für die Timeout-Meldung
+        """
+        super().__init__(timeout=900, title=title)
+        self.render = render
+        self.count = count
+        self.page = 0
+        
+        self.previous_button = ui.Button(emoji="◀️", style=discord.ButtonStyle.secondary)
+        self.previous_button.callback = self.previous_callback
+        self.add_item(self.previous_button)
+        
+        # Seitenanzeige (nicht anklickbar)
+        self.position_button = ui.Button(style=discord.ButtonStyle.secondary, disabled=True)
+        self.add_item(self.position_button)
+        
+        self.next_button = ui.Button(emoji="▶️", style=discord.ButtonStyle.secondary)
+        self.next_button.callback = self.next_callback
+        self.add_item(self.next_button)
+        self.update_buttons()
+    
+    def update_buttons(self):
+        """Begrenzt die aktuelle Seite und aktualisiert Seitenanzeige und Buttons"""
+        count = max(1, self.count())
+        self.page = max(0, min(self.page, count - 1))
+        self.position_button.label = f"Seite {self.page + 1}/{count}"
+        self.previous_button.disabled = self.page == 0
+        self.next_button.disabled = self.page >= count - 1
+    
+    async def show_page(self, interaction, delta):
+        """Wechselt die Seite und bearbeitet die Nachricht"""
+        self.page += delta
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.render(self.page), view=self)
+    
+    async def previous_callback(self, interaction: discord.Interaction):
+        """Callback für den Zurück-Button"""
+        await self.show_page(interaction, -1)
+    
+    async def next_callback(self, interaction: discord.Interaction):
+        """Callback für den Weiter-Button"""
+        await self.show_page(interaction, 1)
+
+
 class AdminTeamSelector(BaseView):
     """Auswahl eines Teams für die Bearbeitung durch Admins"""
-    def __init__(self, for_removal=False):
+    def __init__(self, for_removal=False, event_id=None):
         super().__init__(timeout=3600, title="Admin-Teamauswahl")
         self.selected_team = None
         self.for_removal = for_removal  # Flag, ob die Auswahl für die Abmeldung ist
+        self.event_id = event_id
         
         # Dropdown für die Teamauswahl
         options = self.get_team_options()
@@ -1349,14 +1027,15 @@ class AdminTeamSelector(BaseView):
     
     def get_team_options(self):
         """Erstellt die Liste der Teams für das Dropdown"""
-        event = get_event()
+        event = get_event(self.event_id)
         if not event:
             return []
         
         team_options = []
         
         # Liste der angemeldeten Teams
-        for team_name, size in event["teams"].items():
+        for team_name, team in event.teams.items():
+            size = team.size
             team_options.append(
                 discord.SelectOption(
                     label=f"{team_name} ({size} Personen)",
@@ -1366,7 +1045,7 @@ class AdminTeamSelector(BaseView):
             )
         
         # Liste der Teams auf der Warteliste
-        for i, (team_name, size) in enumerate(event["waitlist"]):
+        for i, (team_name, size, _) in enumerate(event.waitlist):
             team_options.append(
                 discord.SelectOption(
                     label=f"{team_name} ({size} Personen)",
@@ -1398,7 +1077,7 @@ class AdminTeamSelector(BaseView):
             is_waitlist = False
         
         # Hole Informationen zum ausgewählten Team
-        event = get_event()
+        event = get_event(self.event_id)
         if not event:
             await interaction.response.send_message(
                 "Es gibt derzeit kein aktives Event.",
@@ -1417,7 +1096,7 @@ class AdminTeamSelector(BaseView):
             )
             
             # Erstelle die Bestätigungsansicht
-            view = TeamUnregisterConfirmationView(team_name, is_admin=True)
+            view = TeamUnregisterConfirmationView(team_name, is_admin=True, event_id=self.event_id)
             await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
             return
         
@@ -1427,11 +1106,11 @@ class AdminTeamSelector(BaseView):
             team_found = False
             team_size = 0
             position = 0
-            for i, (wl_team, wl_size) in enumerate(event["waitlist"]):
-                if wl_team == team_name:
+            for entry in event.waitlist.entries_for(team_name):
+                if entry.name == team_name:
                     team_found = True
-                    team_size = wl_size
-                    position = i + 1
+                    team_size = entry.size
+                    position = event.waitlist.position(entry) + 1
                     break
             
             if not team_found:
@@ -1442,104 +1121,70 @@ class AdminTeamSelector(BaseView):
                 return
             
             # Erstelle ein Modal zur Bearbeitung des Teams auf der Warteliste
-            modal = TeamEditModal(team_name, team_size, event["max_team_size"], is_admin=True)
+            modal = TeamEditModal(team_name, team_size, event.max_team_size, is_admin=True, event_id=self.event_id)
             await interaction.response.send_modal(modal)
         else:
             # Suche Team in den angemeldeten Teams
-            if team_name not in event["teams"]:
+            if team_name not in event.teams:
                 await interaction.response.send_message(
                     f"Team {team_name} wurde nicht gefunden.",
                     ephemeral=True
                 )
                 return
             
-            team_size = event["teams"][team_name]
+            team_size = event.teams[team_name].size
             
             # Erstelle ein Modal zur Bearbeitung des angemeldeten Teams
-            modal = TeamEditModal(team_name, team_size, event["max_team_size"], is_admin=True)
+
+            modal = TeamEditModal(team_name, team_size, event.max_team_size, is_admin=True, event_id=self.event_id)
             await interaction.response.send_modal(modal)
 
 class EventActionView(BaseView):
-    """View mit Buttons für Event-Aktionen"""
-    def __init__(self, event, user_has_admin=False, user_has_clan_rep=False, has_team=False, team_name=None):
-        super().__init__(timeout=3600, title="Event-Aktionen")  # 1 Stunde Timeout
-        self.team_name = team_name
-        
-        # Team anmelden Button (nur für Clan-Rep)
-        register_button = ui.Button(
-            label="Team anmelden",
-            emoji="✅",
-            style=discord.ButtonStyle.success,
-            custom_id=f"event_register",
-            disabled=not user_has_clan_rep or has_team
-        )
-        register_button.callback = self.register_callback
-        self.add_item(register_button)
-        
-        # Team abmelden Button (nur für Clan-Rep mit Team)
-        if has_team and team_name:
-            unregister_button = ui.Button(
-                label="Team abmelden",
-                emoji="❌",
-                style=discord.ButtonStyle.danger,
-                custom_id=f"event_unregister",
-                disabled=not user_has_clan_rep
-            )
-            unregister_button.callback = self.unregister_callback
-            self.add_item(unregister_button)
-        
-        # Warteliste wird automatisch verwaltet, daher kein Button mehr erforderlich
-        
-        # Team-Info für alle sichtbar
-        team_info_button = ui.Button(
-            label="Mein Team", 
-            emoji="👥",
-            style=discord.ButtonStyle.primary,
-            custom_id=f"event_teaminfo"
-        )
-        team_info_button.callback = self.team_info_callback
-        self.add_item(team_info_button)
-        
-        # Team bearbeiten Button (für Clan-Rep mit Team und Admins)
-        if (user_has_clan_rep and has_team) or user_has_admin:
-            edit_button = ui.Button(
-                label="Team bearbeiten", 
-                emoji="✏️",
-                style=discord.ButtonStyle.primary,
-                custom_id=f"event_edit_team"
-            )
-            edit_button.callback = self.edit_team_callback
-            self.add_item(edit_button)
-            
-            # Team abmelden Button (für Clan-Rep mit Team)
-            if user_has_clan_rep and has_team:
-                unregister_button = ui.Button(
-                    label="Team abmelden", 
-                    emoji="❌",
-                    style=discord.ButtonStyle.danger,
-                    custom_id=f"event_unregister_team"
-                )
-                unregister_button.callback = self.unregister_callback
-                self.add_item(unregister_button)
-        
-        # Admin-Aktionen (nur für Admins)
-        if user_has_admin:
-            admin_button = ui.Button(
-                label="Admin", 
-                emoji="⚙️",
-                style=discord.ButtonStyle.danger,
-                custom_id=f"event_admin"
-            )
-            admin_button.callback = self.admin_callback
-            self.add_item(admin_button)
+    """
+    Persistente View mit Buttons für Event-Aktionen
+    
+    Eine einzige Instanz (event_view) wird beim Start mit bot.add_view registriert
+    und für alle Event-Anzeigen verwendet. Sie hat keinen Timeout und feste
+    custom_ids, sodass die Buttons Neustarts überstehen. Event und Berechtigungen
+    werden bei jedem Klick aus der Interaktion ermittelt (siehe event_id_for_message).
+    """
+    def __init__(self):
+        super().__init__(timeout=None, title="Event-Aktionen")
+        
+        # Alle Buttons sind immer sichtbar; die Callbacks prüfen die Rollen des Klickenden
+        buttons = [
+            ("Team anmelden", "✅", discord.ButtonStyle.success, "event_register", self.register_callback),
+            ("Mein Team", "👥", discord.ButtonStyle.primary, "event_teaminfo", self.team_info_callback),
+            ("Teamliste", "📋", discord.ButtonStyle.secondary, "event_team_list", self.team_list_callback),
+            ("Team bearbeiten", "✏️", discord.ButtonStyle.primary, "event_edit_team", self.edit_team_callback),
+            ("Team abmelden", "❌", discord.ButtonStyle.danger, "event_unregister", self.unregister_callback),
+            ("Admin", "⚙️", discord.ButtonStyle.danger, "event_admin", self.admin_callback)
+        ]
+        for label, emoji, style, custom_id, callback in buttons:
+            button = ui.Button(label=label, emoji=emoji, style=style, custom_id=custom_id)
+            button.callback = callback
+            self.add_item(button)
+    
+    async def interaction_check(self, interaction: discord.Interaction):
+        """Weist Klicks auf Anzeigen gelöschter oder abgelaufener Events ab, statt auf ein anderes Event auszuweichen"""
+        event_id = event_id_for_message(interaction.message)
+        if event_id is not None and event_id not in event_data:
+            await send_feedback(interaction, "Dieses Event existiert nicht mehr.")
+            return False
+        return True
     
     async def register_callback(self, interaction: discord.Interaction):
         """Callback für Team-Registrierung-Button"""
+        event_id = event_id_for_message(interaction.message)
         user_id = str(interaction.user.id)
         
-        # Prüfe, ob der Benutzer bereits einem Team zugewiesen ist
-        if user_id in user_team_assignments:
+        # Prüfe, ob das Team des Benutzers bereits für dieses Event angemeldet ist
+        # (für andere Events kann es mit demselben Namen angemeldet werden)
+        event = get_event(event_id)
+        if user_id in user_team_assignments and (
+                not event or get_team_total_size(event, user_team_assignments[user_id])[2] > 0):
             team_name = user_team_assignments[user_id]
+
             await interaction.response.send_message(
                 f"Du bist bereits dem Team '{team_name}' zugewiesen. Du kannst nicht erneut registrieren.",
                 ephemeral=True
@@ -1568,7 +1213,7 @@ class EventActionView(BaseView):
             return
         
         # Öffne ein Modal für die Team-Anmeldung
-        modal = TeamRegistrationModal(interaction.user)
+        modal = TeamRegistrationModal(interaction.user, event_id=event_id)
         await interaction.response.send_modal(modal)
         
         # Log für Registrierungsversuch
@@ -1580,6 +1225,7 @@ class EventActionView(BaseView):
     
     async def unregister_callback(self, interaction: discord.Interaction):
         """Callback für Team-Abmeldung-Button"""
+        event_id = event_id_for_message(interaction.message)
         user_id = str(interaction.user.id)
         
         # Überprüfe Berechtigung mit der verbesserten has_role-Funktion
@@ -1611,7 +1257,7 @@ class EventActionView(BaseView):
             )
             return
             
-        event = get_event()
+        event = get_event(event_id)
         if not event:
             await interaction.response.send_message("Es gibt kein aktives Event.", ephemeral=True)
             await send_to_log_channel(
@@ -1622,13 +1268,8 @@ class EventActionView(BaseView):
             return
             
         # Prüfe, ob das Team angemeldet ist oder auf der Warteliste steht
-        team_registered = team_name in event["teams"]
-        team_on_waitlist = False
-        
-        for i, (wl_team, _) in enumerate(event["waitlist"]):
-            if wl_team == team_name:
-                team_on_waitlist = True
-                break
+        team_registered = team_name in event.teams
+        team_on_waitlist = any(entry.name == team_name for entry in event.waitlist.entries_for(team_name))
                 
         if team_registered or team_on_waitlist:
             # Bestätigungsdialog anzeigen
@@ -1640,7 +1281,7 @@ class EventActionView(BaseView):
             )
             
             # Erstelle die Bestätigungsansicht
-            view = TeamUnregisterConfirmationView(team_name, is_admin=False)
+            view = TeamUnregisterConfirmationView(team_name, is_admin=False, event_id=event_id)
             await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
             
             # Log für Abmeldebestätigungsdialog
@@ -1666,18 +1307,19 @@ class EventActionView(BaseView):
     
     async def team_info_callback(self, interaction: discord.Interaction):
         """Callback für Team-Info-Button"""
+        event_id = event_id_for_message(interaction.message)
         # Sende eine ephemeral Nachricht mit Team-Informationen
         await interaction.response.defer(ephemeral=True)
         
         global user_team_assignments
-        event = get_event()
+        event = get_event(event_id)
         user_id = str(interaction.user.id)
         
         # Hole das Team des Users
         team_name = user_team_assignments.get(user_id)
         team_size = None
-        if team_name and event and team_name in event["teams"]:
-            team_size = event["teams"][team_name]
+        if team_name and event and team_name in event.teams:
+            team_size = event.teams[team_name].size
         
         if not team_name or not team_size:
             embed = discord.Embed(
@@ -1710,14 +1352,23 @@ class EventActionView(BaseView):
             if event:
                 embed.add_field(
                     name="🎮 Event",
-                    value=f"{event['name']} ({event['date']}, {event['time']})",
+                    value=f"{event.name} ({event.date}, {event.time})",
                     inline=False
                 )
         
         await interaction.followup.send(embed=embed, ephemeral=True)
     
+    async def team_list_callback(self, interaction: discord.Interaction):
+        """Callback für Teamliste-Button: vollständige Teamliste seitenweise, nur für den Klickenden sichtbar"""
+        event = get_event(event_id_for_message(interaction.message))
+        if not event:
+            await interaction.response.send_message("Es gibt kein aktives Event.", ephemeral=True)
+            return
+        await send_team_list(interaction, event, ephemeral=True)
+    
     async def edit_team_callback(self, interaction: discord.Interaction):
         """Callback für Team-Bearbeiten-Button"""
+        event_id = event_id_for_message(interaction.message)
         user_id = str(interaction.user.id)
         
         # Verbesserte Rollenprüfung mit has_role (berücksichtigt ADMIN_IDs in DMs)
@@ -1725,7 +1376,7 @@ class EventActionView(BaseView):
         is_clan_rep = has_role(interaction.user, CLAN_REP_ROLE)
         
         # Prüfe zuerst, ob es überhaupt ein aktives Event gibt
-        event = get_event()
+        event = get_event(event_id)
         if not event:
             await interaction.response.send_message(
                 "Es gibt derzeit kein aktives Event.",
@@ -1740,7 +1391,7 @@ class EventActionView(BaseView):
         
         if is_admin:
             # Prüfe, ob es Teams gibt
-            if not event["teams"] and not event["waitlist"]:
+            if not event.teams and not event.waitlist:
                 await interaction.response.send_message(
                     "Es sind keine Teams zum Bearbeiten vorhanden.",
                     ephemeral=True
@@ -1753,7 +1404,7 @@ class EventActionView(BaseView):
                 return
                 
             # Admins sehen alle Teams zur Auswahl
-            view = AdminTeamSelector()
+            view = AdminTeamSelector(event_id=event_id)
             await interaction.response.send_message(
                 "Wähle das Team, das du bearbeiten möchtest:",
                 view=view,
@@ -1786,12 +1437,12 @@ class EventActionView(BaseView):
             team_size = None
             is_on_waitlist = False
             
-            if team_name in event["teams"]:
-                team_size = event["teams"][team_name]
+            if team_name in event.teams:
+                team_size = event.teams[team_name].size
             else:
-                for wl_team, wl_size in event["waitlist"]:
-                    if wl_team == team_name:
-                        team_size = wl_size
+                for entry in event.waitlist.entries_for(team_name):
+                    if entry.name == team_name:
+                        team_size = entry.size
                         is_on_waitlist = True
                         break
             
@@ -1808,7 +1459,7 @@ class EventActionView(BaseView):
                 return
             
             # Öffne das Modal zur Teambearbeitung
-            modal = TeamEditModal(team_name, team_size, event["max_team_size"])
+            modal = TeamEditModal(team_name, team_size, event.max_team_size, event_id=event_id)
             await interaction.response.send_modal(modal)
             
             # Log für Team-Bearbeitung
@@ -1832,6 +1483,7 @@ class EventActionView(BaseView):
     
     async def admin_callback(self, interaction: discord.Interaction):
         """Callback für Admin-Button"""
+        event_id = event_id_for_message(interaction.message)
         await interaction.response.defer(ephemeral=True)
         
         # Verbesserte Rollenprüfung mit has_role (berücksichtigt ADMIN_IDs in DMs)
@@ -1849,7 +1501,7 @@ class EventActionView(BaseView):
             return
         
         # Prüfe, ob es ein aktives Event gibt
-        event = get_event()
+        event = get_event(event_id)
         if not event:
             await interaction.followup.send("Es gibt kein aktives Event.", ephemeral=True)
             await send_to_log_channel(
@@ -1867,20 +1519,24 @@ class EventActionView(BaseView):
         )
         
         # Erstelle ein View mit Admin-Aktionen
-        view = AdminActionView()
+        view = AdminActionView(event_id=event_id)
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
         
         # Log für Admin-Panel-Zugriff
         await send_to_log_channel(
-            f"👤 Admin-Panel geöffnet: {interaction.user.name} ({interaction.user.id}) hat das Admin-Panel für das Event '{event['name']}' geöffnet",
+            f"👤 Admin-Panel geöffnet: {interaction.user.name} ({interaction.user.id}) hat das Admin-Panel für das Event '{event.name}' geöffnet",
             level="INFO",
             guild=interaction.guild
         )
 
+# Einzige Instanz der Event-Buttons für alle Anzeigen (in setup_hook mit bot.add_view registriert)
+event_view = EventActionView()
+
 class AdminActionView(BaseView):
     """View mit Buttons für Admin-Aktionen"""
-    def __init__(self):
+    def __init__(self, event_id=None):
         super().__init__(timeout=3600, title="Admin-Aktionen")  # 1 Stunde Timeout
+        self.event_id = event_id
         
         # Open Registration
         open_reg_button = ui.Button(
@@ -1954,7 +1610,7 @@ class AdminActionView(BaseView):
             return
         
         # Hole das aktive Event
-        event = get_event()
+        event = get_event(self.event_id)
         if not event:
             await interaction.response.send_message("Es gibt kein aktives Event.", ephemeral=True)
             await send_to_log_channel(
@@ -1964,35 +1620,38 @@ class AdminActionView(BaseView):
             )
             return
         
-        # Speichere die alte Teamgröße für das Logging
-        old_max_size = event["max_team_size"]
-        
-        # Aktualisiere die maximale Teamgröße
-        event["max_team_size"] = EXPANDED_MAX_TEAM_SIZE
-        save_data(event_data, channel_id, user_team_assignments)
+        def apply(outbox):
+            # Speichere die alte Teamgröße für das Logging
+            old_max_size = event.max_team_size
         
-        embed = discord.Embed(
-            title="🔓 Maximale Teamgröße erhöht",
-            description=f"Die maximale Teamgröße wurde auf {EXPANDED_MAX_TEAM_SIZE} erhöht.",
-            color=discord.Color.green()
-        )
+            # Aktualisiere die maximale Teamgröße
+            event.max_team_size = EXPANDED_MAX_TEAM_SIZE
         
-        # Benachrichtige auch im öffentlichen Channel
-        channel = bot.get_channel(interaction.channel_id)
-        if channel:
-            await channel.send(
-                f"📢 **Ankündigung**: Die maximale Teamgröße für das Event '{event['name']}' "
-                f"wurde auf {EXPANDED_MAX_TEAM_SIZE} erhöht!"
+            embed = discord.Embed(
+                title="🔓 Maximale Teamgröße erhöht",
+                description=f"Die maximale Teamgröße wurde auf {EXPANDED_MAX_TEAM_SIZE} erhöht.",
+                color=discord.Color.green()
             )
         
-        # Log für erfolgreiche Registrierungsöffnung
-        await send_to_log_channel(
-            f"🔓 Registrierung geöffnet: {interaction.user.name} ({interaction.user.id}) hat die maximale Teamgröße von {old_max_size} auf {EXPANDED_MAX_TEAM_SIZE} erhöht für Event '{event['name']}'",
-            level="INFO",
-            guild=interaction.guild
-        )
+            # Benachrichtige auch im öffentlichen Channel
+            channel = bot.get_channel(interaction.channel_id)
+            if channel:
+                outbox.send(send_channel_message(
+                    channel,
+                    f"📢 **Ankündigung**: Die maximale Teamgröße für das Event '{event.name}' "
+                    f"wurde auf {EXPANDED_MAX_TEAM_SIZE} erhöht!"
+                ))
+        
+            # Log für erfolgreiche Registrierungsöffnung
+            outbox.send(send_to_log_channel(
+                f"🔓 Registrierung geöffnet: {interaction.user.name} ({interaction.user.id}) hat die maximale Teamgröße von {old_max_size} auf {EXPANDED_MAX_TEAM_SIZE} erhöht für Event '{event.name}'",
+                level="INFO",
+                guild=interaction.guild
+            ))
             
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+            outbox.send(send_feedback(interaction, None, embed=embed, ephemeral=True))
+        
+        await command_queue.submit(event.id, "open_reg", apply)
     
     async def manage_teams_callback(self, interaction: discord.Interaction):
         """Callback für Team-Verwaltung"""
@@ -2010,45 +1669,46 @@ class AdminActionView(BaseView):
             return
         
         # Erstelle ein Embed mit der Team-Übersicht
-        event = get_event()
+        event = get_event(self.event_id)
         if not event:
             await interaction.response.send_message("Es gibt kein aktives Event.", ephemeral=True)
             return
         
         embed = discord.Embed(
             title="👥 Team-Verwaltung",
-            description=f"Hier kannst du alle Teams für das Event **{event['name']}** verwalten.",
+            description=f"Hier kannst du alle Teams für das Event **{event.name}** verwalten.",
             color=discord.Color.blue()
         )
         
         # Angemeldete Teams
         teams_text = ""
-        if event["teams"]:
-            for team_name, size in event["teams"].items():
+        if event.teams:
+            for team_name, team in event.teams.items():
+                size = team.size
                 teams_text += f"• **{team_name}**: {size} {'Person' if size == 1 else 'Personen'}\n"
         else:
             teams_text = "Noch keine Teams angemeldet."
         
         embed.add_field(
-            name=f"📋 Angemeldete Teams ({len(event['teams'])})",
+            name=f"📋 Angemeldete Teams ({len(event.teams)})",
             value=teams_text,
             inline=False
         )
         
         # Warteliste
-        if event["waitlist"]:
+        if event.waitlist:
             waitlist_text = ""
-            for i, (team_name, size) in enumerate(event["waitlist"]):
+            for i, (team_name, size, _) in enumerate(event.waitlist):
                 waitlist_text += f"{i+1}. **{team_name}**: {size} {'Person' if size == 1 else 'Personen'}\n"
             
             embed.add_field(
-                name=f"⏳ Warteliste ({len(event['waitlist'])})",
+                name=f"⏳ Warteliste ({len(event.waitlist)})",
                 value=waitlist_text,
                 inline=False
             )
         
         # Erstelle die Team-Auswahl
-        view = AdminTeamSelector()
+        view = AdminTeamSelector(event_id=self.event_id)
         
         await interaction.response.send_message(
             embed=embed,
@@ -2072,7 +1732,7 @@ class AdminActionView(BaseView):
             return
         
         # Öffne ein Modal zum Hinzufügen eines Teams
-        modal = AdminTeamCreateModal()
+        modal = AdminTeamCreateModal(event_id=self.event_id)
         await interaction.response.send_modal(modal)
     
     async def remove_team_callback(self, interaction: discord.Interaction):
@@ -2091,7 +1751,7 @@ class AdminActionView(BaseView):
             return
         
         # Hole das aktive Event
-        event = get_event()
+        event = get_event(self.event_id)
         if not event:
             await interaction.response.send_message("Es gibt kein aktives Event.", ephemeral=True)
             return
@@ -2104,7 +1764,7 @@ class AdminActionView(BaseView):
         )
         
         # Erstelle die Team-Auswahl mit for_removal=True
-        view = AdminTeamSelector(for_removal=True)
+        view = AdminTeamSelector(for_removal=True, event_id=self.event_id)
         
         await interaction.response.send_message(
             embed=embed,
@@ -2128,7 +1788,7 @@ class AdminActionView(BaseView):
             return
         
         # Hole das aktive Event
-        event = get_event()
+        event = get_event(self.event_id)
         if not event:
             await interaction.response.send_message("Es gibt kein aktives Event.", ephemeral=True)
             return
@@ -2136,21 +1796,22 @@ class AdminActionView(BaseView):
         # Zeige eine Bestätigungsanfrage
         embed = discord.Embed(
             title="⚠️ Event wirklich löschen?",
-            description=f"Bist du sicher, dass du das Event **{event['name']}** löschen möchtest?\n\n"
+            description=f"Bist du sicher, dass du das Event **{event.name}** löschen möchtest?\n\n"
                         f"Diese Aktion kann nicht rückgängig gemacht werden! Alle Team-Anmeldungen und Wartelisten-Einträge werden gelöscht.",
             color=discord.Color.red()
         )
         
-        view = DeleteConfirmationView()
+        view = DeleteConfirmationView(event_id=self.event_id)
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
 class TeamUnregisterConfirmationView(BaseConfirmationView):
     """View für die Bestätigung einer Team-Abmeldung"""
-    def __init__(self, team_name, is_admin=False):
+    def __init__(self, team_name, is_admin=False, event_id=None):
         super().__init__(title="Team-Abmeldung")
         self.team_name = team_name.strip() if team_name else ""  # Behalte Originalschreibweise
         self.team_name_lower = team_name.strip().lower() if team_name else ""  # Lowercase für Vergleiche
         self.is_admin = is_admin
+        self.event_id = event_id
     
     @ui.button(label="Ja, Team abmelden", style=discord.ButtonStyle.danger)
     async def confirm_callback(self, interaction: discord.Interaction, button: ui.Button):
@@ -2184,34 +1845,30 @@ class TeamUnregisterConfirmationView(BaseConfirmationView):
         )
         
         try:
-            # Hole Event-Daten, um Team-Gesamtgröße zu ermitteln (angemeldet + Warteliste)
-            event = get_event()
-            total_size = 0
-            registered_size = 0
-            waitlist_size = 0
+            # Größen lesen und abmelden im selben Command, damit die Meldung zum Ergebnis passt
+            event = get_event(self.event_id)
             
-            if event:
-                # Größe im registrierten Team (case-insensitive)
-                for reg_team, reg_size in event.get("teams", {}).items():
-                    if reg_team.lower() == self.team_name_lower:
-                        registered_size = reg_size
-                        total_size += registered_size
-                        break
+            def apply(outbox):
+                event = get_event(self.event_id)
+                sizes = (0, 0, 0)
+                if event:
+                    # Größen im Event und auf der Warteliste (case-insensitive)
+                    sizes = get_team_total_size(event, self.team_name)[:3]
                 
-                # Größe auf der Warteliste (case-insensitive)
-                for wl_team, wl_size in event.get("waitlist", []):
-                    if wl_team.lower() == self.team_name_lower:
-                        waitlist_size = wl_size
-                        total_size += waitlist_size
-                        break
+                # Führe die Teamgrößenänderung auf 0 durch (was zur Abmeldung führt)
+                success = apply_team_size(
+                    outbox,
+                    interaction, 
+                    self.team_name, 
+                    0, 
+                    is_admin=self.is_admin,
+                    reason="Team manuell abgemeldet",
+                    event_id=self.event_id
+                )
+                return (success, *sizes)
             
-            # Führe die Teamgrößenänderung auf 0 durch (was zur Abmeldung führt)
-            success = await update_team_size(
-                interaction, 
-                self.team_name, 
-                0, 
-                is_admin=self.is_admin,
-                reason="Team manuell abgemeldet"
+            success, registered_size, waitlist_size, total_size = await command_queue.submit(
+                event.id if event else self.event_id, "Team-Abmeldung", apply
             )
             
             if success:
@@ -2311,8 +1968,9 @@ class TeamUnregisterConfirmationView(BaseConfirmationView):
 
 class DeleteConfirmationView(BaseConfirmationView):
     """View für die Bestätigung einer Event-Löschung"""
-    def __init__(self):
+    def __init__(self, event_id=None):
         super().__init__(title="Event-Löschung")
+        self.event_id = event_id
     
     @ui.button(label="Ja, Event löschen", style=discord.ButtonStyle.danger)
     async def confirm_callback(self, interaction: discord.Interaction, button: ui.Button):
@@ -2342,53 +2000,61 @@ class DeleteConfirmationView(BaseConfirmationView):
         
         try:
             # Lösche das Event
-            event = get_event()
-            if event:
-                event_name = event['name']
-                event_date = event.get('date', 'unbekannt')
-                registered_teams = len(event["teams"])
-                waitlist_teams = len(event["waitlist"])
+            event = get_event(self.event_id)
+            def apply(outbox):
+                event = get_event(self.event_id)
+                if event:
+                    event_name = event.name
+                    event_date = event.date or 'unbekannt'
+                    registered_teams = len(event.teams)
+                    waitlist_teams = len(event.waitlist)
                 
-                # Erstelle ein Log mit detaillierten Informationen zum Event
-                log_message = (
-                    f"🗑️ Event gelöscht: {interaction.user.name} ({interaction.user.id}) hat das Event '{event_name}' gelöscht\n"
-                    f"Datum: {event_date}, Angemeldete Teams: {registered_teams}, Teams auf der Warteliste: {waitlist_teams}"
-                )
-                await send_to_log_channel(log_message, level="WARNING", guild=interaction.guild)
+                    # Erstelle ein Log mit detaillierten Informationen zum Event
+                    log_message = (
+                        f"🗑️ Event gelöscht: {interaction.user.name} ({interaction.user.id}) hat das Event '{event_name}' gelöscht\n"
+                        f"Datum: {event_date}, Angemeldete Teams: {registered_teams}, Teams auf der Warteliste: {waitlist_teams}"
+                    )
+                    outbox.send(send_to_log_channel(log_message, level="WARNING", guild=interaction.guild))
                 
-                # Jetzt löschen
-                event_data.clear()
-                user_team_assignments.clear()
-                save_data(event_data, channel_id, user_team_assignments)
+                    # Jetzt löschen (andere Events bleiben unverändert)
+                    remove_event(event.id)
+                    outbox.send(flush_data())
+                    for display_channel_id, message_id in event.display_messages.items():
+                        outbox.send(retire_display(display_channel_id, message_id))
                 
-                embed = discord.Embed(
-                    title="✅ Event gelöscht",
-                    description="Das Event wurde erfolgreich gelöscht.",
-                    color=discord.Color.green()
-                )
+                    embed = discord.Embed(
+                        title="✅ Event gelöscht",
+                        description="Das Event wurde erfolgreich gelöscht.",
+                        color=discord.Color.green()
+                    )
                 
-                # Aktualisiere die Bestätigungsnachricht
-                await interaction.edit_original_response(content=None, embed=embed, view=None)
+                    # Aktualisiere die Bestätigungsnachricht
+                    outbox.send(interaction.edit_original_response(content=None, embed=embed, view=None))
                 
-                # Benachrichtige auch im öffentlichen Channel
-                channel = bot.get_channel(interaction.channel_id)
-                if channel:
-                    await channel.send(f"📢 **Information**: Das Event '{event_name}' wurde gelöscht.")
-            else:
-                embed = discord.Embed(
-                    title="❌ Fehler",
-                    description="Es gibt kein aktives Event zum Löschen.",
-                    color=discord.Color.red()
-                )
+                    # Benachrichtige auch im öffentlichen Channel
+                    channel = bot.get_channel(interaction.channel_id)
+                    if channel:
+                        outbox.send(send_channel_message(channel, f"📢 **Information**: Das Event '{event_name}' wurde gelöscht."))
+                else:
+                    embed = discord.Embed(
+                        title="❌ Fehler",
+                        description="Es gibt kein aktives Event zum Löschen.",
+                        color=discord.Color.red()
+                    )
                 
-                await send_to_log_channel(
-                    f"⚠️ Event-Löschungsversuch fehlgeschlagen: Kein aktives Event vorhanden (Admin: {interaction.user.name})",
-                    level="WARNING", 
-                    guild=interaction.guild
-                )
+                    outbox.send(send_to_log_channel(
+                        f"⚠️ Event-Löschungsversuch fehlgeschlagen: Kein aktives Event vorhanden (Admin: {interaction.user.name})",
+                        level="WARNING", 
+                        guild=interaction.guild
+                    ))
                 
-                # Aktualisiere die Bestätigungsnachricht
-                await interaction.edit_original_response(content=None, embed=embed, view=None)
+                    # Aktualisiere die Bestätigungsnachricht
+                    outbox.send(interaction.edit_original_response(content=None, embed=embed, view=None))
+            
+            await command_queue.submit(event.id if event else self.event_id, "delete_event", apply)
+            if event:
+                command_queue.forget(event.id)
+                forget_display(event.id)
         except Exception as e:
             logger.error(f"Fehler bei Event-Löschung: {e}")
             try:
@@ -2420,9 +2086,9 @@ class DeleteConfirmationView(BaseConfirmationView):
             child.disabled = True
         
         # Hole das aktive Event für Logging
-        event = get_event()
+        event = get_event(self.event_id)
         if event:
-            event_name = event['name']
+            event_name = event.name
             # Log für abgebrochene Event-Löschung
             await send_to_log_channel(
                 f"🛑 Event-Löschung abgebrochen: {interaction.user.name} ({interaction.user.id}) hat die Löschung von Event '{event_name}' abgebrochen",
@@ -2447,49 +2113,78 @@ async def send_team_dm_notification(team_name, message):
     - team_name: Name des Teams
     - message: Nachricht, die gesendet werden soll
     """
-    # Suche nach dem Benutzer, der das Team erstellt hat (case-insensitive)
-    team_name_lower = team_name.lower() if team_name else ""
-    team_leader_id = None
-    for uid, tname in user_team_assignments.items():
-        if tname.lower() == team_name_lower:
-            team_leader_id = uid
-            break
+    # Benutzer, der das Team erstellt hat (case-insensitive, aus dem Rückwärtsindex)
+    team_leader_id = user_team_assignments.leader(team_name) if team_name else None
     
     if team_leader_id:
         try:
             # Versuche, den Benutzer zu erreichen
-            user = await bot.fetch_user(int(team_leader_id))
+            user = await user_profiles.user(team_leader_id)
             if user:
-                await user.send(message)
+                await get_outbound().submit(PRIORITY_DM, ("dm", user.id), lambda: user.send(message))
                 logger.info(f"DM Benachrichtigung an {user.name} für Team {team_name} gesendet")
         except discord.errors.Forbidden:
             logger.warning(f"Konnte keine DM an Benutzer {team_leader_id} senden (Team {team_name})")
         except Exception as e:
             logger.error(f"Fehler beim Senden der DM an Benutzer {team_leader_id}: {e}")
 
+async def send_channel_message(channel, message):
+    """
+    Sendet eine Nachricht in einen Kanal über den Nachrichten-Planer (siehe outbound.py)
+    
+    Parameters:
+    - channel: Discord-Kanal
+    - message: Die zu sendende Nachricht (Text oder Embed)
+    
+    Returns:
+    - Die gesendete Discord-Nachricht
+    """
+    return await get_outbound().submit(PRIORITY_DISPLAY, ("channel", channel.id), lambda: channel.send(message))
+
+async def update_team_size(interaction, team_name, new_size, is_admin=False, reason=None, event_id=None, requester=None):
+    """
+    Aktualisiert die Größe eines Teams über die Command-Warteschlange (siehe apply_team_size)
+    
+    Returns:
+    - True bei Erfolg, False bei Fehler
+    """
+    event = get_event(event_id)
+    return await command_queue.submit(
+        event.id if event else event_id, "update_team_size",
+        lambda outbox: apply_team_size(outbox, interaction, team_name, new_size, is_admin, reason, event_id, requester)
+    )
 
-async def update_team_size(interaction, team_name, new_size, is_admin=False, reason=None):
+def apply_team_size(outbox, interaction, team_name, new_size, is_admin=False, reason=None, event_id=None, requester=None):
     """
     Aktualisiert die Größe eines Teams und verwaltet die Warteliste entsprechend.
     Behandelt Teams als Einheit, unabhängig von Event/Warteliste-Platzierung.
     
+    Läuft als Command im Schreiber-Task (siehe command_queue.py); alle Antworten
+    werden erst nach dem Speichern des Stapels gesendet.
+    
     Parameters:
+    - outbox: Outbox des Commands
     - interaction: Discord-Interaktion
     - team_name: Name des Teams
     - new_size: Neue Teamgröße
     - is_admin: Ob die Änderung von einem Admin durchgeführt wird
     - reason: Optionaler Grund für die Änderung (nur für Admins)
+    - event_id: Optional - ID des Events (Standard: zuletzt erstelltes Event)
+    - requester: Optional - Discord-Nutzer, der bei Änderungen des Teams benachrichtigt wird
     
     Returns:
     - True bei Erfolg, False bei Fehler
     """
+    requested_name = team_name.strip() if isinstance(team_name, str) else team_name
+    
     # Defensive Programmierung - Validiere Eingaben
     if not isinstance(team_name, str) or not team_name.strip():
         logger.error(f"Ungültiger Team-Name: {team_name}")
-        await interaction.response.send_message(
+        outbox.send(send_feedback(
+            interaction,
             "Ungültiger Team-Name.",
             ephemeral=True
-        )
+        ))
         return False
     
     team_name = team_name.strip().lower()  # Normalisiere Teamnamen (Case-insensitive)
@@ -2498,19 +2193,22 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
         new_size = int(new_size)
     except (ValueError, TypeError):
         logger.error(f"Ungültige Teamgröße: {new_size}")
-        await interaction.response.send_message(
+        outbox.send(send_feedback(
+            interaction,
             "Die Teamgröße muss eine ganze Zahl sein.",
             ephemeral=True
-        )
+        ))
         return False
     
-    event = get_event()
+    event = get_event(event_id)
     if not event:
-        await interaction.response.send_message(
+        outbox.send(send_feedback(
+            interaction,
             "Es gibt derzeit kein aktives Event.",
             ephemeral=True
-        )
+        ))
         return False
+    event_id = event.id
     
     user_id = str(interaction.user.id)
     
@@ -2519,71 +2217,59 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
         # Prüfe, ob der Nutzer zum Team gehört (case-insensitive)
         user_team = user_team_assignments.get(user_id, "").lower()
         if not (has_role(interaction.user, CLAN_REP_ROLE) and user_team == team_name):
-            await interaction.response.send_message(
+            outbox.send(send_feedback(
+                interaction,
                 "Du kannst nur dein eigenes Team bearbeiten.",
                 ephemeral=True
-            )
+            ))
             return False
     
-    max_team_size = event.get("max_team_size", 0)
+    max_team_size = event.max_team_size
     
     # Validiere neue Teamgröße
     if new_size < 0:
-        await interaction.response.send_message(
+        outbox.send(send_feedback(
+            interaction,
             "Die Teamgröße kann nicht negativ sein.",
             ephemeral=True
-        )
+        ))
         return False
     
     if new_size > max_team_size and not is_admin:
-        await interaction.response.send_message(
+        outbox.send(send_feedback(
+            interaction,
             f"Die maximale Teamgröße beträgt {max_team_size}.",
             ephemeral=True
-        )
+        ))
         return False
     
     # Hole alle aktuellen Daten des Teams (Event + Warteliste)
     event_size, waitlist_size, current_total_size, registered_name, waitlist_entries = get_team_total_size(event, team_name)
     
-    # Falls waitlist_entries vorhanden sind, für die alte Logik kompatibel machen
-    waitlist_team_name = None
-    waitlist_index = -1
-    if waitlist_entries:
-        # Nimm den ersten Eintrag für die Kompatibilität
-        first_entry = waitlist_entries[0]
-        waitlist_index = first_entry[0]  # Index
-        waitlist_team_name = first_entry[1]  # Team-Name
-    
     # Prüfe, ob das Team existiert
     if current_total_size == 0 and new_size > 0:
         # Neues Team anlegen - sollte nicht über diese Funktion passieren
-        await interaction.response.send_message(
+        outbox.send(send_feedback(
+            interaction,
             f"Team {team_name} existiert nicht. Bitte nutze die Team-Anmeldung, um ein neues Team zu erstellen.",
             ephemeral=True
-        )
+        ))
         return False
     
+    # Nutzer für Benachrichtigungen erst nach der Validierung merken (Teil der Transaktion)
+    if requester is not None:
+        command_queue.changes.set(team_requester, requested_name, requester)
+    
     # Wenn Teamgröße 0 ist, Team automatisch abmelden
     if new_size == 0:
         # Entferne Team aus Event und Warteliste
         if event_size > 0:
-            # Nur exakt diesen Teamnamen entfernen (case-sensitive Lookup im Dict)
-            for registered_name in list(event["teams"].keys()):
-                if registered_name.lower() == team_name:
-                    registered_size = event["teams"].pop(registered_name)
-                    event["slots_used"] -= registered_size
-                    break
+            # Exakt den registrierten Teamnamen entfernen (aus dem Namensindex)
+            event.slots_used -= event.teams.pop(registered_name).size
         
-        # Entferne von Warteliste (case-insensitive)
-        if waitlist_size > 0:
-            waitlist_indices_to_remove = []
-            for i, (wl_team, wl_size) in enumerate(event["waitlist"]):
-                if wl_team.lower() == team_name:
-                    waitlist_indices_to_remove.append(i)
-            
-            # Von hinten nach vorne entfernen, um Indizes nicht zu verschieben
-            for i in sorted(waitlist_indices_to_remove, reverse=True):
-                event["waitlist"].pop(i)
+        # Entferne alle Einträge des Teams von der Warteliste
+        for entry in waitlist_entries:
+            event.waitlist.remove(entry)
         
         # Statustext für Nachricht erstellen
         total_size_message = ""
@@ -2594,20 +2280,14 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
         elif waitlist_size > 0:
             total_size_message = f"mit {waitlist_size} Spielern auf der Warteliste"
         
-        # Finde alle Benutzer, die diesem Team zugewiesen sind, und entferne sie (case-insensitive)
-        users_to_remove = []
-        for uid, tname in user_team_assignments.items():
-            if tname.lower() == team_name:
-                users_to_remove.append(uid)
-        
-        for uid in users_to_remove:
-            del user_team_assignments[uid]
-            
-        save_data(event_data, channel_id, user_team_assignments)
+        # Finde alle Benutzer, die diesem Team zugewiesen sind, und entferne sie (case-insensitive),
+        # sofern das Team nicht noch für ein anderes Event angemeldet ist
+        if not is_team_in_any_event(team_name, exclude_event_id=event_id):
+            user_team_assignments.remove_team(team_name)
         
         # Freie Slots für die Warteliste verwenden, wenn Team angemeldet war
         if event_size > 0:
-            await process_waitlist_after_change(interaction, event_size)
+            queue_promotions(event, outbox, interaction)
         
         # Log für Team-Abmeldung
         admin_or_user = "Admin" if is_admin else "Benutzer"
@@ -2615,7 +2295,7 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
         log_message = f"❌ Team abgemeldet: {admin_or_user} {admin_name} hat Team '{team_name}' {total_size_message} abgemeldet"
         if reason:
             log_message += f" (Grund: {reason})"
-        await send_to_log_channel(log_message, guild=interaction.guild)
+        outbox.send(send_to_log_channel(log_message, guild=interaction.guild))
         
         # Nachricht senden
         message = f"Team {team_name} {total_size_message} wurde abgemeldet."
@@ -2623,22 +2303,24 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
             message += f" Grund: {reason}"
             
         # Nutze followup bei modals/views, ansonsten response
-        try:
-            if hasattr(interaction, 'edit_original_response'):
-                embed = discord.Embed(
-                    title="✅ Team abgemeldet",
-                    description=message,
-                    color=discord.Color.green()
-                )
-                await interaction.edit_original_response(content=None, embed=embed, view=None)
-            else:
-                await interaction.response.send_message(message, ephemeral=True)
-        except Exception as e:
-            logger.error(f"Fehler beim Senden der Abmeldebestätigung: {e}")
+        async def confirm_unregistration():
             try:
-                await interaction.followup.send(message, ephemeral=True)
-            except Exception:
-                pass
+                if hasattr(interaction, 'edit_original_response'):
+                    embed = discord.Embed(
+                        title="✅ Team abgemeldet",
+                        description=message,
+                        color=discord.Color.green()
+                    )
+                    await interaction.edit_original_response(content=None, embed=embed, view=None)
+                else:
+                    await send_feedback(interaction, message)
+            except Exception as e:
+                logger.error(f"Fehler beim Senden der Abmeldebestätigung: {e}")
+                try:
+                    await interaction.followup.send(message, ephemeral=True)
+                except Exception:
+                    pass
+        outbox.send(confirm_unregistration())
         
         # Sende DM an Teamleiter bei Admin-Änderungen
         if is_admin:
@@ -2647,13 +2329,13 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
                 dm_message += f"\nGrund: {reason}"
             
             dm_message += f"\n\nFalls du Fragen hast, wende dich bitte an einen Administrator."
-            await send_team_dm_notification(team_name, dm_message)
+            outbox.send(send_team_dm_notification(team_name, dm_message))
         
         # Channel aktualisieren
         if channel_id:
             channel = bot.get_channel(interaction.channel_id)
             if channel:
-                await send_event_details(channel)
+                outbox.refresh((channel.id, event.id))
         
         return True
     
@@ -2662,46 +2344,30 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
     
     # Keine Änderung in der Gesamtgröße
     if size_difference == 0:
-        await interaction.response.send_message(
+        outbox.send(send_feedback(
+            interaction,
             f"Die Gesamtgröße von Team {team_name} bleibt unverändert bei {current_total_size} " +
             f"({event_size} angemeldet, {waitlist_size} auf der Warteliste).",
             ephemeral=True
-        )
+        ))
         return True
     
     # 1. FALL: Erhöhung der Teamgröße
     if size_difference > 0:
-        # Berechne verfügbare Slots im Event
-        available_slots = event["max_slots"] - event["slots_used"]
-        
-        # Finde den richtigen Teamnamen im Dictionary (case-sensitive lookup)
-        registered_team_name = None
-        for name in event["teams"]:
-            if name.lower() == team_name:
-                registered_team_name = name
-                break
+        # Berechne verfügbare Slots im Event (wartende Teams haben Vorrang)
+        available_slots = open_slots(event)
         
-        # Finde den richtigen Teamnamen in der Warteliste
-        waitlist_team_name = None
-        waitlist_index = -1
-        for i, (wl_team, wl_size) in enumerate(event["waitlist"]):
-            if wl_team.lower() == team_name:
-                waitlist_team_name = wl_team
-                waitlist_index = i
-                break
+        # Richtiger Teamname im Dictionary (aus dem Namensindex)
+        registered_team_name = registered_name
                 
         # Priorität: Erst Event-Slots füllen, dann Warteliste
         if size_difference <= available_slots:
             # Genug freie Slots im Event - alles kann in den Event-Slots untergebracht werden
-            if registered_team_name:
-                # Team bereits registriert - erhöhe die Größe
-                event["teams"][registered_team_name] += size_difference
-                event["slots_used"] += size_difference
-            else:
+            if not registered_team_name:
                 # Team nicht registriert - erstelle es
                 registered_team_name = team_name
-                event["teams"][registered_team_name] = size_difference
-                event["slots_used"] += size_difference
+            add_team_slots(event, registered_team_name, size_difference)
+            event.slots_used += size_difference
             
             # Log für Teamgröße-Erhöhung
             admin_or_user = "Admin" if is_admin else "Benutzer"
@@ -2709,15 +2375,16 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
             log_message = f"📈 Teamgröße erhöht: {admin_or_user} {admin_name} hat die Größe von Team '{team_name}' von {current_total_size} auf {new_size} erhöht"
             if reason:
                 log_message += f" (Grund: {reason})"
-            await send_to_log_channel(log_message, guild=interaction.guild)
+            outbox.send(send_to_log_channel(log_message, guild=interaction.guild))
             
             # Nachricht senden
             event_addition = size_difference
-            await interaction.response.send_message(
+            outbox.send(send_feedback(
+                interaction,
                 f"Die Teamgröße von {team_name} wurde von {current_total_size} auf {new_size} erhöht. " +
                 f"{event_addition} Spieler wurden zum Event hinzugefügt.",
                 ephemeral=True
-            )
+            ))
             
             # Sende DM bei Admin-Änderungen
             if is_admin:
@@ -2726,33 +2393,31 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
                     dm_message += f"\nGrund: {reason}"
                 
                 dm_message += f"\n\nFalls du Fragen hast, wende dich bitte an einen Administrator."
-                await send_team_dm_notification(team_name, dm_message)
+                outbox.send(send_team_dm_notification(team_name, dm_message))
         else:
             # Nicht genug Plätze im Event - fülle Event-Slots, Rest auf Warteliste
             # Zuerst Event-Slots füllen
             event_addition = available_slots
             waitlist_addition = size_difference - available_slots
             
-            if registered_team_name:
-                # Team bereits registriert - erhöhe die Größe
-                event["teams"][registered_team_name] += event_addition
-                event["slots_used"] += event_addition
-            else:
+            if not registered_team_name:
                 # Team nicht registriert - erstelle es
                 registered_team_name = team_name
-                event["teams"][registered_team_name] = event_addition
-                event["slots_used"] += event_addition
+            add_team_slots(event, registered_team_name, event_addition)
+            event.slots_used += event_addition
+
             
             # Dann Warteliste aktualisieren/erstellen
-            if waitlist_team_name:
-                # Team bereits auf Warteliste - erhöhe die Größe
+            if waitlist_entries:
+                # Team bereits auf Warteliste - erhöhe die Größe des ersten Eintrags
+                entry = waitlist_entries[0]
                 new_waitlist_size = waitlist_size + waitlist_addition
-                event["waitlist"][waitlist_index] = (waitlist_team_name, new_waitlist_size)
+                event.waitlist.replace(entry, WaitlistEntry(entry.name, entry.size + waitlist_addition, entry.team_id))
                 waitlist_message = f"{waitlist_addition} Spieler wurden zur Warteliste hinzugefügt (jetzt {new_waitlist_size})."
             else:
                 # Team nicht auf Warteliste - füge es hinzu
-                event["waitlist"].append((team_name, waitlist_addition))
-                waitlist_message = f"{waitlist_addition} Spieler wurden auf die Warteliste gesetzt (Position {len(event['waitlist'])})."
+                event.waitlist.append(WaitlistEntry(team_name, waitlist_addition, get_team_id(event, team_name)))
+                waitlist_message = f"{waitlist_addition} Spieler wurden auf die Warteliste gesetzt (Position {len(event.waitlist)})."
             
             # Log für Teamgröße-Erhöhung mit Warteliste
             admin_or_user = "Admin" if is_admin else "Benutzer"
@@ -2760,14 +2425,15 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
             log_message = f"📈 Teamgröße erhöht: {admin_or_user} {admin_name} hat die Größe von Team '{team_name}' von {current_total_size} auf {new_size} erhöht (Event +{event_addition}, Warteliste +{waitlist_addition})"
             if reason:
                 log_message += f" (Grund: {reason})"
-            await send_to_log_channel(log_message, guild=interaction.guild)
+            outbox.send(send_to_log_channel(log_message, guild=interaction.guild))
             
             # Nachricht senden
-            await interaction.response.send_message(
+            outbox.send(send_feedback(
+                interaction,
                 f"Die Teamgröße von {team_name} wurde von {current_total_size} auf {new_size} erhöht. " +
                 f"{event_addition} Spieler wurden zum Event hinzugefügt. {waitlist_message}",
                 ephemeral=True
-            )
+            ))
             
             # Sende DM bei Admin-Änderungen
             if is_admin:
@@ -2777,7 +2443,7 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
                     dm_message += f"\nGrund: {reason}"
                 
                 dm_message += f"\n\nFalls du Fragen hast, wende dich bitte an einen Administrator."
-                await send_team_dm_notification(team_name, dm_message)
+                outbox.send(send_team_dm_notification(team_name, dm_message))
     
     # 2. FALL: Verringerung der Teamgröße
     else:  # size_difference < 0
@@ -2788,42 +2454,34 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
         waitlist_reduction = min(waitlist_size, reduction)
         event_reduction = reduction - waitlist_reduction
         
-        # Finde den richtigen Teamnamen im Dictionary (case-sensitive lookup)
-        registered_team_name = None
-        for name in event["teams"]:
-            if name.lower() == team_name:
-                registered_team_name = name
-                break
+        # Richtiger Teamname im Dictionary (aus dem Namensindex)
+        registered_team_name = registered_name
         
-        # Finde den richtigen Teamnamen in der Warteliste
-        waitlist_team_name = None
-        waitlist_index = -1
-        for i, (wl_team, wl_size) in enumerate(event["waitlist"]):
-            if wl_team.lower() == team_name:
-                waitlist_team_name = wl_team
-                waitlist_index = i
+        # Erst Warteliste reduzieren (jüngste Einträge zuerst)
+        remaining = waitlist_reduction
+        for entry in reversed(waitlist_entries):
+            if remaining == 0:
                 break
-        
-        # Erst Warteliste reduzieren
-        if waitlist_reduction > 0 and waitlist_team_name and waitlist_index >= 0:
-            new_waitlist_size = waitlist_size - waitlist_reduction
-            if new_waitlist_size > 0:
+            if entry.size > remaining:
                 # Aktualisiere Warteliste
-                event["waitlist"][waitlist_index] = (waitlist_team_name, new_waitlist_size)
+                event.waitlist.replace(entry, WaitlistEntry(entry.name, entry.size - remaining, entry.team_id))
+                remaining = 0
             else:
                 # Entferne von Warteliste
-                event["waitlist"].pop(waitlist_index)
+                event.waitlist.remove(entry)
+                remaining -= entry.size
         
         # Dann Event-Slots reduzieren, falls nötig
         if event_reduction > 0 and registered_team_name:
             new_event_size = event_size - event_reduction
             if new_event_size > 0:
                 # Aktualisiere Event-Slots
-                event["teams"][registered_team_name] = new_event_size
-                event["slots_used"] -= event_reduction
+                event.teams[registered_team_name].size = new_event_size
+                event.slots_used -= event_reduction
             else:
                 # Entferne aus Event
-                event["slots_used"] -= event["teams"].pop(registered_team_name)
+                event.slots_used -= event.teams.pop(registered_team_name).size
+
         
         # Log für Teamgröße-Verringerung
         admin_or_user = "Admin" if is_admin else "Benutzer"
@@ -2838,7 +2496,7 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
         
         if reason:
             log_message += f" (Grund: {reason})"
-        await send_to_log_channel(log_message, guild=interaction.guild)
+        outbox.send(send_to_log_channel(log_message, guild=interaction.guild))
         
         # Nachricht für Benutzer erstellen
         message = f"Die Teamgröße von {team_name} wurde von {current_total_size} auf {new_size} verringert."
@@ -2849,7 +2507,7 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
         elif event_reduction > 0:
             message += f" Es wurden {event_reduction} Spieler vom Event entfernt."
         
-        await interaction.response.send_message(message, ephemeral=True)
+        outbox.send(send_feedback(interaction, message, ephemeral=True))
         
         # Sende DM bei Admin-Änderungen
         if is_admin:
@@ -2865,102 +2523,150 @@ async def update_team_size(interaction, team_name, new_size, is_admin=False, rea
                 dm_message += f"\nGrund: {reason}"
             
             dm_message += f"\n\nFalls du Fragen hast, wende dich bitte an einen Administrator."
-            await send_team_dm_notification(team_name, dm_message)
+            outbox.send(send_team_dm_notification(team_name, dm_message))
         
         # Freie Event-Slots für Teams auf der Warteliste nutzen
         if event_reduction > 0:
-            await process_waitlist_after_change(interaction, event_reduction)
+            queue_promotions(event, outbox, interaction)
+    
+    # Aktualisiere die Event-Anzeige im Channel
+    if channel_id:
+        channel = bot.get_channel(interaction.channel_id)
+        if channel:
+            outbox.refresh((channel.id, event.id))
+    
+    return True
+
+def queue_promotions(event, outbox, interaction=None, refresh=False):
+    """
+    Lässt Teams von der Warteliste nachrücken (innerhalb eines Commands)
+    
+    Alle Nachrücker werden in einem Durchlauf berechnet und gemeinsam übernommen
+    (siehe promotion.py). Gespeichert wird mit dem Stapel; die Benachrichtigungen
+    (eine Kanal-Nachricht, ein Log-Eintrag, je Team-Repräsentant eine DM) gehen
+    über die Outbox erst danach hinaus.
+    
+    Parameters:
+    - event: Eventdaten (nur im Schreiber-Task ändern)
+    - outbox: Outbox des Commands (siehe command_queue.py)
+    - interaction: Optional - Discord-Interaktion, die die Änderung ausgelöst hat
+    - refresh: Ob die Event-Anzeige aktualisiert werden soll (sonst übernimmt das der Aufrufer)
+    
+    Returns:
+    - Liste der angewendeten Promotion-Einträge
+    """
+    promotions = promote_waitlist(event)
+    if not promotions:
+        return []
+    
+    outbox.send(announce_promotions(event, promotion_notices(event, promotions), interaction))
+    
+    if refresh and channel_id:
+        channel = bot.get_channel(channel_id)
+        if channel:
+            outbox.refresh((channel.id, event.id))
+    
+    return promotions
+
+async def process_waitlist_after_change(interaction=None, event_id=None, refresh=False):
+    """
+    Lässt Teams von der Warteliste nachrücken, nachdem Plätze frei geworden sind
+    
+    Reiht einen Command ein; innerhalb eines Commands stattdessen
+    queue_promotions() verwenden.
+    
+    Parameters:
+    - interaction: Optional - Discord-Interaktion, die die Änderung ausgelöst hat
+    - event_id: Optional - ID des Events (Standard: zuletzt erstelltes Event)
+    - refresh: Ob die Event-Anzeige aktualisiert werden soll (sonst übernimmt das der Aufrufer)
+    
+    Returns:
+    - Liste der angewendeten Promotion-Einträge
+    """
+    event = get_event(event_id)
+    if not event:
+        return []
     
-    # Speichere die Änderungen
-    save_data(event_data, channel_id, user_team_assignments)
+    return await command_queue.submit(
+        event.id, "Warteliste",
+        lambda outbox: queue_promotions(event, outbox, interaction, refresh)
+    )
+
+def promotion_notices(event, promotions):
+    """
+    Hält fest, welche Nachrücker ihr Team vollständig ins Event bringen
     
-    # Aktualisiere die Event-Anzeige im Channel
-    if channel_id:
-        channel = bot.get_channel(interaction.channel_id)
-        if channel:
-            await send_event_details(channel)
+    Wird im Command berechnet, damit die später gesendeten Nachrichten
+    den Stand direkt nach dem Nachrücken beschreiben.
     
-    return True
+    Parameters:
+    - event: Eventdaten nach apply_promotions()
+    - promotions: Angewendete Promotion-Einträge (siehe promotion.py)
+    
+    Returns:
+    - Liste von (Promotion, komplett)-Tupeln
+    """
+    notices = []
+    for promotion in promotions:
+        team = event.teams.find(promotion.team_name)
+        notices.append((promotion, promotion.complete and team is not None and team.size == promotion.size))
+    return notices
 
-async def process_waitlist_after_change(interaction, free_slots):
+async def announce_promotions(event, notices, interaction=None):
     """
-    Verarbeitet die Warteliste, nachdem Slots frei geworden sind.
+    Sendet die Benachrichtigungen für alle Nachrücker gesammelt
     
     Parameters:
-    - interaction: Discord-Interaktion
-    - free_slots: Anzahl der frei gewordenen Slots
+    - event: Eventdaten
+    - notices: Ergebnis von promotion_notices()
+    - interaction: Optional - Discord-Interaktion (ohne Interaktion wird in allen Servern geloggt)
     """
-    event = get_event()
-    if not event or free_slots <= 0 or not event["waitlist"]:
-        return
+    def describe(promotion, whole):
+        if whole:
+            return f"Team {promotion.team_name} (komplett)"
+        return f"{promotion.size} Spieler von Team {promotion.team_name}"
     
-    update_needed = False
-    processed_teams = []
-    
-    while free_slots > 0 and event["waitlist"]:
-        team_name, size = event["waitlist"][0]
-        
-        if size <= free_slots:
-            # Das komplette Team kann nachrücken
-            event["waitlist"].pop(0)
-            event["slots_used"] += size
-            event["teams"][team_name] = event["teams"].get(team_name, 0) + size
-            free_slots -= size
-            update_needed = True
-            processed_teams.append((team_name, size))
-        elif free_slots > 0:
-            # Nur ein Teil des Teams kann nachrücken
-            event["waitlist"][0] = (team_name, size - free_slots)
-            event["slots_used"] += free_slots
-            event["teams"][team_name] = event["teams"].get(team_name, 0) + free_slots
-            processed_teams.append((team_name, free_slots))
-            free_slots = 0
-            update_needed = True
-    
-    if update_needed:
-        save_data(event_data, channel_id, user_team_assignments)
-        
-        # Log für verarbeitete Warteliste
-        if interaction and interaction.guild:
-            initiator_name = getattr(interaction.user, "name", "System")
-            log_message = f"⏫ Warteliste verarbeitet: {len(processed_teams)} Teams aufgerückt (initiiert von {initiator_name})"
-            await send_to_log_channel(log_message, guild=interaction.guild)
-        
-        # Benachrichtigungen für aufgerückte Teams
-        for team_name, moved_size in processed_teams:
-            # Channel-Benachrichtigung
-            if channel_id:
-                channel = bot.get_channel(interaction.channel_id)
-                if channel:
-                    if moved_size == event["teams"][team_name]:
-                        await channel.send(f"📢 Team {team_name} wurde komplett von der Warteliste in die Anmeldung aufgenommen!")
-                    else:
-                        await channel.send(f"📢 {moved_size} Spieler von Team {team_name} wurden von der Warteliste in die Anmeldung aufgenommen!")
-            
-            # Log für jedes aufgerückte Team
-            if interaction and interaction.guild:
-                team_log = f"📋 Team '{team_name}': {moved_size} Mitglieder von der Warteliste aufgerückt"
-                await send_to_log_channel(team_log, level="INFO", guild=interaction.guild)
-            
-            # DM an Team-Repräsentanten
-            requester = team_requester.get(team_name)
-            if requester:
-                try:
-                    if moved_size == event["teams"][team_name]:
-                        await requester.send(f"Gute Neuigkeiten! Dein Team {team_name} wurde komplett von der Warteliste in die Anmeldung für das Event '{event['name']}' aufgenommen.")
-                    else:
-                        await requester.send(f"Gute Neuigkeiten! {moved_size} Spieler deines Teams {team_name} wurden von der Warteliste in die Anmeldung für das Event '{event['name']}' aufgenommen.")
-                except discord.errors.Forbidden:
-                    logger.warning(f"Could not send DM to {requester}")
-                    # Log für fehlgeschlagene DM
-                    if interaction and interaction.guild:
-                        await send_to_log_channel(
-                            f"⚠️ Konnte keine DM an {requester.name} (Team {team_name}) senden", 
-                            level="WARNING", 
-                            guild=interaction.guild
-                        )
-
-async def admin_add_team(interaction, team_name, size, discord_user_id=None, discord_username=None, force_waitlist=False):
+    summary = ", ".join(describe(promotion, whole) for promotion, whole in notices)
+    
+    # Eine Kanal-Nachricht für alle Nachrücker
+    if channel_id:
+        channel = bot.get_channel(channel_id)
+        if channel:
+            await send_channel_message(channel, f"📢 Von der Warteliste in die Anmeldung für '{event.name}' aufgenommen: {summary}")
+    
+    # Ein Log-Eintrag für alle Nachrücker
+    initiator_name = getattr(interaction.user, "name", "System") if interaction else "System"
+    guilds = [interaction.guild] if interaction and interaction.guild else bot.guilds
+    for guild in guilds:
+        await send_to_log_channel(
+            f"⏫ Warteliste verarbeitet: {len(notices)} Teams aufgerückt (initiiert von {initiator_name}): {summary}",
+            level="INFO",
+            guild=guild
+        )
+    
+    # DMs an die Team-Repräsentanten parallel senden
+    async def notify(promotion, whole):
+        requester = team_requester.get(promotion.team_name)
+        if not requester:
+            return
+        if whole:
+            message = f"Gute Neuigkeiten! Dein Team {promotion.team_name} wurde komplett von der Warteliste in die Anmeldung für das Event '{event.name}' aufgenommen."
+        else:
+            message = f"Gute Neuigkeiten! {promotion.size} Spieler deines Teams {promotion.team_name} wurden von der Warteliste in die Anmeldung für das Event '{event.name}' aufgenommen."
+        try:
+            await get_outbound().submit(PRIORITY_DM, ("dm", requester.id), lambda: requester.send(message))
+        except discord.errors.Forbidden:
+            logger.warning(f"Could not send DM to {requester}")
+            for guild in guilds:
+                await send_to_log_channel(
+                    f"⚠️ Konnte keine DM an {requester.name} (Team {promotion.team_name}) senden",
+                    level="WARNING",
+                    guild=guild
+                )
+    
+    await asyncio.gather(*(notify(promotion, whole) for promotion, whole in notices))
+
+async def admin_add_team(interaction, team_name, size, discord_user_id=None, discord_username=None, force_waitlist=False, event_id=None):
     """
     Funktion für Admins, um ein Team hinzuzufügen
     
@@ -2971,6 +2677,7 @@ async def admin_add_team(interaction, team_name, size, discord_user_id=None, dis
     - discord_user_id: Optional - Discord-ID des Nutzers, der dem Team zugewiesen wird
     - discord_username: Optional - Username des Nutzers
     - force_waitlist: Ob das Team direkt auf die Warteliste gesetzt werden soll
+    - event_id: Optional - ID des Events (Standard: zuletzt erstelltes Event)
     
     Returns:
     - True bei Erfolg, False bei Fehler
@@ -2982,208 +2689,355 @@ async def admin_add_team(interaction, team_name, size, discord_user_id=None, dis
         (f" (direkt auf Warteliste)" if force_waitlist else ""),
         guild=interaction.guild
     )
-    event = get_event()
-    if not event:
-        await interaction.response.send_message(
-            "Es gibt derzeit kein aktives Event.",
-            ephemeral=True
-        )
-        return False
     
-    # Prüfe, ob das Team bereits existiert
-    if team_name in event["teams"]:
-        await interaction.response.send_message(
-            f"Team {team_name} ist bereits angemeldet. Verwende die Team-Bearbeitung, um die Größe zu ändern.",
-            ephemeral=True
-        )
-        return False
+    # Discord-Nutzer vor dem Command abrufen (keine Discord-Aufrufe im Schreiber-Task)
+    requester = None
+    if discord_user_id:
+        try:
+            requester = await user_profiles.user(discord_user_id)
+        except Exception as e:
+            logger.warning(f"Konnte Benutzer {discord_user_id} nicht abrufen: {e}")
     
-    # Prüfe, ob Team bereits auf der Warteliste steht
-    for wl_team, _ in event["waitlist"]:
-        if wl_team == team_name:
-            await interaction.response.send_message(
+    event = get_event(event_id)
+    def apply(outbox):
+        event = get_event(event_id)
+
+        if not event:
+            outbox.send(send_feedback(
+                interaction,
+                "Es gibt derzeit kein aktives Event.",
+                ephemeral=True
+            ))
+            return False
+    
+        # Prüfe, ob das Team bereits existiert
+        if team_name in event.teams:
+            outbox.send(send_feedback(
+                interaction,
+                f"Team {team_name} ist bereits angemeldet. Verwende die Team-Bearbeitung, um die Größe zu ändern.",
+                ephemeral=True
+            ))
+            return False
+    
+        # Prüfe, ob Team bereits auf der Warteliste steht
+        if any(entry.name == team_name for entry in event.waitlist.entries_for(team_name)):
+            outbox.send(send_feedback(
+                interaction,
                 f"Team {team_name} steht bereits auf der Warteliste. Verwende die Team-Bearbeitung, um die Größe zu ändern.",
                 ephemeral=True
-            )
+            ))
             return False
     
-    max_team_size = event["max_team_size"]
+        max_team_size = event.max_team_size
     
-    # Validiere Team-Größe
-    if size <= 0 or size > max_team_size:
-        await interaction.response.send_message(
-            f"Die Teamgröße muss zwischen 1 und {max_team_size} liegen.",
-            ephemeral=True
-        )
-        return False
+        # Validiere Team-Größe
+        if size <= 0 or size > max_team_size:
+            outbox.send(send_feedback(
+                interaction,
+                f"Die Teamgröße muss zwischen 1 und {max_team_size} liegen.",
+                ephemeral=True
+            ))
+            return False
     
-    # Bestimme, ob auf Warteliste oder direktes Hinzufügen
-    if force_waitlist:
-        # Direkt auf Warteliste setzen
-        event["waitlist"].append((team_name, size))
-        
-        # Setze Benutzer-Team-Zuweisung, wenn angegeben
-        if discord_user_id:
-            user_team_assignments[discord_user_id] = team_name
-            team_requester[team_name] = await bot.fetch_user(int(discord_user_id))
-        
-        await interaction.response.send_message(
-            f"Team {team_name} wurde mit {size} Personen auf die Warteliste gesetzt (Position {len(event['waitlist'])}).",
-            ephemeral=True
-        )
-        
-        # Log-Eintrag
-        logger.info(f"Admin {interaction.user.name} hat Team {team_name} mit {size} Personen zur Warteliste hinzugefügt.")
-        # Log zum Kanal senden
-        await send_to_log_channel(
-            f"📝 Admin {interaction.user.name} hat Team '{team_name}' mit {size} Personen zur Warteliste hinzugefügt.",
-            guild=interaction.guild
-        )
-    else:
-        # Prüfe, ob genügend Slots verfügbar sind
-        available_slots = event["max_slots"] - event["slots_used"]
+        # Gemeinsame ID für Event- und Wartelisten-Einträge des neuen Teams
+        team_id = generate_team_id(team_name)
+    
+        # Bestimme, ob auf Warteliste oder direktes Hinzufügen
+        if force_waitlist:
+            # Direkt auf Warteliste setzen
+            event.waitlist.append(WaitlistEntry(team_name, size, team_id))
         
-        if size <= available_slots:
-            # Genügend Plätze verfügbar, direkt anmelden
-            event["slots_used"] += size
-            event["teams"][team_name] = size
-            
             # Setze Benutzer-Team-Zuweisung, wenn angegeben
             if discord_user_id:
                 user_team_assignments[discord_user_id] = team_name
-            
-            await interaction.response.send_message(
-                f"Team {team_name} wurde mit {size} Personen angemeldet.",
+                if requester:
+                    command_queue.changes.set(team_requester, team_name, requester)
+        
+            outbox.send(send_feedback(
+                interaction,
+                f"Team {team_name} wurde mit {size} Personen auf die Warteliste gesetzt (Position {len(event.waitlist)}).",
                 ephemeral=True
-            )
-            
+            ))
+        
             # Log-Eintrag
-            logger.info(f"Admin {interaction.user.name} hat Team {team_name} mit {size} Personen angemeldet.")
+            logger.info(f"Admin {interaction.user.name} hat Team {team_name} mit {size} Personen zur Warteliste hinzugefügt.")
             # Log zum Kanal senden
-            await send_to_log_channel(
-                f"✅ Admin {interaction.user.name} hat Team '{team_name}' mit {size} Personen angemeldet.",
+            outbox.send(send_to_log_channel(
+                f"📝 Admin {interaction.user.name} hat Team '{team_name}' mit {size} Personen zur Warteliste hinzugefügt.",
                 guild=interaction.guild
-            )
+            ))
         else:
-            # Nicht genügend Plätze verfügbar
-            if available_slots > 0:
-                # Teilweise anmelden und Rest auf Warteliste
-                waitlist_size = size - available_slots
-                
-                # Aktualisiere die angemeldete Teamgröße
-                event["slots_used"] += available_slots
-                event["teams"][team_name] = available_slots
-                
-                # Füge Rest zur Warteliste hinzu
-                event["waitlist"].append((team_name, waitlist_size))
-                
+            # Prüfe, ob genügend Slots verfügbar sind (wartende Teams haben Vorrang)
+            available_slots = open_slots(event)
+        
+            if size <= available_slots:
+                # Genügend Plätze verfügbar, direkt anmelden
+                event.slots_used += size
+                event.teams[team_name] = Team(team_name, size, team_id)
+            
                 # Setze Benutzer-Team-Zuweisung, wenn angegeben
                 if discord_user_id:
                     user_team_assignments[discord_user_id] = team_name
-                    team_requester[team_name] = await bot.fetch_user(int(discord_user_id))
-                
-                await interaction.response.send_message(
-                    f"Team {team_name} wurde teilweise angemeldet. "
-                    f"{available_slots} Spieler sind angemeldet und "
-                    f"{waitlist_size} Spieler wurden auf die Warteliste gesetzt (Position {len(event['waitlist'])}).",
+            
+                outbox.send(send_feedback(
+                    interaction,
+                    f"Team {team_name} wurde mit {size} Personen angemeldet.",
                     ephemeral=True
-                )
-                
+                ))
+            
                 # Log-Eintrag
-                logger.info(f"Admin {interaction.user.name} hat Team {team_name} teilweise angemeldet: {available_slots} angemeldet, {waitlist_size} auf Warteliste.")
+                logger.info(f"Admin {interaction.user.name} hat Team {team_name} mit {size} Personen angemeldet.")
                 # Log zum Kanal senden
-                await send_to_log_channel(
-                    f"⚠️ Admin {interaction.user.name} hat Team '{team_name}' teilweise angemeldet: {available_slots} Mitglieder registriert, {waitlist_size} auf Warteliste.",
+                outbox.send(send_to_log_channel(
+                    f"✅ Admin {interaction.user.name} hat Team '{team_name}' mit {size} Personen angemeldet.",
                     guild=interaction.guild
-                )
+                ))
             else:
-                # Komplett auf Warteliste setzen
-                event["waitlist"].append((team_name, size))
+                # Nicht genügend Plätze verfügbar
+                if available_slots > 0:
+                    # Teilweise anmelden und Rest auf Warteliste
+                    waitlist_size = size - available_slots
                 
-                # Setze Benutzer-Team-Zuweisung, wenn angegeben
-                if discord_user_id:
-                    user_team_assignments[discord_user_id] = team_name
-                    team_requester[team_name] = await bot.fetch_user(int(discord_user_id))
+                    # Aktualisiere die angemeldete Teamgröße
+                    event.slots_used += available_slots
+                    event.teams[team_name] = Team(team_name, available_slots, team_id)
                 
-                await interaction.response.send_message(
-                    f"Team {team_name} wurde mit {size} Personen auf die Warteliste gesetzt (Position {len(event['waitlist'])}).",
-                    ephemeral=True
-                )
+                    # Füge Rest zur Warteliste hinzu
+                    event.waitlist.append(WaitlistEntry(team_name, waitlist_size, team_id))
                 
-                # Log-Eintrag
-                logger.info(f"Admin {interaction.user.name} hat Team {team_name} mit {size} Personen zur Warteliste hinzugefügt (keine Slots verfügbar).")
-                # Log zum Kanal senden
-                await send_to_log_channel(
-                    f"📝 Admin {interaction.user.name} hat Team '{team_name}' mit {size} Personen zur Warteliste hinzugefügt (keine Slots verfügbar).",
-                    guild=interaction.guild
-                )
-    
-    # Speichere Änderungen
-    save_data(event_data, channel_id, user_team_assignments)
-    
-    # Benachrichtigung für Discord-Benutzer, wenn angegeben
-    if discord_user_id and discord_username:
-        try:
-            user = await bot.fetch_user(int(discord_user_id))
-            if user:
-                # Erstelle eine Benachrichtigung
-                message = f"Hallo {discord_username}! Ein Admin hat dich dem Team **{team_name}** für das Event '{event['name']}' zugewiesen."
+                    # Setze Benutzer-Team-Zuweisung, wenn angegeben
+                    if discord_user_id:
+                        user_team_assignments[discord_user_id] = team_name
+                        if requester:
+                            command_queue.changes.set(team_requester, team_name, requester)
                 
-                if team_name in event["teams"]:
-                    message += f" Das Team ist erfolgreich angemeldet mit {event['teams'][team_name]} Spielern."
+                    outbox.send(send_feedback(
+                        interaction,
+                        f"Team {team_name} wurde teilweise angemeldet. "
+                        f"{available_slots} Spieler sind angemeldet und "
+                        f"{waitlist_size} Spieler wurden auf die Warteliste gesetzt (Position {len(event.waitlist)}).",
+                        ephemeral=True
+                    ))
+                
+                    # Log-Eintrag
+                    logger.info(f"Admin {interaction.user.name} hat Team {team_name} teilweise angemeldet: {available_slots} angemeldet, {waitlist_size} auf Warteliste.")
+                    # Log zum Kanal senden
+                    outbox.send(send_to_log_channel(
+                        f"⚠️ Admin {interaction.user.name} hat Team '{team_name}' teilweise angemeldet: {available_slots} Mitglieder registriert, {waitlist_size} auf Warteliste.",
+                        guild=interaction.guild
+                    ))
                 else:
-                    # Suche in der Warteliste
-                    for wl_team, wl_size in event["waitlist"]:
-                        if wl_team == team_name:
-                            message += f" Das Team steht auf der Warteliste (Position {event['waitlist'].index((wl_team, wl_size))+1}) mit {wl_size} Spielern."
-                            break
+                    # Komplett auf Warteliste setzen
+                    event.waitlist.append(WaitlistEntry(team_name, size, team_id))
                 
-                await user.send(message)
-        except Exception as e:
-            logger.warning(f"Konnte Benutzer {discord_user_id} nicht benachrichtigen: {e}")
+                    # Setze Benutzer-Team-Zuweisung, wenn angegeben
+                    if discord_user_id:
+                        user_team_assignments[discord_user_id] = team_name
+                        if requester:
+                            command_queue.changes.set(team_requester, team_name, requester)
+                
+                    outbox.send(send_feedback(
+                        interaction,
+                        f"Team {team_name} wurde mit {size} Personen auf die Warteliste gesetzt (Position {len(event.waitlist)}).",
+                        ephemeral=True
+                    ))
+                
+                    # Log-Eintrag
+                    logger.info(f"Admin {interaction.user.name} hat Team {team_name} mit {size} Personen zur Warteliste hinzugefügt (keine Slots verfügbar).")
+                    # Log zum Kanal senden
+                    outbox.send(send_to_log_channel(
+                        f"📝 Admin {interaction.user.name} hat Team '{team_name}' mit {size} Personen zur Warteliste hinzugefügt (keine Slots verfügbar).",
+                        guild=interaction.guild
+                    ))
+    
+        # Benachrichtigung für Discord-Benutzer, wenn angegeben
+        if requester and discord_username:
+            # Erstelle eine Benachrichtigung
+            message = f"Hallo {discord_username}! Ein Admin hat dich dem Team **{team_name}** für das Event '{event.name}' zugewiesen."
+        
+            if team_name in event.teams:
+                message += f" Das Team ist erfolgreich angemeldet mit {event.teams[team_name].size} Spielern."
+            else:
+                # Suche in der Warteliste
+                for entry in event.waitlist.entries_for(team_name):
+                    if entry.name == team_name:
+                        position = event.waitlist.position(entry) + 1
+                        message += f" Das Team steht auf der Warteliste (Position {position}) mit {entry.size} Spielern."
+                        break
+        
+            async def notify_user():
+                try:
+                    await get_outbound().submit(PRIORITY_DM, ("dm", requester.id), lambda: requester.send(message))
+                except Exception as e:
+                    logger.warning(f"Konnte Benutzer {discord_user_id} nicht benachrichtigen: {e}")
+            outbox.send(notify_user())
     
-    # Update channel with latest event details
-    if channel_id:
-        channel = bot.get_channel(interaction.channel_id)
-        if channel:
-            await send_event_details(channel)
+        # Update channel with latest event details
+        if channel_id:
+            channel = bot.get_channel(interaction.channel_id)
+            if channel:
+                outbox.refresh((channel.id, event.id))
     
-    return True
+        return True
+    
+    return await command_queue.submit(event.id if event else event_id, "admin_add_team", apply)
+
+async def update_display_message(channel, event, embed, view):
+    """
+    Aktualisiert die Anzeige-Nachricht eines Events in einem Kanal
+    
+    Die Nachricht wird bearbeitet, wenn sich der Inhalt seit der letzten
+    Aktualisierung geändert hat. Neu gepostet wird nur, wenn es noch keine
+    Nachricht gibt oder sie gelöscht wurde; die neue Nachrichten-ID wird am
+    Event gespeichert und übersteht damit Neustarts.
+    
+    Parameters:
+    - channel: Discord-Kanal der Anzeige
+    - event: Event (siehe models.py)
+    - embed: Gerendertes Embed (oder Text) der Anzeige
+    - view: View der Anzeige (event_view)
+    """
+    key = (channel.id, event.id)
+    route = ("channel", channel.id)
+    is_embed = isinstance(embed, discord.Embed)
+    content = (embed.to_dict() if is_embed else embed, view.to_components())
+    
+    lock = display_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        message_id = event.display_messages.get(channel.id)
+        if message_id is not None:
+            if display_renders.get(key) == content:
+                return
+            try:
+                message = channel.get_partial_message(message_id)
+                if is_embed:
+                    edit = lambda: message.edit(embed=embed, view=view)
+                else:
+                    edit = lambda: message.edit(content=embed, embed=None, view=view)
+                await get_outbound().submit(PRIORITY_DISPLAY, route, edit)
+                display_renders[key] = content
+                return
+            except discord.NotFound:
+                logger.info(f"Anzeige von Event '{event.id}' in Kanal {channel.id} wurde gelöscht, poste sie neu")
+        
+        if is_embed:
+            post = lambda: channel.send(embed=embed, view=view)
+        else:
+            post = lambda: channel.send(embed, view=view)
+        message = await get_outbound().submit(PRIORITY_DISPLAY, route, post)
+        display_renders[key] = content
+        
+        def apply(outbox):
+            current = event_data.get(event.id)
+            if current is not None:
+                current.display_messages = {**current.display_messages, channel.id: message.id}
+        
+        await command_queue.submit(event.id, "display_message", apply)
+
+async def retire_display(channel_id, message_id):
+    """
+    Entfernt die Buttons der Anzeige-Nachricht eines gelöschten Events
+    
+    Parameters:
+    - channel_id: ID des Kanals der Anzeige
+    - message_id: ID der Anzeige-Nachricht
+    """
+    channel = bot.get_channel(channel_id)
+    if not channel:
+        return
+    message = channel.get_partial_message(message_id)
+    try:
+        await get_outbound().submit(PRIORITY_DISPLAY, ("channel", channel_id), lambda: message.edit(view=None))
+    except discord.NotFound:
+        logger.debug(f"Anzeige-Nachricht {message_id} in Kanal {channel_id} existiert nicht mehr")
+
+def forget_display(event_id):
+    """Entfernt den gemerkten Anzeige-Inhalt und ausstehende Aktualisierungen eines gelöschten Events"""
+    display_refresher.forget(event_id)
+    for key in [key for key in display_renders if key[1] == event_id]:
+        del display_renders[key]
+        display_locks.pop(key, None)
+
+async def refresh_displays(target_channel_id, event_ids):
+    """
+    Rendert die Anzeigen mehrerer Events in einem Kanal mit dem aktuellen Stand neu
+    
+    Wird vom display_refresher aufgerufen; gelöschte Events werden übersprungen.
+    
+    Parameters:
+    - target_channel_id: ID des Kanals der Anzeigen
+    - event_ids: IDs der zu aktualisierenden Events
+    """
+    channel = bot.get_channel(target_channel_id)
+    if not channel:
+        return
+    for event_id in event_ids:
+        event = event_data.get(event_id)
+        if event is not None:
+            await send_event_details(channel, event)
+
+def render_event_details(event):
+    """Embed der Event-Anzeige aus dem Render-Cache (siehe format_event_details)"""
+    if event is None:
+        return format_event_details(event)
+    return render_cache.get(event.id, "details", lambda: format_event_details(event))
+
+def render_event_list(event):
+    """Text-Fallback der Event-Anzeige aus dem Render-Cache (siehe format_event_list)"""
+    if event is None:
+        return format_event_list(event)
+    return render_cache.get(event.id, "list", lambda: format_event_list(event))
+
+def render_team_list(event, page=0):
+    """
+    Embed einer Seite der Teamliste aus dem Render-Cache
+    
+    Die Aufteilung in Seiten wird je Event-Version einmal berechnet, die Embeds
+    der Seiten erst beim ersten Anzeigen.
+    """
+    pages = render_cache.get(event.id, "team_list_pages", lambda: team_list_pages(event))
+    page = max(0, min(page, len(pages) - 1))
+    return render_cache.get(event.id, "team_list", lambda: format_team_list(event, pages[page], page, len(pages)), page=page)
+
+def render_waitlist(event, page=0):
+    """Embed einer Seite der vollständigen Warteliste aus dem Render-Cache (siehe render_team_list)"""
+    pages = render_cache.get(event.id, "waitlist_pages", lambda: waitlist_pages(event))
+    page = max(0, min(page, len(pages) - 1))
+    return render_cache.get(event.id, "waitlist", lambda: format_waitlist(event, pages[page], page, len(pages)), page=page)
+
+def page_count(event, view, paginate):
+    """Anzahl der Seiten einer Ansicht aus dem Render-Cache (paginate: Funktion paginate(event))"""
+    return len(render_cache.get(event.id, view, lambda: paginate(event)))
+
+async def send_team_list(interaction, event, ephemeral=False):
+    """Sendet die Teamliste eines Events, bei mehreren Seiten mit Blätter-Buttons"""
+    await send_pages(
+        interaction, "",
+        lambda page: render_team_list(event, page),
+        lambda: page_count(event, "team_list_pages", team_list_pages),
+        ephemeral=ephemeral, title="Teamliste"
+    )
 
 async def send_event_details(channel, event=None):
     """Send event details to a channel with interactive buttons"""
     if event is None:
         event = get_event()
     
+    # Kanal-Anzeige mit den persistenten Buttons: die bestehende Nachricht wird bearbeitet statt neu gepostet
+    if event is not None:
+        try:
+            await update_display_message(channel, event, render_event_details(event), event_view)
+        except Exception as e:
+            # Kein neues Posten: display_renders bleibt unverändert, die nächste Aktualisierung versucht es erneut
+            logger.error(f"Anzeige von Event '{event.id}' in Kanal {channel.id} konnte nicht aktualisiert werden: {e}")
+        return
+    
     try:
-        embed = format_event_details(event)
-        
-        # Get the user's roles for button states
-        has_admin = False
-        has_clan_rep = False
-        has_team = False
-        team_name = None
-        
-        # Check if the message is for a specific user
-        if hasattr(channel, 'author'):
-            user = channel.author
-            user_id = str(user.id)
-            has_admin = has_role(user, ORGANIZER_ROLE)
-            has_clan_rep = has_role(user, CLAN_REP_ROLE)
-            team_name = user_team_assignments.get(user_id)
-            has_team = team_name is not None
-        
-        # Add interactive buttons
-        view = EventActionView(event, has_admin, has_clan_rep, has_team, team_name)
-        
-        if isinstance(embed, discord.Embed):
-            await channel.send(embed=embed, view=view)
-        else:
-            await channel.send(embed, view=view)
+        await send_channel_message(channel, render_event_details(event))
     except Exception as e:
         logger.error(f"Error sending event details: {e}")
         # Fallback to plain text if embed fails
-        await channel.send(format_event_list(event))
+        await send_channel_message(channel, render_event_list(event))
 
 @bot.event
 async def on_ready():
@@ -3235,6 +3089,10 @@ async def on_ready():
             logger.info(f"Log-Kanal initialisiert: {log_channel.name} (ID: {log_channel.id})")
             await send_to_log_channel(f"Event-Bot gestartet!", guild=guild)
             
+            # Probleme beim Laden der gespeicherten Daten melden
+            for message in pop_load_report():
+                await send_to_log_channel(f"💾 Datenwiederherstellung: {message}", level="WARNING", guild=guild)
+            
             # Initialisiere globale Log-Kanal-Variable für andere Module
             from utils import discord_log_channel
             import utils
@@ -3247,7 +3105,7 @@ async def on_ready():
         channel = bot.get_channel(channel_id)
         if channel:
             logger.info(f"Channel gefunden: {channel.name}")
-            await channel.send("Event-Bot ist online und bereit!")
+            await send_channel_message(channel, "Event-Bot ist online und bereit!")
             await send_to_log_channel(f"Hauptkanal initialisiert: {channel.name} ({channel.id})")
         else:
             logger.warning("Gespeicherter Channel konnte nicht gefunden werden.")
@@ -3308,7 +3166,10 @@ async def process_log_queue():
                     if len(combined_message) > 1900:
                         combined_message = combined_message[:1900] + "...\n(Nachricht gekürzt)"
                     
-                    await discord_log_channel.send(f"```\n{combined_message}\n```")
+                    get_outbound().post(
+                        PRIORITY_LOG, ("channel", discord_log_channel.id), discord_log_channel.send,
+                        text=f"```\n{combined_message}\n```"
+                    )
                 except Exception as e:
                     logger.error(f"Fehler beim Senden von Log-Nachrichten an Discord: {e}")
             
@@ -3319,93 +3180,67 @@ async def process_log_queue():
             logger.error(f"Fehler in process_log_queue: {e}")
             await asyncio.sleep(10)  # Längere Pause bei Fehlern
 
+async def check_event_waitlist_and_expiry(event):
+    """
+    Prüft Ablauf und Warteliste eines einzelnen Events
+    
+    Parameters:
+    - event: Eventdaten
+    """
+    # Überprüfe, ob expiry_date vorhanden ist
+    if event.expiry_date is None:
+        # Wenn nicht, überspringen wir die Verfallsprüfung
+        logger.warning(f"Event '{event.id}' hat kein expiry_date, überspringe Verfallsprüfung")
+        return
+
+    # Check for event expiry
+    if datetime.now() > event.expiry_date:
+        logger.info(f"Event '{event.id}' expired, removing it")
+        
+        event_name = event.name or "Unbekanntes Event"
+        
+        def apply(outbox):
+            remove_event(event.id)
+            for display_channel_id, message_id in event.display_messages.items():
+                outbox.send(retire_display(display_channel_id, message_id))
+            
+            # Systemlognachricht zum Event-Ablauf
+            for guild in bot.guilds:
+                outbox.send(send_to_log_channel(
+                    f"⏰ Event '{event_name}' ist automatisch abgelaufen und wurde aus dem System entfernt.",
+                    level="INFO",
+                    guild=guild
+                ))
+            
+            if channel_id:
+                channel = bot.get_channel(channel_id)
+                if channel:
+                    outbox.send(send_channel_message(channel, f"Das Event '{event_name}' ist abgelaufen und wurde gelöscht."))
+        
+        await command_queue.submit(event.id, "Ablauf", apply)
+        command_queue.forget(event.id)
+        forget_display(event.id)
+        return
+
+    # Freie Plätze mit Teams von der Warteliste auffüllen
+    await process_waitlist_after_change(event_id=event.id, refresh=True)
+
 async def check_waitlist_and_expiry():
+
     """Background task to check waitlist and event expiry"""
     await bot.wait_until_ready()
     
     while not bot.is_closed():
         try:
             await asyncio.sleep(WAITLIST_CHECK_INTERVAL)
-            event = get_event()
-
-            if not event:
-                continue
-                
-            # Überprüfe, ob expiry_date vorhanden ist
-            if "expiry_date" not in event:
-                # Wenn nicht, überspringen wir die Verfallsprüfung
-                logger.warning("Event hat kein expiry_date, überspringe Verfallsprüfung")
-                continue
-
-            # Check for event expiry
-            if datetime.now() > event["expiry_date"]:
-                logger.info("Event expired, removing it")
-                
-                event_name = event.get("name", "Unbekanntes Event")
-                
-                event_data.clear()
-                save_data(event_data, channel_id, user_team_assignments)
-                
-                # Systemlognachricht zum Event-Ablauf
-                for guild in bot.guilds:
-                    await send_to_log_channel(
-                        f"⏰ Event '{event_name}' ist automatisch abgelaufen und wurde aus dem System entfernt.",
-                        level="INFO",
-                        guild=guild
-                    )
-                
-                if channel_id:
-                    channel = bot.get_channel(channel_id)
-                    if channel:
-                        await channel.send("Das Event ist abgelaufen und wurde gelöscht.")
-                continue
-
-            # Check for free slots and process waitlist
-            if event["slots_used"] < event["max_slots"] and event["waitlist"]:
-                available_slots = event["max_slots"] - event["slots_used"]
-                update_needed = False
-                
-                while available_slots > 0 and event["waitlist"]:
-                    team_name, size = event["waitlist"][0]
-                    
-                    if size <= available_slots:
-                        # Remove from waitlist and add to registered teams
-                        event["waitlist"].pop(0)
-                        event["slots_used"] += size
-                        event["teams"][team_name] = event["teams"].get(team_name, 0) + size
-                        available_slots -= size
-                        update_needed = True
-                        
-                        # Notify team representative
-                        if channel_id:
-                            channel = bot.get_channel(channel_id)
-                            if channel:
-                                await channel.send(f"Team {team_name} wurde von der Warteliste in die Anmeldung aufgenommen!")
-                        
-                        requester = team_requester.get(team_name)
-                        if requester:
-                            try:
-                                await requester.send(f"Gute Neuigkeiten! Dein Team {team_name} wurde von der Warteliste in die Anmeldung für das Event '{event['name']}' aufgenommen.")
-                            except discord.errors.Forbidden:
-                                logger.warning(f"Could not send DM to {requester}")
-                    else:
-                        break
-
-                if update_needed:
-                    save_data(event_data, channel_id, user_team_assignments)
-                    
-                    # Log für automatische Wartelisten-Verarbeitung
-                    for guild in bot.guilds:
-                        await send_to_log_channel(
-                            f"⏫ Automatische Wartelisten-Verarbeitung: Teams wurden automatisch von der Warteliste aufgenommen",
-                            level="INFO",
-                            guild=guild
-                        )
-                    
-                    if channel_id:
-                        channel = bot.get_channel(channel_id)
-                        if channel:
-                            await send_event_details(channel)
+            
+            # Jedes Event hat eigene Kapazität, Warteliste und Ablaufdatum
+            for event in get_events():
+                await check_event_waitlist_and_expiry(event)
+            
+            # Nicht mehr benötigte veraltete Benutzerprofile entfernen und Änderungen speichern
+            user_profiles.prune(user_team_assignments)
+            await user_profiles.flush(USER_PROFILE_FILE)
         
         except Exception as e:
             logger.error(f"Error in waitlist check: {e}")
@@ -3423,18 +3258,21 @@ async def set_channel(interaction: discord.Interaction):
         await interaction.response.send_message("Du benötigst 'Kanäle verwalten'-Berechtigungen, um diesen Befehl zu nutzen.", ephemeral=True)
         return
         
-    global channel_id
-    channel_id = interaction.channel_id
-    save_data(event_data, channel_id, user_team_assignments)
+    def apply(outbox):
+        global channel_id
+        channel_id = interaction.channel_id
+        command_queue.changes.mark("channel_id")
     
-    # Log für Channel-Setzung
-    await send_to_log_channel(
-        f"📌 Event-Channel: {interaction.user.name} hat Channel '{interaction.channel.name}' (ID: {channel_id}) als Event-Channel festgelegt",
-        guild=interaction.guild
-    )
+        # Log für Channel-Setzung
+        outbox.send(send_to_log_channel(
+            f"📌 Event-Channel: {interaction.user.name} hat Channel '{interaction.channel.name}' (ID: {channel_id}) als Event-Channel festgelegt",
+            guild=interaction.guild
+        ))
     
-    await interaction.response.send_message(f"Dieser Channel ({interaction.channel.name}) wurde erfolgreich für Event-Interaktionen gesetzt.")
-    logger.info(f"Channel gesetzt: {interaction.channel.name} (ID: {channel_id})")
+        outbox.send(send_feedback(interaction, f"Dieser Channel ({interaction.channel.name}) wurde erfolgreich für Event-Interaktionen gesetzt.", ephemeral=False))
+        logger.info(f"Channel gesetzt: {interaction.channel.name} (ID: {channel_id})")
+    
+    await command_queue.submit(None, "set_channel", apply)
 
 # Event commands
 @bot.tree.command(name="event", description="Erstellt ein neues Event (nur für Orga-Team)")
@@ -3517,57 +3355,44 @@ async def create_event_internal(interaction: discord.Interaction, name: str, dat
     # Kommandoausführung loggen
     logger.info(f"Event-Erstellung: {interaction.user.name} ({interaction.user.id}) erstellt Event mit Parametern: name='{name}', date='{date}', time='{time}'")
 
-    if get_event():
-        await interaction.response.send_message("Es existiert bereits ein aktives Event. Bitte lösche es zuerst mit /delete_event.")
-        return
-    
     # Validate date format
     event_date = parse_date(date)
     if not event_date:
         await interaction.response.send_message("Ungültiges Datumsformat. Bitte verwende das Format TT.MM.JJJJ.")
         return
     
-    # Create event
-    event_data["event"] = {
-        "name": name,
-        "date": date,
-        "time": time,
-        "description": description,
-        "teams": {},
-        "waitlist": [],
-        "max_slots": DEFAULT_MAX_SLOTS,
-        "slots_used": 0,
-        "max_team_size": DEFAULT_MAX_TEAM_SIZE,
-        "expiry_date": event_date + timedelta(days=1)
-    }
-
-    save_data(event_data, channel_id, user_team_assignments)
-    await interaction.response.send_message("Event erfolgreich erstellt!")
+    # Create event (mehrere Events können gleichzeitig aktiv sein)
+    event_id = generate_event_id(name, event_data)
+    
+    def apply(outbox):
+        event_data[event_id] = Event(
+            event_id, name, date, time, description,
+            max_slots=DEFAULT_MAX_SLOTS,
+            max_team_size=DEFAULT_MAX_TEAM_SIZE,
+            expiry_date=event_date + timedelta(days=1)
+        )
+    
+    await command_queue.submit(event_id, "create_event", apply)
+    await flush_data()
+    await interaction.response.send_message(f"Event erfolgreich erstellt! (Event-ID: {event_id})")
     
     # Log zum Erstellen des Events
     await send_to_log_channel(
-        f"🆕 Event erstellt: '{name}' am {date} um {time} durch {interaction.user.name}",
+        f"🆕 Event erstellt: '{name}' (ID: {event_id}) am {date} um {time} durch {interaction.user.name}",
         guild=interaction.guild
     )
     
-    # Get channel after creating the event
+    # Anzeige im Kanal über update_display_message posten, damit die Nachrichten-ID
+    # gespeichert wird und spätere Aktualisierungen diese Nachricht bearbeiten
     channel = bot.get_channel(interaction.channel_id)
-    if channel:
-        # Check roles for this specific user
-        user_id = str(interaction.user.id)
-        has_admin = has_role(interaction.user, ORGANIZER_ROLE)
-        has_clan_rep = has_role(interaction.user, CLAN_REP_ROLE)
-        team_name = user_team_assignments.get(user_id)
-        has_team = team_name is not None
-        
-        # Create embed
-        embed = format_event_details(get_event())
-        view = EventActionView(get_event(), has_admin, has_clan_rep, has_team, team_name)
-        
-        await channel.send(embed=embed, view=view)
+    event = get_event(event_id)
+    if channel and event:
+        await update_display_message(channel, event, render_event_details(event), event_view)
 
 @bot.tree.command(name="delete_event", description="Löscht das aktuelle Event (nur für Orga-Team)")
-async def delete_event(interaction: discord.Interaction):
+@app_commands.describe(event="Event (Standard: zuletzt erstelltes Event)")
+@app_commands.autocomplete(event=event_autocomplete)
+async def delete_event(interaction: discord.Interaction, event: str = None):
     """Delete the current event"""
     # Kommandoausführung loggen
     logger.info(f"Slash-Command: /delete_event ausgeführt von {interaction.user.name} ({interaction.user.id}) in Kanal {interaction.channel.name}")
@@ -3581,7 +3406,7 @@ async def delete_event(interaction: discord.Interaction):
         )
         return
 
-    event = get_event()
+    event = get_event(event)
     if not event:
         await send_feedback(interaction, "Es gibt kein aktives Event zum Löschen.", ephemeral=True)
         return
@@ -3589,7 +3414,7 @@ async def delete_event(interaction: discord.Interaction):
     # Zeige eine Bestätigungsanfrage mit den Konsequenzen des Löschens
     embed = discord.Embed(
         title="⚠️ Event wirklich löschen?",
-        description=f"Bist du sicher, dass du das Event **{event['name']}** löschen möchtest?\n\n"
+        description=f"Bist du sicher, dass du das Event **{event.name}** löschen möchtest?\n\n"
                     f"Diese Aktion kann nicht rückgängig gemacht werden! Alle Team-Anmeldungen und Wartelisten-Einträge werden gelöscht.",
         color=discord.Color.red()
     )
@@ -3597,58 +3422,80 @@ async def delete_event(interaction: discord.Interaction):
     # Details zum Event hinzufügen
     embed.add_field(
         name="Event-Details", 
-        value=f"**Name:** {event['name']}\n"
-              f"**Datum:** {event.get('date', 'Nicht angegeben')}\n"
-              f"**Angemeldete Teams:** {len(event['teams'])}\n"
-              f"**Teams auf Warteliste:** {len(event['waitlist'])}"
+        value=f"**Name:** {event.name}\n"
+              f"**Datum:** {event.date or 'Nicht angegeben'}\n"
+              f"**Angemeldete Teams:** {len(event.teams)}\n"
+              f"**Teams auf Warteliste:** {len(event.waitlist)}"
     )
     
     # Verwende die vorhandene Bestätigungsansicht
-    view = DeleteConfirmationView()
+    view = DeleteConfirmationView(event_id=event.id)
     await send_feedback(interaction, "", embed=embed, view=view, ephemeral=True)
 
 @bot.tree.command(name="show_event", description="Zeigt das aktuelle Event an")
-async def show_event(interaction: discord.Interaction):
+@app_commands.describe(event="Event (Standard: zuletzt erstelltes Event)")
+@app_commands.autocomplete(event=event_autocomplete)
+async def show_event(interaction: discord.Interaction, event: str = None):
     """Show the current event"""
-    event = get_event()
+    event = get_event(event)
+
     if not event:
         await interaction.response.send_message("Es gibt derzeit kein aktives Event.", ephemeral=True)
         return
     
     # Prüfe, ob es ein echtes Event mit Inhalt ist
-    if not event.get('name') or not event.get('date'):
+    if not event.name or not event.date:
         await interaction.response.send_message("Es gibt derzeit kein aktives Event.", ephemeral=True)
         return
     
-    # Es gibt ein Event, zeige die Details mit Buttons
-    await interaction.response.send_message("Hier sind die Event-Details:")
+    # Es gibt ein Event, zeige die Details mit Buttons - nur für den Aufrufenden, damit
+    # neben der gespeicherten Event-Anzeige des Kanals keine weiteren Kopien entstehen
+    await send_feedback(
+        interaction,
+        "Hier sind die Event-Details:",
+        ephemeral=True,
+        embed=render_event_details(event),
+        view=event_view
+    )
+
+@bot.tree.command(name="events", description="Listet alle aktiven Events auf")
+async def list_events(interaction: discord.Interaction):
+    """List all active events"""
+    events = get_events()
+    if not events:
+        await interaction.response.send_message("Es gibt derzeit kein aktives Event.", ephemeral=True)
+        return
     
-    # Get channel after sending initial response
-    channel = bot.get_channel(interaction.channel_id)
-    if channel:
-        # Check roles for this specific user
-        user_id = str(interaction.user.id)
-        has_admin = has_role(interaction.user, ORGANIZER_ROLE)
-        has_clan_rep = has_role(interaction.user, CLAN_REP_ROLE)
-        team_name = user_team_assignments.get(user_id)
-        has_team = team_name is not None
-        
-        # Create embed
-        embed = format_event_details(event)
-        view = EventActionView(event, has_admin, has_clan_rep, has_team, team_name)
-        
-        await channel.send(embed=embed, view=view)
+    embed = discord.Embed(
+        title=f"📅 Aktive Events ({len(events)})",
+        description="Befehle wirken ohne Event-Angabe auf das zuletzt erstellte Event.",
+        color=discord.Color.blue()
+    )
+    for event in events:
+        embed.add_field(
+            name=f"{event.name} ({event.date}, {event.time})",
+            value=f"ID: `{event.id}`\n"
+                  f"👥 {event.slots_used}/{event.max_slots} Plätze belegt, "
+                  f"⏳ {len(event.waitlist)} Teams auf der Warteliste",
+            inline=False
+        )
+
+    
+    await interaction.response.send_message(embed=embed, ephemeral=True)
 
 # Registration commands
+
 @bot.tree.command(name="reg", description="Meldet dein Team an oder ändert die Teamgröße (nur für Clan-Rep)")
 @app_commands.describe(
     team_name="Name des Teams", 
-    size="Anzahl der Teilnehmer (0 zum Entfernen des Teams)"
+    size="Anzahl der Teilnehmer (0 zum Entfernen des Teams)",
+    event="Event (Standard: zuletzt erstelltes Event)"
 )
-async def register_team(interaction: discord.Interaction, team_name: str, size: int):
+@app_commands.autocomplete(event=event_autocomplete, team_name=team_autocomplete)
+async def register_team(interaction: discord.Interaction, team_name: str, size: int, event: str = None):
     """Register a team or update team size. Size 0 unregisters the team."""
     # Validiere den Befehlskontext (Rolle, Event)
-    event, _ = await validate_command_context(interaction, required_role=CLAN_REP_ROLE)
+    event, _ = await validate_command_context(interaction, required_role=CLAN_REP_ROLE, event_id=event)
     if not event:
         return
 
@@ -3657,7 +3504,7 @@ async def register_team(interaction: discord.Interaction, team_name: str, size:
     user_id = str(interaction.user.id)
 
     # Validiere die Teamgröße
-    if not await validate_team_size(interaction, size, event["max_team_size"]):
+    if not await validate_team_size(interaction, size, event.max_team_size):
         return
 
     # Prüfe, ob der Nutzer bereits einem anderen Team zugewiesen ist
@@ -3675,26 +3522,19 @@ async def register_team(interaction: discord.Interaction, team_name: str, size:
     
     # Abmeldung (size == 0)
     if size == 0:
-        await handle_team_unregistration(interaction, team_name)
+        await handle_team_unregistration(interaction, team_name, event_id=event.id)
         return
     
-    # Nutzer für Benachrichtigungen speichern
-    team_requester[team_name] = interaction.user
-    
     # Verwende update_team_size für die eigentliche Logik
-    success = await update_team_size(interaction, team_name, size)
-    
-    if success:
-        # Speichere Daten nach jeder Änderung
-        save_data(event_data, channel_id, user_team_assignments)
-        
-        # Aktualisiere die Event-Anzeige
-        await update_event_displays(interaction=interaction)
+    # (speichert mit dem Stapel, aktualisiert die Event-Anzeige und merkt sich den Nutzer für Benachrichtigungen)
+    await update_team_size(interaction, team_name, size, event_id=event.id, requester=interaction.user)
 
 # Der /wl-Befehl wurde entfernt, da die Warteliste jetzt automatisch vom Bot verwaltet wird
 
 @bot.tree.command(name="open_reg", description="Erhöht die maximale Teamgröße oder entfernt die Begrenzung (nur für Orga-Team)")
-async def open_registration(interaction: discord.Interaction):
+@app_commands.describe(event="Event (Standard: zuletzt erstelltes Event)")
+@app_commands.autocomplete(event=event_autocomplete)
+async def open_registration(interaction: discord.Interaction, event: str = None):
     """Increases maximum team size or removes the limit (admin only)"""
     # Überprüfe Rolle
     if not has_role(interaction.user, ORGANIZER_ROLE):
@@ -3704,54 +3544,56 @@ async def open_registration(interaction: discord.Interaction):
         )
         return
 
-    event = get_event()
+    event = get_event(event)
     if not event:
         await send_feedback(interaction, "Es gibt derzeit kein aktives Event.")
         return
     
-    current_max_size = event["max_team_size"]
-    new_max_size = None
-    message = ""
-    
-    # Logik für verschiedene Fälle:
-    # Fall 1: Max. Teamgröße ist 9 -> auf 18 erhöhen
-    # Fall 2: Max. Teamgröße ist 18 -> Begrenzung aufheben (99)
-    # Fall 3: Keine Begrenzung mehr -> Nichts tun
-    
-    if current_max_size == DEFAULT_MAX_TEAM_SIZE:
-        # Fall 1: Von 9 auf 18 erhöhen
-        new_max_size = EXPANDED_MAX_TEAM_SIZE
-        message = f"Die maximale Teamgröße wurde auf {new_max_size} erhöht."
-    elif current_max_size == EXPANDED_MAX_TEAM_SIZE:
-        # Fall 2: Begrenzung aufheben (auf 99 setzen)
-        new_max_size = 99  # Praktisch unbegrenzt
-        message = f"Die Begrenzung der Teamgröße wurde aufgehoben. Teams können jetzt beliebig groß sein."
-    else:
-        # Fall 3: Keine Änderung notwendig
-        await send_feedback(interaction, "Die Teamgröße ist bereits unbegrenzt.")
-        return
+    def apply(outbox):
+        current_max_size = event.max_team_size
+        new_max_size = None
+        message = ""
+    
+        # Logik für verschiedene Fälle:
+        # Fall 1: Max. Teamgröße ist 9 -> auf 18 erhöhen
+        # Fall 2: Max. Teamgröße ist 18 -> Begrenzung aufheben (99)
+        # Fall 3: Keine Begrenzung mehr -> Nichts tun
+    
+        if current_max_size == DEFAULT_MAX_TEAM_SIZE:
+            # Fall 1: Von 9 auf 18 erhöhen
+            new_max_size = EXPANDED_MAX_TEAM_SIZE
+            message = f"Die maximale Teamgröße wurde auf {new_max_size} erhöht."
+        elif current_max_size == EXPANDED_MAX_TEAM_SIZE:
+            # Fall 2: Begrenzung aufheben (auf 99 setzen)
+            new_max_size = 99  # Praktisch unbegrenzt
+            message = f"Die Begrenzung der Teamgröße wurde aufgehoben. Teams können jetzt beliebig groß sein."
+        else:
+            # Fall 3: Keine Änderung notwendig
+            outbox.send(send_feedback(interaction, "Die Teamgröße ist bereits unbegrenzt."))
+            return
     
-    # Speichere die alte Teamgröße für das Logging
-    old_max_size = event["max_team_size"]
+        # Speichere die alte Teamgröße für das Logging
+        old_max_size = event.max_team_size
     
-    # Aktualisiere die maximale Teamgröße
-    event["max_team_size"] = new_max_size
-    save_data(event_data, channel_id, user_team_assignments)
+        # Aktualisiere die maximale Teamgröße
+        event.max_team_size = new_max_size
     
-    # Log für die Änderung der maximalen Teamgröße
-    log_message = f"⬆️ Teamgröße angepasst: Admin {interaction.user.name} hat die maximale Teamgröße für Event '{event['name']}' von {old_max_size} auf {new_max_size} geändert"
-    await send_to_log_channel(log_message, guild=interaction.guild)
+        # Log für die Änderung der maximalen Teamgröße
+        log_message = f"⬆️ Teamgröße angepasst: Admin {interaction.user.name} hat die maximale Teamgröße für Event '{event.name}' von {old_max_size} auf {new_max_size} geändert"
+        outbox.send(send_to_log_channel(log_message, guild=interaction.guild))
     
-    # Benutzer-Feedback
-    await send_feedback(interaction, message)
+        # Benutzer-Feedback
+        outbox.send(send_feedback(interaction, message))
     
-    # Ankündigung im Event-Kanal
-    if channel_id:
-        channel = bot.get_channel(channel_id)
-        if channel:
-            channel_message = f"📢 **Ankündigung**: Die maximale Teamgröße für das Event '{event['name']}' wurde angepasst! {message}"
-            await channel.send(channel_message)
-            await send_event_details(channel)
+        # Ankündigung im Event-Kanal
+        if channel_id:
+            channel = bot.get_channel(channel_id)
+            if channel:
+                channel_message = f"📢 **Ankündigung**: Die maximale Teamgröße für das Event '{event.name}' wurde angepasst! {message}"
+                outbox.send(send_channel_message(channel, channel_message))
+                outbox.refresh((channel.id, event.id))
+    
+    await command_queue.submit(event.id, "open_reg", apply)
 
 @bot.tree.command(name="reset_team_assignment", description="Setzt die Team-Zuweisung eines Nutzers zurück (nur für Orga-Team)")
 @app_commands.describe(
@@ -3769,129 +3611,63 @@ async def reset_team_assignment(interaction: discord.Interaction, user: discord.
 
     user_id = str(user.id)
     
-    if user_id not in user_team_assignments:
-        await interaction.response.send_message(f"{user.display_name} ist keinem Team zugewiesen.")
-        return
+    def apply(outbox):
+        # Im Schreiber prüfen, damit eine zwischenzeitliche Änderung nicht überschrieben wird
+        if user_id not in user_team_assignments:
+            outbox.send(send_feedback(interaction, f"{user.display_name} ist keinem Team zugewiesen.", ephemeral=False))
+            return None
     
-    team_name = user_team_assignments[user_id]
-    del user_team_assignments[user_id]
-    save_data(event_data, channel_id, user_team_assignments)
+        team_name = user_team_assignments[user_id]
+        del user_team_assignments[user_id]
     
-    # Log für Zurücksetzen der Team-Zuweisung
-    await send_to_log_channel(
-        f"🔄 Team-Zuweisung zurückgesetzt: Admin {interaction.user.name} hat die Zuweisung von {user.display_name} zum Team '{team_name}' entfernt",
-        guild=interaction.guild
-    )
+        # Log für Zurücksetzen der Team-Zuweisung
+        outbox.send(send_to_log_channel(
+            f"🔄 Team-Zuweisung zurückgesetzt: Admin {interaction.user.name} hat die Zuweisung von {user.display_name} zum Team '{team_name}' entfernt",
+            guild=interaction.guild
+        ))
     
-    await interaction.response.send_message(
-        f"Team-Zuweisung für {user.display_name} (Team {team_name}) wurde zurückgesetzt."
-    )
+        outbox.send(send_feedback(
+            interaction,
+            f"Team-Zuweisung für {user.display_name} (Team {team_name}) wurde zurückgesetzt.",
+            ephemeral=False
+        ))
+        return team_name
+    
+    team_name = await command_queue.submit(None, "reset_team_assignment", apply)
+    if team_name is None:
+        return
     
     # Try to notify the user
     try:
-        await user.send(
+        await get_outbound().submit(PRIORITY_DM, ("dm", user.id), lambda: user.send(
             f"Deine Team-Zuweisung (Team {team_name}) wurde von einem Administrator zurückgesetzt. "
             f"Du kannst dich nun einem anderen Team anschließen."
-        )
+        ))
     except discord.errors.Forbidden:
         # User has DMs disabled, continue silently
         pass
 
 # Team List and CSV Export Commands
 @bot.tree.command(name="team_list", description="Zeigt eine schön formatierte Liste aller angemeldeten Teams")
-async def team_list(interaction: discord.Interaction):
+@app_commands.describe(event="Event (Standard: zuletzt erstelltes Event)")
+@app_commands.autocomplete(event=event_autocomplete)
+async def team_list(interaction: discord.Interaction, event: str = None):
     """Display a formatted list of all registered teams"""
-    event = get_event()
+    event = get_event(event)
     if not event:
         await interaction.response.send_message("Es gibt derzeit kein aktives Event.")
         return
     
-    # Create formatted team list embed
-    embed = discord.Embed(
-        title=f"Teamliste für {event['name']}",
-        description=f"Datum: {event['date']} | Uhrzeit: {event['time']}",
-        color=discord.Color.blue()
-    )
-    
-    # Add registered teams section
-    if event["teams"]:
-        registered_text = ""
-        # Prüfe, ob das Team-Dictionary jetzt das erweiterte Format mit IDs verwendet
-        using_team_ids = False
-        if event["teams"] and isinstance(next(iter(event["teams"].values())), dict):
-            using_team_ids = True
-        
-        if using_team_ids:
-            # Neues Format mit Team-IDs
-            for idx, (team_name, data) in enumerate(sorted(event["teams"].items()), 1):
-                team_size = data.get("size", 0)
-                team_id = data.get("id", "")
-                registered_text += f"**{idx}.** {team_name.capitalize()} - {team_size} Mitglieder | ID: `{team_id}`\n"
-        else:
-            # Altes Format ohne Team-IDs
-            for idx, (team_name, size) in enumerate(sorted(event["teams"].items()), 1):
-                registered_text += f"**{idx}.** {team_name.capitalize()} - {size} Mitglieder\n"
-        
-        embed.add_field(
-            name=f"📋 Angemeldete Teams ({event['slots_used']}/{event['max_slots']} Slots)",
-            value=registered_text,
-            inline=False
-        )
-    else:
-        embed.add_field(
-            name=f"📋 Angemeldete Teams (0/{event['max_slots']} Slots)",
-            value="Noch keine Teams angemeldet.",
-            inline=False
-        )
-    
-    # Add waitlist section
-    if event["waitlist"]:
-        waitlist_text = ""
-        # Prüfe, ob die Warteliste das erweiterte Format mit IDs verwendet
-        using_waitlist_ids = False
-        if event["waitlist"] and len(event["waitlist"][0]) > 2:
-            using_waitlist_ids = True
-        
-        if using_waitlist_ids:
-            # Neues Format mit Team-IDs
-            for idx, entry in enumerate(event["waitlist"], 1):
-                if len(entry) >= 3:  # Format: (team_name, size, team_id)
-                    team_name, size, team_id = entry
-                    waitlist_text += f"**{idx}.** {team_name.capitalize()} - {size} Mitglieder | ID: `{team_id}`\n"
-        else:
-            # Altes Format ohne Team-IDs
-            for idx, (team_name, size) in enumerate(event["waitlist"], 1):
-                waitlist_text += f"**{idx}.** {team_name.capitalize()} - {size} Mitglieder\n"
-        
-        embed.add_field(
-            name="⏳ Warteliste",
-            value=waitlist_text,
-            inline=False
-        )
-    else:
-        embed.add_field(
-            name="⏳ Warteliste",
-            value="Keine Teams auf der Warteliste.",
-            inline=False
-        )
-    
-    # Add statistics
-    available_slots = event["max_slots"] - event["slots_used"]
-    embed.add_field(
-        name="📊 Statistik",
-        value=f"Anzahl Teams: **{len(event['teams'])}**\n"
-              f"Verfügbare Slots: **{available_slots}**\n"
-              f"Warteliste: **{len(event['waitlist'])}** Teams\n"
-              f"Max. Teamgröße: **{event['max_team_size']}**",
-        inline=False
-    )
-    
-    embed.set_footer(text=f"Erstellt am {datetime.now().strftime('%d.%m.%Y um %H:%M')} Uhr")
-    
-    await interaction.response.send_message(embed=embed)
+    # Teamliste seitenweise aus dem Render-Cache (nur nach Änderungen am Event neu erstellt)
+    await send_team_list(interaction, event)
 
 @bot.tree.command(name="export_csv", description="Exportiert die Teamliste als CSV-Datei (nur für Orga-Team)")
-async def export_csv(interaction: discord.Interaction):
+@app_commands.describe(
+    team="Optional - Name oder ID eines einzelnen Teams",
+    event="Event (Standard: zuletzt erstelltes Event)"
+)
+@app_commands.autocomplete(event=event_autocomplete)
+async def export_csv(interaction: discord.Interaction, team: str = None, event: str = None):
     """Export team data as CSV file"""
     # Überprüfe Berechtigung
     if not has_role(interaction.user, ORGANIZER_ROLE):
@@ -3901,7 +3677,7 @@ async def export_csv(interaction: discord.Interaction):
         )
         return
     
-    event = get_event()
+    event = get_event(event)
     if not event:
         await interaction.response.send_message("Es gibt derzeit kein aktives Event.")
         return
@@ -3913,49 +3689,20 @@ async def export_csv(interaction: discord.Interaction):
     # Write header
     csv_writer.writerow(["Team", "Größe", "Status", "Team-ID"])
     
-    # Write registered teams
-    # Prüfe, ob das Team-Dictionary das erweiterte Format mit IDs verwendet
-    using_team_ids = False
-    if event["teams"] and isinstance(next(iter(event["teams"].values())), dict):
-        using_team_ids = True
-    
-    if using_team_ids:
-        # Neues Format mit Team-IDs
-        for team_name, data in event["teams"].items():
-            size = data.get("size", 0)
-            team_id = data.get("id", "")
-            csv_writer.writerow([team_name, size, "Angemeldet", team_id])
-    else:
-        # Altes Format ohne Team-IDs
-        for team_name, size in event["teams"].items():
-            csv_writer.writerow([team_name, size, "Angemeldet", ""])
-    
-    # Write waitlist teams
-    # Prüfe, ob die Warteliste das erweiterte Format mit IDs verwendet
-    using_waitlist_ids = False
-    if event["waitlist"] and len(event["waitlist"][0]) > 2:
-        using_waitlist_ids = True
-    
-    if using_waitlist_ids:
-        # Neues Format mit Team-IDs
-        for entry in event["waitlist"]:
-            if len(entry) >= 3:  # Format: (team_name, size, team_id)
-                team_name, size, team_id = entry
-                csv_writer.writerow([team_name, size, "Warteliste", team_id])
-    else:
-        # Altes Format ohne Team-IDs
-        for team_name, size in event["waitlist"]:
-            csv_writer.writerow([team_name, size, "Warteliste", ""])
+    # Write registered teams, then waitlist teams
+    for status, team_name, size, team_id in team_export_rows(event, team):
+        csv_writer.writerow([team_name, size, status, team_id])
+
     
     # Reset stream position to start
     output.seek(0)
     
     # Create discord file object
-    event_date = event["date"].replace(".", "-")
+    event_date = event.date.replace(".", "-")
     filename = f"teams_{event_date}.csv"
     file = discord.File(fp=io.BytesIO(output.getvalue().encode('utf-8')), filename=filename)
     
-    await interaction.response.send_message(f"Hier ist die exportierte Teamliste für {event['name']}:", file=file)
+    await interaction.response.send_message(f"Hier ist die exportierte Teamliste für {event.name}:", file=file)
 
 @bot.tree.command(name="help", description="Zeigt Hilfe zu den verfügbaren Befehlen")
 async def help_command(interaction: discord.Interaction):
@@ -3979,7 +3726,8 @@ async def help_command(interaction: discord.Interaction):
         name="🔍 Allgemeine Befehle",
         value=(
             "• `/help` - Zeigt diese Hilfe an\n"
-            "• `/show_event` - Zeigt das aktuelle Event an\n"
+            "• `/show_event [event]` - Zeigt ein Event an (ohne Angabe das zuletzt erstellte)\n"
+            "• `/events` - Listet alle aktiven Events mit ihrer Event-ID auf\n"
         ),
         inline=False
     )
@@ -4017,10 +3765,15 @@ async def help_command(interaction: discord.Interaction):
 
 
 @bot.tree.command(name="unregister", description="Meldet dein Team vom Event ab")
-async def unregister_command(interaction: discord.Interaction, team_name: str = None):
+@app_commands.describe(
+    team_name="Name des Teams (Standard: dein Team)",
+    event="Event (Standard: zuletzt erstelltes Event)"
+)
+@app_commands.autocomplete(event=event_autocomplete, team_name=team_autocomplete)
+async def unregister_command(interaction: discord.Interaction, team_name: str = None, event: str = None):
     """Melde dein Team vom Event ab"""
     # Validiere den Befehlskontext (Event)
-    event, _ = await validate_command_context(interaction)
+    event, _ = await validate_command_context(interaction, event_id=event)
     if not event:
         return
     
@@ -4052,13 +3805,15 @@ async def unregister_command(interaction: discord.Interaction, team_name: str =
         return
     
     # Verwende handle_team_unregistration für die eigentliche Abmeldungslogik
-    await handle_team_unregistration(interaction, team_name, is_admin)
+    await handle_team_unregistration(interaction, team_name, is_admin, event_id=event.id)
 
 @bot.tree.command(name="update", description="Aktualisiert die Details des aktuellen Events")
-async def update_command(interaction: discord.Interaction):
+@app_commands.describe(event="Event (Standard: zuletzt erstelltes Event)")
+@app_commands.autocomplete(event=event_autocomplete)
+async def update_command(interaction: discord.Interaction, event: str = None):
     """Aktualisiert die Event-Details im Kanal"""
     # Validiere den Befehlskontext (Rolle, Event)
-    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE)
+    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, event_id=event)
     if not event:
         return
     
@@ -4081,7 +3836,7 @@ async def update_command(interaction: discord.Interaction):
         return
     
     # Aktualisiere die Event-Details im Kanal
-    success = await update_event_displays(interaction=interaction, channel=channel)
+    success = await update_event_displays(interaction=interaction, channel=channel, event_id=event.id)
     
     if success:
         await send_feedback(
@@ -4097,10 +3852,12 @@ async def update_command(interaction: discord.Interaction):
         )
 
 @bot.tree.command(name="edit", description="Bearbeitet die Größe deines Teams")
-async def edit_command(interaction: discord.Interaction):
+@app_commands.describe(event="Event (Standard: zuletzt erstelltes Event)")
+@app_commands.autocomplete(event=event_autocomplete)
+async def edit_command(interaction: discord.Interaction, event: str = None):
     """Bearbeite die Größe deines Teams"""
     # Validiere den Befehlskontext (Event, Team-Zugehörigkeit)
-    event, team_name = await validate_command_context(interaction, team_required=True)
+    event, team_name = await validate_command_context(interaction, team_required=True, event_id=event)
     if not event:
         return
     
@@ -4122,179 +3879,179 @@ async def edit_command(interaction: discord.Interaction):
     # Prüfe Admin-Status für erweiterte Optionen
     is_admin = has_role(interaction.user, ORGANIZER_ROLE)
     
-    modal = TeamEditModal(display_name, total_size, event["max_team_size"], is_admin=is_admin)
+    modal = TeamEditModal(display_name, total_size, event.max_team_size, is_admin=is_admin, event_id=event.id)
     await interaction.response.send_modal(modal)
 
 @bot.tree.command(name="close", description="Schließt die Anmeldungen für das aktuelle Event (nur für Orga-Team)")
-async def close_command(interaction: discord.Interaction):
+@app_commands.describe(event="Event (Standard: zuletzt erstelltes Event)")
+@app_commands.autocomplete(event=event_autocomplete)
+async def close_command(interaction: discord.Interaction, event: str = None):
     """Schließt die Anmeldungen für das Event"""
     # Kommandoausführung loggen
     logger.info(f"Slash-Command: /close ausgeführt von {interaction.user.name} ({interaction.user.id}) in Kanal {interaction.channel.name}")
     
     # Validiere den Befehlskontext (Rolle, Event)
-    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE)
+    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, event_id=event)
     if not event:
         return
     
-    # Setze die verfügbaren Slots auf die aktuell verwendeten Slots
-    event["max_slots"] = event["slots_used"]
+    def apply(outbox):
+        # Setze die verfügbaren Slots auf die aktuell verwendeten Slots
+        event.max_slots = event.slots_used
     
-    # Speichere die Änderungen
-    save_data(event_data, channel_id, user_team_assignments)
+        outbox.send(send_feedback(
+            interaction,
+            f"Die Anmeldungen für das Event '{event.name}' wurden geschlossen. Neue Teams können nur noch auf die Warteliste.",
+            ephemeral=True
+        ))
     
-    await send_feedback(
-        interaction,
-        f"Die Anmeldungen für das Event '{event['name']}' wurden geschlossen. Neue Teams können nur noch auf die Warteliste.",
-        ephemeral=True
-    )
+        # Log eintragen
+        outbox.send(send_to_log_channel(
+            f"🔒 Event geschlossen: {interaction.user.name} hat die Anmeldungen für das Event '{event.name}' geschlossen",
+            level="INFO",
+            guild=interaction.guild
+        ))
     
-    # Log eintragen
-    await send_to_log_channel(
-        f"🔒 Event geschlossen: {interaction.user.name} hat die Anmeldungen für das Event '{event['name']}' geschlossen",
-        level="INFO",
-        guild=interaction.guild
-    )
+        # Aktualisiere die Event-Details im Kanal
+        outbox.refresh((channel_id or interaction.channel_id, event.id))
     
-    # Aktualisiere die Event-Details im Kanal
-    await update_event_displays(interaction=interaction)
+    await command_queue.submit(event.id, "close", apply)
 
 @bot.tree.command(name="open", description="Öffnet die Anmeldungen für das aktuelle Event wieder (nur für Orga-Team)")
-async def open_command(interaction: discord.Interaction):
+@app_commands.describe(event="Event (Standard: zuletzt erstelltes Event)")
+@app_commands.autocomplete(event=event_autocomplete)
+async def open_command(interaction: discord.Interaction, event: str = None):
     """Öffnet die Anmeldungen für das Event wieder"""
     # Kommandoausführung loggen
     logger.info(f"Slash-Command: /open ausgeführt von {interaction.user.name} ({interaction.user.id}) in Kanal {interaction.channel.name}")
     
     # Validiere den Befehlskontext (Rolle, Event)
-    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE)
+    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, event_id=event)
     if not event:
         return
     
-    # Speichere die alten Werte für das Log
-    old_max_slots = event["max_slots"]
+    def apply(outbox):
+        # Speichere die alten Werte für das Log
+        old_max_slots = event.max_slots
     
-    # Setze die verfügbaren Slots auf den Standardwert
-    event["max_slots"] = DEFAULT_MAX_SLOTS
+        # Setze die verfügbaren Slots auf den Standardwert
+        event.max_slots = DEFAULT_MAX_SLOTS
     
-    # Speichere die Änderungen
-    save_data(event_data, channel_id, user_team_assignments)
+        # Berechne wie viele Slots wieder verfügbar sind
+        new_available_slots = DEFAULT_MAX_SLOTS - event.slots_used
     
-    # Berechne wie viele Slots wieder verfügbar sind
-    new_available_slots = DEFAULT_MAX_SLOTS - event["slots_used"]
+        outbox.send(send_feedback(
+            interaction,
+            f"Die Anmeldungen für das Event '{event.name}' wurden wieder geöffnet. "
+            f"Es sind jetzt {new_available_slots} Slots verfügbar.",
+            ephemeral=True
+        ))
     
-    await send_feedback(
-        interaction,
-        f"Die Anmeldungen für das Event '{event['name']}' wurden wieder geöffnet. "
-        f"Es sind jetzt {new_available_slots} Slots verfügbar.",
-        ephemeral=True
-    )
+        # Log eintragen
+        outbox.send(send_to_log_channel(
+            f"🔓 Event geöffnet: {interaction.user.name} hat die Anmeldungen für das Event '{event.name}' wieder geöffnet "
+            f"(Slots: {old_max_slots} → {DEFAULT_MAX_SLOTS})",
+            level="INFO",
+            guild=interaction.guild
+        ))
     
-    # Log eintragen
-    await send_to_log_channel(
-        f"🔓 Event geöffnet: {interaction.user.name} hat die Anmeldungen für das Event '{event['name']}' wieder geöffnet "
-        f"(Slots: {old_max_slots} → {DEFAULT_MAX_SLOTS})",
-        level="INFO",
-        guild=interaction.guild
-    )
+        # Verarbeite die Warteliste, wenn Slots frei geworden sind
+        if new_available_slots > 0:
+            queue_promotions(event, outbox, interaction)
     
-    # Verarbeite die Warteliste, wenn Slots frei geworden sind
-    if new_available_slots > 0:
-        await process_waitlist_after_change(interaction, new_available_slots)
+        # Aktualisiere die Event-Details im Kanal
+        outbox.refresh((channel_id or interaction.channel_id, event.id))
     
-    # Aktualisiere die Event-Details im Kanal
-    await update_event_displays(interaction=interaction)
+    await command_queue.submit(event.id, "open", apply)
 
 @bot.tree.command(name="find", description="Findet ein Team oder einen Spieler im Event")
-async def find_command(interaction: discord.Interaction, search_term: str):
+@app_commands.describe(
+    search_term="Teamname, Team-ID, Spielername oder Discord-ID",
+    event="Event (Standard: zuletzt erstelltes Event)",
+    page="Seite der Suchergebnisse (Standard: 1)"
+)
+@app_commands.autocomplete(event=event_autocomplete)
+async def find_command(interaction: discord.Interaction, search_term: str, event: str = None, page: int = 1):
     """Findet ein Team oder einen Spieler im Event"""
     # Validiere den Befehlskontext (Event)
-    event, _ = await validate_command_context(interaction)
+    event, _ = await validate_command_context(interaction, event_id=event)
     if not event:
         return
     
-    search_term = search_term.lower()
-    results = []
+    # Exakte Team-ID direkt über den ID-Index auflösen
+    id_team_name = event.find_team_name(search_term.strip())
+    if id_team_name:
+        results = []
+        for status, team_name, size, team_id in team_export_rows(event, id_team_name):
+            icon = "✅" if status == "Angemeldet" else "⏳"
+            results.append(f"{icon} **{team_name}**: {size} {'Person' if size == 1 else 'Personen'} ({status}, ID: {team_id})")
+        await send_feedback(
+            interaction,
+            f"**🔍 Team mit der ID '{search_term.strip()}':**\n\n" + "\n".join(results),
+            ephemeral=True
+        )
+        return
     
-    # Prüfe, ob das Team-Dictionary das erweiterte Format mit IDs verwendet
-    using_team_ids = False
-    if event["teams"] and isinstance(next(iter(event["teams"].values())), dict):
-        using_team_ids = True
-    
-    # Suche in registrierten Teams
-    if using_team_ids:
-        # Neues Format mit Team-IDs
-        for team_name, data in event["teams"].items():
-            if search_term in team_name.lower():
-                size = data.get("size", 0)
-                team_id = data.get("id", "keine ID")
-                results.append(f"✅ **{team_name}**: {size} {'Person' if size == 1 else 'Personen'} (Angemeldet, ID: {team_id})")
-    else:
-        # Altes Format
-        for team_name, size in event["teams"].items():
-            if search_term in team_name.lower():
-                results.append(f"✅ **{team_name}**: {size} {'Person' if size == 1 else 'Personen'} (Angemeldet)")
-    
-    # Prüfe, ob die Warteliste das erweiterte Format mit IDs verwendet
-    using_waitlist_ids = False
-    if event["waitlist"] and len(event["waitlist"][0]) > 2:
-        using_waitlist_ids = True
-    
-    # Suche in Warteliste
-    if using_waitlist_ids:
-        # Neues Format mit Team-IDs
-        for i, entry in enumerate(event["waitlist"]):
-            if len(entry) >= 3:  # Format: (team_name, size, team_id)
-                team_name, size, team_id = entry
-                if search_term in team_name.lower():
-                    results.append(f"⏳ **{team_name}**: {size} {'Person' if size == 1 else 'Personen'} (Warteliste Position {i+1}, ID: {team_id})")
-    else:
-        # Altes Format
-        for i, (team_name, size) in enumerate(event["waitlist"]):
-            if search_term in team_name.lower():
-                results.append(f"⏳ **{team_name}**: {size} {'Person' if size == 1 else 'Personen'} (Warteliste Position {i+1})")
-    
-    # Suche nach zugewiesenen Benutzern (Discord-ID -> Team)
-    user_results = []
-    for user_id, team_name in user_team_assignments.items():
-        # Versuche, den Benutzer zu finden
-        try:
-            user = await bot.fetch_user(int(user_id))
-            if search_term in user.name.lower() or search_term in str(user.id):
-                # Hole die Team-Details
-                event_size, waitlist_size, total_size, registered_name, _ = get_team_total_size(event, team_name)
-                
-                if event_size > 0:
-                    user_results.append(f"👤 **{user.name}** (ID: {user.id}) ist in Team **{team_name}** (Angemeldet, Größe: {total_size})")
-                elif waitlist_size > 0:
-                    # Finde Position auf der Warteliste
-                    waitlist_position = "unbekannt"
-                    for i, entry in enumerate(event["waitlist"]):
-                        if using_waitlist_ids:
-                            if len(entry) >= 3 and entry[0].lower() == team_name.lower():
-                                waitlist_position = i + 1
-                                break
-                        else:
-                            if entry[0].lower() == team_name.lower():
-                                waitlist_position = i + 1
-                                break
-                    
-                    user_results.append(f"👤 **{user.name}** (ID: {user.id}) ist in Team **{team_name}** (Warteliste Position {waitlist_position}, Größe: {total_size})")
-        except Exception as e:
-            # Bei Fehler einfach überspringen
-            logger.error(f"Fehler beim Suchen des Benutzers {user_id}: {e}")
-            pass
+    # Benutzer des Events ohne bekanntes Profil nachschlagen (gleichzeitig), danach sucht der Index
+    # ohne Netzwerk; kürzlich fehlgeschlagene Abrufe überspringt der Profil-Cache bis USER_FETCH_RETRY_AFTER
+    unnamed = search_index.unnamed_in(event)
+    if unnamed:
+        missing = user_profiles.missing(unnamed)
+        if missing:
+            # Vor den API-Abrufen bestätigen, damit die Interaktion nicht abläuft
+            if not interaction.response.is_done():
+                await interaction.response.defer(ephemeral=True)
+            await user_profiles.resolve(missing)
+        search_index.update(ChangeScope((), tuple(unnamed)))
     
-    # Kombiniere die Ergebnisse
-    results.extend(user_results)
+    # Gerankte Treffer aus dem Suchindex (exakt, Präfix, Teilstring, Tippfehler)
+    page = max(1, page)
+    hits, total = search_index.search(event, search_term, limit=FIND_PAGE_SIZE, offset=(page - 1) * FIND_PAGE_SIZE)
     
-    if results:
-        # Erstelle eine Nachricht mit allen Ergebnissen
-        message = f"**🔍 Suchergebnisse für '{search_term}':**\n\n" + "\n".join(results)
-        
-        # Wenn die Nachricht zu lang ist, kürze sie
-        if len(message) > 1900:
-            message = message[:1900] + "...\n(Weitere Ergebnisse wurden abgeschnitten)"
+    results = []
+    for hit in hits:
+        if hit.key[0] == "team":
+            # Alle Einträge des Teams (Anmeldung und Warteliste)
+            team = event.teams.find(hit.key[2])
+            if team:
+                results.append(f"✅ **{team.name}**: {team.size} {'Person' if team.size == 1 else 'Personen'} (Angemeldet, ID: {team.id})")
+            for entry in event.waitlist.entries_for(hit.key[2]):
+                results.append(f"⏳ **{entry.name}**: {entry.size} {'Person' if entry.size == 1 else 'Personen'} (Warteliste Position {event.waitlist.position(entry) + 1}, ID: {entry.team_id})")
+            continue
+        
+        # Zugewiesener Benutzer (Discord-ID -> Team); Name aus dem Profil-Cache
+        user_id = hit.key[1]
+        profile = user_profiles.get(user_id)
+        user_name = profile.name if profile else user_id
+        team_name = user_team_assignments.get(user_id)
+        event_size, waitlist_size, total_size, registered_name, waitlist_entries = get_team_total_size(event, team_name)
         
-        await send_feedback(interaction, message, ephemeral=True)
+        if event_size > 0:
+            results.append(f"👤 **{user_name}** (ID: {user_id}) ist in Team **{team_name}** (Angemeldet, Größe: {total_size})")
+        elif waitlist_size > 0:
+            # Position und wartende Spieler davor (erster Eintrag des Teams)
+            first_entry = waitlist_entries[0]
+            waitlist_position = event.waitlist.position(first_entry) + 1
+            players_ahead = event.waitlist.players_ahead(first_entry)
+            
+            results.append(f"👤 **{user_name}** (ID: {user_id}) ist in Team **{team_name}** (Warteliste Position {waitlist_position}, {players_ahead} Spieler davor, Größe: {total_size})")
+    
+    if results:
+        pages = (total + FIND_PAGE_SIZE - 1) // FIND_PAGE_SIZE
+        header = f"**🔍 Suchergebnisse für '{search_term}' (Seite {page}/{pages}, {total} Treffer):**\n\n"
+        hint = f"\n\nWeitere Treffer mit `/find search_term:{search_term} page:{page + 1}`" if page < pages else ""
+        
+        # Treffer auf Nachrichten mit höchstens 2000 Zeichen verteilen statt abzuschneiden
+        chunks = chunk_lines(results, MESSAGE_LIMIT - len(header) - len(hint))
+        for index, chunk in enumerate(chunks):
+            message = chunk
+            if index == 0:
+                message = header + message
+            if index == len(chunks) - 1:
+                message += hint
+            await send_feedback(interaction, message, ephemeral=True)
+    elif total:
+        await send_feedback(interaction, f"Seite {page} gibt es nicht - die Suche nach '{search_term}' hat {total} Treffer.", ephemeral=True)
     else:
         await send_feedback(
             interaction,
@@ -4305,10 +4062,15 @@ async def find_command(interaction: discord.Interaction, search_term: str):
 
 
 @bot.tree.command(name="export_teams", description="Exportiert die Teamliste als CSV-Datei (nur für Orga-Team)")
-async def export_teams(interaction: discord.Interaction):
+@app_commands.describe(
+    team="Optional - Name oder ID eines einzelnen Teams",
+    event="Event (Standard: zuletzt erstelltes Event)"
+)
+@app_commands.autocomplete(event=event_autocomplete)
+async def export_teams(interaction: discord.Interaction, team: str = None, event: str = None):
     """Exportiert alle Teams als CSV-Datei"""
     # Validiere den Befehlskontext (Rolle, Event)
-    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE)
+    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, event_id=event)
     if not event:
         return
         
@@ -4320,82 +4082,15 @@ async def export_teams(interaction: discord.Interaction):
     csv_file = io.StringIO()
     csv_writer = csv.writer(csv_file)
     
-    # Prüfe, ob das Team-Dictionary das erweiterte Format mit IDs verwendet
-    using_team_ids = False
-    if event["teams"] and isinstance(next(iter(event["teams"].values())), dict):
-        using_team_ids = True
-    
-    # Prüfe, ob die Warteliste das erweiterte Format mit IDs verwendet
-    using_waitlist_ids = False
-    if event["waitlist"] and len(event["waitlist"][0]) > 2:
-        using_waitlist_ids = True
+    csv_writer.writerow(["Typ", "Teamname", "Größe", "Teamleiter-Discord-ID", "Team-ID", "Registrierungsdatum"])
     
-    # Erweiterten Header für das neue Format
-    if using_team_ids or using_waitlist_ids:
-        csv_writer.writerow(["Typ", "Teamname", "Größe", "Teamleiter-Discord-ID", "Team-ID", "Registrierungsdatum"])
-    else:
-        # Standard-Header für das alte Format
-        csv_writer.writerow(["Typ", "Teamname", "Größe", "Teamleiter-Discord-ID", "Registrierungsdatum"])
-    
-    # Schreibe angemeldete Teams
-    if using_team_ids:
-        # Neues Format mit Team-IDs
-        for team_name, data in event["teams"].items():
-            size = data.get("size", 0)
-            team_id = data.get("id", "keine ID")
-            
-            # Finde Team-Leiter (suche ersten Nutzer mit diesem Team)
-            leader_id = "Unbekannt"
-            for user_id, assigned_team in user_team_assignments.items():
-                if assigned_team.lower() == team_name.lower():
-                    leader_id = user_id
-                    break
-            
-            if using_team_ids or using_waitlist_ids:
-                csv_writer.writerow(["Angemeldet", team_name, size, leader_id, team_id, ""])
-            else:
-                csv_writer.writerow(["Angemeldet", team_name, size, leader_id, ""])
-    else:
-        # Altes Format
-        for team_name, size in event["teams"].items():
-            # Finde Team-Leiter (suche ersten Nutzer mit diesem Team)
-            leader_id = "Unbekannt"
-            for user_id, assigned_team in user_team_assignments.items():
-                if assigned_team.lower() == team_name.lower():
-                    leader_id = user_id
-                    break
-            
-            csv_writer.writerow(["Angemeldet", team_name, size, leader_id, ""])
-    
-    # Schreibe Warteliste
-    if using_waitlist_ids:
-        # Neues Format mit Team-IDs
-        for i, entry in enumerate(event["waitlist"]):
-            if len(entry) >= 3:  # Format: (team_name, size, team_id)
-                team_name, size, team_id = entry
-                
-                # Finde Team-Leiter (suche ersten Nutzer mit diesem Team)
-                leader_id = "Unbekannt"
-                for user_id, assigned_team in user_team_assignments.items():
-                    if assigned_team.lower() == team_name.lower():
-                        leader_id = user_id
-                        break
-                
-                if using_team_ids or using_waitlist_ids:
-                    csv_writer.writerow(["Warteliste", team_name, size, leader_id, team_id, ""])
-                else:
-                    csv_writer.writerow(["Warteliste", team_name, size, leader_id, ""])
-    else:
-        # Altes Format
-        for i, (team_name, size) in enumerate(event["waitlist"]):
-            # Finde Team-Leiter (suche ersten Nutzer mit diesem Team)
-            leader_id = "Unbekannt"
-            for user_id, assigned_team in user_team_assignments.items():
-                if assigned_team.lower() == team_name.lower():
-                    leader_id = user_id
-                    break
-            
-            csv_writer.writerow(["Warteliste", team_name, size, leader_id, ""])
+    # Schreibe angemeldete Teams, danach die Warteliste
+    for status, team_name, size, team_id in team_export_rows(event, team):
+        # Team-Leiter (erster zugewiesener Nutzer, aus dem Rückwärtsindex)
+        leader_id = user_team_assignments.leader(team_name) or "Unbekannt"
+        
+        csv_writer.writerow([status, team_name, size, leader_id, team_id, ""])
+
     
     # Zurück zum Anfang der Datei
     csv_file.seek(0)
@@ -4406,14 +4101,14 @@ async def export_teams(interaction: discord.Interaction):
     
     # Log für CSV-Export
     await send_to_log_channel(
-        f"📊 CSV-Export: Admin {interaction.user.name} hat eine CSV-Datei der Teams für Event '{event['name']}' exportiert",
+        f"📊 CSV-Export: Admin {interaction.user.name} hat eine CSV-Datei der Teams für Event '{event.name}' exportiert",
         guild=interaction.guild
     )
     
     # Sende Datei als Anhang
     await send_feedback(
         interaction,
-        f"Hier ist die Teamliste für das Event '{event['name']}':",
+        f"Hier ist die Teamliste für das Event '{event.name}':",
         ephemeral=False,
         embed=None,
         view=None
@@ -4429,20 +4124,23 @@ async def export_teams(interaction: discord.Interaction):
     size="Größe des Teams",
     discord_id="Discord ID des Team-Representatives (optional)",
     discord_name="Discord Name des Team-Representatives (optional)",
-    force_waitlist="Team direkt auf die Warteliste setzen (True/False)"
+    force_waitlist="Team direkt auf die Warteliste setzen (True/False)",
+    event="Event (Standard: zuletzt erstelltes Event)"
 )
+@app_commands.autocomplete(event=event_autocomplete)
 async def add_team_command(
     interaction: discord.Interaction, 
     team_name: str, 
     size: int, 
     discord_id: str = None, 
     discord_name: str = None, 
-    force_waitlist: bool = False
+    force_waitlist: bool = False,
+    event: str = None
 ):
     """Fügt ein Team direkt zum Event oder zur Warteliste hinzu (Admin-Befehl)"""
     
     # Validiere Berechtigungen (nur Organisatoren)
-    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, team_required=False)
+    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, team_required=False, event_id=event)
     if not event:
         return
 
@@ -4459,131 +4157,200 @@ async def add_team_command(
             return
 
     # Team mit der Admin-Funktion hinzufügen
-    success = await admin_add_team(
+    # (Event-Anzeige und Fehlermeldungen übernimmt admin_add_team)
+    await admin_add_team(
         interaction, 
         team_name, 
         size, 
         discord_user_id=discord_user_id, 
         discord_username=discord_name, 
-        force_waitlist=force_waitlist
+        force_waitlist=force_waitlist,
+        event_id=event.id
     )
-    
-    if success:
-        # Event-Anzeige aktualisieren
-        channel = bot.get_channel(channel_id)
-        if channel:
-            await update_event_displays(channel=channel)
-    else:
-        # Fehlermeldung wird bereits von admin_add_team gesendet
-        pass
 
 
 @bot.tree.command(name="admin_team_edit", description="Bearbeitet die Größe eines Teams (nur für Orga-Team)")
 @app_commands.describe(
-    team_name="Name des Teams",
+    team_name="Name oder ID des Teams",
     new_size="Neue Größe des Teams",
-    reason="Grund für die Änderung (optional)"
+    reason="Grund für die Änderung (optional)",
+    event="Event (Standard: zuletzt erstelltes Event)"
 )
-async def admin_team_edit_command(interaction: discord.Interaction, team_name: str, new_size: int, reason: str = None):
+@app_commands.autocomplete(event=event_autocomplete, team_name=team_autocomplete)
+async def admin_team_edit_command(interaction: discord.Interaction, team_name: str, new_size: int, reason: str = None, event: str = None):
     """Bearbeitet die Größe eines Teams (Admin-Befehl)"""
     
     # Validiere Berechtigungen (nur Organisatoren)
-    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, team_required=False)
+    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, team_required=False, event_id=event)
     if not event:
         return
 
-    # Teamgröße mit Admin-Rechten aktualisieren
-    team_name = team_name.strip()
-    success = await update_team_size(interaction, team_name, new_size, is_admin=True, reason=reason)
-    
-    if success:
-        # Event-Anzeige aktualisieren
-        channel = bot.get_channel(channel_id)
-        if channel:
-            await update_event_displays(channel=channel)
-    else:
-        # Fehlermeldung wird bereits von update_team_size gesendet
-        pass
+    # Teamgröße mit Admin-Rechten aktualisieren (Team-IDs werden in den Namen aufgelöst)
+    team_name = resolve_team_reference(event, team_name)
+    # (Event-Anzeige und Fehlermeldungen übernimmt update_team_size)
+    await update_team_size(interaction, team_name, new_size, is_admin=True, reason=reason, event_id=event.id)
 
 
 @bot.tree.command(name="admin_team_remove", description="Entfernt ein Team vom Event oder der Warteliste (nur für Orga-Team)")
 @app_commands.describe(
-    team_name="Name des Teams, das entfernt werden soll"
+    team_name="Name oder ID des Teams, das entfernt werden soll",
+    event="Event (Standard: zuletzt erstelltes Event)"
 )
-async def admin_team_remove_command(interaction: discord.Interaction, team_name: str):
+@app_commands.autocomplete(event=event_autocomplete, team_name=team_autocomplete)
+async def admin_team_remove_command(interaction: discord.Interaction, team_name: str, event: str = None):
     """Entfernt ein Team vom Event oder der Warteliste (Admin-Befehl)"""
     
     # Validiere Berechtigungen (nur Organisatoren)
-    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, team_required=False)
+    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, team_required=False, event_id=event)
     if not event:
         return
 
-    team_name = team_name.strip()
+    team_name = resolve_team_reference(event, team_name)
     
     # Team mit Admin-Rechten abmelden
-    success = await handle_team_unregistration(interaction, team_name, is_admin=True)
+    success = await handle_team_unregistration(interaction, team_name, is_admin=True, event_id=event.id)
     
     if success:
         # Event-Anzeige aktualisieren
         channel = bot.get_channel(channel_id)
         if channel:
-            await update_event_displays(channel=channel)
+            display_refresher.mark(channel.id, event.id)
 
 
 @bot.tree.command(name="admin_waitlist", description="Zeigt die vollständige Warteliste an (nur für Orga-Team)")
-async def admin_waitlist_command(interaction: discord.Interaction):
+@app_commands.describe(event="Event (Standard: zuletzt erstelltes Event)")
+@app_commands.autocomplete(event=event_autocomplete)
+async def admin_waitlist_command(interaction: discord.Interaction, event: str = None):
     """Zeigt die vollständige Warteliste mit Details an (Admin-Befehl)"""
     
     # Validiere Berechtigungen (nur Organisatoren)
-    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, team_required=False)
+    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, team_required=False, event_id=event)
     if not event:
         return
     
     # Keine Warteliste vorhanden
-    if not event.get('waitlist', []):
+    if not event.waitlist:
         await send_feedback(
             interaction,
             "Es sind aktuell keine Teams auf der Warteliste."
         )
         return
     
-    # Warteliste formatieren
-    waitlist_str = "## 📋 Warteliste\n\n"
-    for idx, entry in enumerate(event['waitlist']):
-        # Prüfe das Format der Wartelisten-Einträge
-        if isinstance(entry, dict):
-            # Dictionary-Format (neues Format)
-            team_name = entry.get('team_name', 'Unbekannt')
-            size = entry.get('size', 0)
-            team_id = entry.get('team_id', 'N/A')
-            waitlist_str += f"**{idx+1}.** {team_name} ({size} Spieler, Team-ID: {team_id})\n"
-        elif isinstance(entry, tuple) and len(entry) >= 3:
-            # Tupel-Format mit Team-ID (team_name, size, team_id)
-            team_name, size, team_id = entry
-            waitlist_str += f"**{idx+1}.** {team_name} ({size} Spieler, Team-ID: {team_id})\n"
-        elif isinstance(entry, tuple) and len(entry) >= 2:
-            # Tupel-Format ohne Team-ID (team_name, size)
-            team_name, size = entry[:2]
-            waitlist_str += f"**{idx+1}.** {team_name} ({size} Spieler)\n"
-        else:
-            # Unbekanntes Format
-            waitlist_str += f"**{idx+1}.** {entry} (Format nicht erkannt)\n"
-    
-    # Warteliste als Embed senden
-    embed = discord.Embed(
-        title=f"Warteliste für {event['name']}",
-        description=waitlist_str,
-        color=discord.Color.orange()
+    # Warteliste seitenweise aus dem Render-Cache (nur nach Änderungen am Event neu erstellt)
+    await send_pages(
+        interaction,
+        "Hier ist die vollständige Warteliste:",
+        lambda page: render_waitlist(event, page),
+        lambda: page_count(event, "waitlist_pages", waitlist_pages),
+        title="Warteliste"
     )
+
+
+@bot.tree.command(name="admin_allocation_policy", description="Legt fest, wie Teams von der Warteliste nachrücken (nur für Orga-Team)")
+@app_commands.describe(
+    policy="Vergabestrategie für freie Plätze",
+    event="Event (Standard: zuletzt erstelltes Event)"
+)
+@app_commands.choices(policy=[app_commands.Choice(name=label, value=name) for name, (label, _) in POLICIES.items()])
+@app_commands.autocomplete(event=event_autocomplete)
+async def admin_allocation_policy_command(interaction: discord.Interaction, policy: str, event: str = None):
+    """Setzt die Vergabestrategie der Warteliste für ein Event (Admin-Befehl)"""
     
-    embed.set_footer(text=f"Insgesamt {len(event['waitlist'])} Teams auf der Warteliste")
+    # Validiere Berechtigungen (nur Organisatoren)
+    event, _ = await validate_command_context(interaction, required_role=ORGANIZER_ROLE, team_required=False, event_id=event)
+    if not event:
+        return
     
-    await send_feedback(
-        interaction,
-        "Hier ist die vollständige Warteliste:",
-        ephemeral=True,
-        embed=embed
+    def apply(outbox):
+        old_policy = event.allocation_policy
+        event.allocation_policy = policy
+    
+        outbox.send(send_to_log_channel(
+            f"⚙️ Vergabestrategie: Admin {interaction.user.name} hat die Vergabestrategie für Event '{event.name}' von {old_policy} auf {policy} geändert",
+            guild=interaction.guild
+        ))
+        outbox.send(send_feedback(
+            interaction,
+            f"Die Vergabestrategie für '{event.name}' ist jetzt: {POLICIES[policy][0]}.",
+            ephemeral=True
+        ))
+    
+        # Mit der neuen Strategie können eventuell sofort Teams nachrücken
+        queue_promotions(event, outbox, interaction, refresh=True)
+    
+    await command_queue.submit(event.id, "admin_allocation_policy", apply)
+
+
+@bot.tree.command(name="admin_queue_stats", description="Zeigt die Kennzahlen der Command-Warteschlange an (nur für Orga-Team)")
+async def admin_queue_stats_command(interaction: discord.Interaction):
+    """Zeigt Stapelgrößen und Wartezeiten der Command-Warteschlange an (Admin-Befehl)"""
+    
+    # Validiere Berechtigungen (nur Organisatoren)
+    if not has_role(interaction.user, ORGANIZER_ROLE):
+        await send_feedback(
+            interaction,
+            f"Du benötigst die Rolle '{ORGANIZER_ROLE}', um diesen Befehl zu nutzen.",
+            ephemeral=True
+        )
+        return
+    
+    lines = []
+    for event_id, stats in command_queue.event_stats.items():
+        event = get_event(event_id) if event_id else None
+        label = event.name if event else (event_id or "Ohne Event")
+        wait_avg = stats["wait_total"] / stats["commands"] if stats["commands"] else 0.0
+        lines.append(
+            f"**{label}**: {stats['commands']} Änderungen, "
+            f"Ø {wait_avg * 1000:.1f} ms / max. {stats['wait_max'] * 1000:.1f} ms gewartet"
+        )
+    
+    stats = command_queue.stats
+    applied = stats["submitted"] - command_queue.pending
+    embed = discord.Embed(
+        title="📥 Command-Warteschlange",
+        description="\n".join(lines) or "Seit dem Start wurden keine Änderungen vorgenommen.",
+        color=discord.Color.blue()
+    )
+    embed.add_field(
+        name="Stapel",
+        value=(
+            f"{applied} Änderungen in {stats['batches']} Stapeln "
+            f"({stats['batches'] - stats['unchanged']} gespeichert, {stats['unchanged']} ohne Änderung), "
+            f"größter Stapel: {stats['largest_batch']}, fehlgeschlagen: {stats['failed']}"
+        ),
+        inline=False
+    )
+    embed.add_field(
+        name="Anzeige",
+        value=(
+            f"{stats['coalesced_refreshes']} im Stapel zusammengefasst, "
+            f"{display_refresher.stats['refreshes']} gerendert, {display_refresher.stats['skipped']} übersprungen "
+            f"(max. alle {display_refresher.interval:g} s je Kanal), {display_refresher.pending} ausstehend\n"
+            f"Render-Cache: {render_cache.stats['hits']} Treffer, {render_cache.stats['misses']} neu gerendert, "
+            f"{render_cache.stats['invalidated']} verworfen"
+        ),
+        inline=False
+    )
+    outbound = get_outbound()
+    depths = ", ".join(f"{name}: {count}" for name, count in outbound.depths().items())
+    embed.add_field(
+        name="Ausgehende Nachrichten",
+        value=(
+            f"Wartend - {depths}\n"
+            f"{outbound.stats['sent']} gesendet, {outbound.stats['merged']} zusammengefasst, "
+            f"{outbound.stats['throttled']}× gebremst, fehlgeschlagen: {outbound.stats['failed']}, "
+            f"max. Wartezeit {outbound.stats['wait_max'] * 1000:.0f} ms"
+        ),
+        inline=False
     )
+    wait_avg = stats["wait_total"] / applied if applied else 0.0
+    apply_avg = stats["apply_total"] / applied if applied else 0.0
+    embed.set_footer(
+        text=f"Wartezeit Ø {wait_avg * 1000:.1f} ms, max. {stats['wait_max'] * 1000:.1f} ms · "
+             f"Anwenden Ø {apply_avg * 1000:.2f} ms, max. {stats['apply_max'] * 1000:.2f} ms"
+    )
+    
+    await send_feedback(interaction, "", ephemeral=True, embed=embed)
 
 
 @bot.tree.command(name="admin_user_assignments", description="Zeigt alle Benutzer-Team-Zuweisungen an (nur für Orga-Team)")
@@ -4605,41 +4372,38 @@ async def admin_user_assignments_command(interaction: discord.Interaction):
         )
         return
     
-    # Zuweisungen formatieren
-    assignments_str = "## 👥 Benutzer-Team-Zuweisungen\n\n"
-    
-    # Nach Teams gruppieren
-    team_users = {}
-    for user_id, team_name in user_team_assignments.items():
-        if team_name not in team_users:
-            team_users[team_name] = []
-        
-        # Versuche den Benutzer zu holen
-        user = interaction.guild.get_member(int(user_id))
-        user_display = f"<@{user_id}> ({user.display_name if user else 'Unbekannt'})"
-        team_users[team_name].append(user_display)
-    
-    # Sortiere Teams alphabetisch
-    for team_name in sorted(team_users.keys()):
-        assignments_str += f"**{team_name}**:\n"
-        for user_entry in team_users[team_name]:
-            assignments_str += f"- {user_entry}\n"
-        assignments_str += "\n"
-    
-    # Zuweisungen als Embed senden
-    embed = discord.Embed(
-        title="Benutzer-Team-Zuweisungen",
-        description=assignments_str,
-        color=discord.Color.blue()
-    )
-    
-    embed.set_footer(text=f"Insgesamt {len(user_team_assignments)} Benutzer-Zuweisungen")
+    # Zuweisungen als Zeilen, nach Teams gruppiert (Rückwärtsindex), Teams alphabetisch sortiert
+    lines = []
+    for team_name, user_ids in sorted(user_team_assignments.teams()):
+        lines.append(f"**{team_name}**:")
+        for user_id in user_ids:
+            # Versuche den Benutzer zu holen
+            user = interaction.guild.get_member(int(user_id))
+            lines.append(f"- <@{user_id}> ({user.display_name if user else 'Unbekannt'})")
+        lines.append("")
+    
+    # Vorab in Seiten aufteilen (Beschreibung höchstens 4096 Zeichen); Embeds erst beim Anzeigen
+    pages = chunk_lines(lines, DESCRIPTION_LIMIT - 100)
+    total = len(user_team_assignments)
+    
+    def render(page):
+        embed = discord.Embed(
+            title="Benutzer-Team-Zuweisungen",
+            description=f"## 👥 Benutzer-Team-Zuweisungen\n\n{pages[page]}",
+            color=discord.Color.blue()
+        )
+        footer = f"Insgesamt {total} Benutzer-Zuweisungen"
+        if len(pages) > 1:
+            footer = f"Seite {page + 1}/{len(pages)} · {footer}"
+        embed.set_footer(text=footer)
+        return embed
     
-    await send_feedback(
+    await send_pages(
         interaction,
         "Hier sind alle Benutzer-Team-Zuweisungen:",
-        ephemeral=True,
-        embed=embed
+        render,
+        lambda: len(pages),
+        title="Zuweisungen"
     )
 
 
@@ -4768,6 +4532,7 @@ async def admin_help_command(interaction: discord.Interaction):
             "• `/admin_add_team` - Fügt ein Team direkt zum Event oder zur Warteliste hinzu\n"
             "• `/admin_team_edit` - Bearbeitet die Größe eines Teams\n"
             "• `/admin_team_remove` - Entfernt ein Team vom Event oder der Warteliste\n"
+            "• `/admin_allocation_policy` - Legt fest, wie Teams von der Warteliste nachrücken\n"
             "• `/reset_team_assignment` - Setzt die Team-Zuweisung eines Nutzers zurück"
         ),
         inline=False
@@ -4778,6 +4543,7 @@ async def admin_help_command(interaction: discord.Interaction):
         name="Informationen & Tools",
         value=(
             "• `/admin_waitlist` - Zeigt die vollständige Warteliste mit Details an\n"
+            "• `/admin_queue_stats` - Zeigt Stapel und Wartezeiten der Command-Warteschlange an\n"
             "• `/admin_user_assignments` - Zeigt alle Benutzer-Team-Zuweisungen an\n"
             "• `/admin_get_user_id` - Gibt die Discord ID eines Benutzers zurück\n"
             "• `/export_csv` oder `/export_teams` - Exportiert die Teams als CSV-Datei\n"
@@ -5154,12 +4920,18 @@ async def test_command(interaction: discord.Interaction):
                         logger.error(f"Test-Fehlermeldung: {result.stderr}")
                 return result.stdout
         
-        # Stelle globale Variablen für die Daten-Wiederherstellung sicher
-        global event_data, user_team_assignments, channel_id
+        # Sichern der aktuellen Daten als Transaktion über alle Events (ohne tiefe Kopie);
+        # Sichern und Wiederherstellen laufen als Commands im Schreiber
+        snapshot = await command_queue.submit(
+            None, "test_snapshot", lambda outbox: ChangeSet(event_data, user_team_assignments).touch_all()
+        )
         
-        # Sichern der aktuellen Daten
-        event_data_backup = copy.deepcopy(event_data)
-        user_team_assignments_backup = copy.deepcopy(user_team_assignments)
+        def restore_snapshot(outbox):
+            # Alle Events in die Transaktion des Commands aufnehmen, damit genau die
+            # zurückgesetzten Teile gespeichert werden
+            command_queue.changes.touch_all()
+            snapshot.rollback()
+            outbox.send(flush_data())
         
         # Umleitung der stdout in eine StringIO, um die Ausgabe zu erfassen
         original_stdout = sys.stdout
@@ -5221,11 +4993,7 @@ async def test_command(interaction: discord.Interaction):
         finally:
             # Zurücksetzen von stdout und Wiederherstellung der ursprünglichen Daten
             sys.stdout = original_stdout
-            event_data = event_data_backup
-            user_team_assignments = user_team_assignments_backup
-            
-            # Speichere die ursprünglichen Daten
-            save_data(event_data, channel_id, user_team_assignments)
+            await command_queue.submit(None, "test_restore", restore_snapshot)
     
     except Exception as e:
         # Allgemeine Fehlerbehandlung
@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 """
 Diagnostisches Tool zur Überprüfung der Datenstruktur in der event_data.pkl-Datei.
-Dieses Skript liest die aktuelle Datenstruktur und gibt Details zum Event aus.
+Dieses Skript liest die aktuelle Datenstruktur und gibt Details zu allen Events aus.
 """
 
-import pickle
+import os
 import json
 import argparse
 
-def check_data(pkl_file='event_data.pkl', json_output=False, detailed=False):
+from storage import read_state, read_sqlite_state, generation_files
+
+def check_data(pkl_file='event_data.pkl', json_output=False, detailed=False, journal_file='event_data.journal', db_file=None):
     """
     Prüft und zeigt die Inhalte der event_data.pkl-Datei an.
     
@@ -16,11 +18,21 @@ def check_data(pkl_file='event_data.pkl', json_output=False, detailed=False):
     - pkl_file: Pfad zur Pickle-Datei (Default: 'event_data.pkl')
     - json_output: Ob die Ausgabe im JSON-Format erfolgen soll (für Scripting, Default: False)
     - detailed: Ob detaillierte Informationen angezeigt werden sollen (Default: False)
+    - journal_file: Pfad zur Journal-Datei, deren Änderungen auf den Snapshot angewendet werden (Default: 'event_data.journal')
+    - db_file: Optional - Pfad zur SQLite-Datenbank; wird statt Snapshot/Journal gelesen (auch während der Bot läuft)
     """
     try:
-        # Lade die Daten
-        with open(pkl_file, 'rb') as f:
-            data = pickle.load(f)
+        if db_file:
+            # Lade die Daten aus der SQLite-Datenbank (schreibgeschützt)
+            pkl_file = db_file
+            data = read_sqlite_state(db_file)
+            journal_info = {"replayed_frames": 0, "replayed_records": 0, "torn_bytes": 0}
+        else:
+            # Lade die Daten (Snapshot + Journal)
+            candidates = generation_files(pkl_file) + ([journal_file] if journal_file else [])
+            if not any(os.path.exists(path) for path in candidates):
+                raise FileNotFoundError(pkl_file)
+            data, journal_info = read_state(pkl_file, journal_file)
         
         # Basis-Datenstruktur
         result = {
@@ -28,53 +40,47 @@ def check_data(pkl_file='event_data.pkl', json_output=False, detailed=False):
             "data_structure": {
                 "keys": list(data.keys()),
                 "types": {k: str(type(v).__name__) for k, v in data.items()}
-            }
+            },
+            "journal": {
+                "replayed_frames": journal_info["replayed_frames"],
+                "replayed_records": journal_info["replayed_records"],
+                "torn_bytes": journal_info["torn_bytes"]
+            },
+            "recovery": journal_info.get("report", []),
+            "migrated": journal_info.get("migrated", 0)
         }
         
-        # Event-Daten
-        event_data = data.get('event_data', {})
-        if event_data:
-            event = event_data.get('event', {})
-            if event:
-                result["event"] = {
-                    "name": event.get('name'),
-                    "date": event.get('date'),
-                    "time": event.get('time'),
-                    "description": event.get('description', 'keine')[:30] + '...' if detailed else '...',
-                    "teams_count": len(event.get('teams', {})),
-                    "waitlist_count": len(event.get('waitlist', [])),
-                    "max_slots": event.get('max_slots', 0),
-                    "slots_used": event.get('slots_used', 0),
-                    "max_team_size": event.get('max_team_size', 0),
-                    "is_closed": event.get('is_closed', False)
-                }
-                
-                # Detaillierte Teamliste, wenn angefordert
-                if detailed:
-                    result["event"]["teams"] = {}
-                    for team_name, team_data in event.get('teams', {}).items():
-                        if isinstance(team_data, dict):
-                            result["event"]["teams"][team_name] = team_data
-                        else:
-                            result["event"]["teams"][team_name] = {"size": team_data}
-                    
-                    result["event"]["waitlist"] = []
-                    for entry in event.get('waitlist', []):
-                        if len(entry) >= 3:  # Neues Format: (team_name, size, team_id)
-                            result["event"]["waitlist"].append({
-                                "team_name": entry[0],
-                                "size": entry[1],
-                                "team_id": entry[2]
-                            })
-                        else:  # Altes Format: (team_name, size)
-                            result["event"]["waitlist"].append({
-                                "team_name": entry[0],
-                                "size": entry[1]
-                            })
-            else:
-                result["event"] = None
-        else:
-            result["event"] = None
+        # Event-Daten (alle gleichzeitig aktiven Events, Schlüssel ist die Event-ID)
+        result["events"] = []
+        for event_id, event in data.get('event_data', {}).items():
+            if not event:
+                continue
+            summary = {
+                "id": event_id,
+                "name": event.get('name'),
+                "date": event.get('date'),
+                "time": event.get('time'),
+                "description": event.get('description', 'keine')[:30] + '...' if detailed else '...',
+                "teams_count": len(event.get('teams', {})),
+                "waitlist_count": len(event.get('waitlist', [])),
+                "max_slots": event.get('max_slots', 0),
+                "slots_used": event.get('slots_used', 0),
+                "max_team_size": event.get('max_team_size', 0),
+                "is_closed": event.get('is_closed', False)
+            }
+            
+            # Detaillierte Teamliste, wenn angefordert
+            if detailed:
+                # Alte Layouts wurden beim Laden bereits migriert (nur im Speicher)
+                summary["teams"] = dict(event.get('teams', {}))
+                summary["waitlist"] = [
+                    {"team_name": team_name, "size": size, "team_id": team_id}
+                    for team_name, size, team_id in event.get('waitlist', [])
+                ]
+            result["events"].append(summary)
+        
+        # Zuletzt erstelltes Event (Standard-Event des Bots)
+        result["event"] = result["events"][-1] if result["events"] else None
         
         # Kanal-ID
         result["channel_id"] = data.get('channel_id')
@@ -95,35 +101,44 @@ def check_data(pkl_file='event_data.pkl', json_output=False, detailed=False):
             print(f"- Keys: {', '.join(result['data_structure']['keys'])}")
             for k, v in result['data_structure']['types'].items():
                 print(f"- {k}: {v}")
+            if not db_file:
+                print(f"- Journal: {result['journal']['replayed_frames']} Einträge mit {result['journal']['replayed_records']} Änderungen angewendet")
+            if result['journal']['torn_bytes']:
+                print(f"- Journal: {result['journal']['torn_bytes']} Bytes unvollständiger Eintrag am Ende ignoriert")
+            for message in result['recovery']:
+                print(f"- Wiederherstellung: {message}")
+            if result['migrated']:
+                print(f"- Migration: {result['migrated']} Einträge im älteren Datenlayout (werden beim nächsten Bot-Start umgeschrieben)")
             
-            print("\nEvent-Daten:")
-            if result["event"]:
-                print(f"- Name: {result['event']['name']}")
-                print(f"- Datum: {result['event']['date']}")
-                print(f"- Uhrzeit: {result['event']['time']}")
-                print(f"- Beschreibung: {result['event']['description']}")
-                print(f"- Teams: {result['event']['teams_count']}")
-                print(f"- Warteliste: {result['event']['waitlist_count']}")
-                print(f"- Max. Slots: {result['event']['max_slots']}")
-                print(f"- Belegte Slots: {result['event']['slots_used']}")
-                print(f"- Max. Teamgröße: {result['event']['max_team_size']}")
-                print(f"- Geschlossen: {result['event']['is_closed']}")
+            print(f"\nEvent-Daten ({len(result['events'])} Events):")
+            for event in result["events"]:
+                print(f"\n- ID: {event['id']}")
+                print(f"- Name: {event['name']}")
+                print(f"- Datum: {event['date']}")
+                print(f"- Uhrzeit: {event['time']}")
+                print(f"- Beschreibung: {event['description']}")
+                print(f"- Teams: {event['teams_count']}")
+                print(f"- Warteliste: {event['waitlist_count']}")
+                print(f"- Max. Slots: {event['max_slots']}")
+                print(f"- Belegte Slots: {event['slots_used']}")
+                print(f"- Max. Teamgröße: {event['max_team_size']}")
+                print(f"- Geschlossen: {event['is_closed']}")
                 
-                if detailed and result["event"]["teams"]:
+                if detailed and event["teams"]:
                     print("\nTeams:")
-                    for team_name, team_data in result["event"]["teams"].items():
+                    for team_name, team_data in event["teams"].items():
                         size = team_data.get("size", "?")
                         team_id = team_data.get("id", "keine ID")
                         print(f"  - {team_name} (Größe: {size}, ID: {team_id})")
                 
-                if detailed and result["event"]["waitlist"]:
+                if detailed and event["waitlist"]:
                     print("\nWarteliste:")
-                    for i, entry in enumerate(result["event"]["waitlist"]):
+                    for i, entry in enumerate(event["waitlist"]):
                         team_name = entry.get("team_name", "?")
                         size = entry.get("size", "?")
                         team_id = entry.get("team_id", "keine ID")
                         print(f"  {i+1}. {team_name} (Größe: {size}, ID: {team_id})")
-            else:
+            if not result["events"]:
                 print("Kein aktives Event gefunden.")
             
             print(f"\nKanal-ID: {result['channel_id']}")
@@ -158,8 +173,10 @@ if __name__ == "__main__":
     # Kommandozeilenparameter
     parser = argparse.ArgumentParser(description='Prüft die Datenstruktur der event_data.pkl-Datei.')
     parser.add_argument('--file', default='event_data.pkl', help='Pfad zur Pickle-Datei')
+    parser.add_argument('--journal', default='event_data.journal', help='Pfad zur Journal-Datei')
+    parser.add_argument('--db', default=None, help='Pfad zur SQLite-Datenbank (STORAGE_BACKEND=sqlite)')
     parser.add_argument('--json', action='store_true', help='Ausgabe im JSON-Format')
     parser.add_argument('--detailed', action='store_true', help='Zeigt detaillierte Informationen an')
     
     args = parser.parse_args()
-    check_data(args.file, args.json, args.detailed)
\ No newline at end of file
+    check_data(args.file, args.json, args.detailed, args.journal, args.db)
\ No newline at end of file
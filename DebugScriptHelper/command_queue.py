@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Ein einziger Schreiber für alle Zustandsänderungen.
+
+Alle ändernden Befehle (/reg, /unregister, /edit, Admin-Befehle, open_reg,
+close/open, Ablauf, Nachrücken) werden als Command an die CommandQueue
+übergeben. Ein Schreiber-Task arbeitet die Warteschlange in Stapeln ab: alle
+wartenden Commands werden in Reihenfolge angewendet, danach wird einmal
+gespeichert und jeder Aufrufer erhält sein Ergebnis über ein Future. Da nur
+der Schreiber den Zustand ändert, sind die Änderungen ohne Sperren
+serialisierbar.
+
+Ein Command ist eine synchrone Funktion apply(outbox): Sie prüft und ändert
+den Zustand ohne Discord-Kommunikation. Antworten, Log-Nachrichten und DMs
+legt sie in die Outbox, die der Aufrufer nach dem Speichern ausliefert.
+Veraltete Event-Anzeigen (Outbox.refresh) werden je Stapel zusammengefasst
+und nach dem Speichern einmal an die Anzeige-Aktualisierung übergeben
+(siehe refresh.py).
+
+Jeder Command läuft in einer eigenen Transaktion (siehe transaction.py):
+Bricht apply() mit einer Ausnahme ab, werden seine Änderungen zurückgesetzt
+und die Outbox verworfen. Die ChangeScopes der erfolgreichen Commands werden
+zusammengeführt und beim Speichern übergeben, sodass nur die angefassten
+Events und Zuweisungen verglichen werden.
+
+Wartezeit (Einreihen bis Anwenden), Anwendungsdauer und Stapelgrößen werden
+gemessen (CommandQueue.stats), auffällig lange Wartezeiten werden geloggt.
+
+Dieses Modul hat keine Abhängigkeiten zu discord oder config.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, NamedTuple
+
+from transaction import EMPTY_SCOPE
+
+logger = logging.getLogger("event_bot.commands")
+
+class Outbox:
+    """Sammelt die Discord-Aufrufe eines Commands bis nach dem Speichern des Stapels"""
+
+    def __init__(self):
+        self._pending = []
+        self._refreshes = {}  # {Schlüssel: None} - veraltete Anzeigen in Reihenfolge
+
+    def send(self, coroutine):
+        """
+        Reiht einen Aufruf ein, den der Aufrufer nach dem Speichern ausführt
+
+        Parameters:
+        - coroutine: Noch nicht gestartete Coroutine (z.B. interaction.response.send_message(...))
+        """
+        self._pending.append(coroutine)
+
+    def refresh(self, key):
+        """
+        Markiert eine Event-Anzeige als veraltet
+
+        Pro Stapel wird jeder Schlüssel nur einmal weitergegeben.
+
+        Parameters:
+        - key: Schlüssel der Anzeige (z.B. (channel_id, event_id))
+        """
+        self._refreshes[key] = None
+
+    def take_refreshes(self):
+        """Entnimmt die markierten Anzeigen als Liste von Schlüsseln"""
+        refreshes, self._refreshes = list(self._refreshes), {}
+        return refreshes
+
+    def discard(self):
+        """Verwirft alle gesammelten Aufrufe (z.B. wenn der Command fehlgeschlagen ist)"""
+        for coroutine in self._pending:
+            coroutine.close()
+        self._pending.clear()
+        self._refreshes.clear()
+
+    async def deliver(self):
+        """Führt alle gesammelten Aufrufe in Reihenfolge aus; Fehler einzelner Aufrufe werden geloggt"""
+        pending, self._pending = self._pending, []
+        for coroutine in pending:
+            try:
+                await coroutine
+            except Exception as e:
+                logger.error(f"Fehler beim Senden nach einer Zustandsänderung: {e}")
+
+class Command(NamedTuple):
+    """Eine eingereihte Zustandsänderung"""
+    event_id: Any  # Betroffenes Event (nur für Kennzahlen und Log)
+    operation: str  # Bezeichnung für das Log
+    apply: Callable  # apply(outbox) -> Ergebnis
+    future: asyncio.Future
+    queued: float  # Zeitpunkt des Einreihens (time.perf_counter)
+
+class CommandQueue:
+    """
+    Warteschlange mit einem Schreiber-Task, der Commands stapelweise anwendet
+
+    Der Schreiber wird beim ersten submit() auf dem laufenden Event-Loop gestartet.
+    """
+
+    def __init__(self, persist, begin=None, refresh=None, warn_after=0.5, max_batch=100):
+        """
+        Parameters:
+        - persist: Funktion persist(scope), die den Zustand einmal pro Stapel speichert
+          (scope: zusammengeführter ChangeScope oder None ohne Transaktionen; Stapel
+          ohne Änderung werden nicht gespeichert)
+        - begin: Optional - Funktion begin(event_id), die das ChangeSet eines Commands
+          erstellt (ohne begin laufen Commands ohne Transaktion)
+        - refresh: Optional - Funktion refresh(key), die nach dem Speichern je markierter
+          Anzeige eines Stapels einmal aufgerufen wird
+        - warn_after: Wartezeit in Sekunden, ab der eine Warnung geloggt wird
+        - max_batch: Maximale Anzahl Commands pro Stapel
+        """
+        self.persist = persist
+        self.begin = begin
+        self.refresh = refresh
+        self.changes = None  # ChangeSet des gerade angewendeten Commands (nur innerhalb von apply)
+        self.warn_after = warn_after
+        self.max_batch = max(1, max_batch)
+        self._queue = asyncio.Queue()
+        self._task = None
+        self.stats = {
+            "submitted": 0,  # Eingereihte Commands
+            "failed": 0,  # Commands, die mit einer Ausnahme abgebrochen sind (zurückgesetzt)
+            "batches": 0,  # Angewendete Stapel
+            "unchanged": 0,  # Stapel ohne Änderung (nicht gespeichert)
+            "largest_batch": 0,  # Größter Stapel
+            "refreshes": 0,  # Weitergegebene Anzeige-Markierungen
+            "coalesced_refreshes": 0,  # Innerhalb eines Stapels zusammengefasste Markierungen
+            "wait_total": 0.0,  # Summe der Wartezeiten in Sekunden
+            "wait_max": 0.0,  # Längste Wartezeit in Sekunden
+            "apply_total": 0.0,  # Summe der Anwendungsdauer in Sekunden
+            "apply_max": 0.0  # Längste Anwendungsdauer in Sekunden
+        }
+        self.event_stats = {}  # {event_id: {"commands", "wait_total", "wait_max"}}
+
+    @property
+    def pending(self):
+        """Anzahl der eingereihten, noch nicht angewendeten Commands"""
+        return self._queue.qsize()
+
+    def start(self):
+        """Startet den Schreiber-Task, falls er noch nicht läuft"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, event_id, operation, apply):
+        """
+        Reiht einen Command ein, wartet auf sein Ergebnis und liefert danach die Outbox aus
+
+        Parameters:
+        - event_id: ID des betroffenen Events
+        - operation: Bezeichnung der Änderung für das Log
+        - apply: Synchrone Funktion apply(outbox), die prüft und ändert
+
+        Returns:
+        - Rückgabewert von apply (Ausnahmen aus apply werden weitergereicht)
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(Command(event_id, operation, apply, future, time.perf_counter()))
+        self.stats["submitted"] += 1
+        result, outbox = await future
+        await outbox.deliver()
+        return result
+
+    async def _run(self):
+        """Schreiber-Task: entnimmt alle wartenden Commands und wendet sie als Stapel an"""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                self._apply_batch(batch)
+            except Exception as e:
+                logger.error(f"Fehler im Schreiber-Task: {e}")
+
+    def _apply_batch(self, batch):
+        """Wendet einen Stapel an, speichert einmal und gibt die Ergebnisse zurück"""
+        results = []
+        refreshes = {}  # {Schlüssel: None}
+        scope = EMPTY_SCOPE if self.begin is not None else None
+        for command in batch:
+            started = time.perf_counter()
+            outbox = Outbox()
+            changes = self.begin(command.event_id) if self.begin is not None else None
+            self.changes = changes
+            try:
+                result = command.apply(outbox)
+            except Exception as e:
+                if changes is not None:
+                    changes.rollback()
+                outbox.discard()
+                self.stats["failed"] += 1
+                logger.error(f"Event '{command.event_id}': {command.operation} fehlgeschlagen und zurückgesetzt: {e}")
+                results.append((command, e, None))
+            else:
+                if changes is not None:
+                    scope = scope.merge(changes.commit())
+                results.append((command, result, outbox))
+                for key in outbox.take_refreshes():
+                    if key in refreshes:
+                        self.stats["coalesced_refreshes"] += 1
+                    refreshes[key] = None
+            finally:
+                self.changes = None
+            self._record(command, started - command.queued, time.perf_counter() - started)
+
+        self.stats["batches"] += 1
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        # Stapel ohne tatsächliche Änderung (z.B. abgelehnte Commands) nicht speichern
+        if scope != EMPTY_SCOPE:
+            try:
+                self.persist(scope)
+            except Exception as e:
+                logger.error(f"Fehler beim Speichern des Stapels: {e}")
+        else:
+            self.stats["unchanged"] += 1
+
+        for command, result, outbox in results:
+            if command.future.cancelled():
+                if outbox is not None:
+                    outbox.discard()
+            elif outbox is None:
+                command.future.set_exception(result)
+            else:
+                command.future.set_result((result, outbox))
+
+        if refreshes and self.refresh is not None:
+            self.stats["refreshes"] += len(refreshes)
+            for key in refreshes:
+                try:
+                    self.refresh(key)
+                except Exception as e:
+                    logger.error(f"Fehler beim Markieren der Event-Anzeige {key}: {e}")
+
+    def _record(self, command, wait, duration):
+        """Erfasst die Kennzahlen eines angewendeten Commands"""
+        stats = self.stats
+        stats["wait_total"] += wait
+        stats["wait_max"] = max(stats["wait_max"], wait)
+        stats["apply_total"] += duration
+        stats["apply_max"] = max(stats["apply_max"], duration)
+        event_stats = self.event_stats.setdefault(command.event_id, {"commands": 0, "wait_total": 0.0, "wait_max": 0.0})
+        event_stats["commands"] += 1
+        event_stats["wait_total"] += wait
+        event_stats["wait_max"] = max(event_stats["wait_max"], wait)
+        if wait >= self.warn_after:
+            logger.warning(f"Event '{command.event_id}': {command.operation} hat {wait * 1000:.0f} ms in der Warteschlange gewartet")
+
+    def forget(self, event_id):
+        """Entfernt die Kennzahlen eines gelöschten Events"""
+        self.event_stats.pop(event_id, None)
+
+    async def close(self):
+        """Wendet noch wartende Commands an und beendet den Schreiber-Task"""
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            self._apply_batch(batch)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info(
+            f"Schreiber beendet: {self.stats['submitted']} Commands in {self.stats['batches']} Stapeln, "
+            f"{self.stats['coalesced_refreshes']} Anzeige-Aktualisierungen eingespart, "
+            f"max. Wartezeit {self.stats['wait_max'] * 1000:.1f} ms"
+        )
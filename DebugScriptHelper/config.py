@@ -35,11 +35,29 @@ CLAN_REP_ROLE = "Clan-Rep"  # Rolle für Clan-Repräsentanten
 # Datei für die Pickle-Datenspeicherung (für die Legacy Bot-Version)
 SAVE_FILE = "event_data.pkl"
 
+# Speicher-Backend: "journal" (Snapshot + Änderungsjournal), "sqlite" (Datenbank im WAL-Modus) oder "pickle" (kompletter Snapshot bei jeder Änderung)
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'journal').lower()
+JOURNAL_FILE = "event_data.journal"  # Append-only-Journal mit den Änderungen seit dem letzten Snapshot
+JOURNAL_COMPACT_INTERVAL = 200  # Nach so vielen Journal-Einträgen wird ein neuer Snapshot geschrieben
+DATABASE_FILE = "event_data.db"  # SQLite-Datenbank für STORAGE_BACKEND=sqlite
+SNAPSHOT_GENERATIONS = 3  # Anzahl aufbewahrter Snapshot-Generationen (event_data.pkl, .1, .2) für den Rückgriff beim Laden
+SAVE_COALESCE_WINDOW = float(os.environ.get('SAVE_COALESCE_WINDOW', '1.0'))  # Sekunden, in denen Änderungen zu einem Schreibvorgang zusammengefasst werden
+
 # Event-Konfiguration
 DEFAULT_MAX_SLOTS = 96  # Maximale Anzahl der Teilnehmer pro Event
 DEFAULT_MAX_TEAM_SIZE = 9  # Maximale Größe eines Teams
 EXPANDED_MAX_TEAM_SIZE = 18  # Erhöhte maximale Teamgröße nach /open_reg
 WAITLIST_CHECK_INTERVAL = 60  # Überprüfungsintervall der Warteliste in Sekunden
+COMMAND_WAIT_WARNING = float(os.environ.get('COMMAND_WAIT_WARNING', '0.5'))  # Sekunden Wartezeit eines Commands in der Warteschlange, ab der eine Warnung geloggt wird
+DISPLAY_REFRESH_INTERVAL = float(os.environ.get('DISPLAY_REFRESH_INTERVAL', '2.0'))  # Mindestabstand in Sekunden zwischen zwei Aktualisierungen der Event-Anzeigen eines Kanals
+OUTBOUND_ROUTE_LIMIT = 5  # Nachrichten je Kanal bzw. DM-Empfänger und OUTBOUND_ROUTE_PERIOD
+OUTBOUND_ROUTE_PERIOD = 5.0  # Zeitraum der Kanal-Begrenzung in Sekunden
+OUTBOUND_GLOBAL_LIMIT = 50  # Ausgehende Discord-Aufrufe insgesamt je Sekunde
+USER_PROFILE_FILE = "user_profiles.json"  # Zwischenspeicher der Benutzernamen (siehe profiles.py)
+USER_PROFILE_TTL = 7 * 24 * 3600  # Sekunden, nach denen ein Benutzerprofil neu abgerufen wird
+USER_FETCH_CONCURRENCY = 5  # Maximale Anzahl gleichzeitiger Abrufe von Benutzerprofilen
+USER_FETCH_RETRY_AFTER = 600  # Sekunden, bis ein fehlgeschlagener Abruf eines Benutzerprofils wiederholt wird
+FIND_PAGE_SIZE = 15  # Suchergebnisse pro Seite bei /find
 
 # Admin-Konfiguration - IDs der Administratoren für DM-Kontexte
 # Fügen Sie hier die IDs der Discord-Benutzer ein, die Admin-Rechte in DMs haben sollen
@@ -1,29 +1,19 @@
 #!/usr/bin/env python3
 
-import pickle
 import os
 
-# Default empty event data structure
+from storage import write_snapshot
+
+# Default empty event data structure (Events werden mit /event angelegt, Schlüssel ist die Event-ID)
 default_data = {
-    'event_data': {
-        'event': {
-            'name': None,
-            'date': None,
-            'time': None,
-            'description': None,
-            'max_slots': 96,
-            'max_team_size': 9,
-            'slots_used': 0,
-            'teams': {},
-            'waitlist': []
-        }
-    },
+    'event_data': {},
     'channel_id': None,
     'user_team_assignments': {}
 }
 
 # Save to pickle file
 SAVE_FILE = "event_data.pkl"
+JOURNAL_FILE = "event_data.journal"
 
 def initialize_data():
     """Initialize event data pickle file with default structure"""
@@ -45,9 +35,13 @@ def initialize_data():
             except Exception as backup_err:
                 print(f"Failed to create backup before initialization: {backup_err}")
         
-        # Create the pickle file with default structure
-        with open(SAVE_FILE, 'wb') as f:
-            pickle.dump(default_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Create the pickle file with default structure (atomar, mit Prüfsumme)
+        write_snapshot(SAVE_FILE, default_data)
+        
+        # Remove the change journal, otherwise its entries would be replayed on top of the new file
+        if os.path.exists(JOURNAL_FILE):
+            os.replace(JOURNAL_FILE, f"{JOURNAL_FILE}.bak.before_init")
+            print(f"Moved existing journal to {JOURNAL_FILE}.bak.before_init")
         
         print(f"Successfully initialized {SAVE_FILE} with default empty structure.")
         return True
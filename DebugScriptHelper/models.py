@@ -0,0 +1,952 @@
+#!/usr/bin/env python3
+"""
+Typisiertes Datenmodell des Event-Bots.
+
+Events, Teams und Wartelisten-Einträge werden beim Laden einmalig aus dem
+kanonischen Speicher-Layout (siehe serialization.py) in kompakte Klassen mit
+__slots__ überführt und dabei validiert. Der Bot arbeitet danach nur noch mit
+Attributzugriffen; Typ-Prüfungen und Default-Werte bei jedem Zugriff entfallen.
+
+Die Persistenz-Schicht speichert weiterhin Dictionaries: Event.to_dict()
+liefert das kanonische Layout, Event.from_dict() liest es wieder ein.
+
+Teams und Warteliste führen einen Index über den normalisierten Teamnamen
+(TeamTable, Waitlist), der bei jeder Änderung aktualisiert wird. Case-insensitive
+Lookups und Größensummen laufen dadurch ohne Scan über alle Einträge. Die
+Warteliste ist zusätzlich eine indizierte Warteschlange, die Positionen und
+die Zahl der wartenden Spieler davor in O(log n) beantwortet.
+
+Die Benutzer-Team-Zuweisungen (TeamAssignments) führen analog einen
+Rückwärtsindex vom normalisierten Teamnamen auf die zugewiesenen Benutzer.
+
+Für Transaktionen (siehe transaction.py) sichern Events ihren Zustand mit
+Event.backup() ohne tiefe Kopie, TeamAssignments protokolliert die vorherigen
+Werte geänderter Zuweisungen in einem Journal.
+
+Dieses Modul hat keine Abhängigkeiten zu discord oder config.
+"""
+
+import bisect
+import logging
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger("event_bot.models")
+
+# Markiert im Änderungs-Journal einen Benutzer, der vorher keine Zuweisung hatte
+_UNSET = object()
+
+class ModelError(ValueError):
+    """Gespeicherte Eventdaten verletzen die Invarianten des Datenmodells"""
+
+class Team:
+    """Angemeldetes Team eines Events"""
+    __slots__ = ("name", "size", "id")
+
+    def __init__(self, name, size, team_id):
+        self.name = name
+        self.size = size
+        self.id = team_id
+
+    def __eq__(self, other):
+        if not isinstance(other, Team):
+            return NotImplemented
+        return self.name == other.name and self.size == other.size and self.id == other.id
+
+    def __repr__(self):
+        return f"Team({self.name!r}, {self.size}, {self.id!r})"
+
+class WaitlistEntry(NamedTuple):
+    """Eintrag auf der Warteliste (entspricht dem gespeicherten 3-Tupel)"""
+    name: str
+    size: int
+    team_id: Optional[str]
+
+def normalize_team_name(team_name):
+    """
+    Normalisiert einen Teamnamen für case-insensitive Vergleiche
+
+    Parameters:
+    - team_name: Name des Teams
+
+    Returns:
+    - Schlüssel für die Team-Indizes
+    """
+    return team_name.strip().lower()
+
+class TeamTable(dict):
+    """
+    Angemeldete Teams eines Events ({team_name: Team}) mit Index über den normalisierten Namen
+
+    Alle ändernden Dictionary-Operationen halten den Index aktuell, sodass find()
+    in O(1) arbeitet. Zusätzlich wird ein Index Team-ID -> Teamname geführt.
+    Die Größe eines Teams darf direkt geändert werden, Name und ID nicht.
+    """
+    __slots__ = ("_names", "_ids")
+
+    def __init__(self, teams=None):
+        super().__init__()
+        self._names = {}  # {normalisierter Name: Schlüssel im Dictionary}
+        self._ids = {}  # {team_id: Schlüssel im Dictionary}
+        if teams:
+            self.update(teams)
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def __setitem__(self, name, team):
+        old = self.get(name)
+        if old is not None and old.id != team.id:
+            self._ids.pop(old.id, None)
+        super().__setitem__(name, team)
+        self._names.setdefault(normalize_team_name(name), name)
+        if team.id is not None:
+            self._ids[team.id] = name
+
+    def __delitem__(self, name):
+        team = self[name]
+        super().__delitem__(name)
+        self._unindex(name, team)
+
+    def pop(self, name, *default):
+        if name not in self:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        team = super().pop(name)
+        self._unindex(name, team)
+        return team
+
+    def popitem(self):
+        name, team = super().popitem()
+        self._unindex(name, team)
+        return name, team
+
+    def setdefault(self, name, team=None):
+        if name not in self:
+            self[name] = team
+        return self[name]
+
+    def update(self, *args, **kwargs):
+        for name, team in dict(*args, **kwargs).items():
+            self[name] = team
+
+    def clear(self):
+        super().clear()
+        self._names.clear()
+        self._ids.clear()
+
+    def _unindex(self, name, team):
+        if self._ids.get(team.id) == name:
+            del self._ids[team.id]
+        key = normalize_team_name(name)
+        if self._names.get(key) != name:
+            return
+        del self._names[key]
+        # Nur wenn Schreibvarianten eines Namens nebeneinander existieren, muss nachindiziert werden
+        if len(self._names) < len(self):
+            for other in self:
+                if normalize_team_name(other) == key:
+                    self._names[key] = other
+                    break
+
+    def find(self, team_name):
+        """
+        Sucht ein angemeldetes Team (case-insensitive)
+
+        Parameters:
+        - team_name: Name des Teams in beliebiger Schreibweise
+
+        Returns:
+        - Team oder None
+        """
+        name = self._names.get(normalize_team_name(team_name))
+        return None if name is None else dict.__getitem__(self, name)
+
+    def find_id(self, team_id):
+        """
+        Sucht ein angemeldetes Team über seine ID
+
+        Parameters:
+        - team_id: ID des Teams
+
+        Returns:
+        - Team oder None
+        """
+        name = self._ids.get(team_id)
+        return None if name is None else dict.__getitem__(self, name)
+
+class FenwickTree:
+    """
+    Fenwick-Baum (Binary Indexed Tree) über Slot-Nummern ab 0
+
+    Punkt-Updates und Präfixsummen in O(log n). Die Kapazität wächst bei Bedarf
+    durch Verdopplung; Positionen jenseits der Kapazität haben den Wert 0.
+    """
+    __slots__ = ("_values", "_tree")
+
+    def __init__(self):
+        self._values = []
+        self._tree = [0]
+
+    def add(self, index, delta):
+        """Addiert delta auf den Wert an Position index"""
+        if index >= len(self._values):
+            self._grow(index)
+        self._values[index] += delta
+        tree = self._tree
+        i = index + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index):
+        """Summe der Werte an den Positionen < index"""
+        i = min(index, len(self._values))
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def find_zero(self, k):
+        """
+        Liefert die Position der k-ten (ab 0 gezählt) Null, wenn alle Werte 0 oder 1 sind
+
+        Parameters:
+        - k: Rang der gesuchten Position unter allen Positionen mit Wert 0
+
+        Returns:
+        - Position im Baum
+        """
+        tree = self._tree
+        capacity = len(self._values)
+        pos = 0
+        step = 1 << (capacity.bit_length() - 1) if capacity else 0
+        while step:
+            nxt = pos + step
+            if nxt <= capacity and step - tree[nxt] <= k:
+                pos = nxt
+                k -= step - tree[nxt]
+            step >>= 1
+        return pos + k
+
+    def _grow(self, index):
+        capacity = max(16, 2 * len(self._values))
+        while capacity <= index:
+            capacity *= 2
+        self._values.extend([0] * (capacity - len(self._values)))
+        tree = [0] + self._values
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+class Waitlist:
+    """
+    Warteliste eines Events als indizierte Warteschlange von WaitlistEntry-Einträgen
+
+    Jeder Eintrag belegt beim Einreihen eine fortlaufende Slot-Nummer. Entfernte
+    Einträge hinterlassen eine Lücke, die in einem Fenwick-Baum gezählt wird;
+    ein zweiter Fenwick-Baum nimmt die Größenänderungen auf. Damit gilt:
+
+    - append / popleft: O(1) (amortisiert)
+    - remove / replace eines beliebigen Eintrags: O(log n)
+    - position / players_ahead / Zugriff per Index: O(log n)
+    - entries_for (case-insensitive Teamname): O(1) über den Namensindex
+
+    Nach außen verhält sich die Warteliste wie eine Liste (Iteration, len,
+    Index-Zugriff, Vergleich mit Listen).
+    """
+    __slots__ = ("_slots", "_head", "_count", "_sizes_before", "_gaps", "_size_changes", "_entries", "_ids")
+
+    # Ab so vielen unbenutzten Slots wird die Slot-Tabelle neu aufgebaut
+    COMPACT_THRESHOLD = 64
+
+    def __init__(self, entries=()):
+        self._reset()
+        for entry in entries:
+            self.append(entry)
+
+    def _reset(self):
+        self._slots = []  # Einträge nach Slot-Nummer (None = entfernt)
+        self._head = 0  # Erster belegter Slot
+        self._count = 0
+        self._sizes_before = [0]  # Summe der ursprünglichen Größen aller Slots < i
+        self._gaps = FenwickTree()  # 1 für jeden entfernten Slot hinter dem Kopf
+        self._size_changes = FenwickTree()  # Größenänderungen pro Slot
+        self._entries = {}  # {normalisierter Name: [Slot, ...]} in Wartelisten-Reihenfolge
+        self._ids = {}  # {team_id: [Slot, ...]}
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __iter__(self):
+        for slot in range(self._head, len(self._slots)):
+            entry = self._slots[slot]
+            if entry is not None:
+                yield entry
+
+    def __eq__(self, other):
+        if isinstance(other, Waitlist):
+            return self._count == other._count and list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Waitlist({list(self)!r})"
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        return self._slots[self._slot_at(index)]
+
+    def __setitem__(self, index, entry):
+        self._replace_slot(self._slot_at(index), entry)
+
+    def _slot_at(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Wartelisten-Index außerhalb des gültigen Bereichs")
+        # Nicht entfernte Slots vor dem Kopf wurden per popleft entnommen und zählen mit
+        offset = self._head - self._gaps.prefix(self._head)
+        return self._gaps.find_zero(offset + index)
+
+    def _locate(self, entry):
+        slots = self._entries.get(normalize_team_name(entry.name), ())
+        for slot in slots:
+            if self._slots[slot] is entry:
+                return slot
+        for slot in slots:
+            if self._slots[slot] == entry:
+                return slot
+        raise ValueError(f"{entry!r} steht nicht auf der Warteliste")
+
+    def append(self, entry):
+        """Reiht einen Eintrag am Ende der Warteliste ein"""
+        slot = len(self._slots)
+        self._slots.append(entry)
+        self._sizes_before.append(self._sizes_before[-1] + entry.size)
+        self._entries.setdefault(normalize_team_name(entry.name), []).append(slot)
+        if entry.team_id is not None:
+            self._ids.setdefault(entry.team_id, []).append(slot)
+        self._count += 1
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def popleft(self):
+        """
+        Entnimmt den ersten Eintrag der Warteliste
+
+        Returns:
+        - WaitlistEntry
+
+        Raises:
+        - IndexError: wenn die Warteliste leer ist
+        """
+        if not self._count:
+            raise IndexError("Warteliste ist leer")
+        entry = self._slots[self._head]
+        self._delete_slot(self._head)
+        return entry
+
+    def pop(self, index=-1):
+        if index == 0:
+            return self.popleft()
+        slot = self._slot_at(index)
+        entry = self._slots[slot]
+        self._delete_slot(slot)
+        return entry
+
+    def remove(self, entry):
+        """Entfernt einen Eintrag (bevorzugt genau dieses Objekt) von der Warteliste"""
+        self._delete_slot(self._locate(entry))
+
+    def replace(self, entry, new_entry):
+        """
+        Ersetzt einen Eintrag an seiner Position
+
+        Parameters:
+        - entry: Bisheriger WaitlistEntry
+        - new_entry: Neuer WaitlistEntry
+        """
+        self._replace_slot(self._locate(entry), new_entry)
+
+    def clear(self):
+        self._reset()
+
+    def _delete_slot(self, slot):
+        entry = self._slots[slot]
+        self._slots[slot] = None
+        self._count -= 1
+        _unindex_slot(self._entries, normalize_team_name(entry.name), slot)
+        _unindex_slot(self._ids, entry.team_id, slot)
+
+        if slot == self._head:
+            # Kopf weiterschieben; Slots vor dem Kopf werden bei Abfragen herausgerechnet
+            while self._head < len(self._slots) and self._slots[self._head] is None:
+                self._head += 1
+        else:
+            self._gaps.add(slot, 1)
+            self._size_changes.add(slot, -entry.size)
+
+        if len(self._slots) - self._count > max(self.COMPACT_THRESHOLD, self._count):
+            self._compact()
+
+    def _replace_slot(self, slot, entry):
+        old = self._slots[slot]
+        self._slots[slot] = entry
+        if entry.size != old.size:
+            self._size_changes.add(slot, entry.size - old.size)
+        old_key = normalize_team_name(old.name)
+        new_key = normalize_team_name(entry.name)
+        if old_key != new_key:
+            _unindex_slot(self._entries, old_key, slot)
+            bisect.insort(self._entries.setdefault(new_key, []), slot)
+        if old.team_id != entry.team_id:
+            _unindex_slot(self._ids, old.team_id, slot)
+            if entry.team_id is not None:
+                bisect.insort(self._ids.setdefault(entry.team_id, []), slot)
+
+    def _compact(self):
+        entries = list(self)
+        self._reset()
+        self.extend(entries)
+
+    def position(self, entry):
+        """
+        Liefert die Position eines Eintrags auf der Warteliste
+
+        Parameters:
+        - entry: WaitlistEntry aus dieser Warteliste
+
+        Returns:
+        - Position ab 0 (Anzahl der Einträge davor)
+
+        Raises:
+        - ValueError: wenn der Eintrag nicht auf der Warteliste steht
+        """
+        slot = self._locate(entry)
+        return (slot - self._head) - (self._gaps.prefix(slot) - self._gaps.prefix(self._head))
+
+    def players_ahead(self, entry):
+        """
+        Liefert die Anzahl der Spieler, die vor einem Eintrag auf der Warteliste stehen
+
+        Parameters:
+        - entry: WaitlistEntry aus dieser Warteliste
+
+        Returns:
+        - Summe der Größen aller Einträge davor
+        """
+        return self._players_before(self._locate(entry))
+
+    def total_size(self):
+        """Summe der Größen aller Einträge auf der Warteliste"""
+        return self._players_before(len(self._slots))
+
+    def _players_before(self, slot):
+        head = self._head
+        return (self._sizes_before[slot] - self._sizes_before[head]) + \
+            (self._size_changes.prefix(slot) - self._size_changes.prefix(head))
+
+    def entries_for(self, team_name):
+        """
+        Liefert alle Einträge eines Teams (case-insensitive) in Wartelisten-Reihenfolge
+
+        Parameters:
+        - team_name: Name des Teams in beliebiger Schreibweise
+
+        Returns:
+        - Tupel der WaitlistEntry-Einträge (leer, wenn das Team nicht wartet)
+        """
+        return tuple(self._slots[slot] for slot in self._entries.get(normalize_team_name(team_name), ()))
+
+    def entries_for_id(self, team_id):
+        """
+        Liefert alle Einträge mit einer Team-ID in Wartelisten-Reihenfolge
+
+        Parameters:
+        - team_id: ID des Teams
+
+        Returns:
+        - Tupel der WaitlistEntry-Einträge (leer, wenn die ID nicht wartet)
+        """
+        return tuple(self._slots[slot] for slot in self._ids.get(team_id, ()))
+
+def _unindex_slot(index, key, slot):
+    """Entfernt einen Slot aus einem Wartelisten-Index {Schlüssel: [Slot, ...]}"""
+    slots = index.get(key)
+    if slots is None:
+        return
+    slots.remove(slot)
+    if not slots:
+        del index[key]
+
+class TeamAssignments(dict):
+    """
+    Benutzer-Team-Zuweisungen ({user_id: team_name}) mit Rückwärtsindex Team -> Benutzer
+
+    Der Index über den normalisierten Teamnamen wird bei jeder Änderung
+    mitgeführt. Teamleiter-Suche, das Entfernen aller Mitglieder eines Teams und
+    die gruppierte Auflistung arbeiten dadurch nur auf den Mitgliedern des
+    jeweiligen Teams. Benutzer eines Teams stehen in Zuweisungsreihenfolge.
+
+    Solange ein Journal mit track() angemeldet ist, wird darin für jeden
+    geänderten Benutzer der Wert vor der ersten Änderung festgehalten;
+    restore() stellt diese Werte wieder her.
+    """
+    __slots__ = ("_members", "_journals")
+
+    def __init__(self, assignments=None):
+        super().__init__()
+        self._members = {}  # {normalisierter Name: {user_id: None}}
+        self._journals = []  # Angemeldete Änderungs-Journale ({user_id: vorheriger Wert})
+        if assignments:
+            self.update(assignments)
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def __setitem__(self, user_id, team_name):
+        self._record(user_id)
+        old = self.get(user_id)
+        if old is not None and normalize_team_name(old) != normalize_team_name(team_name):
+            self._unindex(user_id, old)
+        super().__setitem__(user_id, team_name)
+        self._members.setdefault(normalize_team_name(team_name), {})[user_id] = None
+
+    def __delitem__(self, user_id):
+        team_name = self[user_id]
+        self._record(user_id)
+        super().__delitem__(user_id)
+        self._unindex(user_id, team_name)
+
+    def pop(self, user_id, *default):
+        if user_id not in self:
+            if default:
+                return default[0]
+            raise KeyError(user_id)
+        team_name = self[user_id]
+        del self[user_id]
+        return team_name
+
+    def popitem(self):
+        if self and self._journals:
+            self._record(next(reversed(self)))
+        user_id, team_name = super().popitem()
+        self._unindex(user_id, team_name)
+        return user_id, team_name
+
+    def setdefault(self, user_id, team_name=None):
+        if user_id not in self:
+            self[user_id] = team_name
+        return self[user_id]
+
+    def update(self, *args, **kwargs):
+        for user_id, team_name in dict(*args, **kwargs).items():
+            self[user_id] = team_name
+
+    def clear(self):
+        for user_id in self:
+            self._record(user_id)
+        super().clear()
+        self._members.clear()
+
+    def _unindex(self, user_id, team_name):
+        key = normalize_team_name(team_name)
+        members = self._members.get(key)
+        if members is None:
+            return
+        members.pop(user_id, None)
+        if not members:
+            del self._members[key]
+
+    def _record(self, user_id):
+        """Hält den aktuellen Wert eines Benutzers in allen angemeldeten Journalen fest (nur beim ersten Mal)"""
+        for journal in self._journals:
+            if user_id not in journal:
+                journal[user_id] = dict.get(self, user_id, _UNSET)
+
+    def track(self, journal):
+        """
+        Meldet ein Änderungs-Journal an
+
+        Parameters:
+        - journal: Leeres Dictionary, das {user_id: vorheriger Wert} aufnimmt
+        """
+        self._journals.append(journal)
+
+    def untrack(self, journal):
+        """Meldet ein Änderungs-Journal wieder ab"""
+        self._journals = [other for other in self._journals if other is not journal]
+
+    def changed(self, journal):
+        """
+        Liefert die Benutzer eines Journals, deren Zuweisung sich tatsächlich geändert hat
+
+        Parameters:
+        - journal: Mit track() gefülltes Journal
+
+        Returns:
+        - Tupel der User-IDs in Journal-Reihenfolge
+        """
+        return tuple(user_id for user_id, team_name in journal.items()
+                     if dict.get(self, user_id, _UNSET) != team_name)
+
+    def restore(self, journal):
+        """
+        Stellt die in einem Journal festgehaltenen Werte wieder her
+
+        Wieder hergestellte Benutzer stehen danach am Ende ihres Teams
+        (die Teamleiter-Reihenfolge kann sich dadurch ändern).
+
+        Parameters:
+        - journal: Mit track() gefülltes Journal (vorher abmelden)
+        """
+        for user_id, team_name in journal.items():
+            if team_name is _UNSET:
+                if user_id in self:
+                    del self[user_id]
+            elif dict.get(self, user_id) != team_name:
+                self[user_id] = team_name
+
+    def members(self, team_name):
+        """
+        Liefert die einem Team zugewiesenen Benutzer (case-insensitive)
+
+        Parameters:
+        - team_name: Name des Teams in beliebiger Schreibweise
+
+        Returns:
+        - Tupel der User-IDs in Zuweisungsreihenfolge
+        """
+        return tuple(self._members.get(normalize_team_name(team_name), ()))
+
+    def leader(self, team_name):
+        """
+        Liefert den Teamleiter (zuerst zugewiesener Benutzer) eines Teams
+
+        Parameters:
+        - team_name: Name des Teams in beliebiger Schreibweise
+
+        Returns:
+        - User-ID oder None
+        """
+        return next(iter(self._members.get(normalize_team_name(team_name), ())), None)
+
+    def remove_team(self, team_name):
+        """
+        Entfernt die Zuweisungen aller Mitglieder eines Teams
+
+        Parameters:
+        - team_name: Name des Teams in beliebiger Schreibweise
+
+        Returns:
+        - Liste der entfernten User-IDs
+        """
+        user_ids = list(self._members.pop(normalize_team_name(team_name), ()))
+        for user_id in user_ids:
+            self._record(user_id)
+            super().__delitem__(user_id)
+        return user_ids
+
+    def teams(self):
+        """
+        Gruppiert die Zuweisungen nach Team
+
+        Returns:
+        - Liste von Tupeln (team_name, user_ids); team_name in der Schreibweise der ersten Zuweisung
+        """
+        return [(self[next(iter(members))], tuple(members)) for members in self._members.values()]
+
+class TeamIdAllocator:
+    """
+    Vergibt monotone, kollisionsfreie Team-IDs nach dem Snowflake-Schema (ohne Hashing)
+
+    Eine ID setzt sich aus den Millisekunden seit EPOCH_MS und einer laufenden
+    Nummer für mehrere IDs innerhalb derselben Millisekunde zusammen und wird
+    als Dezimal-String gespeichert. Jede neue ID ist größer als alle zuvor
+    vergebenen oder per observe() gemeldeten IDs.
+    """
+    __slots__ = ("_last", "_clock")
+
+    EPOCH_MS = 1735689600000  # 01.01.2025 00:00 UTC
+    SEQUENCE_BITS = 12
+
+    def __init__(self, clock=time.time):
+        self._last = 0
+        self._clock = clock
+
+    def observe(self, team_id):
+        """
+        Meldet eine bereits vergebene ID, damit sie nicht erneut vergeben wird
+
+        IDs in anderen Formaten (z.B. alte Hash-IDs) werden ignoriert.
+
+        Parameters:
+        - team_id: Gespeicherte Team-ID
+        """
+        if isinstance(team_id, str) and team_id.isdigit():
+            self._last = max(self._last, int(team_id))
+
+    def next_id(self):
+        """
+        Vergibt die nächste ID
+
+        Returns:
+        - Team-ID als String
+        """
+        now = (int(self._clock() * 1000) - self.EPOCH_MS) << self.SEQUENCE_BITS
+        self._last = max(now, self._last + 1)
+        return str(self._last)
+
+class Event:
+    """Ein Event mit Teams, Warteliste, Kapazität und Ablaufdatum"""
+    __slots__ = (
+        "id", "name", "date", "time", "description", "teams", "waitlist",
+        "max_slots", "slots_used", "max_team_size", "expiry_date", "allocation_policy", "display_messages", "extra"
+    )
+
+    # Schlüssel des gespeicherten Layouts, die als Attribute abgebildet werden
+    _FIELDS = ("name", "date", "time", "description", "max_slots", "slots_used", "max_team_size", "expiry_date",
+               "allocation_policy", "display_messages")
+
+    # Standard-Vergabestrategie für nachrückende Teams (siehe promotion.py)
+    DEFAULT_POLICY = "fifo"
+
+    def __init__(self, event_id, name, date, time="", description="", max_slots=0, max_team_size=0,
+                 slots_used=0, teams=None, waitlist=None, expiry_date=None, allocation_policy=DEFAULT_POLICY,
+                 display_messages=None, extra=None):
+        self.id = event_id
+        self.name = name
+        self.date = date
+        self.time = time
+        self.description = description
+        self.teams = TeamTable(teams)  # {team_name: Team}
+        self.waitlist = Waitlist(waitlist or ())  # Warteschlange von WaitlistEntry
+        self.max_slots = max_slots
+        self.slots_used = slots_used
+        self.max_team_size = max_team_size
+        self.expiry_date = expiry_date
+        self.allocation_policy = allocation_policy  # Name der Vergabestrategie für die Warteliste
+        # Anzeige-Nachricht des Events je Kanal {channel_id: message_id}; wird nur ersetzt, nie in-place geändert
+        self.display_messages = display_messages if display_messages is not None else {}
+        self.extra = extra if extra is not None else {}  # Unbekannte Felder bleiben erhalten
+
+    def __eq__(self, other):
+        if not isinstance(other, Event):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return f"Event({self.id!r}, {self.name!r}, {len(self.teams)} Teams, {len(self.waitlist)} auf der Warteliste)"
+
+    @classmethod
+    def from_dict(cls, event_id, data):
+        """
+        Erstellt ein Event aus dem kanonischen Speicher-Layout und prüft die Invarianten
+
+        Parameters:
+        - event_id: Schlüssel des Events in event_data
+        - data: Event-Dictionary (Teams als {"size", "id"}, Warteliste als 3-Tupel)
+
+        Returns:
+        - Event-Objekt
+
+        Raises:
+        - ModelError: wenn die Daten nicht dem kanonischen Layout entsprechen
+        """
+        if not isinstance(data, dict):
+            raise ModelError(f"Event '{event_id}' ist kein Dictionary")
+
+        teams = {}
+        for name, team in data.get("teams", {}).items():
+            if not isinstance(team, dict) or not isinstance(team.get("size"), int):
+                raise ModelError(f"Event '{event_id}': ungültiger Team-Eintrag {name!r}: {team!r}")
+            teams[name] = Team(name, team["size"], team.get("id"))
+
+        waitlist = []
+        for entry in data.get("waitlist", []):
+            if not isinstance(entry, tuple) or len(entry) != 3 or not isinstance(entry[1], int):
+                raise ModelError(f"Event '{event_id}': ungültiger Wartelisten-Eintrag {entry!r}")
+            waitlist.append(WaitlistEntry(*entry))
+
+        values = {}
+        for field in ("name", "date", "time", "description"):
+            value = data.get(field)
+            values[field] = value if value is not None else ""
+        for field in ("max_slots", "slots_used", "max_team_size"):
+            value = data.get(field, 0)
+            if not isinstance(value, int):
+                raise ModelError(f"Event '{event_id}': {field} ist keine ganze Zahl: {value!r}")
+            values[field] = value
+        expiry_date = data.get("expiry_date")
+        if expiry_date is not None and not isinstance(expiry_date, datetime):
+            raise ModelError(f"Event '{event_id}': expiry_date ist kein Zeitpunkt: {expiry_date!r}")
+        allocation_policy = data.get("allocation_policy", cls.DEFAULT_POLICY)
+        if not isinstance(allocation_policy, str):
+            raise ModelError(f"Event '{event_id}': allocation_policy ist kein Name: {allocation_policy!r}")
+        display_messages = data.get("display_messages", {})
+        if not isinstance(display_messages, dict) or not all(
+                isinstance(key, int) and isinstance(value, int) for key, value in display_messages.items()):
+            raise ModelError(f"Event '{event_id}': ungültige Anzeige-Nachrichten: {display_messages!r}")
+
+        extra = {key: value for key, value in data.items()
+                 if key not in cls._FIELDS and key not in ("id", "teams", "waitlist")}
+
+        event = cls(event_id, teams=teams, waitlist=waitlist, expiry_date=expiry_date,
+                    allocation_policy=allocation_policy, display_messages=dict(display_messages), extra=extra, **values)
+        event.check_invariants()
+        return event
+
+    def find_team_name(self, team_id):
+        """
+        Löst eine Team-ID in den Teamnamen auf (angemeldet oder auf der Warteliste)
+
+        Parameters:
+        - team_id: ID des Teams
+
+        Returns:
+        - Teamname oder None, wenn die ID in diesem Event nicht vorkommt
+        """
+        team = self.teams.find_id(team_id)
+        if team is not None:
+            return team.name
+        entries = self.waitlist.entries_for_id(team_id)
+        return entries[0].name if entries else None
+
+    def backup(self):
+        """
+        Sichert den aktuellen Zustand für ein späteres restore()
+
+        Kopiert werden nur die Felder, die Team-Objekte mit ihrer Größe und die
+        (unveränderlichen) Wartelisten-Einträge - keine tiefe Kopie.
+
+        Returns:
+        - Undurchsichtige Sicherung für restore()
+        """
+        return (
+            tuple(getattr(self, field) for field in self._FIELDS),
+            [(team, team.name, team.size, team.id) for team in self.teams.values()],
+            tuple(self.waitlist),
+            dict(self.extra)
+        )
+
+    def changed_since(self, backup):
+        """
+        Prüft, ob sich das Event seit einer Sicherung geändert hat
+
+        Parameters:
+        - backup: Ergebnis von backup()
+
+        Returns:
+        - True, wenn Felder, Teams oder Warteliste von der Sicherung abweichen
+        """
+        return self.backup() != backup
+
+    def restore(self, backup):
+        """
+        Setzt das Event auf eine mit backup() erstellte Sicherung zurück
+
+        Die Objekte (Event, TeamTable, Waitlist, Team) bleiben dieselben, damit
+        Referenzen darauf gültig bleiben.
+
+        Parameters:
+        - backup: Ergebnis von backup()
+        """
+        fields, teams, waitlist, extra = backup
+        for field, value in zip(self._FIELDS, fields):
+            setattr(self, field, value)
+        self.teams.clear()
+        for team, name, size, team_id in teams:
+            team.name, team.size, team.id = name, size, team_id
+            self.teams[name] = team
+        self.waitlist.clear()
+        self.waitlist.extend(waitlist)
+        self.extra = extra
+
+    def to_dict(self):
+        """
+        Liefert das Event im kanonischen Speicher-Layout
+
+        Returns:
+        - Dictionary, wie es die Persistenz-Schicht speichert
+        """
+        data = dict(self.extra)
+        data.update({
+            "id": self.id,
+            "name": self.name,
+            "date": self.date,
+            "time": self.time,
+            "description": self.description,
+            "teams": {name: {"size": team.size, "id": team.id} for name, team in self.teams.items()},
+            "waitlist": [tuple(entry) for entry in self.waitlist],
+            "max_slots": self.max_slots,
+            "slots_used": self.slots_used,
+            "max_team_size": self.max_team_size,
+        })
+        if self.expiry_date is not None:
+            data["expiry_date"] = self.expiry_date
+        if self.allocation_policy != self.DEFAULT_POLICY:
+            data["allocation_policy"] = self.allocation_policy
+        if self.display_messages:
+            data["display_messages"] = dict(self.display_messages)
+        return data
+
+    def check_invariants(self):
+        """
+        Prüft die Invarianten des Events und korrigiert die Slot-Belegung
+
+        slots_used muss der Summe der angemeldeten Teamgrößen entsprechen. Weicht
+        der gespeicherte Wert ab, wird er neu berechnet und eine Warnung geloggt.
+
+        Raises:
+        - ModelError: bei negativen Größen oder falsch zugeordneten Team-Namen
+        """
+        total = 0
+        for name, team in self.teams.items():
+            if team.name != name:
+                raise ModelError(f"Event '{self.id}': Team {team.name!r} unter dem Namen {name!r} gespeichert")
+            if team.size < 0:
+                raise ModelError(f"Event '{self.id}': Team {name!r} hat eine negative Größe ({team.size})")
+            total += team.size
+        for entry in self.waitlist:
+            if entry.size <= 0:
+                raise ModelError(f"Event '{self.id}': Wartelisten-Eintrag {entry.name!r} hat die Größe {entry.size}")
+        if self.slots_used != total:
+            logger.warning(f"Event '{self.id}': slots_used war {self.slots_used}, Summe der Teams ist {total} - korrigiert")
+            self.slots_used = total
+
+def events_from_dicts(event_data):
+    """
+    Überführt geladene Eventdaten in das typisierte Modell
+
+    Leere Platzhalter (z.B. von initialize_data.py) werden übersprungen.
+
+    Parameters:
+    - event_data: {event_id: Event-Dictionary} aus der Persistenz-Schicht
+
+    Returns:
+    - {event_id: Event}
+    """
+    events = {}
+    for event_id, data in event_data.items():
+        if not isinstance(data, dict) or not (data.get("name") or data.get("date")):
+            continue
+        events[event_id] = Event.from_dict(event_id, data)
+    return events
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Zentraler Planer für ausgehende Discord-Nachrichten.
+
+Alle ausgehenden Aufrufe (Interaktions-Antworten, Event-Anzeigen, DMs,
+Log-Kanal) werden als Nachricht mit einer Prioritätsklasse und einer Route
+eingereiht. Ein Verteiler-Task startet immer die wartende Nachricht mit der
+höchsten Priorität, deren Route gerade senden darf:
+
+    PRIORITY_RESPONSE > PRIORITY_DISPLAY > PRIORITY_DM > PRIORITY_LOG
+
+Jede Route (z.B. ("channel", id) oder ("dm", user_id)) hat einen eigenen
+Token-Bucket, zusätzlich begrenzt ein globaler Bucket alle Nachrichten.
+So landen Log-Meldungen bei hoher Last hinter den Antworten auf
+Interaktionen, statt sie aufzuhalten. Innerhalb einer Route bleibt die
+Reihenfolge erhalten.
+
+Text-Nachrichten (submit(..., text=...)) derselben Route und Priorität, die
+noch warten, werden zu einer Nachricht zusammengefasst, solange sie unter
+MERGE_LIMIT Zeichen bleibt - bei Andrang entstehen so wenige lange statt
+vieler kurzer Log-Nachrichten.
+
+Dieses Modul hat keine Abhängigkeiten zu discord oder config.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger("event_bot.outbound")
+
+# Prioritätsklassen (kleiner = wichtiger)
+PRIORITY_RESPONSE = 0  # Antworten auf Interaktionen
+PRIORITY_DISPLAY = 1  # Event-Anzeigen
+PRIORITY_DM = 2  # Direktnachrichten
+PRIORITY_LOG = 3  # Log-Kanal
+
+PRIORITY_NAMES = {
+    PRIORITY_RESPONSE: "Antworten",
+    PRIORITY_DISPLAY: "Anzeigen",
+    PRIORITY_DM: "DMs",
+    PRIORITY_LOG: "Log-Kanal"
+}
+
+# Maximale Länge einer zusammengefassten Text-Nachricht (Discord erlaubt 2000 Zeichen)
+MERGE_LIMIT = 1900
+
+class TokenBucket:
+    """Erlaubt `capacity` Nachrichten je `period` Sekunden, mit gleichmäßigem Nachfüllen"""
+    __slots__ = ("capacity", "period", "tokens", "updated")
+
+    def __init__(self, capacity, period):
+        self.capacity = max(1, capacity)
+        self.period = max(0.001, period)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def wait_time(self, now):
+        """
+        Wartezeit bis zur nächsten erlaubten Nachricht
+
+        Parameters:
+        - now: Aktueller Zeitpunkt (time.monotonic)
+
+        Returns:
+        - Sekunden bis ein Token frei ist (0, wenn sofort gesendet werden darf)
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / self.period)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) * self.period / self.capacity
+
+    def take(self):
+        """Verbraucht ein Token (nur nach wait_time() == 0 aufrufen)"""
+        self.tokens -= 1
+
+class Message:
+    """Eine eingereihte ausgehende Nachricht"""
+    __slots__ = ("priority", "route", "call", "texts", "length", "future", "queued")
+
+    def __init__(self, priority, route, call, text, future):
+        self.priority = priority
+        self.route = route
+        self.call = call  # call() bzw. call(text) für Text-Nachrichten -> Coroutine
+        self.texts = [text] if text is not None else None
+        self.length = len(text) if text is not None else 0
+        self.future = future
+        self.queued = time.monotonic()
+
+class OutboundScheduler:
+    """
+    Prioritäts-Warteschlange mit Token-Buckets je Route
+
+    Der Verteiler wird beim ersten submit() auf dem laufenden Event-Loop gestartet.
+    """
+
+    def __init__(self, route_limit=5, route_period=5.0, global_limit=50, global_period=1.0):
+        """
+        Parameters:
+        - route_limit: Nachrichten je Route und route_period
+        - route_period: Zeitraum des Routen-Buckets in Sekunden
+        - global_limit: Nachrichten insgesamt je global_period
+        - global_period: Zeitraum des globalen Buckets in Sekunden
+        """
+        self.route_limit = route_limit
+        self.route_period = route_period
+        self._global = TokenBucket(global_limit, global_period)
+        self._buckets = {}  # {Route: TokenBucket}
+        self._queues = {priority: deque() for priority in PRIORITY_NAMES}
+        self._wakeup = None  # Wird mit dem Verteiler-Task erstellt
+        self._task = None
+        self._running = set()  # Laufende Sende-Tasks
+        self.stats = {
+            "submitted": 0,  # Eingereihte Nachrichten
+            "merged": 0,  # In eine wartende Nachricht übernommene Texte
+            "sent": 0,  # Gestartete Discord-Aufrufe
+            "failed": 0,  # Fehlgeschlagene Discord-Aufrufe
+            "throttled": 0,  # Wartepausen wegen Rate-Limits
+            "wait_max": 0.0  # Längste Wartezeit einer Nachricht in Sekunden
+        }
+
+    def depths(self):
+        """
+        Anzahl der wartenden Nachrichten je Prioritätsklasse
+
+        Returns:
+        - Dictionary {Anzeigename: Anzahl} in Prioritätsreihenfolge
+        """
+        return {PRIORITY_NAMES[priority]: len(queue) for priority, queue in self._queues.items()}
+
+    @property
+    def pending(self):
+        """Anzahl aller wartenden Nachrichten"""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def submit(self, priority, route, call, text=None):
+        """
+        Reiht eine ausgehende Nachricht ein
+
+        Parameters:
+        - priority: Prioritätsklasse (PRIORITY_*)
+        - route: Schlüssel des Routen-Buckets (None: nur globaler Bucket)
+        - call: Funktion, die die Discord-Coroutine erzeugt - call() oder, mit text, call(text)
+        - text: Optional - Text der Nachricht; wartende Texte derselben Route und
+          Priorität werden zusammengefasst
+
+        Returns:
+        - Future mit dem Ergebnis des Discord-Aufrufs
+        """
+        self.stats["submitted"] += 1
+        queue = self._queues[priority]
+        if text is not None:
+            for message in reversed(queue):
+                if message.route != route:
+                    continue
+                if message.texts is not None and message.call == call and message.length + len(text) + 1 <= MERGE_LIMIT:
+                    message.texts.append(text)
+                    message.length += len(text) + 1
+                    self.stats["merged"] += 1
+                    return message.future
+                break
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append(Message(priority, route, call, text, future))
+        self._start()
+        self._wakeup.set()
+        return future
+
+    def post(self, priority, route, call, text=None):
+        """
+        Wie submit(), aber ohne auf das Ergebnis zu warten (Fehler werden nur geloggt)
+
+        Returns:
+        - Future mit dem Ergebnis des Discord-Aufrufs
+        """
+        future = self.submit(priority, route, call, text)
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return future
+
+    def _start(self):
+        """Startet den Verteiler-Task, falls er noch nicht läuft"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()  # an den aktuellen Event-Loop gebunden
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _next(self, now):
+        """
+        Entnimmt die nächste sendebereite Nachricht
+
+        Returns:
+        - (Message, None) oder (None, Wartezeit in Sekunden bzw. None, wenn nichts wartet)
+        """
+        delay = self._global.wait_time(now)
+        if delay > 0:
+            return None, delay if self.pending else None
+
+        delay = None
+        for queue in self._queues.values():
+            blocked = set()
+            for message in queue:
+                if message.route in blocked:
+                    continue
+                bucket = self._bucket(message.route)
+                wait = bucket.wait_time(now) if bucket is not None else 0.0
+                if wait == 0:
+                    queue.remove(message)
+                    if bucket is not None:
+                        bucket.take()
+                    self._global.take()
+                    return message, None
+                blocked.add(message.route)
+                delay = wait if delay is None else min(delay, wait)
+        return None, delay
+
+    def _bucket(self, route):
+        """Liefert den Token-Bucket einer Route (None für Nachrichten ohne Route)"""
+        if route is None:
+            return None
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            bucket = self._buckets[route] = TokenBucket(self.route_limit, self.route_period)
+        return bucket
+
+    async def _run(self):
+        """Verteiler-Task: startet sendebereite Nachrichten nach Priorität"""
+        while True:
+            self._wakeup.clear()
+            message, delay = self._next(time.monotonic())
+            if message is not None:
+                self._dispatch(message)
+                continue
+            if delay is None:
+                await self._wakeup.wait()
+                continue
+            self.stats["throttled"] += 1
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch(self, message):
+        """Startet den Discord-Aufruf einer Nachricht als eigenen Task"""
+        wait = time.monotonic() - message.queued
+        self.stats["wait_max"] = max(self.stats["wait_max"], wait)
+        self.stats["sent"] += 1
+        if message.future.cancelled():
+            return
+        if message.texts is not None:
+            coroutine = message.call("\n".join(message.texts))
+        else:
+            coroutine = message.call()
+        task = asyncio.get_running_loop().create_task(self._send(message, coroutine))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _send(self, message, coroutine):
+        """Führt einen Discord-Aufruf aus und übergibt das Ergebnis an das Future"""
+        try:
+            result = await coroutine
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Fehler beim Senden ({PRIORITY_NAMES[message.priority]}, {message.route}): {e}")
+            if not message.future.done():
+                message.future.set_exception(e)
+        else:
+            if not message.future.done():
+                message.future.set_result(result)
+
+    async def close(self, timeout=5.0):
+        """
+        Sendet noch wartende Nachrichten (höchstens timeout Sekunden lang) und beendet den Verteiler
+
+        Parameters:
+        - timeout: Maximale Wartezeit in Sekunden
+        """
+        deadline = time.monotonic() + timeout
+        while (self.pending or self._running) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        for queue in self._queues.values():
+            for message in queue:
+                message.future.cancel()
+            queue.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info(
+            f"Nachrichten-Planer beendet: {self.stats['sent']} gesendet, {self.stats['merged']} zusammengefasst, "
+            f"max. Wartezeit {self.stats['wait_max'] * 1000:.0f} ms"
+        )
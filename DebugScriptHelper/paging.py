@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Aufteilung langer Listen in Seiten nach den Längengrenzen von Discord.
+
+Listen (Teams, Warteliste, Zuweisungen, Suchtreffer) werden als einzelne
+Zeilen erzeugt und vorab in Stücke gepackt, die eine Grenze nicht
+überschreiten (chunk_lines) - ein Embed-Feld, eine Beschreibung oder eine
+Nachricht. paginate_sections verteilt die Felder mehrerer Abschnitte auf
+Seiten, die jeweils in ein Embed passen. Eine Zeile wird nie auf zwei
+Stücke verteilt; nur eine einzelne zu lange Zeile wird gekürzt.
+
+Dieses Modul hat keine Abhängigkeiten zu discord oder config.
+"""
+
+# Längengrenzen von Discord
+FIELD_LIMIT = 1024  # Wert eines Embed-Felds
+FIELD_COUNT_LIMIT = 25  # Felder je Embed
+DESCRIPTION_LIMIT = 4096  # Beschreibung eines Embeds
+EMBED_LIMIT = 6000  # Alle Texte eines Embeds zusammen
+MESSAGE_LIMIT = 2000  # Inhalt einer Nachricht
+
+# Platz je Seite für Felder; der Rest bleibt für Titel, Beschreibung, Statistik und Fußzeile
+PAGE_BUDGET = 5000
+
+def clip(line, limit):
+    """Kürzt eine einzelne Zeile auf höchstens limit Zeichen"""
+    return line if len(line) <= limit else line[:limit - 1] + "…"
+
+def chunk_lines(lines, limit, separator="\n"):
+    """
+    Packt Zeilen der Reihe nach in möglichst wenige Stücke
+
+    Parameters:
+    - lines: Iterable von Zeilen (ohne Zeilenumbruch)
+    - limit: Maximale Länge eines Stücks
+    - separator: Trenner zwischen den Zeilen eines Stücks
+
+    Returns:
+    - Liste von Strings, jeder höchstens limit Zeichen lang (leer, wenn es keine Zeilen gibt)
+    """
+    chunks = []
+    current = []
+    size = 0
+    for line in lines:
+        line = clip(line, limit)
+        extra = len(line) + (len(separator) if current else 0)
+        if current and size + extra > limit:
+            chunks.append(separator.join(current))
+            current = []
+            extra = len(line)
+            size = 0
+        current.append(line)
+        size += extra
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+def paginate_sections(sections, page_budget=PAGE_BUDGET, max_fields=FIELD_COUNT_LIMIT, field_limit=FIELD_LIMIT):
+    """
+    Verteilt Abschnitte auf Felder und die Felder auf Seiten
+
+    Ein Abschnitt, der nicht in ein Feld passt, wird auf mehrere Felder
+    verteilt; die weiteren Felder heißen "<Name> (Forts.)".
+
+    Parameters:
+    - sections: Liste von Tupeln (Feldname, Zeilen, Text bei leeren Zeilen)
+    - page_budget: Maximale Zeichenzahl aller Felder einer Seite
+    - max_fields: Maximale Anzahl der Felder einer Seite
+    - field_limit: Maximale Länge eines Feldwerts
+
+    Returns:
+    - Liste von Seiten (mindestens eine), jede eine Liste von Tupeln (Feldname, Wert)
+    """
+    pages = [[]]
+    size = 0
+    for name, lines, empty in sections:
+        chunks = chunk_lines(lines, field_limit) or [empty]
+        for index, chunk in enumerate(chunks):
+            field_name = name if index == 0 else f"{name} (Forts.)"
+            cost = len(field_name) + len(chunk)
+            if pages[-1] and (size + cost > page_budget or len(pages[-1]) >= max_fields):
+                pages.append([])
+                size = 0
+            pages[-1].append((field_name, chunk))
+            size += cost
+    return pages
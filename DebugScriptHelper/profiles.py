@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Zwischenspeicher für Discord-Benutzerprofile.
+
+Namen von Benutzern werden beim Zuweisen zu einem Team gemerkt
+(ProfileCache.remember), sodass Suchen wie /find ohne Discord-Aufrufe
+auskommen. Fehlt ein Profil, wird zuerst der lokale Cache des Bots gefragt
+(lookup, z.B. bot.get_user), erst danach wird über die REST-API abgerufen
+(fetch, z.B. bot.fetch_user) - mehrere Benutzer gleichzeitig, aber höchstens
+`max_concurrency` Abrufe parallel. Schlägt ein Abruf fehl (z.B. gelöschtes
+Konto), wird derselbe Benutzer erst nach `retry_after` Sekunden erneut
+abgerufen.
+
+Profile, die älter als `ttl` Sekunden sind, gelten als veraltet: Sie werden
+weiter verwendet, aber im Hintergrund neu abgerufen. prune() entfernt
+veraltete Profile von Benutzern, die keinem Team mehr zugewiesen sind.
+Nach einer Aktualisierung im Hintergrund wird on_update aufgerufen, damit
+abhängige Indizes (z.B. der Suchindex) die neuen Namen übernehmen.
+
+Die Profile werden in einer eigenen JSON-Datei gespeichert (save/load);
+geht sie verloren, werden die Namen einfach neu abgerufen. Auf dem
+Event-Loop wird mit flush() in einem Worker-Thread geschrieben.
+
+Dieses Modul hat keine Abhängigkeiten zu discord oder config.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import NamedTuple
+
+from storage import atomic_write
+
+logger = logging.getLogger("event_bot.profiles")
+
+class UserProfile(NamedTuple):
+    """Gemerkte Namen eines Discord-Benutzers"""
+    name: str  # Benutzername
+    display_name: str  # Anzeigename (Server-Nickname oder globaler Name)
+    updated: float  # Zeitpunkt der letzten Aktualisierung (time.time)
+
+class ProfileCache:
+    """Benutzerprofile nach User-ID (als String, wie in user_team_assignments)"""
+
+    def __init__(self, lookup, fetch, ttl=7 * 86400, max_concurrency=5, retry_after=600, on_update=None):
+        """
+        Parameters:
+        - lookup: Funktion lookup(user_id: int), die einen Benutzer ohne Netzwerk liefert (oder None)
+        - fetch: Coroutine-Funktion fetch(user_id: int), die einen Benutzer über die API abruft
+        - ttl: Sekunden, nach denen ein Profil als veraltet gilt
+        - max_concurrency: Maximale Anzahl gleichzeitiger API-Abrufe
+        - retry_after: Sekunden, bis ein fehlgeschlagener Abruf in resolve() wiederholt wird
+        - on_update: Optional - Funktion on_update(user_ids), die nach einer Aktualisierung
+          im Hintergrund aufgerufen wird (kann auch später gesetzt werden)
+        """
+        self.lookup = lookup
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_concurrency = max(1, max_concurrency)
+        self.retry_after = retry_after
+        self.on_update = on_update
+        self._profiles = {}  # {user_id: UserProfile}
+        self._failed = {}  # {user_id: Zeitpunkt des letzten fehlgeschlagenen Abrufs (time.time)}
+        self._refreshing = set()  # User-IDs, die gerade im Hintergrund abgerufen werden
+        self._semaphore = None  # Wird beim ersten Abruf im Event-Loop erstellt
+        self._save_lock = None  # Wird beim ersten flush() im Event-Loop erstellt
+        self.dirty = False  # Ungespeicherte Änderungen
+        self.stats = {
+            "hits": 0,  # Aus dem Zwischenspeicher beantwortet
+            "local": 0,  # Aus dem lokalen Cache des Bots übernommen
+            "fetched": 0,  # Über die API abgerufen
+            "failed": 0,  # Fehlgeschlagene Abrufe
+            "skipped": 0,  # Wegen eines kürzlich fehlgeschlagenen Abrufs übersprungen
+            "evicted": 0  # Durch prune() entfernt
+        }
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def remember(self, user):
+        """
+        Merkt sich die Namen eines Benutzers (z.B. beim Zuweisen zu einem Team)
+
+        Parameters:
+        - user: Discord-Benutzer oder -Mitglied (id, name, display_name)
+
+        Returns:
+        - Das gespeicherte UserProfile
+        """
+        profile = UserProfile(user.name, getattr(user, "display_name", None) or user.name, time.time())
+        self._profiles[str(user.id)] = profile
+        self.dirty = True
+        return profile
+
+    def get(self, user_id):
+        """
+        Liefert das gemerkte Profil ohne Netzwerkzugriff
+
+        Veraltete Profile werden geliefert und im Hintergrund neu abgerufen.
+
+        Parameters:
+        - user_id: Discord-User-ID
+
+        Returns:
+        - UserProfile oder None, wenn der Benutzer unbekannt ist
+        """
+        user_id = str(user_id)
+        profile = self._profiles.get(user_id)
+        if profile is not None:
+            self.stats["hits"] += 1
+            if time.time() - profile.updated > self.ttl:
+                self._refresh_later(user_id)
+        return profile
+
+    async def user(self, user_id):
+        """
+        Liefert das Benutzer-Objekt (z.B. für DMs): lokaler Cache zuerst, sonst API-Abruf
+
+        Parameters:
+        - user_id: Discord-User-ID
+
+        Returns:
+        - Discord-Benutzer (Ausnahmen des API-Abrufs werden weitergereicht)
+        """
+        user = self.lookup(int(user_id))
+        if user is not None:
+            self.stats["local"] += 1
+        else:
+            user = await self._fetch(int(user_id))
+        self.remember(user)
+        return user
+
+    def missing(self, user_ids):
+        """
+        Ermittelt die Benutzer, für die resolve() die API abfragen würde
+
+        Benutzer aus dem lokalen Cache des Bots werden dabei übernommen; Benutzer,
+        deren Abruf vor weniger als retry_after Sekunden fehlgeschlagen ist, fehlen.
+
+        Parameters:
+        - user_ids: Iterable von Discord-User-IDs
+
+        Returns:
+        - Liste von User-IDs (als String) ohne Profil
+        """
+        missing = []
+        retry = time.time() - self.retry_after
+        for user_id in dict.fromkeys(str(user_id) for user_id in user_ids):
+            if self.get(user_id) is not None:
+                continue
+            user = self.lookup(int(user_id))
+            if user is not None:
+                self.stats["local"] += 1
+                self.remember(user)
+            elif self._failed.get(user_id, 0) > retry:
+                self.stats["skipped"] += 1
+            else:
+                missing.append(user_id)
+        return missing
+
+    async def resolve(self, user_ids):
+        """
+        Liefert die Profile mehrerer Benutzer; nur unbekannte werden abgerufen
+
+        Parameters:
+        - user_ids: Iterable von Discord-User-IDs
+
+        Returns:
+        - Dictionary {user_id (str): UserProfile} - Benutzer, deren Abruf fehlschlägt
+          oder kürzlich fehlgeschlagen ist, fehlen
+        """
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        missing = self.missing(user_ids)
+        profiles = {user_id: self._profiles[user_id] for user_id in user_ids if user_id in self._profiles}
+
+        if missing:
+            users = await asyncio.gather(*(self._fetch(int(user_id)) for user_id in missing), return_exceptions=True)
+            for user_id, user in zip(missing, users):
+                if isinstance(user, Exception):
+                    logger.warning(f"Konnte Benutzer {user_id} nicht abrufen: {user}")
+                    continue
+                profiles[user_id] = self.remember(user)
+        return profiles
+
+    async def _fetch(self, user_id):
+        """Ruft einen Benutzer über die API ab (höchstens max_concurrency gleichzeitig)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            try:
+                user = await self.fetch(user_id)
+            except Exception:
+                self.stats["failed"] += 1
+                self._failed[str(user_id)] = time.time()
+                raise
+        self.stats["fetched"] += 1
+        self._failed.pop(str(user_id), None)
+        return user
+
+    def _refresh_later(self, user_id):
+        """Ruft ein veraltetes Profil im Hintergrund neu ab"""
+        if user_id in self._refreshing:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._refreshing.add(user_id)
+
+        async def refresh():
+            try:
+                await self.user(user_id)
+                if self.on_update is not None:
+                    self.on_update((user_id,))
+            except Exception as e:
+                logger.warning(f"Konnte veraltetes Profil von Benutzer {user_id} nicht aktualisieren: {e}")
+            finally:
+                self._refreshing.discard(user_id)
+
+        loop.create_task(refresh())
+
+    def prune(self, keep=()):
+        """
+        Entfernt veraltete Profile von Benutzern, die nicht mehr benötigt werden
+
+        Parameters:
+        - keep: User-IDs, deren Profile erhalten bleiben (z.B. alle Team-Zuweisungen)
+
+        Returns:
+        - Anzahl der entfernten Profile
+        """
+        keep = {str(user_id) for user_id in keep}
+        expired = time.time() - self.ttl
+        evicted = [user_id for user_id, profile in self._profiles.items()
+                   if profile.updated < expired and user_id not in keep]
+        for user_id in evicted:
+            del self._profiles[user_id]
+        # Fehlgeschlagene Abrufe nur so lange merken, wie sie Wiederholungen verhindern
+        retry = time.time() - self.retry_after
+        self._failed = {user_id: failed for user_id, failed in self._failed.items() if failed > retry}
+        if evicted:
+            self.dirty = True
+            self.stats["evicted"] += len(evicted)
+        return len(evicted)
+
+    def load(self, path):
+        """
+        Lädt gespeicherte Profile (eine fehlende oder beschädigte Datei ergibt einen leeren Cache)
+
+        Parameters:
+        - path: Pfad der JSON-Datei
+        """
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._profiles = {str(user_id): UserProfile(*values) for user_id, values in data.items()}
+        except Exception as e:
+            logger.warning(f"Benutzerprofile aus {path} konnten nicht geladen werden: {e}")
+            self._profiles = {}
+        self.dirty = False
+
+    def _serialize(self):
+        """Erfasst die Profile als JSON-Bytes und setzt dirty zurück (None ohne Änderungen)"""
+        if not self.dirty:
+            return None
+        data = {user_id: list(profile) for user_id, profile in self._profiles.items()}
+        self.dirty = False
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    def save(self, path):
+        """
+        Speichert die Profile atomar, falls sie sich geändert haben
+
+        Parameters:
+        - path: Pfad der JSON-Datei
+        """
+        data = self._serialize()
+        if data is None:
+            return
+        try:
+            atomic_write(path, data)
+        except Exception:
+            self.dirty = True
+            raise
+
+    async def flush(self, path):
+        """
+        Wie save(), schreibt die Datei aber in einem Worker-Thread statt auf dem Event-Loop
+
+        Die Profile werden auf dem Event-Loop erfasst; Schreibvorgänge laufen nacheinander.
+
+        Parameters:
+        - path: Pfad der JSON-Datei
+        """
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        async with self._save_lock:
+            data = self._serialize()
+            if data is None:
+                return
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, atomic_write, path, data)
+            except Exception:
+                self.dirty = True
+                raise
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Nachrücken von der Warteliste.
+
+Alle Stellen, an denen Plätze frei werden (Abmeldung, Verkleinerung,
+Kapazitätserhöhung, Hintergrundprüfung), verwenden diese eine Engine:
+plan_promotions() berechnet in einem Durchlauf über die Warteliste, welche
+Teams wie viele Spieler nachrücken lassen, apply_promotions() übernimmt
+das Ergebnis als eine Zustandsänderung. Speichern, Anzeige und
+Benachrichtigungen erledigt der Aufrufer einmal für alle Nachrücker.
+
+Welche Einträge nachrücken, bestimmt die Vergabestrategie des Events
+(Event.allocation_policy, siehe POLICIES):
+- fifo: strikte Reihenfolge, der Kopf der Warteliste rückt notfalls teilweise nach
+- fifo_no_split: strikte Reihenfolge, Teams rücken nur vollständig nach
+- best_fit: füllt die freien Plätze möglichst vollständig mit ganzen Teams aus
+  den ersten BEST_FIT_LOOKAHEAD Einträgen; überholt wird nur ein Team, das
+  nicht vollständig passt, und je Durchlauf von höchstens
+  BEST_FIT_LOOKAHEAD - 1 später eingetragenen Teams
+
+Dieses Modul hat keine Abhängigkeiten zu discord oder config.
+"""
+
+import logging
+from typing import NamedTuple
+
+from models import Event, Team, WaitlistEntry
+
+logger = logging.getLogger("event_bot.promotion")
+
+# Anzahl der Wartelisten-Einträge, die best_fit gemeinsam betrachtet
+BEST_FIT_LOOKAHEAD = 8
+
+class Promotion(NamedTuple):
+    """Ein Wartelisten-Eintrag, der (teilweise) ins Event nachrückt"""
+    entry: WaitlistEntry  # Eintrag auf der Warteliste zum Zeitpunkt der Planung
+    size: int  # Anzahl der nachrückenden Spieler
+
+    @property
+    def team_name(self):
+        return self.entry.name
+
+    @property
+    def team_id(self):
+        return self.entry.team_id
+
+    @property
+    def complete(self):
+        """True, wenn der Eintrag vollständig von der Warteliste entfernt wird"""
+        return self.size == self.entry.size
+
+def plan_fifo(waitlist, free_slots):
+    """
+    Strikte Reihenfolge mit Teilnachrücken
+
+    Die Warteliste wird in Reihenfolge abgearbeitet, bis keine Plätze mehr frei
+    sind. Passt ein Eintrag nicht vollständig, rückt der passende Teil nach und
+    der Rest bleibt an der Spitze der Warteliste.
+
+    Parameters:
+    - waitlist: Warteliste des Events
+    - free_slots: Anzahl freier Plätze
+
+    Returns:
+    - Liste von Promotion-Einträgen
+    """
+    promotions = []
+    for entry in waitlist:
+        if free_slots <= 0:
+            break
+        moved = min(entry.size, free_slots)
+        promotions.append(Promotion(entry, moved))
+        free_slots -= moved
+    return promotions
+
+def plan_fifo_no_split(waitlist, free_slots):
+    """
+    Strikte Reihenfolge ohne Teilnachrücken
+
+    Passt der Kopf der Warteliste nicht vollständig, bleiben die Plätze frei,
+    bis genug Platz für das ganze Team ist. Niemand wird überholt.
+
+    Parameters:
+    - waitlist: Warteliste des Events
+    - free_slots: Anzahl freier Plätze
+
+    Returns:
+    - Liste von Promotion-Einträgen
+    """
+    promotions = []
+    for entry in waitlist:
+        if entry.size > free_slots:
+            break
+        promotions.append(Promotion(entry, entry.size))
+        free_slots -= entry.size
+    return promotions
+
+def plan_best_fit(waitlist, free_slots, lookahead=BEST_FIT_LOOKAHEAD):
+    """
+    Bestmögliche Auslastung mit ganzen Teams aus einem begrenzten Fenster
+
+    Solange der Kopf der Warteliste vollständig passt, rückt er wie bei FIFO
+    nach. Danach wird unter den übrigen Einträgen der ersten lookahead die
+    Auswahl gesucht, die die meisten freien Plätze belegt; bei gleicher
+    Auslastung gewinnt die Auswahl mit den früheren Einträgen. Teams werden
+    nie aufgeteilt.
+
+    Parameters:
+    - waitlist: Warteliste des Events
+    - free_slots: Anzahl freier Plätze
+    - lookahead: Größe des betrachteten Fensters (begrenzt das Überholen)
+
+    Returns:
+    - Liste von Promotion-Einträgen in Wartelisten-Reihenfolge
+    """
+    promotions = []
+    window = []
+    for entry in waitlist:
+        if len(promotions) + len(window) >= lookahead:
+            break
+        if not window and entry.size <= free_slots:
+            promotions.append(Promotion(entry, entry.size))
+            free_slots -= entry.size
+        else:
+            window.append(entry)
+
+    # Teilsummen-Tabelle: belegte Plätze -> früheste Auswahl (Indizes im Fenster)
+    best = {0: ()}
+    for index, entry in enumerate(window):
+        for used, chosen in list(best.items()):
+            total = used + entry.size
+            if total > free_slots:
+                continue
+            candidate = chosen + (index,)
+            if total not in best or candidate < best[total]:
+                best[total] = candidate
+    return promotions + [Promotion(window[index], window[index].size) for index in best[max(best)]]
+
+# Registrierte Vergabestrategien: Name -> (Anzeigename, Planungsfunktion)
+POLICIES = {
+    "fifo": ("Reihenfolge (Teams können geteilt werden)", plan_fifo),
+    "fifo_no_split": ("Reihenfolge (nur ganze Teams)", plan_fifo_no_split),
+    "best_fit": ("Beste Auslastung (begrenztes Überholen)", plan_best_fit),
+}
+
+def open_slots(event):
+    """
+    Freie Plätze, die eine neue Anmeldung direkt belegen darf
+
+    Solange Teams auf der Warteliste stehen, vergibt nur die Vergabestrategie
+    freie Plätze. Sonst könnten neue Teams an der Warteliste vorbei die Plätze
+    belegen, die fifo_no_split oder best_fit bewusst freihalten.
+
+    Parameters:
+    - event: Event (siehe models.py)
+
+    Returns:
+    - Anzahl der direkt belegbaren Plätze
+    """
+    if event.waitlist:
+        return 0
+    return max(0, event.max_slots - event.slots_used)
+
+def plan_promotions(event, policy=None):
+    """
+    Berechnet alle Nachrücker für die aktuell freien Plätze eines Events
+
+    Parameters:
+    - event: Event (siehe models.py)
+    - policy: Name der Vergabestrategie (Standard: die des Events)
+
+    Returns:
+    - Liste von Promotion-Einträgen (leer, wenn nichts frei ist oder nichts passt)
+    """
+    policy = policy or event.allocation_policy
+    if policy not in POLICIES:
+        logger.warning(f"Event '{event.id}': unbekannte Vergabestrategie {policy!r}, verwende {Event.DEFAULT_POLICY}")
+        policy = Event.DEFAULT_POLICY
+    return POLICIES[policy][1](event.waitlist, event.max_slots - event.slots_used)
+
+def apply_promotions(event, promotions):
+    """
+    Übernimmt geplante Nachrücker in das Event
+
+    Parameters:
+    - event: Event, für das die Nachrücker mit plan_promotions() berechnet wurden
+    - promotions: Ergebnis von plan_promotions()
+    """
+    for promotion in promotions:
+        entry = promotion.entry
+        if promotion.complete:
+            event.waitlist.remove(entry)
+        else:
+            event.waitlist.replace(entry, WaitlistEntry(entry.name, entry.size - promotion.size, entry.team_id))
+
+        # Bereits angemeldete Teams (beliebige Schreibweise) werden vergrößert
+        team = event.teams.find(promotion.team_name)
+        if team is not None:
+            team.size += promotion.size
+        else:
+            event.teams[promotion.team_name] = Team(promotion.team_name, promotion.size, promotion.team_id)
+        event.slots_used += promotion.size
+
+def promote_waitlist(event):
+    """
+    Lässt so viele Teams von der Warteliste nachrücken, wie Plätze frei sind
+
+    Parameters:
+    - event: Event (siehe models.py)
+
+    Returns:
+    - Liste der angewendeten Promotion-Einträge
+    """
+    promotions = plan_promotions(event)
+    apply_promotions(event, promotions)
+    return promotions
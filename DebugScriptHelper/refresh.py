@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Entprellte Aktualisierung der Event-Anzeigen.
+
+Änderungen markieren die Anzeige eines Events in einem Kanal nur als
+veraltet (RefreshScheduler.mark). Je Kanal läuft höchstens ein Task, der
+alle markierten Events dieses Kanals neu rendert - sofort, wenn die letzte
+Aktualisierung mindestens `interval` Sekunden zurückliegt, sonst am Ende
+des Intervalls. Gerendert wird immer der Zustand zum Zeitpunkt des
+Renderns, nicht der Zustand beim Markieren.
+
+Wird während des Renderns erneut markiert, folgt nach Ablauf des Intervalls
+eine weitere Aktualisierung, sodass der letzte Stand immer angezeigt wird.
+Markierungen, die in einer bereits anstehenden Aktualisierung aufgehen,
+werden als übersprungen gezählt (RefreshScheduler.stats).
+
+Dieses Modul hat keine Abhängigkeiten zu discord oder config.
+"""
+
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger("event_bot.refresh")
+
+class RefreshScheduler:
+    """Fasst Anzeige-Aktualisierungen je Kanal zusammen und begrenzt ihre Häufigkeit"""
+
+    def __init__(self, render, interval=2.0):
+        """
+        Parameters:
+        - render: Coroutine-Funktion render(channel_id, event_ids), die die Anzeigen neu rendert
+        - interval: Mindestabstand zweier Aktualisierungen eines Kanals in Sekunden
+        """
+        self.render = render
+        self.interval = max(0.0, interval)
+        self._dirty = {}  # {channel_id: {event_id: None}} - veraltete Anzeigen in Markierungsreihenfolge
+        self._tasks = {}  # {channel_id: asyncio.Task}
+        self._last = {}  # {channel_id: Zeitpunkt der letzten Aktualisierung (time.monotonic)}
+        self.stats = {
+            "marked": 0,  # Markierungen
+            "refreshes": 0,  # Gerenderte Anzeigen
+            "skipped": 0,  # In einer anstehenden Aktualisierung aufgegangene Markierungen
+            "failed": 0  # Fehlgeschlagene Aktualisierungen
+        }
+
+    @property
+    def pending(self):
+        """Anzahl der markierten, noch nicht gerenderten Anzeigen"""
+        return sum(len(events) for events in self._dirty.values())
+
+    def mark(self, channel_id, event_id):
+        """
+        Markiert die Anzeige eines Events in einem Kanal als veraltet
+
+        Parameters:
+        - channel_id: ID des Kanals der Anzeige
+        - event_id: ID des Events
+        """
+        self.stats["marked"] += 1
+        events = self._dirty.setdefault(channel_id, {})
+        if event_id in events:
+            self.stats["skipped"] += 1
+            return
+        events[event_id] = None
+        task = self._tasks.get(channel_id)
+        if task is None or task.done():
+            self._tasks[channel_id] = asyncio.get_running_loop().create_task(self._run(channel_id))
+
+    async def _run(self, channel_id):
+        """Task eines Kanals: rendert, solange Anzeigen markiert sind, höchstens einmal je Intervall"""
+        try:
+            while self._dirty.get(channel_id):
+                delay = self._last.get(channel_id, float("-inf")) + self.interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self._render(channel_id)
+        finally:
+            if self._tasks.get(channel_id) is asyncio.current_task():
+                del self._tasks[channel_id]
+
+    async def _render(self, channel_id):
+        """Rendert alle markierten Anzeigen eines Kanals"""
+        events = list(self._dirty.pop(channel_id, {}))
+        if not events:
+            return
+        self._last[channel_id] = time.monotonic()
+        self.stats["refreshes"] += len(events)
+        try:
+            await self.render(channel_id, events)
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Fehler beim Aktualisieren der Anzeigen in Kanal {channel_id}: {e}")
+
+    def forget(self, event_id):
+        """Entfernt ein gelöschtes Event aus den markierten Anzeigen"""
+        for events in self._dirty.values():
+            events.pop(event_id, None)
+
+    async def close(self):
+        """Beendet alle Tasks und rendert noch markierte Anzeigen sofort"""
+        tasks, self._tasks = list(self._tasks.values()), {}
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        for channel_id in list(self._dirty):
+            await self._render(channel_id)
+        logger.info(
+            f"Anzeige-Aktualisierung beendet: {self.stats['refreshes']} Aktualisierungen, "
+            f"{self.stats['skipped']} übersprungen"
+        )
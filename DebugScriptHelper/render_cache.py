@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Versionierter Zwischenspeicher für gerenderte Event-Ansichten.
+
+Jedes Event hat einen Versionszähler, der bei jeder gespeicherten Änderung
+erhöht wird (RenderCache.bump, aufgerufen mit dem ChangeScope eines
+Stapels, siehe transaction.py). Gerenderte Ansichten (Embed der Anzeige,
+Text-Fallback, Teamliste, Warteliste) werden unter
+(Event-Version, Ansicht, Seite) abgelegt; solange sich das Event nicht
+ändert, kostet eine erneute Anzeige nur einen Dictionary-Zugriff.
+
+Beim Erhöhen der Version werden die Ansichten des Events verworfen, der
+Speicher wächst also nur mit der Anzahl der Events und Ansichten.
+Gespeicherte Werte werden geteilt und dürfen nicht verändert werden.
+
+Dieses Modul hat keine Abhängigkeiten zu discord oder config.
+"""
+
+class RenderCache:
+    """Gerenderte Ansichten je Event, gültig bis zur nächsten Änderung des Events"""
+
+    def __init__(self):
+        self._versions = {}  # {event_id: Versionszähler}
+        self._entries = {}  # {event_id: {(Ansicht, Seite): (Version, Wert)}}
+        self.stats = {
+            "hits": 0,  # Aus dem Zwischenspeicher geliefert
+            "misses": 0,  # Neu gerendert
+            "invalidated": 0  # Durch eine Änderung verworfene Ansichten
+        }
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def version(self, event_id):
+        """
+        Liefert die aktuelle Version eines Events
+
+        Parameters:
+        - event_id: ID des Events
+
+        Returns:
+        - Versionszähler (0, solange das Event nicht geändert wurde)
+        """
+        return self._versions.get(event_id, 0)
+
+    def bump(self, event_ids=None):
+        """
+        Erhöht die Version geänderter Events und verwirft ihre Ansichten
+
+        Parameters:
+        - event_ids: IDs der geänderten Events; None für alle Events
+        """
+        if event_ids is None:
+            event_ids = set(self._versions) | set(self._entries)
+        for event_id in event_ids:
+            self._versions[event_id] = self._versions.get(event_id, 0) + 1
+            entries = self._entries.pop(event_id, None)
+            if entries:
+                self.stats["invalidated"] += len(entries)
+
+    def get(self, event_id, view, build, page=0):
+        """
+        Liefert eine gerenderte Ansicht, rendert sie nur nach einer Änderung neu
+
+        Parameters:
+        - event_id: ID des Events
+        - view: Name der Ansicht (z.B. "details", "team_list")
+        - build: Funktion ohne Parameter, die die Ansicht rendert
+        - page: Optional - Seite der Ansicht
+
+        Returns:
+        - Die (geteilte) gerenderte Ansicht
+        """
+        version = self._versions.get(event_id, 0)
+        entries = self._entries.setdefault(event_id, {})
+        entry = entries.get((view, page))
+        if entry is not None and entry[0] == version:
+            self.stats["hits"] += 1
+            return entry[1]
+        self.stats["misses"] += 1
+        value = build()
+        entries[(view, page)] = (version, value)
+        return value
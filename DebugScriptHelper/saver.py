@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Hintergrund-Speicherdienst für den Event-Bot.
+
+Die Command-Handler melden Änderungen nur noch mit mark_dirty() an. Mehrere
+Meldungen innerhalb des Zeitfensters werden zu einem einzigen Schreibvorgang
+zusammengefasst. Die Änderungen werden auf dem Event-Loop erfasst
+(storage.prepare_save) und in einem eigenen Thread geschrieben
+(storage.write_save), sodass Festplattenzugriffe den Gateway-Loop nicht blockieren.
+
+Für Pfade, die sicher auf der Platte sein müssen, bevor es weitergeht
+(z.B. Event erstellen/löschen), gibt es die Barriere flush().
+
+Meldungen mit ChangeScope (siehe transaction.py) werden zusammengeführt;
+fehlt bei einer Meldung im Zeitfenster der ChangeScope, wird der komplette
+Zustand verglichen.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("event_bot.saver")
+
+class BackgroundSaver:
+    """
+    Fasst Speicheranforderungen zusammen und schreibt sie im Hintergrund
+
+    Alle Schreibaufträge laufen über einen einzigen Worker-Thread und werden
+    daher in der Reihenfolge geschrieben, in der sie erstellt wurden.
+    """
+
+    def __init__(self, storage, window=1.0):
+        """
+        Parameters:
+        - storage: Speicher-Backend (siehe storage.create_storage)
+        - window: Zeitfenster in Sekunden, in dem Änderungen zusammengefasst werden
+        """
+        self.storage = storage
+        self.window = max(0.0, window)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-saver")
+        self._pending = None  # Zuletzt gemeldeter Zustand (event_data, channel_id, user_team_assignments)
+        self._pending_scope = None  # Zusammengeführter ChangeScope der Meldungen (None = alles vergleichen)
+        self._pending_marks = 0  # Anzahl Meldungen seit dem letzten Schreibauftrag
+        self._timer = None  # Geplanter Schreibauftrag (asyncio.TimerHandle)
+        self._last_write = None  # Future des zuletzt übergebenen Schreibauftrags
+        self.stats = {
+            "requested": 0,  # Anzahl mark_dirty()-Aufrufe
+            "written": 0,  # Tatsächlich geschriebene Aufträge
+            "coalesced": 0,  # Eingesparte Schreibvorgänge durch Zusammenfassen
+            "failed": 0  # Fehlgeschlagene Schreibvorgänge
+        }
+
+    def mark_dirty(self, event_data, channel_id, user_team_assignments, scope=None):
+        """
+        Meldet einen geänderten Zustand; geschrieben wird spätestens nach window Sekunden
+
+        Muss aus dem laufenden Event-Loop aufgerufen werden.
+
+        Parameters:
+        - scope: Optional - ChangeScope der gemeldeten Änderung (None = alles vergleichen)
+        """
+        if self._pending is None:
+            self._pending_scope = scope
+        elif self._pending_scope is not None:
+            self._pending_scope = self._pending_scope.merge(scope) if scope is not None else None
+        self._pending = (event_data, channel_id, user_team_assignments)
+        self._pending_marks += 1
+        self.stats["requested"] += 1
+        if self._timer is None:
+            self._schedule()
+
+    def _schedule(self):
+        """Plant den nächsten Schreibauftrag nach Ablauf des Zeitfensters"""
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(self.window, self._on_timer)
+
+    def _on_timer(self):
+        """Callback des Zeitfensters"""
+        self._timer = None
+        self._submit()
+
+    def _submit(self):
+        """
+        Erstellt den Schreibauftrag auf dem Event-Loop und übergibt ihn an den Worker-Thread
+
+        Returns:
+        - False, wenn der Auftrag nicht erstellt werden konnte
+        """
+        if self._pending is None:
+            return True
+
+        state = self._pending
+        scope = self._pending_scope
+        marks = self._pending_marks
+        self._pending = None
+        self._pending_scope = None
+        self._pending_marks = 0
+        if marks > 1:
+            self.stats["coalesced"] += marks - 1
+
+        try:
+            job = self.storage.prepare_save(*state, scope=scope)
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Error saving data: {e}")
+            self.storage.invalidate()
+            return False
+
+        if job is None:
+            return True
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self.storage.write_save, job)
+        future.add_done_callback(lambda f: self._on_written(f, state))
+        self._last_write = future
+        logger.debug(f"Speicherauftrag übergeben ({marks} Änderungsmeldungen zusammengefasst)")
+        return True
+
+    def _on_written(self, future, state):
+        """Wertet das Ergebnis eines Schreibauftrags aus (läuft auf dem Event-Loop)"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            self.stats["written"] += 1
+            return
+
+        self.stats["failed"] += 1
+        logger.error(f"Error saving data: {error}")
+        # Der persistierte Stand ist unbekannt: beim nächsten Versuch den kompletten Zustand schreiben
+        self.storage.invalidate()
+        if self._pending is None:
+            self._pending = state
+            self._pending_marks = 1
+        # Nach invalidate() wird ohnehin der komplette Zustand geschrieben
+        self._pending_scope = None
+        if self._timer is None:
+            self._schedule()
+
+    async def flush(self):
+        """
+        Schreibt alle gemeldeten Änderungen sofort und wartet, bis sie auf der Platte sind
+
+        Returns:
+        - True, wenn alle bis zu diesem Zeitpunkt gemeldeten Änderungen geschrieben wurden
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._submit():
+            return False
+
+        future = self._last_write
+        if future is None:
+            return True
+        try:
+            # shield: ein abgebrochener Aufrufer darf den Schreibvorgang nicht abbrechen
+            await asyncio.shield(future)
+        except Exception:
+            return False
+        return True
+
+    async def close(self):
+        """Schreibt ausstehende Änderungen und beendet den Worker-Thread"""
+        await self.flush()
+        self._executor.shutdown(wait=True)
+        logger.info(
+            f"Speicherdienst beendet: {self.stats['requested']} Anforderungen, "
+            f"{self.stats['written']} Schreibvorgänge, {self.stats['coalesced']} zusammengefasst, "
+            f"{self.stats['failed']} fehlgeschlagen"
+        )
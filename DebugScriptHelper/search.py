@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Suchindex für Teams und Benutzer (/find).
+
+SearchIndex ist ein allgemeiner Index über kurze Texte je Schlüssel:
+- Präfixe über eine sortierte Liste aller Texte (bisect statt Scan)
+- Teilstrings über Trigramme: nur Schlüssel, die alle Trigramme der Suche
+  enthalten, werden geprüft
+- Tippfehler über gemeinsame Trigramme und eine begrenzte Editierdistanz
+  zum ganzen Text oder einem seiner Wörter
+
+Treffer werden gerankt (exakt < Präfix < Teilstring < ähnlich, dann nach
+Distanz und Länge) und seitenweise geliefert; die Gesamtzahl zählt immer
+alle Treffer, unabhängig von der Seite. Nur die Autovervollständigung sucht
+ähnliche Treffer erst, wenn die direkten die Vorschläge nicht füllen.
+
+EventSearch hält je Event einen Index für die Teams (Name, Team-ID) und
+einen gemeinsamen Index für die zugewiesenen Benutzer (User-ID, Name,
+Anzeigename aus dem Profil-Cache) aktuell; complete() liefert daraus
+Vorschläge für die Autovervollständigung. update() gleicht nur die Events
+und Benutzer eines ChangeScope ab (siehe transaction.py) und ändert dabei
+nur die Einträge, die sich tatsächlich geändert haben.
+
+Dieses Modul hat keine Abhängigkeiten zu discord oder config.
+"""
+
+import logging
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import NamedTuple
+
+logger = logging.getLogger("event_bot.search")
+
+# Ranking der Trefferarten
+MATCH_EXACT = 0
+MATCH_PREFIX = 1
+MATCH_SUBSTRING = 2
+MATCH_FUZZY = 3
+
+def normalize(text):
+    """Vereinheitlicht einen Text für die Suche (Groß-/Kleinschreibung, Leerraum)"""
+    return " ".join(str(text).casefold().split())
+
+def trigrams(text, padded=False):
+    """
+    Zerlegt einen normalisierten Text in Trigramme
+
+    Parameters:
+    - text: Normalisierter Text
+    - padded: Ob Anfang und Ende markiert werden (für die Ähnlichkeitssuche)
+
+    Returns:
+    - Menge der Trigramme
+    """
+    if padded:
+        text = f"\x02{text}\x03"
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def edit_distance(a, b, limit):
+    """
+    Levenshtein-Distanz mit Abbruch
+
+    Parameters:
+    - a, b: Zu vergleichende Texte
+    - limit: Größte interessante Distanz
+
+    Returns:
+    - Distanz oder limit + 1, wenn sie größer als limit ist
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+def words(text):
+    """Liefert einen normalisierten Text und, bei mehreren Wörtern, zusätzlich die einzelnen Wörter"""
+    return (text, *text.split(" ")) if " " in text else (text,)
+
+def rank(hit):
+    """Sortierschlüssel eines Treffers: Trefferart, Distanz, Länge, Text"""
+    return (hit.match, hit.distance, len(hit.text), hit.text)
+
+class SearchHit(NamedTuple):
+    """Ein Suchtreffer"""
+    key: tuple  # Schlüssel des Eintrags
+    text: str  # Getroffener (normalisierter) Text
+    match: int  # Trefferart (MATCH_*)
+    distance: int  # Editierdistanz (nur bei MATCH_FUZZY, sonst 0)
+
+class SearchIndex:
+    """Trigramm- und Präfix-Index über Texte je Schlüssel"""
+
+    def __init__(self):
+        self._texts = {}  # {Schlüssel: Tupel normalisierter Texte}
+        self._postings = {}  # {Trigramm: Menge von Schlüsseln}
+        self._sorted = []  # Sortierte Liste von (Text, Schlüssel) für Präfix-Bereiche
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, key):
+        return key in self._texts
+
+    def add(self, key, texts):
+        """
+        Nimmt einen Eintrag auf oder ersetzt ihn
+
+        Parameters:
+        - key: Schlüssel (Tupel aus Strings)
+        - texts: Durchsuchbare Texte des Eintrags (z.B. Name und ID)
+        """
+        self.remove(key)
+        normalized = tuple(dict.fromkeys(text for text in map(normalize, texts) if text))
+        self._texts[key] = normalized
+        for text in normalized:
+            insort(self._sorted, (text, key))
+            for gram in trigrams(text, padded=True):
+                self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key):
+        """Entfernt einen Eintrag (fehlende Schlüssel werden ignoriert)"""
+        texts = self._texts.pop(key, None)
+        if texts is None:
+            return
+        for text in texts:
+            index = bisect_left(self._sorted, (text, key))
+            if index < len(self._sorted) and self._sorted[index] == (text, key):
+                del self._sorted[index]
+            for gram in trigrams(text, padded=True):
+                keys = self._postings.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._postings[gram]
+
+    def prefix(self, term, limit=25):
+        """
+        Liefert Schlüssel, deren Texte mit dem Suchbegriff beginnen, in alphabetischer Reihenfolge
+
+        Liest nur den passenden Bereich der sortierten Liste und bricht nach limit Schlüsseln ab.
+
+        Parameters:
+        - term: Suchbegriff (leer: alle Einträge)
+        - limit: Maximale Anzahl der Schlüssel
+
+        Returns:
+        - Liste von Schlüsseln (ohne Duplikate)
+        """
+        query = normalize(term)
+        keys = {}
+        index = bisect_left(self._sorted, (query,))
+        while index < len(self._sorted) and len(keys) < limit and self._sorted[index][0].startswith(query):
+            keys[self._sorted[index][1]] = None
+            index += 1
+        return list(keys)
+
+    def search(self, term, limit=10, offset=0, accept=None, max_distance=None):
+        """
+        Sucht Einträge und liefert eine Seite gerankter Treffer
+
+        Parameters:
+        - term: Suchbegriff
+        - limit: Treffer pro Seite
+        - offset: Anzahl übersprungener Treffer
+        - accept: Optional - Funktion accept(key), die Einträge zulässt (z.B. nur ein Event)
+        - max_distance: Größte Editierdistanz für ähnliche Treffer
+          (Standard: 1 bis 4 Zeichen, sonst 2; unter 3 Zeichen keine Ähnlichkeitssuche)
+
+        Returns:
+        - Tupel (Liste von SearchHit, Gesamtzahl aller Treffer)
+        """
+        hits = self.matches(term, accept, max_distance=max_distance)
+        return hits[offset:offset + limit], len(hits)
+
+    def matches(self, term, accept=None, wanted=None, max_distance=None):
+        """
+        Sucht alle Treffer in Rangfolge (siehe search)
+
+        Parameters:
+        - term: Suchbegriff
+        - accept: Optional - Funktion accept(key), die Einträge zulässt
+        - wanted: Optional - Anzahl benötigter Treffer; ähnliche Treffer werden nur gesucht,
+          wenn die direkten Treffer weniger sind
+        - max_distance: Größte Editierdistanz für ähnliche Treffer
+
+        Returns:
+        - Liste von SearchHit in Rangfolge
+        """
+        query = normalize(term)
+        if not query:
+            return []
+        if max_distance is None:
+            max_distance = 0 if len(query) < 3 else 1 if len(query) <= 4 else 2
+        best = {}  # {Schlüssel: SearchHit}
+
+        def record(key, text, match, distance=0):
+            hit = best.get(key)
+            if (hit is None or (match, distance) < (hit.match, hit.distance)) and (accept is None or accept(key)):
+                best[key] = SearchHit(key, text, match, distance)
+
+        # Exakte Treffer und Präfixe: zusammenhängender Bereich der sortierten Liste
+        index = bisect_left(self._sorted, (query,))
+        while index < len(self._sorted) and self._sorted[index][0].startswith(query):
+            text, key = self._sorted[index]
+            record(key, text, MATCH_EXACT if text == query else MATCH_PREFIX)
+            index += 1
+
+        grams = trigrams(query)
+        if grams:
+            # Teilstrings: Schnittmenge der Trigramm-Listen, kleinste zuerst
+            postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:]) if postings[0] else set()
+            for key in candidates:
+                if key in best:
+                    continue
+                for text in self._texts[key]:
+                    if query in text:
+                        record(key, text, MATCH_SUBSTRING)
+                        break
+
+        if max_distance > 0 and (wanted is None or len(best) < wanted):
+            # Ähnliche Texte: genug gemeinsame Trigramme, dann begrenzte Editierdistanz
+            padded = trigrams(query, padded=True)
+            shared = Counter()
+            for gram in padded:
+                shared.update(self._postings.get(gram, ()))
+            # Jede Änderung zerstört höchstens drei Trigramme
+            needed = max(1, len(padded) - 3 * max_distance)
+            for key, count in shared.items():
+                if count < needed or key in best:
+                    continue
+                distance = min(
+                    edit_distance(query, word, max_distance)
+                    for text in self._texts[key] for word in words(text)
+                )
+                if distance <= max_distance:
+                    record(key, self._texts[key][0], MATCH_FUZZY, distance)
+
+        return sorted(best.values(), key=rank)
+
+class EventSearch:
+    """Hält je Event einen SearchIndex über die Teams und einen über die zugewiesenen Benutzer aktuell"""
+
+    def __init__(self, event_data, assignments, profiles=None):
+        """
+        Parameters:
+        - event_data: {event_id: Event} des Bots
+        - assignments: TeamAssignments des Bots
+        - profiles: Optional - ProfileCache für Benutzernamen (siehe profiles.py)
+        """
+        self.event_data = event_data
+        self.assignments = assignments
+        self.profiles = profiles
+        self.teams = {}  # {event_id: SearchIndex} - Teams je Event
+        self.users = SearchIndex()  # Zugewiesene Benutzer aller Events
+        self._events = {}  # {event_id: {Schlüssel: Texte}} - indizierte Teams je Event
+        self._users = {}  # {user_id: Texte} - indizierte Benutzer
+        self.unnamed = set()  # Indizierte Benutzer ohne bekanntes Profil
+
+    def update(self, scope=None):
+        """
+        Gleicht die Indizes mit dem aktuellen Zustand ab
+
+        Parameters:
+        - scope: Optional - ChangeScope; ohne scope werden alle Events und Benutzer abgeglichen
+        """
+        if scope is None:
+            events = set(self.event_data) | set(self._events)
+            users = set(self.assignments) | set(self._users)
+        else:
+            events, users = scope.events, scope.users
+        for event_id in events:
+            self._sync_event(event_id)
+        for user_id in users:
+            self._sync_user(user_id)
+
+    def _sync_event(self, event_id):
+        """Gleicht die Teams eines Events ab (Anmeldung und Warteliste)"""
+        event = self.event_data.get(event_id)
+        entries = {}
+        if event is not None:
+            for entry in event.waitlist:
+                entries[("team", event_id, entry.name.casefold())] = (entry.name, entry.team_id)
+            for name, team in event.teams.items():
+                entries[("team", event_id, name.casefold())] = (name, team.id)
+
+        indexed = self._events.pop(event_id, {})
+        if not entries:
+            self.teams.pop(event_id, None)
+            return
+        index = self.teams.setdefault(event_id, SearchIndex())
+        for key in indexed.keys() - entries.keys():
+            index.remove(key)
+        for key, texts in entries.items():
+            if indexed.get(key) != texts:
+                index.add(key, texts)
+        self._events[event_id] = entries
+
+    def _sync_user(self, user_id):
+        """Gleicht einen Benutzer ab (User-ID und Namen aus dem Profil-Cache)"""
+        user_id = str(user_id)
+        key = ("user", user_id)
+        if user_id not in self.assignments:
+            self._users.pop(user_id, None)
+            self.unnamed.discard(user_id)
+            self.users.remove(key)
+            return
+
+        profile = self.profiles.get(user_id) if self.profiles is not None else None
+        texts = (user_id, profile.name, profile.display_name) if profile is not None else (user_id,)
+        if profile is None:
+            self.unnamed.add(user_id)
+        else:
+            self.unnamed.discard(user_id)
+        if self._users.get(user_id) != texts:
+            self._users[user_id] = texts
+            self.users.add(key, texts)
+
+    def _in_event(self, event, user_id):
+        """Prüft, ob das Team eines zugewiesenen Benutzers im Event angemeldet oder auf der Warteliste ist"""
+        team_name = self.assignments.get(user_id)
+        return team_name is not None and (
+            event.teams.find(team_name) is not None or bool(event.waitlist.entries_for(team_name)))
+
+    def unnamed_in(self, event):
+        """
+        Liefert die indizierten Benutzer ohne bekanntes Profil, deren Team im Event ist
+
+        Parameters:
+        - event: Event (siehe models.py)
+
+        Returns:
+        - Liste von User-IDs
+        """
+        return [user_id for user_id in self.unnamed if self._in_event(event, user_id)]
+
+    def complete(self, event_id, term, limit=25):
+        """
+        Vorschläge für Teamnamen eines Events (z.B. für die Autovervollständigung)
+
+        Zuerst Namen und IDs, die mit dem Begriff beginnen, alphabetisch; reicht
+        das nicht, werden Teilstring- und ähnliche Treffer angehängt.
+
+        Parameters:
+        - event_id: ID des Events
+        - term: Bisher eingegebener Text
+        - limit: Maximale Anzahl der Vorschläge
+
+        Returns:
+        - Liste von Tupeln (Teamname, Team-ID)
+        """
+        index = self.teams.get(event_id)
+        if index is None:
+            return []
+        keys = dict.fromkeys(index.prefix(term, limit))
+        if len(keys) < limit and normalize(term):
+            for hit in index.matches(term, wanted=limit):
+                keys.setdefault(hit.key)
+        entries = self._events[event_id]
+        return [entries[key] for key in list(keys)[:limit]]
+
+    def search(self, event, term, limit=10, offset=0):
+        """
+        Sucht Teams eines Events und Benutzer, deren Team im Event ist
+
+        Parameters:
+        - event: Event (siehe models.py)
+        - term: Suchbegriff
+        - limit: Treffer pro Seite
+        - offset: Anzahl übersprungener Treffer
+
+        Returns:
+        - Tupel (Liste von SearchHit, Gesamtzahl aller Treffer)
+        """
+        def accept(key):
+            return self._in_event(event, key[1])
+
+        # Immer alle Treffer suchen, damit Gesamtzahl und Seitenanzahl nicht von der Seite abhängen
+        hits = self.users.matches(term, accept)
+        index = self.teams.get(event.id)
+        if index is not None:
+            hits += index.matches(term)
+        hits.sort(key=rank)
+        return hits[offset:offset + limit], len(hits)
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Binärformat und Migration der gespeicherten Bot-Daten.
+
+Der Zustand wird in einem versionierten, mit struct gepackten Format
+gespeichert. Das Event-Schema ist fest vorgegeben: Teams werden als Tabelle
+(Name, Größe, ID) und die Warteliste als geordnete Zeilen (Name, Größe, ID)
+geschrieben, alle übrigen Event-Felder als typisierte Einzelwerte.
+
+Kanonisches Datenlayout (SCHEMA_VERSION 3):
+- event_data:        {event_id: event} (beliebig viele gleichzeitige Events)
+- event["id"]:       event_id (identisch mit dem Schlüssel in event_data)
+- event["teams"]:    {team_name: {"size": int, "id": str}}
+- event["waitlist"]: [(team_name, size, team_id), ...]
+
+Ältere Pickle-Dateien (Teams als {name: größe}, Wartelisten-Einträge als
+2-Tupel, Test-Dateien als Tupel (event_data, channel_id, user_team_assignments))
+werden beim Laden einmalig mit migrate_state() in dieses Layout überführt.
+"""
+
+import struct
+import hashlib
+from datetime import date, datetime
+
+# Version des Binärformats (Aufbau der Datei) und des Datenlayouts
+FORMAT_VERSION = 2
+SCHEMA_VERSION = 3
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+# Kennzeichnung für fehlende Strings (None) in Tabellenzeilen
+_NO_STRING = 0xFFFFFFFF
+
+# Typ-Kennungen für Einzelwerte
+_T_NONE = b"N"
+_T_TRUE = b"T"
+_T_FALSE = b"F"
+_T_INT = b"i"
+_T_BIGINT = b"I"
+_T_FLOAT = b"f"
+_T_STR = b"s"
+_T_BYTES = b"b"
+_T_LIST = b"l"
+_T_TUPLE = b"t"
+_T_DICT = b"d"
+_T_DATETIME = b"D"
+_T_DATE = b"a"
+
+# Kennungen für Event-Felder und event_data-Einträge
+_F_VALUE = b"V"
+_F_TEAMS = b"T"
+_F_WAITLIST = b"W"
+_E_VALUE = b"v"
+_E_EVENT = b"e"
+
+_I64_MIN = -(1 << 63)
+_I64_MAX = (1 << 63) - 1
+
+
+class FormatError(Exception):
+    """Die Daten entsprechen nicht dem erwarteten Binärformat"""
+
+
+# ############################# #
+# EINZELWERTE                   #
+# ############################# #
+
+def _put_str(out, value):
+    """Schreibt einen String mit Längenpräfix"""
+    data = value.encode("utf-8")
+    out.append(_U32.pack(len(data)))
+    out.append(data)
+
+def _put_opt_str(out, value):
+    """Schreibt einen String oder None"""
+    if value is None:
+        out.append(_U32.pack(_NO_STRING))
+    else:
+        _put_str(out, value)
+
+def _put_value(out, value):
+    """Schreibt einen typisierten Einzelwert"""
+    if value is None:
+        out.append(_T_NONE)
+    elif value is True:
+        out.append(_T_TRUE)
+    elif value is False:
+        out.append(_T_FALSE)
+    elif isinstance(value, int):
+        if _I64_MIN <= value <= _I64_MAX:
+            out.append(_T_INT)
+            out.append(_I64.pack(value))
+        else:
+            out.append(_T_BIGINT)
+            _put_str(out, str(value))
+    elif isinstance(value, float):
+        out.append(_T_FLOAT)
+        out.append(_F64.pack(value))
+    elif isinstance(value, str):
+        out.append(_T_STR)
+        _put_str(out, value)
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(_T_BYTES)
+        out.append(_U32.pack(len(value)))
+        out.append(bytes(value))
+    elif isinstance(value, datetime):
+        out.append(_T_DATETIME)
+        _put_str(out, value.isoformat())
+    elif isinstance(value, date):
+        out.append(_T_DATE)
+        _put_str(out, value.isoformat())
+    elif isinstance(value, tuple):
+        out.append(_T_TUPLE)
+        out.append(_U32.pack(len(value)))
+        for item in value:
+            _put_value(out, item)
+    elif isinstance(value, list):
+        out.append(_T_LIST)
+        out.append(_U32.pack(len(value)))
+        for item in value:
+            _put_value(out, item)
+    elif isinstance(value, dict):
+        out.append(_T_DICT)
+        out.append(_U32.pack(len(value)))
+        for key, item in value.items():
+            _put_value(out, key)
+            _put_value(out, item)
+    else:
+        raise TypeError(f"Typ {type(value).__name__} kann nicht gespeichert werden")
+
+
+class _Reader:
+    """Liest Werte aus einem Byte-Puffer"""
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def _take(self, size):
+        end = self.offset + size
+        if end > len(self.data):
+            raise FormatError("Daten unerwartet zu Ende")
+        chunk = self.data[self.offset:end]
+        self.offset = end
+        return chunk
+
+    def unpack(self, fmt):
+        (value,) = fmt.unpack(self._take(fmt.size))
+        return value
+
+    def str(self):
+        return str(self._take(self.unpack(_U32)), "utf-8")
+
+    def opt_str(self):
+        length = self.unpack(_U32)
+        if length == _NO_STRING:
+            return None
+        return str(self._take(length), "utf-8")
+
+    def tag(self):
+        return bytes(self._take(1))
+
+    def value(self):
+        tag = self.tag()
+        if tag == _T_NONE:
+            return None
+        if tag == _T_TRUE:
+            return True
+        if tag == _T_FALSE:
+            return False
+        if tag == _T_INT:
+            return self.unpack(_I64)
+        if tag == _T_BIGINT:
+            return int(self.str())
+        if tag == _T_FLOAT:
+            return self.unpack(_F64)
+        if tag == _T_STR:
+            return self.str()
+        if tag == _T_BYTES:
+            return bytes(self._take(self.unpack(_U32)))
+        if tag == _T_DATETIME:
+            return datetime.fromisoformat(self.str())
+        if tag == _T_DATE:
+            return date.fromisoformat(self.str())
+        if tag == _T_TUPLE:
+            return tuple(self.value() for _ in range(self.unpack(_U32)))
+        if tag == _T_LIST:
+            return [self.value() for _ in range(self.unpack(_U32))]
+        if tag == _T_DICT:
+            result = {}
+            for _ in range(self.unpack(_U32)):
+                key = self.value()
+                result[key] = self.value()
+            return result
+        raise FormatError(f"Unbekannte Typ-Kennung {tag!r}")
+
+    def done(self):
+        if self.offset != len(self.data):
+            raise FormatError(f"{len(self.data) - self.offset} Bytes nach dem Ende der Daten")
+
+def encode_value(value):
+    """
+    Serialisiert einen einzelnen Wert (None, bool, int, float, str, bytes,
+    datetime, date sowie Listen, Tupel und Dictionaries daraus)
+
+    Returns:
+    - bytes
+    """
+    out = []
+    _put_value(out, value)
+    return b"".join(out)
+
+def decode_value(data):
+    """Gegenstück zu encode_value"""
+    reader = _Reader(data)
+    value = reader.value()
+    reader.done()
+    return value
+
+
+# ############################# #
+# ZUSTAND                       #
+# ############################# #
+
+def _is_team_table(teams):
+    """Prüft, ob sich die Teams als Tabelle (Name, Größe, ID) schreiben lassen"""
+    for data in teams.values():
+        if not isinstance(data, dict) or data.keys() != {"size", "id"} or not isinstance(data["size"], int) \
+                or not (data["id"] is None or isinstance(data["id"], str)):
+            return False
+    return True
+
+def _is_waitlist_table(waitlist):
+    """Prüft, ob sich die Warteliste als Tabelle (Name, Größe, ID) schreiben lässt"""
+    for entry in waitlist:
+        if not isinstance(entry, tuple) or len(entry) != 3 or not isinstance(entry[1], int) \
+                or not (entry[2] is None or isinstance(entry[2], str)):
+            return False
+    return True
+
+def _put_event(out, event):
+    """Schreibt ein Event gemäß Schema (Teams und Warteliste als Tabellen)"""
+    out.append(_U32.pack(len(event)))
+    for field, value in event.items():
+        _put_str(out, field)
+        if field == "teams" and isinstance(value, dict) and _is_team_table(value):
+            out.append(_F_TEAMS)
+            out.append(_U32.pack(len(value)))
+            for name, data in value.items():
+                _put_str(out, name)
+                out.append(_I64.pack(data["size"]))
+                _put_opt_str(out, data["id"])
+        elif field == "waitlist" and isinstance(value, list) and _is_waitlist_table(value):
+            out.append(_F_WAITLIST)
+            out.append(_U32.pack(len(value)))
+            for name, size, team_id in value:
+                _put_str(out, name)
+                out.append(_I64.pack(size))
+                _put_opt_str(out, team_id)
+        else:
+            # Nicht-kanonische Daten werden unverändert (aber ohne Tabellenlayout) gespeichert
+            out.append(_F_VALUE)
+            _put_value(out, value)
+
+def _read_event(reader):
+    """Liest ein mit _put_event geschriebenes Event"""
+    event = {}
+    for _ in range(reader.unpack(_U32)):
+        field = reader.str()
+        kind = reader.tag()
+        if kind == _F_TEAMS:
+            teams = {}
+            for _ in range(reader.unpack(_U32)):
+                name = reader.str()
+                size = reader.unpack(_I64)
+                teams[name] = {"size": size, "id": reader.opt_str()}
+            event[field] = teams
+        elif kind == _F_WAITLIST:
+            waitlist = []
+            for _ in range(reader.unpack(_U32)):
+                name = reader.str()
+                size = reader.unpack(_I64)
+                waitlist.append((name, size, reader.opt_str()))
+            event[field] = waitlist
+        elif kind == _F_VALUE:
+            event[field] = reader.value()
+        else:
+            raise FormatError(f"Unbekannte Feld-Kennung {kind!r}")
+    return event
+
+def encode_state(state, journal_seq=0):
+    """
+    Serialisiert den kompletten Zustand im Binärformat
+
+    Parameters:
+    - state: Dictionary mit 'event_data', 'channel_id' und 'user_team_assignments'
+    - journal_seq: Letzte im Zustand enthaltene Journal-Nummer
+
+    Returns:
+    - bytes (ohne Dateikopf/Prüfsumme)
+    """
+    out = [_U16.pack(SCHEMA_VERSION), _I64.pack(journal_seq)]
+    _put_value(out, state["channel_id"])
+
+    assignments = state["user_team_assignments"]
+    out.append(_U32.pack(len(assignments)))
+    for user_id, team_name in assignments.items():
+        _put_str(out, str(user_id))
+        _put_opt_str(out, team_name)
+
+    event_data = state["event_data"]
+    out.append(_U32.pack(len(event_data)))
+    for key, value in event_data.items():
+        _put_value(out, key)
+        if isinstance(value, dict):
+            out.append(_E_EVENT)
+            _put_event(out, value)
+        else:
+            out.append(_E_VALUE)
+            _put_value(out, value)
+
+    return b"".join(out)
+
+def decode_state(data):
+    """
+    Gegenstück zu encode_state
+
+    Returns:
+    - Tupel (state, journal_seq, schema_version)
+
+    Raises:
+    - FormatError bei ungültigen Daten
+    """
+    reader = _Reader(data)
+    schema_version = reader.unpack(_U16)
+    if schema_version > SCHEMA_VERSION:
+        raise FormatError(f"Schema-Version {schema_version} ist neuer als diese Version ({SCHEMA_VERSION})")
+    journal_seq = reader.unpack(_I64)
+    channel_id = reader.value()
+
+    assignments = {}
+    for _ in range(reader.unpack(_U32)):
+        user_id = reader.str()
+        assignments[user_id] = reader.opt_str()
+
+    event_data = {}
+    for _ in range(reader.unpack(_U32)):
+        key = reader.value()
+        kind = reader.tag()
+        if kind == _E_EVENT:
+            event_data[key] = _read_event(reader)
+        elif kind == _E_VALUE:
+            event_data[key] = reader.value()
+        else:
+            raise FormatError(f"Unbekannte Eintrags-Kennung {kind!r}")
+    reader.done()
+
+    state = {"event_data": event_data, "channel_id": channel_id, "user_team_assignments": assignments}
+    return state, journal_seq, schema_version
+
+
+# ############################# #
+# MIGRATION                     #
+# ############################# #
+
+def legacy_team_id(team_name):
+    """
+    Erzeugt eine stabile Team-ID für migrierte Teams ohne ID
+
+    Die ID hängt nur vom Namen ab, damit Event- und Wartelisten-Einträge
+    desselben Teams bei der Migration dieselbe ID erhalten.
+    """
+    return hashlib.md5(team_name.lower().encode("utf-8")).hexdigest()[:10]
+
+def state_from_legacy(data):
+    """
+    Überführt die verschiedenen Pickle-Layouts in das Zustands-Dictionary
+
+    Unterstützt:
+    - {'event_data': ..., 'channel_id': ..., 'user_team_assignments': ...} (event_data.pkl)
+    - (event_data, channel_id, user_team_assignments) (Test/test_event_data.pkl)
+
+    Returns:
+    - Tupel (state, journal_seq)
+
+    Raises:
+    - FormatError bei unbekanntem Layout
+    """
+    if isinstance(data, dict):
+        state = {
+            "event_data": data.get('event_data', {}),
+            "channel_id": data.get('channel_id'),
+            "user_team_assignments": data.get('user_team_assignments', {}),
+        }
+        return state, data.get('journal_seq', 0)
+    if isinstance(data, tuple) and len(data) == 3:
+        event_data, channel_id, user_team_assignments = data
+        state = {
+            "event_data": event_data or {},
+            "channel_id": channel_id,
+            "user_team_assignments": user_team_assignments or {},
+        }
+        return state, 0
+    raise FormatError(f"Unbekanntes Datenlayout: {type(data).__name__}")
+
+def migrate_event(event):
+    """
+    Überführt Teams und Warteliste eines Events in das kanonische Layout (in-place)
+
+    Returns:
+    - Anzahl der geänderten Einträge
+    """
+    changes = 0
+    teams = event.get("teams")
+    if isinstance(teams, dict):
+        for name, data in list(teams.items()):
+            if isinstance(data, dict):
+                canonical = {"size": data.get("size", 0), "id": data.get("id") or legacy_team_id(name)}
+            else:
+                canonical = {"size": data, "id": legacy_team_id(name)}
+            if canonical != data:
+                teams[name] = canonical
+                changes += 1
+
+    waitlist = event.get("waitlist")
+    if isinstance(waitlist, list):
+        # Wartelisten-Einträge registrierter Teams bekommen deren ID
+        team_ids = {}
+        if isinstance(teams, dict):
+            team_ids = {name.lower(): data["id"] for name, data in teams.items()}
+        for i, entry in enumerate(waitlist):
+            name, size = entry[0], entry[1]
+            team_id = entry[2] if len(entry) >= 3 and entry[2] else team_ids.get(name.lower()) or legacy_team_id(name)
+            canonical = (name, size, team_id)
+            if canonical != entry:
+                waitlist[i] = canonical
+                changes += 1
+    return changes
+
+def migrate_state(state):
+    """
+    Überführt einen (ggf. alten) Zustand in das kanonische Layout (in-place)
+
+    Returns:
+    - Anzahl der geänderten Einträge (0, wenn der Zustand bereits kanonisch war)
+    """
+    changes = 0
+    for event_id, event in state["event_data"].items():
+        if isinstance(event, dict):
+            changes += migrate_event(event)
+            # Events aus der Zeit vor mehreren Events ("event") kennen ihre ID noch nicht
+            if event and event.get("id") != event_id:
+                event["id"] = event_id
+                changes += 1
+
+
+    assignments = state["user_team_assignments"]
+    for user_id in list(assignments):
+        if not isinstance(user_id, str):
+            assignments[str(user_id)] = assignments.pop(user_id)
+            changes += 1
+    return changes
@@ -0,0 +1,1221 @@
+#!/usr/bin/env python3
+"""
+Persistenz-Schicht für den Event-Bot.
+
+Unterstützte Speicher-Modi:
+- "pickle":  Der komplette Zustand wird bei jedem Speichern neu serialisiert
+             und die Datei komplett neu geschrieben (ursprüngliches Verhalten).
+- "journal": Bei jedem Speichern werden nur die Änderungen seit dem letzten
+             Speichern als kompakte Datensätze an eine Journal-Datei angehängt.
+             Ein vollständiger Snapshot wird nur periodisch bei der Kompaktierung
+             geschrieben. Beim Laden wird der Snapshot gelesen und das Journal
+             darauf abgespielt.
+- "sqlite":  Der Zustand liegt in einer SQLite-Datenbank (WAL-Modus) mit
+             eigenen Tabellen für Events, Teams, Warteliste und Zuweisungen.
+             Änderungen werden als einzelne Zeilen-Updates geschrieben;
+             externe Tools können parallel lesen, ohne den Bot zu blockieren.
+
+Snapshots werden atomar geschrieben (temporäre Datei + fsync + os.replace)
+und tragen eine CRC32-Prüfsumme. Die letzten Generationen bleiben als
+<datei>.1, <datei>.2, ... erhalten; ist der aktuelle Snapshot beschädigt,
+wird beim Laden auf die neueste gültige Generation zurückgegriffen.
+
+Snapshots, Journal-Rahmen und SQLite-Werte verwenden das versionierte
+Binärformat aus serialization.py. Ältere Pickle-Dateien werden weiterhin
+gelesen und beim Laden einmalig in das kanonische Layout migriert
+(Teams als {"size", "id"}, Wartelisten-Einträge als 3-Tupel).
+
+Alle Backends teilen das Speichern in zwei Schritte auf: prepare_save()
+erfasst die Änderungen als unveränderliche Daten (auf dem Event-Loop) und
+write_save() schreibt sie auf die Platte (im Hintergrund-Thread, siehe saver.py).
+save() führt beide Schritte direkt nacheinander aus.
+
+Events können als Dictionaries oder als Modell-Objekte (models.Event)
+übergeben werden; gespeichert wird immer das kanonische Layout.
+
+Journal und SQLite nehmen optional einen ChangeScope an (siehe transaction.py):
+Dann werden nur die darin genannten Events und Zuweisungen mit dem zuletzt
+persistierten Stand verglichen.
+
+
+Dieses Modul hat bewusst keine Abhängigkeiten zu discord oder config,
+damit es auch von check_data.py und der Testsuite genutzt werden kann.
+"""
+
+import os
+import copy
+import pickle
+import sqlite3
+import struct
+import zlib
+import logging
+from datetime import datetime
+
+from serialization import (
+    FORMAT_VERSION, FormatError, encode_state, decode_state, encode_value, decode_value,
+    state_from_legacy, migrate_state
+)
+from models import Event
+
+logger = logging.getLogger("event_bot.storage")
+
+# Kopf eines Journal-Rahmens: Länge der Nutzdaten und CRC32-Prüfsumme
+_FRAME_HEADER = struct.Struct("<II")
+
+# Kennung von Snapshots mit Prüfsumme und Formatversion
+# (EVSNAP1: Pickle mit Prüfsumme, ältere Dateien sind reine Pickle-Dateien)
+_SNAPSHOT_MAGIC = b"EVSNAP%d\n" % FORMAT_VERSION
+_LEGACY_SNAPSHOT_MAGIC = b"EVSNAP1\n"
+
+# Erstes Byte von Pickle-Daten (Protokoll 2+); Binärformat-Daten beginnen nie damit
+_PICKLE_PREFIX = b"\x80"
+
+# Kennung von Journal-Rahmen im Binärformat
+_FRAME_VERSION = bytes([FORMAT_VERSION])
+
+# Anzahl aufbewahrter Snapshot-Generationen (inklusive des aktuellen Snapshots)
+DEFAULT_GENERATIONS = 3
+
+
+class SnapshotError(Exception):
+    """Ein Snapshot ist unvollständig oder beschädigt"""
+
+# Teile eines Events, die feingranular protokolliert werden
+_TEAMS_KEY = "teams"
+_WAITLIST_KEY = "waitlist"
+
+
+# ############################# #
+# ZUSTANDS-KOPIEN UND DIFFS     #
+# ############################# #
+
+def _copy_team_value(value):
+    """Kopiert einen Team-Eintrag (Dictionaries werden in-place verändert)"""
+    return dict(value) if isinstance(value, dict) else value
+
+def _plain_event(value):
+    """Liefert ein Event im gespeicherten Layout (Modell-Objekte werden in Dictionaries umgewandelt)"""
+    return value.to_dict() if isinstance(value, Event) else value
+
+def _copy_event(event):
+    """Erstellt eine unabhängige Kopie eines Event-Dictionaries"""
+    result = {}
+    for key, value in event.items():
+        if key == _TEAMS_KEY and isinstance(value, dict):
+            result[key] = {name: _copy_team_value(data) for name, data in value.items()}
+        elif key == _WAITLIST_KEY and isinstance(value, list):
+            result[key] = list(value)
+        else:
+            result[key] = copy.deepcopy(value)
+    return result
+
+def copy_state(event_data, channel_id, user_team_assignments):
+    """
+    Erstellt eine unabhängige Kopie des Bot-Zustands
+
+    Returns:
+    - Dictionary mit den Schlüsseln 'event_data', 'channel_id' und 'user_team_assignments'
+    """
+    return {
+        "event_data": {
+            key: _copy_event(value) if isinstance(value, dict) else copy.deepcopy(value)
+            for key, value in ((key, _plain_event(value)) for key, value in event_data.items())
+        },
+        "channel_id": channel_id,
+        "user_team_assignments": dict(user_team_assignments),
+    }
+
+def _diff_waitlist(event_key, old, new):
+    """Ermittelt die Journal-Datensätze für eine geänderte Warteliste"""
+    if old == new:
+        return []
+
+    # Einzelne Einträge geändert (z.B. Teilnachrücken oder Größenänderung)
+    if len(old) == len(new):
+        changed = [i for i, (a, b) in enumerate(zip(old, new)) if a != b]
+        if len(changed) <= 2:
+            return [("waitlist_item", event_key, i, new[i]) for i in changed]
+
+    # Nachrücken (vorne entfernt) und/oder Neuanmeldungen (hinten angehängt)
+    old_len = len(old)
+    for popped in range(old_len):
+        kept = old_len - popped
+        if new[:kept] == old[popped:]:
+            records = []
+            if popped:
+                records.append(("waitlist_pop", event_key, popped))
+            if len(new) > kept:
+                records.append(("waitlist_push", event_key, list(new[kept:])))
+            return records
+
+    return [("waitlist_set", event_key, list(new))]
+
+def _diff_event(event_key, old, new):
+    """Ermittelt die Journal-Datensätze für ein geändertes Event"""
+    records = []
+
+    for key, value in new.items():
+        if key == _TEAMS_KEY and isinstance(value, dict) and isinstance(old.get(key), dict):
+            old_teams = old[key]
+            for name, data in value.items():
+                if name not in old_teams or old_teams[name] != data:
+                    records.append(("team_set", event_key, name, _copy_team_value(data)))
+            for name in old_teams:
+                if name not in value:
+                    records.append(("team_del", event_key, name))
+        elif key == _WAITLIST_KEY and isinstance(value, list) and isinstance(old.get(key), list):
+            records.extend(_diff_waitlist(event_key, old[key], value))
+        elif key not in old or old[key] != value:
+            if key == _TEAMS_KEY and isinstance(value, dict):
+                value = {name: _copy_team_value(data) for name, data in value.items()}
+            elif key == _WAITLIST_KEY and isinstance(value, list):
+                value = list(value)
+            else:
+                value = copy.deepcopy(value)
+            records.append(("field_set", event_key, key, value))
+
+    for key in old:
+        if key not in new:
+            records.append(("field_del", event_key, key))
+
+    return records
+
+def diff_state(old, event_data, channel_id, user_team_assignments, scope=None):
+    """
+    Vergleicht den zuletzt gespeicherten Zustand mit dem aktuellen Zustand
+
+    Parameters:
+    - old: Zuletzt gespeicherter Zustand (siehe copy_state)
+    - event_data, channel_id, user_team_assignments: Aktueller Zustand
+    - scope: Optional - ChangeScope (siehe transaction.py); nur dessen Events und
+      Benutzer werden verglichen, alle anderen gelten als unverändert
+
+    Returns:
+    - Liste kompakter Datensätze, die old in den aktuellen Zustand überführen
+    """
+    records = []
+    old_events = old["event_data"]
+
+    if scope is None:
+        changed_events = event_data.items()
+        removed_events = old_events
+        changed_users = user_team_assignments.items()
+        removed_users = old["user_team_assignments"]
+    else:
+        changed_events = [(key, event_data[key]) for key in scope.events if key in event_data]
+        removed_events = [key for key in scope.events if key in old_events]
+        changed_users = [(user_id, user_team_assignments[user_id]) for user_id in scope.users if user_id in user_team_assignments]
+        removed_users = scope.users
+
+    for key, value in changed_events:
+        value = _plain_event(value)
+        if key not in old_events:
+            if isinstance(value, dict):
+                records.append(("event_put", key, _copy_event(value)))
+            else:
+                records.append(("event_put", key, copy.deepcopy(value)))
+        elif old_events[key] == value:
+            # Unveränderte Events werden nicht erneut geschrieben
+            continue
+        elif isinstance(value, dict) and isinstance(old_events[key], dict):
+            records.extend(_diff_event(key, old_events[key], value))
+
+        elif old_events[key] != value:
+            records.append(("event_put", key, copy.deepcopy(value)))
+
+    for key in removed_events:
+        if key not in event_data:
+            records.append(("event_del", key))
+
+    if old["channel_id"] != channel_id:
+        records.append(("channel_set", channel_id))
+
+    old_assignments = old["user_team_assignments"]
+    for user_id, team_name in changed_users:
+        if old_assignments.get(user_id) != team_name:
+            records.append(("assign_set", user_id, team_name))
+    for user_id in removed_users:
+        if user_id in old_assignments and user_id not in user_team_assignments:
+            records.append(("assign_del", user_id))
+
+    return records
+
+def apply_records(state, records):
+    """
+    Spielt Journal-Datensätze auf einen Zustand ab (in-place)
+
+    Parameters:
+    - state: Zustand im Format von copy_state
+    - records: Liste von Datensätzen aus diff_state
+    """
+    events = state["event_data"]
+
+    for record in records:
+        op = record[0]
+
+        if op == "team_set":
+            _, key, name, value = record
+            events[key].setdefault(_TEAMS_KEY, {})[name] = _copy_team_value(value)
+        elif op == "team_del":
+            _, key, name = record
+            events[key].get(_TEAMS_KEY, {}).pop(name, None)
+        elif op == "waitlist_item":
+            _, key, index, entry = record
+            events[key][_WAITLIST_KEY][index] = entry
+        elif op == "waitlist_pop":
+            _, key, count = record
+            del events[key][_WAITLIST_KEY][:count]
+        elif op == "waitlist_push":
+            _, key, entries = record
+            events[key].setdefault(_WAITLIST_KEY, []).extend(entries)
+        elif op == "waitlist_set":
+            _, key, entries = record
+            events[key][_WAITLIST_KEY] = list(entries)
+        elif op == "field_set":
+            _, key, field, value = record
+            events[key][field] = copy.deepcopy(value)
+        elif op == "field_del":
+            _, key, field = record
+            events[key].pop(field, None)
+        elif op == "event_put":
+            _, key, value = record
+            events[key] = _copy_event(value) if isinstance(value, dict) else copy.deepcopy(value)
+        elif op == "event_del":
+            _, key = record
+            events.pop(key, None)
+        elif op == "channel_set":
+            state["channel_id"] = record[1]
+        elif op == "assign_set":
+            _, user_id, team_name = record
+            state["user_team_assignments"][user_id] = team_name
+        elif op == "assign_del":
+            state["user_team_assignments"].pop(record[1], None)
+        else:
+            logger.warning(f"Unbekannter Journal-Datensatz ignoriert: {op}")
+
+
+# ############################# #
+# SNAPSHOT- UND JOURNAL-DATEIEN #
+# ############################# #
+
+def _check_payload(raw, magic):
+    """Prüft Kopf, Länge und Prüfsumme eines Snapshots und liefert die Nutzdaten"""
+    offset = len(magic)
+    if len(raw) < offset + _FRAME_HEADER.size:
+        raise SnapshotError("Kopfzeile unvollständig")
+    length, checksum = _FRAME_HEADER.unpack_from(raw, offset)
+    payload = raw[offset + _FRAME_HEADER.size:]
+    if len(payload) != length:
+        raise SnapshotError(f"Länge {len(payload)} statt {length} Bytes")
+    if zlib.crc32(payload) != checksum:
+        raise SnapshotError("Prüfsumme stimmt nicht")
+    return payload
+
+def decode_snapshot(raw):
+    """
+    Prüft und deserialisiert den Inhalt einer Snapshot-Datei
+
+    Ältere Pickle-Snapshots (mit oder ohne Prüfsumme, auch das Tupel-Layout
+    der Testsuite) werden gelesen, aber nicht migriert (siehe migrate_state).
+
+    Returns:
+    - Tupel (state, journal_seq)
+
+    Raises:
+    - SnapshotError, wenn die Datei abgeschnitten ist oder die Prüfsumme nicht stimmt
+    """
+    try:
+        if raw.startswith(_SNAPSHOT_MAGIC):
+            state, journal_seq, _ = decode_state(_check_payload(raw, _SNAPSHOT_MAGIC))
+            return state, journal_seq
+        if raw.startswith(_LEGACY_SNAPSHOT_MAGIC):
+            payload = _check_payload(raw, _LEGACY_SNAPSHOT_MAGIC)
+        elif raw.startswith(b"EVSNAP"):
+            raise SnapshotError(f"Unbekannte Formatversion {raw[:8]!r}")
+        else:
+            # Ältere Snapshots ohne Prüfsumme
+            payload = raw
+        return state_from_legacy(pickle.loads(payload))
+    except SnapshotError:
+        raise
+    except Exception as e:
+        raise SnapshotError(f"Nicht lesbar: {e}") from e
+
+def read_snapshot(snapshot_file):
+    """
+    Liest einen Snapshot und prüft die Prüfsumme
+
+    Returns:
+    - Tupel (state, journal_seq) oder (None, 0), wenn keine Datei existiert
+
+    Raises:
+    - SnapshotError bei beschädigten Dateien
+    """
+    if not os.path.exists(snapshot_file):
+        return None, 0
+
+    with open(snapshot_file, 'rb') as f:
+        return decode_snapshot(f.read())
+
+def encode_snapshot(state, journal_seq=0):
+    """Serialisiert einen vollständigen Snapshot (mit Kennung, Länge und Prüfsumme)"""
+    payload = encode_state(state, journal_seq)
+    return _SNAPSHOT_MAGIC + _FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+def _fsync_directory(path):
+    """Macht Umbenennungen im Verzeichnis dauerhaft (nicht auf allen Systemen möglich)"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _write_temp(path, data):
+    """Schreibt Daten vollständig in <path>.tmp und liefert den Pfad der temporären Datei"""
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return temp_file
+
+def atomic_write(path, data):
+    """Ersetzt eine Datei atomar: entweder steht danach der alte oder der neue Inhalt darin"""
+    os.replace(_write_temp(path, data), path)
+    _fsync_directory(path)
+
+def generation_files(snapshot_file, generations=DEFAULT_GENERATIONS):
+    """
+    Liefert die Dateinamen aller Snapshot-Generationen, neueste zuerst
+
+    Returns:
+    - Liste [snapshot_file, snapshot_file.1, snapshot_file.2, ...]
+    """
+    return [snapshot_file] + [f"{snapshot_file}.{i}" for i in range(1, max(1, generations))]
+
+def write_snapshot_data(snapshot_file, data, generations=DEFAULT_GENERATIONS):
+    """
+    Schreibt einen serialisierten Snapshot atomar und rotiert die älteren Generationen
+
+    Die neue Datei wird zuerst vollständig geschrieben und mit fsync gesichert.
+    Erst danach werden die Generationen per Umbenennung verschoben, sodass zu
+    jedem Zeitpunkt mindestens eine vollständige Generation existiert.
+    """
+    temp_file = _write_temp(snapshot_file, data)
+    files = generation_files(snapshot_file, generations)
+    for older, newer in zip(reversed(files[1:]), reversed(files[:-1])):
+        if os.path.exists(newer):
+            os.replace(newer, older)
+    os.replace(temp_file, snapshot_file)
+    _fsync_directory(snapshot_file)
+
+def write_snapshot(snapshot_file, state, journal_seq=0, generations=DEFAULT_GENERATIONS):
+    """Schreibt einen vollständigen Snapshot (atomar, mit Generationen)"""
+    write_snapshot_data(snapshot_file, encode_snapshot(state, journal_seq), generations)
+
+def _quarantine(path):
+    """Verschiebt eine beschädigte Datei zur Seite, damit sie nicht überschrieben wird"""
+    target = f"{path}.corrupt-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    try:
+        os.replace(path, target)
+        return target
+    except OSError as e:
+        logger.error(f"Konnte beschädigte Datei {path} nicht verschieben: {e}")
+        return None
+
+def load_snapshot(snapshot_file, generations=DEFAULT_GENERATIONS, quarantine=False):
+    """
+    Lädt die neueste gültige Snapshot-Generation
+
+    Parameters:
+    - snapshot_file: Pfad zum aktuellen Snapshot
+    - generations: Anzahl der Generationen, die geprüft werden
+    - quarantine: Ob beschädigte Dateien zur Seite verschoben werden (nur im Bot, nicht in Diagnose-Tools)
+
+    Returns:
+    - Tupel (state, journal_seq, report)
+      - state: Zustand oder None, wenn keine gültige Generation existiert
+      - report: Liste von Meldungen über beschädigte/übersprungene Generationen
+    """
+    files = generation_files(snapshot_file, generations)
+    report = []
+
+    for index, path in enumerate(files):
+        if not os.path.exists(path):
+            if index == 0 and any(os.path.exists(older) for older in files[1:]):
+                report.append(f"Snapshot {path} fehlt")
+            continue
+
+        try:
+            state, journal_seq = read_snapshot(path)
+        except (SnapshotError, OSError) as e:
+            message = f"Snapshot {path} ist beschädigt ({e})"
+            if quarantine:
+                moved = _quarantine(path)
+                if moved:
+                    message += f" und wurde nach {moved} verschoben"
+            logger.error(message)
+            report.append(message)
+            continue
+
+        if report:
+            report.append(f"Verwende ältere Snapshot-Generation {path}")
+        return state, journal_seq, report
+
+    if report:
+        report.append("Keine gültige Snapshot-Generation gefunden")
+    return None, 0, report
+
+def read_journal(journal_file):
+    """
+    Liest alle vollständigen Rahmen aus der Journal-Datei
+
+    Ein unvollständiger oder beschädigter Rahmen am Ende (z.B. nach einem Absturz
+    während des Schreibens) beendet das Lesen; alles davor bleibt gültig.
+
+    Returns:
+    - Tupel (frames, valid_length, file_length)
+      - frames: Liste von (seq, records)
+      - valid_length: Byte-Offset hinter dem letzten gültigen Rahmen
+      - file_length: Tatsächliche Dateigröße
+    """
+    if not os.path.exists(journal_file):
+        return [], 0, 0
+
+    with open(journal_file, 'rb') as f:
+        data = f.read()
+
+    frames = []
+    offset = 0
+    while offset + _FRAME_HEADER.size <= len(data):
+        length, checksum = _FRAME_HEADER.unpack_from(data, offset)
+        start = offset + _FRAME_HEADER.size
+        end = start + length
+        if end > len(data) or zlib.crc32(data[start:end]) != checksum:
+            break
+        try:
+            frames.append(_decode_frame(data[start:end]))
+        except Exception:
+            break
+        offset = end
+
+    return frames, offset, len(data)
+
+def _decode_frame(payload):
+    """Liest die Nutzdaten eines Journal-Rahmens (Binärformat oder ältere Pickle-Rahmen)"""
+    if payload[:1] == _FRAME_VERSION:
+        seq, records = decode_value(payload[1:])
+        return seq, records
+    if payload[:1] == _PICKLE_PREFIX:
+        return pickle.loads(payload)
+    raise FormatError(f"Unbekannte Rahmen-Version {payload[:1]!r}")
+
+def _encode_frame(seq, records):
+    """Kodiert einen Journal-Rahmen (Kopf + Versionsbyte + Datensätze im Binärformat)"""
+    payload = _FRAME_VERSION + encode_value((seq, records))
+    return _FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+def read_state(snapshot_file, journal_file=None, generations=DEFAULT_GENERATIONS, quarantine=False):
+    """
+    Liest Snapshot und (optional) Journal und liefert den kombinierten Zustand
+
+    Parameters:
+    - snapshot_file: Pfad zur Snapshot-Datei
+    - journal_file: Optional - Pfad zur Journal-Datei
+    - generations: Anzahl der Snapshot-Generationen für den Rückgriff
+    - quarantine: Ob beschädigte Snapshots zur Seite verschoben werden
+
+    Returns:
+    - Tupel (state, info)
+      - state: Zustand im Format von copy_state (leer, falls keine Daten existieren)
+      - info: Dictionary mit Details (journal_seq, max_seq, replayed_frames, replayed_records,
+              torn_bytes, migrated, report)
+    """
+    state, snapshot_seq, report = load_snapshot(snapshot_file, generations, quarantine)
+    if state is None:
+        state = {"event_data": {}, "channel_id": None, "user_team_assignments": {}}
+
+    info = {
+        "journal_seq": snapshot_seq,
+        "max_seq": snapshot_seq,
+        "replayed_frames": 0,
+        "replayed_records": 0,
+        "valid_length": 0,
+        "torn_bytes": 0,
+        "migrated": 0,
+        "report": report
+    }
+
+    if journal_file:
+        frames, valid_length, file_length = read_journal(journal_file)
+        pending = [(seq, records) for seq, records in frames if seq > snapshot_seq]
+        if frames:
+            info["max_seq"] = max(snapshot_seq, frames[-1][0])
+
+        # Nach einem Rückgriff auf eine ältere Generation fehlen die Änderungen
+        # zwischen dieser Generation und dem Journal. Die relativen Datensätze
+        # (z.B. Nachrücken von der Warteliste) würden dann falsch angewendet.
+        if pending and pending[0][0] != snapshot_seq + 1:
+            report.append(
+                f"Journal beginnt bei Nr. {pending[0][0]}, Snapshot endet bei Nr. {snapshot_seq}: "
+                f"{len(pending)} Journal-Einträge wurden nicht angewendet"
+            )
+            pending = []
+
+        for seq, records in pending:
+            apply_records(state, records)
+            info["journal_seq"] = seq
+            info["replayed_frames"] += 1
+            info["replayed_records"] += len(records)
+        info["valid_length"] = valid_length
+        info["torn_bytes"] = file_length - valid_length
+
+    # Alte Layouts einmalig nach dem Abspielen migrieren (das Journal kann alte Werte enthalten)
+    info["migrated"] = migrate_state(state)
+    if info["migrated"]:
+        logger.info(f"{info['migrated']} Einträge aus älterem Datenlayout migriert")
+
+    return state, info
+
+
+# ############################# #
+# SPEICHER-BACKENDS             #
+# ############################# #
+
+class PickleStorage:
+    """Schreibt bei jedem Speichern den kompletten Zustand als Snapshot-Datei"""
+
+    def __init__(self, snapshot_file, generations=DEFAULT_GENERATIONS):
+        self.snapshot_file = snapshot_file
+        self.generations = generations
+        self.load_report = []  # Meldungen über Rückgriffe auf ältere Generationen beim Laden
+
+    def load(self):
+        """
+        Lädt den Zustand (bei Bedarf aus einer älteren Generation)
+
+        Returns:
+        - Tupel (event_data, channel_id, user_team_assignments)
+        """
+        if not any(os.path.exists(path) for path in generation_files(self.snapshot_file, self.generations)):
+            logger.info("No save file found, starting with empty data")
+            self.load_report = []
+            return {}, None, {}
+
+        state, info = read_state(self.snapshot_file, generations=self.generations, quarantine=True)
+        self.load_report = info["report"]
+        if info["migrated"]:
+            # Migrierten Stand sofort im aktuellen Format sichern
+            self.save(state["event_data"], state["channel_id"], state["user_team_assignments"])
+        logger.info(f"Data loaded from {self.snapshot_file}")
+        return state["event_data"], state["channel_id"], state["user_team_assignments"]
+
+    def prepare_save(self, event_data, channel_id, user_team_assignments, scope=None):
+        """Serialisiert den kompletten Zustand (Schreibauftrag für write_save; scope wird nicht benötigt)"""
+        state = {
+            "event_data": {key: _plain_event(value) for key, value in event_data.items()},
+
+            "channel_id": channel_id,
+            "user_team_assignments": user_team_assignments
+        }
+        return encode_snapshot(state)
+
+    def write_save(self, payload):
+        """Schreibt einen mit prepare_save erstellten Auftrag"""
+        write_snapshot_data(self.snapshot_file, payload, self.generations)
+        logger.info(f"Data saved to {self.snapshot_file}")
+
+    def invalidate(self):
+        """Nichts zu tun: jeder Auftrag enthält den kompletten Zustand"""
+
+    def save(self, event_data, channel_id, user_team_assignments, scope=None):
+        """Speichert den kompletten Zustand"""
+        self.write_save(self.prepare_save(event_data, channel_id, user_team_assignments))
+        return True
+
+
+class JournalStorage:
+    """
+    Speichert Änderungen als Append-only-Journal mit periodischer Kompaktierung
+
+    Jeder Aufruf von save() vergleicht den aktuellen Zustand mit dem zuletzt
+    persistierten Stand und hängt nur die Unterschiede als einen Rahmen an das
+    Journal an. Nach compact_interval Rahmen wird ein neuer Snapshot geschrieben
+    und das Journal geleert.
+    """
+
+    def __init__(self, snapshot_file, journal_file, compact_interval=200, generations=DEFAULT_GENERATIONS):
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.compact_interval = max(1, compact_interval)
+        self.generations = generations
+        self.load_report = []  # Meldungen über Rückgriffe auf ältere Generationen beim Laden
+        self._persisted = None  # Zuletzt persistierter Zustand (Kopie)
+        self._seq = 0  # Laufende Nummer des letzten Journal-Rahmens
+        self._frames_since_compaction = 0
+
+    def load(self):
+        """
+        Lädt Snapshot und spielt das Journal ab
+
+        Returns:
+        - Tupel (event_data, channel_id, user_team_assignments)
+        """
+        files = generation_files(self.snapshot_file, self.generations) + [self.journal_file]
+        if not any(os.path.exists(path) for path in files):
+            logger.info("No save file found, starting with empty data")
+            self._persisted = {"event_data": {}, "channel_id": None, "user_team_assignments": {}}
+            self._seq = 0
+            self._frames_since_compaction = 0
+            self.load_report = []
+            return {}, None, {}
+
+        state, info = read_state(self.snapshot_file, self.journal_file, self.generations, quarantine=True)
+        self.load_report = info["report"]
+
+        # Beschädigtes Ende abschneiden, damit neue Rahmen lesbar bleiben
+        if info["torn_bytes"] > 0:
+            logger.warning(f"Unvollständiger Journal-Eintrag ({info['torn_bytes']} Bytes) am Ende von {self.journal_file} verworfen")
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(info["valid_length"])
+
+        # Nummern nie wiederverwenden, auch wenn Journal-Einträge verworfen wurden
+        self._seq = info["max_seq"]
+        self._frames_since_compaction = info["replayed_frames"]
+        self._persisted = copy_state(state["event_data"], state["channel_id"], state["user_team_assignments"])
+
+        # Nach einem Rückgriff sofort einen frischen Snapshot schreiben, damit
+        # verworfene Journal-Einträge nicht später doch noch abgespielt werden.
+        # Migrierte Daten werden ebenfalls sofort im aktuellen Format gesichert.
+        if self.load_report or info["migrated"]:
+            self.compact(state["event_data"], state["channel_id"], state["user_team_assignments"])
+
+        logger.info(
+            f"Data loaded from {self.snapshot_file} "
+            f"(+{info['replayed_frames']} Journal-Einträge mit {info['replayed_records']} Änderungen)"
+        )
+        return state["event_data"], state["channel_id"], state["user_team_assignments"]
+
+    def prepare_save(self, event_data, channel_id, user_team_assignments, scope=None):
+        """
+        Ermittelt die Änderungen seit dem letzten Speichern
+
+        Der persistierte Stand wird sofort fortgeschrieben, damit weitere Aufträge
+        darauf aufbauen können. Schlägt write_save fehl, muss invalidate()
+        aufgerufen werden; der nächste Auftrag ist dann ein vollständiger Snapshot.
+
+        Parameters:
+        - scope: Optional - ChangeScope der Änderungen seit dem letzten Speichern
+
+        Returns:
+        - Schreibauftrag für write_save oder None, wenn es nichts zu speichern gibt
+        """
+        # Ohne bekannten Ausgangszustand kann kein Diff gebildet werden
+        if self._persisted is None:
+            return self._prepare_compaction(event_data, channel_id, user_team_assignments)
+
+        records = diff_state(self._persisted, event_data, channel_id, user_team_assignments, scope)
+        if not records:
+            logger.debug("Keine Änderungen zu speichern")
+            return None
+
+        self._seq += 1
+        job = {"frame": _encode_frame(self._seq, records), "records": len(records)}
+        apply_records(self._persisted, records)
+        self._frames_since_compaction += 1
+
+        if self._frames_since_compaction >= self.compact_interval:
+            job.update(self._prepare_compaction(event_data, channel_id, user_team_assignments))
+        return job
+
+    def _prepare_compaction(self, event_data, channel_id, user_team_assignments):
+        """Serialisiert einen vollständigen Snapshot für die Kompaktierung"""
+        state = copy_state(event_data, channel_id, user_team_assignments)
+        # Der Snapshot merkt sich die letzte enthaltene Journal-Nummer. Stürzt der
+        # Bot zwischen Snapshot und Leeren des Journals ab, werden die alten
+        # Rahmen beim Laden übersprungen.
+        job = {"snapshot": encode_snapshot(state, self._seq), "journal_seq": self._seq}
+        self._persisted = state
+        self._frames_since_compaction = 0
+        return job
+
+    def write_save(self, job):
+        """Schreibt einen mit prepare_save erstellten Auftrag"""
+        if "frame" in job:
+            with open(self.journal_file, 'ab') as f:
+                f.write(job["frame"])
+                f.flush()
+                os.fsync(f.fileno())
+            logger.info(f"Data saved to {self.journal_file} ({job['records']} Änderungen)")
+
+        if "snapshot" in job:
+            write_snapshot_data(self.snapshot_file, job["snapshot"], self.generations)
+            atomic_write(self.journal_file, b"")
+            logger.info(f"Journal kompaktiert: Snapshot {self.snapshot_file} geschrieben (Journal-Nr. {job['journal_seq']})")
+
+    def invalidate(self):
+        """Verwirft den persistierten Stand nach einem Schreibfehler"""
+        self._persisted = None
+
+    def save(self, event_data, channel_id, user_team_assignments, scope=None):
+        """
+        Hängt die Änderungen seit dem letzten Speichern an das Journal an
+
+        Returns:
+        - True bei Erfolg
+        """
+        job = self.prepare_save(event_data, channel_id, user_team_assignments, scope)
+        if job is not None:
+            try:
+                self.write_save(job)
+            except Exception:
+                self.invalidate()
+                raise
+        return True
+
+    def compact(self, event_data, channel_id, user_team_assignments):
+        """Schreibt einen vollständigen Snapshot und leert das Journal"""
+        self.write_save(self._prepare_compaction(event_data, channel_id, user_team_assignments))
+
+
+# ############################# #
+# SQLITE-BACKEND                #
+# ############################# #
+
+SQLITE_SCHEMA_VERSION = 3
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value BLOB
+);
+CREATE TABLE IF NOT EXISTS events (
+    event_key TEXT PRIMARY KEY,
+    value BLOB
+);
+CREATE TABLE IF NOT EXISTS event_fields (
+    event_key TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value BLOB,
+    PRIMARY KEY (event_key, field)
+);
+CREATE TABLE IF NOT EXISTS teams (
+    event_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_folded TEXT NOT NULL,
+    team_id TEXT,
+    size INTEGER,
+    kind TEXT NOT NULL,
+    extra BLOB,
+    PRIMARY KEY (event_key, name)
+);
+CREATE INDEX IF NOT EXISTS idx_teams_name_folded ON teams (event_key, name_folded);
+CREATE INDEX IF NOT EXISTS idx_teams_team_id ON teams (team_id);
+CREATE TABLE IF NOT EXISTS waitlist (
+    event_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_folded TEXT NOT NULL,
+    size INTEGER,
+    team_id TEXT,
+    arity INTEGER NOT NULL,
+    PRIMARY KEY (event_key, position)
+);
+CREATE INDEX IF NOT EXISTS idx_waitlist_name_folded ON waitlist (event_key, name_folded);
+CREATE TABLE IF NOT EXISTS assignments (
+    user_id TEXT PRIMARY KEY,
+    team_name TEXT,
+    team_folded TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_assignments_team ON assignments (team_folded);
+"""
+
+def _fold(name):
+    """Normalisiert einen Teamnamen für case-insensitive Suchen"""
+    return name.casefold() if isinstance(name, str) else str(name).casefold()
+
+def _blob(value):
+    """Serialisiert einen Wert im Binärformat für eine BLOB-Spalte"""
+    return sqlite3.Binary(encode_value(value))
+
+def _unblob(data):
+    """Gegenstück zu _blob (liest auch Werte aus Datenbanken mit Schema-Version 1)"""
+    data = bytes(data)
+    if data[:1] == _PICKLE_PREFIX:
+        return pickle.loads(data)
+    return decode_value(data)
+
+def _team_row(event_key, name, value):
+    """Zerlegt einen Team-Eintrag (int oder Dictionary) in Tabellenspalten"""
+    if isinstance(value, dict):
+        extra = {k: v for k, v in value.items() if k not in ("size", "id")}
+        return (event_key, name, _fold(name), value.get("id"), value.get("size"), "dict",
+                _blob(extra) if extra else None)
+    return (event_key, name, _fold(name), None, value, "int", None)
+
+def _team_value(team_id, size, kind, extra):
+    """Setzt einen Team-Eintrag aus den Tabellenspalten wieder zusammen"""
+    if kind != "dict":
+        return size
+    value = {"size": size, "id": team_id}
+    if extra is not None:
+        value.update(_unblob(extra))
+    return value
+
+def _waitlist_row(event_key, position, entry):
+    """Zerlegt einen Wartelisten-Eintrag (2- oder 3-Tupel) in Tabellenspalten"""
+    team_id = entry[2] if len(entry) >= 3 else None
+    return (event_key, position, entry[0], _fold(entry[0]), entry[1], team_id, len(entry))
+
+class SqliteStorage:
+    """
+    Speichert den Zustand in einer SQLite-Datenbank im WAL-Modus
+
+    Wie im Journal-Modus wird der aktuelle Zustand mit dem zuletzt persistierten
+    Stand verglichen. Die Unterschiede werden als einzelne INSERT/UPDATE/DELETE-
+    Anweisungen in einer Transaktion geschrieben. Existiert noch keine Datenbank,
+    wird beim ersten Laden der bisherige Pickle-Snapshot (+ Journal) importiert.
+    """
+
+    def __init__(self, db_file, snapshot_file=None, journal_file=None, generations=DEFAULT_GENERATIONS):
+        self.db_file = db_file
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.generations = generations
+        self.load_report = []  # Meldungen über Rückgriffe beim Import des alten Snapshots
+        self._conn = None
+        self._persisted = None
+
+    def _connect(self):
+        """Öffnet die Datenbank (einmalig) und legt das Schema an"""
+        if self._conn is None:
+            # Schreibzugriffe kommen ggf. aus dem Thread des Hintergrund-Speicherdienstes
+            conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SQLITE_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Schließt die Datenbankverbindung"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def load(self):
+        """
+        Lädt den Zustand aus der Datenbank (importiert bei Bedarf den alten Pickle-Stand)
+
+        Returns:
+        - Tupel (event_data, channel_id, user_team_assignments)
+        """
+        conn = self._connect()
+        initialized = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+
+        if not initialized:
+            has_snapshot = self.snapshot_file and os.path.exists(self.snapshot_file)
+            has_journal = self.journal_file and os.path.exists(self.journal_file)
+            if has_snapshot or has_journal:
+                state, info = read_state(self.snapshot_file, self.journal_file, self.generations, quarantine=True)
+                self.load_report = info["report"]
+                logger.info(f"Importiere bestehende Daten aus {self.snapshot_file} nach {self.db_file}")
+            else:
+                state = {"event_data": {}, "channel_id": None, "user_team_assignments": {}}
+                logger.info("No save file found, starting with empty data")
+            with conn:
+                _write_full(conn, state)
+        else:
+            state = _read_sqlite(conn)
+            (version,) = initialized
+            # Datenbanken älterer Versionen einmalig migrieren und neu schreiben
+            if migrate_state(state) or version < SQLITE_SCHEMA_VERSION:
+                logger.info(f"Migriere {self.db_file} auf Schema-Version {SQLITE_SCHEMA_VERSION}")
+                with conn:
+                    _write_full(conn, state)
+            logger.info(f"Data loaded from {self.db_file}")
+
+        self._persisted = copy_state(state["event_data"], state["channel_id"], state["user_team_assignments"])
+        return state["event_data"], state["channel_id"], state["user_team_assignments"]
+
+    def prepare_save(self, event_data, channel_id, user_team_assignments, scope=None):
+        """
+        Ermittelt die Änderungen seit dem letzten Speichern (siehe JournalStorage.prepare_save)
+
+        Returns:
+        - Schreibauftrag für write_save oder None, wenn es nichts zu speichern gibt
+        """
+        if self._persisted is None:
+            state = copy_state(event_data, channel_id, user_team_assignments)
+            self._persisted = copy_state(state["event_data"], state["channel_id"], state["user_team_assignments"])
+            return ("full", state)
+
+        records = diff_state(self._persisted, event_data, channel_id, user_team_assignments, scope)
+        if not records:
+            logger.debug("Keine Änderungen zu speichern")
+            return None
+
+        apply_records(self._persisted, records)
+        return ("records", records)
+
+    def write_save(self, job):
+        """Schreibt einen mit prepare_save erstellten Auftrag in einer Transaktion"""
+        kind, payload = job
+        conn = self._connect()
+        with conn:
+            if kind == "full":
+                _write_full(conn, payload)
+            else:
+                _apply_sql_records(conn, payload)
+        if kind == "full":
+            logger.info(f"Data saved to {self.db_file} (vollständig)")
+        else:
+            logger.info(f"Data saved to {self.db_file} ({len(payload)} Änderungen)")
+
+    def invalidate(self):
+        """Verwirft den persistierten Stand nach einem Schreibfehler"""
+        self._persisted = None
+
+    def save(self, event_data, channel_id, user_team_assignments, scope=None):
+        """
+        Schreibt die Änderungen seit dem letzten Speichern als Zeilen-Updates
+
+        Returns:
+        - True bei Erfolg
+        """
+        job = self.prepare_save(event_data, channel_id, user_team_assignments, scope)
+        if job is not None:
+            try:
+                self.write_save(job)
+            except Exception:
+                self.invalidate()
+                raise
+        return True
+
+
+def _delete_event_rows(conn, event_key):
+    """Entfernt alle Zeilen eines Events"""
+    for table in ("events", "event_fields", "teams", "waitlist"):
+        conn.execute(f"DELETE FROM {table} WHERE event_key = ?", (event_key,))
+
+def _replace_teams(conn, event_key, teams):
+    """Ersetzt alle Teams eines Events"""
+    conn.execute("DELETE FROM teams WHERE event_key = ?", (event_key,))
+    conn.executemany(
+        "INSERT INTO teams (event_key, name, name_folded, team_id, size, kind, extra) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [_team_row(event_key, name, value) for name, value in teams.items()]
+    )
+
+def _replace_waitlist(conn, event_key, entries):
+    """Ersetzt die komplette Warteliste eines Events"""
+    conn.execute("DELETE FROM waitlist WHERE event_key = ?", (event_key,))
+    conn.executemany(
+        "INSERT INTO waitlist (event_key, position, name, name_folded, size, team_id, arity) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [_waitlist_row(event_key, i, entry) for i, entry in enumerate(entries)]
+    )
+
+def _set_field(conn, event_key, field, value):
+    """
+    Setzt ein Event-Feld. Teams und Warteliste liegen in eigenen Tabellen;
+    in event_fields steht dann nur ein Platzhalter (NULL), damit die Feld-Reihenfolge erhalten bleibt.
+    """
+    if field == _TEAMS_KEY and isinstance(value, dict):
+        _replace_teams(conn, event_key, value)
+        blob = None
+    elif field == _WAITLIST_KEY and isinstance(value, list):
+        _replace_waitlist(conn, event_key, value)
+        blob = None
+    else:
+        blob = _blob(value)
+    conn.execute(
+        "INSERT INTO event_fields (event_key, field, value) VALUES (?, ?, ?) "
+        "ON CONFLICT (event_key, field) DO UPDATE SET value = excluded.value",
+        (event_key, field, blob)
+    )
+
+def _put_event(conn, event_key, value):
+    """Schreibt ein komplettes Event (oder einen sonstigen Wert in event_data)"""
+    _delete_event_rows(conn, event_key)
+    if isinstance(value, dict):
+        conn.execute("INSERT INTO events (event_key, value) VALUES (?, NULL)", (event_key,))
+        for field, field_value in value.items():
+            _set_field(conn, event_key, field, field_value)
+    else:
+        conn.execute("INSERT INTO events (event_key, value) VALUES (?, ?)", (event_key, _blob(value)))
+
+def _write_full(conn, state):
+    """Schreibt den kompletten Zustand in eine (ggf. bereits befüllte) Datenbank"""
+    for table in ("events", "event_fields", "teams", "waitlist", "assignments", "meta"):
+        conn.execute(f"DELETE FROM {table}")
+    for event_key, value in state["event_data"].items():
+        _put_event(conn, event_key, value)
+    conn.executemany(
+        "INSERT INTO assignments (user_id, team_name, team_folded) VALUES (?, ?, ?)",
+        [(user_id, team_name, _fold(team_name)) for user_id, team_name in state["user_team_assignments"].items()]
+    )
+    conn.execute("INSERT INTO meta (key, value) VALUES ('channel_id', ?)", (_blob(state["channel_id"]),))
+    conn.execute("INSERT INTO meta (key, value) VALUES ('schema_version', ?)", (SQLITE_SCHEMA_VERSION,))
+
+def _apply_sql_records(conn, records):
+    """Übersetzt Datensätze aus diff_state in einzelne SQL-Anweisungen"""
+    for record in records:
+        op = record[0]
+
+        if op == "team_set":
+            _, key, name, value = record
+            # UPSERT statt REPLACE, damit die Reihenfolge (rowid) der Teams erhalten bleibt
+            conn.execute(
+                "INSERT INTO teams (event_key, name, name_folded, team_id, size, kind, extra) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (event_key, name) DO UPDATE SET team_id = excluded.team_id, size = excluded.size, "
+                "kind = excluded.kind, extra = excluded.extra",
+                _team_row(key, name, value)
+            )
+        elif op == "team_del":
+            _, key, name = record
+            conn.execute("DELETE FROM teams WHERE event_key = ? AND name = ?", (key, name))
+        elif op == "waitlist_item":
+            _, key, index, entry = record
+            row = _waitlist_row(key, 0, entry)
+            conn.execute(
+                "UPDATE waitlist SET name = ?, name_folded = ?, size = ?, team_id = ?, arity = ? "
+                "WHERE event_key = ? AND position = "
+                "(SELECT position FROM waitlist WHERE event_key = ? ORDER BY position LIMIT 1 OFFSET ?)",
+                row[2:] + (key, key, index)
+            )
+        elif op == "waitlist_pop":
+            _, key, count = record
+            conn.execute(
+                "DELETE FROM waitlist WHERE event_key = ? AND position IN "
+                "(SELECT position FROM waitlist WHERE event_key = ? ORDER BY position LIMIT ?)",
+                (key, key, count)
+            )
+        elif op == "waitlist_push":
+            _, key, entries = record
+            (last,) = conn.execute("SELECT MAX(position) FROM waitlist WHERE event_key = ?", (key,)).fetchone()
+            start = -1 if last is None else last
+            conn.executemany(
+                "INSERT INTO waitlist (event_key, position, name, name_folded, size, team_id, arity) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [_waitlist_row(key, start + 1 + i, entry) for i, entry in enumerate(entries)]
+            )
+        elif op == "waitlist_set":
+            _, key, entries = record
+            _replace_waitlist(conn, key, entries)
+        elif op == "field_set":
+            _, key, field, value = record
+            _set_field(conn, key, field, value)
+        elif op == "field_del":
+            _, key, field = record
+            conn.execute("DELETE FROM event_fields WHERE event_key = ? AND field = ?", (key, field))
+            if field == _TEAMS_KEY:
+                conn.execute("DELETE FROM teams WHERE event_key = ?", (key,))
+            elif field == _WAITLIST_KEY:
+                conn.execute("DELETE FROM waitlist WHERE event_key = ?", (key,))
+        elif op == "event_put":
+            _, key, value = record
+            _put_event(conn, key, value)
+        elif op == "event_del":
+            _delete_event_rows(conn, record[1])
+        elif op == "channel_set":
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('channel_id', ?)", (_blob(record[1]),))
+        elif op == "assign_set":
+            _, user_id, team_name = record
+            conn.execute(
+                "INSERT INTO assignments (user_id, team_name, team_folded) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET team_name = excluded.team_name, team_folded = excluded.team_folded",
+                (user_id, team_name, _fold(team_name))
+            )
+        elif op == "assign_del":
+            conn.execute("DELETE FROM assignments WHERE user_id = ?", (record[1],))
+        else:
+            logger.warning(f"Unbekannter Datensatz ignoriert: {op}")
+
+def _read_sqlite(conn):
+    """Liest den kompletten Zustand aus der Datenbank"""
+    event_data = {}
+    for event_key, value in conn.execute("SELECT event_key, value FROM events ORDER BY rowid"):
+        event_data[event_key] = {} if value is None else _unblob(value)
+
+    for event_key, field, value in conn.execute("SELECT event_key, field, value FROM event_fields ORDER BY rowid"):
+        event = event_data.get(event_key)
+        if not isinstance(event, dict):
+            continue
+        if value is not None:
+            event[field] = _unblob(value)
+        elif field == _TEAMS_KEY:
+            event[field] = {
+                name: _team_value(team_id, size, kind, extra)
+                for name, team_id, size, kind, extra in conn.execute(
+                    "SELECT name, team_id, size, kind, extra FROM teams WHERE event_key = ? ORDER BY rowid",
+                    (event_key,)
+                )
+            }
+        elif field == _WAITLIST_KEY:
+            event[field] = [
+                (name, size, team_id) if arity >= 3 else (name, size)
+                for name, size, team_id, arity in conn.execute(
+                    "SELECT name, size, team_id, arity FROM waitlist WHERE event_key = ? ORDER BY position",
+                    (event_key,)
+                )
+            ]
+        else:
+            event[field] = None
+
+    row = conn.execute("SELECT value FROM meta WHERE key = 'channel_id'").fetchone()
+    channel_id = _unblob(row[0]) if row and row[0] is not None else None
+
+    user_team_assignments = {
+        user_id: team_name
+        for user_id, team_name in conn.execute("SELECT user_id, team_name FROM assignments ORDER BY rowid")
+    }
+
+    return {"event_data": event_data, "channel_id": channel_id, "user_team_assignments": user_team_assignments}
+
+def read_sqlite_state(db_file):
+    """
+    Liest den Zustand schreibgeschützt aus einer SQLite-Datenbank (z.B. für check_data.py)
+
+    Dank WAL-Modus blockiert das Lesen den laufenden Bot nicht. Alte Layouts
+    werden nur im Speicher migriert, die Datenbank bleibt unverändert.
+
+    Returns:
+    - Zustand im Format von copy_state
+    """
+    if not os.path.exists(db_file):
+        raise FileNotFoundError(db_file)
+    conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+    try:
+        state = _read_sqlite(conn)
+    finally:
+        conn.close()
+    migrate_state(state)
+    return state
+
+
+def create_storage(backend, snapshot_file, journal_file=None, compact_interval=200, db_file=None,
+                   generations=DEFAULT_GENERATIONS):
+    """
+    Erstellt das konfigurierte Speicher-Backend
+
+    Parameters:
+    - backend: "journal", "sqlite" oder "pickle"
+    - snapshot_file: Pfad zur Snapshot-Datei
+    - journal_file: Pfad zur Journal-Datei (nur für "journal")
+    - compact_interval: Anzahl Journal-Einträge bis zur Kompaktierung
+    - db_file: Pfad zur SQLite-Datenbank (nur für "sqlite")
+    - generations: Anzahl aufbewahrter Snapshot-Generationen
+
+    Returns:
+    - Ein Backend-Objekt mit load(), save(), prepare_save(), write_save() und invalidate()
+    """
+    if backend == "journal":
+        return JournalStorage(snapshot_file, journal_file or f"{snapshot_file}.journal", compact_interval, generations)
+    if backend == "sqlite":
+        return SqliteStorage(db_file or f"{os.path.splitext(snapshot_file)[0]}.db", snapshot_file, journal_file, generations)
+    if backend != "pickle":
+        logger.warning(f"Unbekanntes Speicher-Backend '{backend}', verwende 'pickle'")
+    return PickleStorage(snapshot_file, generations)
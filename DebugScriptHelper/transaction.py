@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Leichtgewichtige Transaktionen für Zustandsänderungen.
+
+Ein ChangeSet hält fest, was eine Änderung anfasst: Events sichern ihren
+Zustand beim ersten touch() mit Event.backup() (Felder, Team-Größen,
+Wartelisten-Einträge - keine tiefe Kopie), die Benutzer-Team-Zuweisungen
+protokollieren die vorherigen Werte selbst (TeamAssignments.track), weitere
+Dictionaries (z.B. team_requester) werden über ChangeSet.set() geändert.
+Gespeicherte Einstellungen außerhalb von Events und Zuweisungen (z.B. der
+Event-Kanal) werden mit ChangeSet.mark() vermerkt.
+
+Schlägt ein späterer Schritt fehl, setzt rollback() genau diese Teile zurück.
+commit() verwirft die Sicherungen und liefert den ChangeScope - die IDs der
+Events und Benutzer, die sich gegenüber der Sicherung tatsächlich geändert
+haben; nur angefasste, aber unveränderte Teile fallen nicht hinein. Die Persistenz-Schicht vergleicht damit nur
+diese Teile mit dem zuletzt gespeicherten Stand (siehe storage.diff_state)
+statt den kompletten Zustand.
+
+Die Command-Warteschlange (command_queue.py) führt jeden Command in einem
+eigenen ChangeSet aus. Nicht erfasst werden Zustände außerhalb von Events,
+Zuweisungen und mit set() geänderten Dictionaries (z.B. vergebene Team-IDs).
+
+Dieses Modul hat keine Abhängigkeiten zu discord oder config.
+"""
+
+import logging
+from typing import NamedTuple
+
+logger = logging.getLogger("event_bot.transaction")
+
+# Markiert einen Schlüssel, der vor der Änderung nicht vorhanden war
+_UNSET = object()
+
+class ChangeScope(NamedTuple):
+    """Teile des Zustands, die eine oder mehrere Transaktionen geändert haben"""
+    events: tuple  # IDs der angefassten Events (in Reihenfolge der ersten Änderung)
+    users: tuple  # User-IDs mit geänderter Team-Zuweisung
+    settings: tuple = ()  # Namen geänderter Einstellungen (z.B. "channel_id")
+
+    def merge(self, other):
+        """
+        Vereinigt zwei ChangeScopes
+
+        Parameters:
+        - other: Weiterer ChangeScope
+
+        Returns:
+        - ChangeScope mit den Events, Benutzern und Einstellungen beider Seiten
+        """
+        return ChangeScope(
+            tuple(dict.fromkeys(self.events + other.events)),
+            tuple(dict.fromkeys(self.users + other.users)),
+            tuple(dict.fromkeys(self.settings + other.settings))
+        )
+
+# Leerer ChangeScope (z.B. für einen Stapel ohne erfolgreiche Commands)
+EMPTY_SCOPE = ChangeScope((), ())
+
+class ChangeSet:
+    """
+    Änderungen einer Transaktion mit Rücksetzmöglichkeit
+
+    Jedes ChangeSet muss genau einmal mit commit() oder rollback() abgeschlossen werden.
+    """
+
+    def __init__(self, event_data, assignments):
+        """
+        Parameters:
+        - event_data: {event_id: Event} des Bots
+        - assignments: TeamAssignments des Bots
+        """
+        self.event_data = event_data
+        self.assignments = assignments
+        self._order = tuple(event_data)  # Event-Reihenfolge vor der Transaktion
+        self._events = {}  # {event_id: (Event, Sicherung) oder None, wenn es das Event noch nicht gab}
+        self._users = {}  # Journal der Zuweisungen {user_id: vorheriger Wert}
+        self._values = []  # Mit set() geänderte Werte [(Dictionary, Schlüssel, vorheriger Wert)]
+        self._settings = {}  # Mit mark() vermerkte Einstellungen {Name: None}
+        self._open = True
+        assignments.track(self._users)
+
+    def touch(self, event_id):
+        """
+        Sichert ein Event vor seiner ersten Änderung in dieser Transaktion
+
+        Parameters:
+        - event_id: ID des Events (darf noch nicht existieren)
+
+        Returns:
+        - Das ChangeSet selbst
+        """
+        if event_id not in self._events:
+            event = self.event_data.get(event_id)
+            self._events[event_id] = (event, event.backup()) if event is not None else None
+        return self
+
+    def touch_all(self):
+        """
+        Sichert alle vorhandenen Events
+
+        Returns:
+        - Das ChangeSet selbst
+        """
+        for event_id in self._order:
+            self.touch(event_id)
+        return self
+
+    def set(self, mapping, key, value):
+        """
+        Setzt einen Wert in einem Dictionary, der beim Zurücksetzen wiederhergestellt wird
+
+        Parameters:
+        - mapping: Dictionary außerhalb der Events (z.B. team_requester)
+        - key: Schlüssel
+        - value: Neuer Wert
+        """
+        self._values.append((mapping, key, mapping.get(key, _UNSET)))
+        mapping[key] = value
+
+    def mark(self, setting):
+        """
+        Vermerkt eine geänderte Einstellung außerhalb von Events und Zuweisungen
+
+        Die Einstellung wird nicht gesichert; mark() gehört daher an das Ende eines Commands.
+
+        Parameters:
+        - setting: Name der Einstellung (z.B. "channel_id")
+        """
+        self._settings[setting] = None
+
+    def _close(self):
+        """Beendet die Aufzeichnung"""
+        if not self._open:
+            raise RuntimeError("ChangeSet wurde bereits abgeschlossen")
+        self._open = False
+        self.assignments.untrack(self._users)
+
+    def commit(self):
+        """
+        Übernimmt die Änderungen und verwirft die Sicherungen
+
+        Returns:
+        - ChangeScope mit den geänderten, angelegten und entfernten Events, den geänderten Benutzern
+          und den vermerkten Einstellungen (EMPTY_SCOPE, wenn sich nichts geändert hat)
+        """
+        self._close()
+        events = {}
+        for event_id, saved in self._events.items():
+            current = self.event_data.get(event_id)
+            if saved is None:
+                changed = current is not None
+            else:
+                event, backup = saved
+                changed = current is not event or event.changed_since(backup)
+            if changed:
+                events[event_id] = None
+        if tuple(self.event_data) != self._order:
+            before = set(self._order)
+            events.update(dict.fromkeys(key for key in self.event_data if key not in before))
+            events.update(dict.fromkeys(key for key in self._order if key not in self.event_data))
+        scope = ChangeScope(tuple(events), self.assignments.changed(self._users), tuple(self._settings))
+        self._events = {}
+        self._users = {}
+        self._values = []
+        self._settings = {}
+        return scope
+
+    def rollback(self):
+        """Setzt alle in dieser Transaktion aufgezeichneten Änderungen zurück"""
+        self._close()
+        for mapping, key, value in reversed(self._values):
+            if value is _UNSET:
+                mapping.pop(key, None)
+            else:
+                mapping[key] = value
+        self.assignments.restore(self._users)
+
+        for saved in self._events.values():
+            if saved is not None:
+                event, backup = saved
+                event.restore(backup)
+
+        # Angelegte Events entfernen, entfernte Events an ihrer Position wieder einfügen
+        if tuple(self.event_data) != self._order:
+            current = dict(self.event_data)
+            self.event_data.clear()
+            for event_id in self._order:
+                saved = self._events.get(event_id)
+                event = saved[0] if saved is not None else current.get(event_id)
+                if event is None:
+                    logger.warning(f"Event '{event_id}' wurde ohne Sicherung entfernt und kann nicht wiederhergestellt werden")
+                    continue
+                self.event_data[event_id] = event
+        logger.info(f"Änderungen zurückgesetzt ({len(self._events)} Events, {len(self._users)} Zuweisungen)")
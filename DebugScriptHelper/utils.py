@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 
-import pickle
 import os
 import logging
 import asyncio
@@ -10,6 +9,9 @@ from datetime import datetime
 import discord
 from discord import Embed
 import io
+from models import TeamAssignments, TeamIdAllocator, events_from_dicts
+from outbound import PRIORITY_LOG
+from paging import chunk_lines, clip, paginate_sections, DESCRIPTION_LIMIT, EMBED_LIMIT, FIELD_COUNT_LIMIT, MESSAGE_LIMIT
 
 # Discord log channel handler
 discord_log_channel = None
@@ -87,7 +89,7 @@ async def send_to_log_channel(message, level="INFO", guild=None):
     - guild: Die Guild, in der der Log-Kanal gesucht werden soll (optional)
     
     Returns:
-    - True bei Erfolg, False bei Fehler
+    - True, wenn die Nachricht für den Log-Kanal eingereiht wurde, sonst False
     """
     from config import LOG_CHANNEL_NAME, LOG_CHANNEL_ID
     global discord_log_channel
@@ -132,7 +134,10 @@ async def send_to_log_channel(message, level="INFO", guild=None):
             else:
                 formatted_message = f"ℹ️ {message}"
             
-            await discord_log_channel.send(formatted_message)
+            # Niedrigste Priorität; wartende Log-Nachrichten werden bei Andrang zusammengefasst
+            get_outbound().post(
+                PRIORITY_LOG, ("channel", discord_log_channel.id), discord_log_channel.send, text=formatted_message
+            )
             return True
     except Exception as e:
         logger.error(f"Fehler beim Senden der Nachricht an den Log-Kanal: {e}")
@@ -154,36 +159,138 @@ def get_bot():
 # Constants
 SAVE_FILE = "event_data.pkl"
 
+# Vergabe der Team-IDs (Untergrenze wird beim Laden aus den gespeicherten IDs gesetzt)
+_team_ids = TeamIdAllocator()
+
+# Speicher-Backend (wird beim ersten Zugriff anhand der Konfiguration erstellt)
+_storage = None
+
+def get_storage():
+    """
+    Liefert das konfigurierte Speicher-Backend (siehe storage.py)
+    
+    Returns:
+    - Backend-Objekt mit load() und save()
+    """
+    global _storage
+    if _storage is None:
+        from config import STORAGE_BACKEND, JOURNAL_FILE, JOURNAL_COMPACT_INTERVAL, DATABASE_FILE, SNAPSHOT_GENERATIONS
+        from storage import create_storage
+        _storage = create_storage(
+            STORAGE_BACKEND, SAVE_FILE, JOURNAL_FILE, JOURNAL_COMPACT_INTERVAL, DATABASE_FILE, SNAPSHOT_GENERATIONS
+        )
+    return _storage
+
+# Hintergrund-Speicherdienst (wird beim ersten Speichern aus dem Event-Loop erstellt)
+_saver = None
+
+def get_saver():
+    """
+    Liefert den Hintergrund-Speicherdienst (siehe saver.py)
+    
+    Returns:
+    - BackgroundSaver für das konfigurierte Speicher-Backend
+    """
+    global _saver
+    if _saver is None:
+        from config import SAVE_COALESCE_WINDOW
+        from saver import BackgroundSaver
+        _saver = BackgroundSaver(get_storage(), SAVE_COALESCE_WINDOW)
+    return _saver
+
 def load_data():
-    """Load event data from pickle file"""
+    """
+    Load event data (Snapshot + Journal oder SQLite, je nach STORAGE_BACKEND)
+    
+    Returns:
+    - Tupel (event_data, channel_id, user_team_assignments); event_data enthält
+      die Events als typisierte Modell-Objekte ({event_id: Event}, siehe models.py),
+      user_team_assignments ist ein TeamAssignments-Dictionary mit Rückwärtsindex
+    """
     try:
-        if os.path.exists(SAVE_FILE):
-            with open(SAVE_FILE, 'rb') as f:
-                data = pickle.load(f)
-                logger.info(f"Data loaded from {SAVE_FILE}")
-                return data.get('event_data', {}), data.get('channel_id'), data.get('user_team_assignments', {})
-        else:
-            logger.info("No save file found, starting with empty data")
-            return {}, None, {}
+        event_data, channel_id, user_team_assignments = get_storage().load()
     except Exception as e:
         logger.error(f"Error loading data: {e}")
-        return {}, None, {}
+        return {}, None, TeamAssignments()
+    
+    # Ungültige Daten brechen den Start ab, statt beim nächsten Speichern überschrieben zu werden
+    event_data = events_from_dicts(event_data)
+    observe_team_ids(event_data)
+    return event_data, channel_id, TeamAssignments(user_team_assignments)
+
 
-def save_data(event_data, channel_id, user_team_assignments):
-    """Save event data to pickle file"""
+def save_data(event_data, channel_id, user_team_assignments, scope=None):
+    """
+    Save event data
+    
+    Innerhalb des Event-Loops wird die Änderung nur beim Hintergrund-Speicherdienst
+    gemeldet und zusammen mit weiteren Änderungen im Hintergrund geschrieben.
+    Ohne laufenden Event-Loop (Skripte, Tests) wird direkt gespeichert.
+    
+    Parameters:
+    - scope: Optional - ChangeScope einer abgeschlossenen Transaktion (siehe transaction.py);
+      dann werden nur die darin genannten Events und Zuweisungen verglichen
+    """
     try:
-        data = {
-            'event_data': event_data,
-            'channel_id': channel_id,
-            'user_team_assignments': user_team_assignments
-        }
-        with open(SAVE_FILE, 'wb') as f:
-            pickle.dump(data, f)
-        logger.info(f"Data saved to {SAVE_FILE}")
-        return True
-    except Exception as e:
-        logger.error(f"Error saving data: {e}")
-        return False
+        asyncio.get_running_loop()
+    except RuntimeError:
+        try:
+            return get_storage().save(event_data, channel_id, user_team_assignments, scope)
+        except Exception as e:
+            logger.error(f"Error saving data: {e}")
+            return False
+    
+    get_saver().mark_dirty(event_data, channel_id, user_team_assignments, scope)
+    return True
+
+def pop_load_report():
+    """
+    Liefert die Meldungen des letzten Ladevorgangs (Rückgriff auf ältere Snapshots,
+    beschädigte Dateien) und leert sie, damit sie nur einmal gemeldet werden
+    
+    Returns:
+    - Liste von Meldungen (leer, wenn alles in Ordnung war)
+    """
+    storage = get_storage()
+    report = list(getattr(storage, "load_report", []))
+    storage.load_report = []
+    return report
+
+async def flush_data():
+    """
+    Wartet, bis alle gemeldeten Änderungen auf der Platte sind (für kritische Pfade)
+    
+    Returns:
+    - True, wenn alle Änderungen erfolgreich geschrieben wurden
+    """
+    return await get_saver().flush()
+
+async def close_saver():
+    """Schreibt ausstehende Änderungen beim Herunterfahren und beendet den Speicherdienst"""
+    if _saver is not None:
+        await _saver.close()
+
+# Planer für ausgehende Discord-Nachrichten (wird beim ersten Zugriff erstellt)
+_outbound = None
+
+def get_outbound():
+    """
+    Liefert den Planer für ausgehende Nachrichten (siehe outbound.py)
+    
+    Returns:
+    - OutboundScheduler mit den konfigurierten Rate-Limits
+    """
+    global _outbound
+    if _outbound is None:
+        from config import OUTBOUND_ROUTE_LIMIT, OUTBOUND_ROUTE_PERIOD, OUTBOUND_GLOBAL_LIMIT
+        from outbound import OutboundScheduler
+        _outbound = OutboundScheduler(OUTBOUND_ROUTE_LIMIT, OUTBOUND_ROUTE_PERIOD, OUTBOUND_GLOBAL_LIMIT)
+    return _outbound
+
+async def close_outbound():
+    """Sendet noch wartende Nachrichten beim Herunterfahren und beendet den Planer"""
+    if _outbound is not None:
+        await _outbound.close()
 
 def generate_team_id(team_name):
     """Generiert eine eindeutige ID für ein Team
@@ -192,20 +299,51 @@ def generate_team_id(team_name):
     - team_name: Der Name des Teams
     
     Returns:
-    - Eine eindeutige ID für das Team (basierend auf Namen und Timestamp)
+    - Eine eindeutige, monoton steigende ID für das Team (siehe models.TeamIdAllocator)
+    """
+    team_id = _team_ids.next_id()
+    logger.debug(f"Team-ID generiert: {team_id} für Team '{team_name}'")
+    return team_id
+
+def observe_team_ids(event_data):
+    """
+    Übernimmt die gespeicherten Team-IDs als Untergrenze für neue IDs
+    
+    Die zuletzt vergebene ID muss nicht separat gespeichert werden: jede
+    relevante ID steht in den gespeicherten Teams oder auf einer Warteliste.
+    
+    Parameters:
+    - event_data: {event_id: Event}
+    """
+    for event in event_data.values():
+        for team in event.teams.values():
+            _team_ids.observe(team.id)
+        for entry in event.waitlist:
+            _team_ids.observe(entry.team_id)
+
+def generate_event_id(event_name, existing_ids=()):
+    """Generiert eine eindeutige ID für ein Event
+    
+    Parameters:
+    - event_name: Der Name des Events
+    - existing_ids: Bereits vergebene Event-IDs, die nicht erneut vergeben werden dürfen
+    
+    Returns:
+    - Eine eindeutige ID für das Event (basierend auf Namen und Timestamp)
     """
     import hashlib
     import time
     
-    # Kombiniere Team-Namen mit aktuellem Timestamp für Eindeutigkeit
-    unique_base = f"{team_name}_{int(time.time())}"
-    # Erstelle einen Hash für diesen String
-    team_hash = hashlib.md5(unique_base.encode('utf-8')).hexdigest()
-    # Verwende nur die ersten 10 Zeichen für eine kürzere ID
-    short_id = team_hash[:10]
+    attempt = 0
+    while True:
+        unique_base = f"{event_name}_{time.time_ns()}_{attempt}"
+        event_id = hashlib.md5(unique_base.encode('utf-8')).hexdigest()[:8]
+        if event_id not in existing_ids:
+            break
+        attempt += 1
     
-    logger.debug(f"Team-ID generiert: {short_id} für Team '{team_name}'")
-    return short_id
+    logger.debug(f"Event-ID generiert: {event_id} für Event '{event_name}'")
+    return event_id
 
 def has_role(user, role_name):
     """Check if a user has a specific role or is in the ADMIN_IDS list
@@ -243,67 +381,79 @@ def parse_date(date_str):
     except ValueError:
         return None
 
+def persons(size):
+    """Anzahl mit passender Einheit (Person/Personen)"""
+    return f"{size} {'Person' if size == 1 else 'Personen'}"
+
 def format_event_details(event):
-    """Format event details as Discord embed"""
+    """
+    Format event details as Discord embed
+    
+    Teams und Warteliste werden auf mehrere Felder verteilt (höchstens 1024 Zeichen je
+    Feld). Passen nicht alle in das Embed, verweist das letzte Feld auf die
+    vollständige, seitenweise Teamliste.
+    """
     if not event:
         return "Kein aktives Event."
     
     # Prüfen, ob es ein echtes Event mit Inhalt ist
-    if not event.get('name') or not event.get('date'):
+    if not event.name or not event.date:
         return "Kein aktives Event."
-        
+    
+    description = clip(event.description or 'Keine Beschreibung verfügbar', DESCRIPTION_LIMIT)
     embed = Embed(
-        title=f"📅 Event: {event['name']}",
-        description=event.get('description', 'Keine Beschreibung verfügbar'),
+        title=f"📅 Event: {event.name}",
+        description=description,
         color=discord.Color.blue()
     )
     
     # Add event details
-    embed.add_field(name="📆 Datum", value=event['date'], inline=True)
-    embed.add_field(name="⏰ Uhrzeit", value=event.get('time', 'keine Angabe'), inline=True)
+    embed.add_field(name="📆 Datum", value=event.date, inline=True)
+    embed.add_field(name="⏰ Uhrzeit", value=event.time or 'keine Angabe', inline=True)
     embed.add_field(name="\u200b", value="\u200b", inline=True)  # Spacer for alignment
     
     # Add team registration info
     embed.add_field(
         name="👥 Team-Anmeldungen",
-        value=f"{event['slots_used']}/{event['max_slots']} Plätze belegt",
+        value=f"{event.slots_used}/{event.max_slots} Plätze belegt",
         inline=True
     )
     embed.add_field(
         name="🔢 Max. Teamgröße",
-        value=str(event['max_team_size']),
+        value=str(event.max_team_size),
         inline=True
     )
     embed.add_field(name="\u200b", value="\u200b", inline=True)  # Spacer for alignment
     
-    # Add registered teams
-    teams_text = ""
-    if event['teams']:
-        for team_name, size in event['teams'].items():
-            teams_text += f"• **{team_name}**: {size} {'Person' if size == 1 else 'Personen'}\n"
-    else:
-        teams_text = "Noch keine Teams angemeldet."
-    
-    embed.add_field(
-        name=f"📋 Angemeldete Teams ({len(event['teams'])})",
-        value=teams_text or "Keine Teams angemeldet",
-        inline=False
-    )
-    
-    # Add waitlist if exists
-    if event['waitlist']:
-        waitlist_text = ""
-        for i, (team_name, size) in enumerate(event['waitlist']):
-            waitlist_text += f"{i+1}. **{team_name}**: {size} {'Person' if size == 1 else 'Personen'}\n"
-        
+    # Teams und Warteliste als Zeilen; nur so viele Felder, wie in das Embed passen
+    sections = [(
+        f"📋 Angemeldete Teams ({len(event.teams)})",
+        [f"• **{team_name}**: {persons(team.size)}" for team_name, team in event.teams.items()],
+        "Noch keine Teams angemeldet."
+    )]
+    if event.waitlist:
+        sections.append((
+            f"⏳ Warteliste ({len(event.waitlist)})",
+            [f"{i}. **{team_name}**: {persons(size)}" for i, (team_name, size, _) in enumerate(event.waitlist, 1)],
+            ""
+        ))
+    budget = EMBED_LIMIT - len(embed.title) - len(description) - 600  # feste Felder, Fußzeile, Hinweis
+    pages = paginate_sections(sections, budget, FIELD_COUNT_LIMIT - len(embed.fields) - 1)
+    for name, value in pages[0]:
+        embed.add_field(name=name, value=value, inline=False)
+    if len(pages) > 1:
+        hidden = sum(value.count("\n") + 1 for page in pages[1:] for _, value in page)
         embed.add_field(
-            name=f"⏳ Warteliste ({len(event['waitlist'])})",
-            value=waitlist_text,
+            name="➕ Weitere Einträge",
+            value=f"{hidden} weitere Einträge - vollständige Liste über den Button 'Teamliste' oder mit /team_list",
             inline=False
         )
     
     # Add footer with instructions
-    embed.set_footer(text="Verwende /reg um dein Team anzumelden oder /wl für die Warteliste.")
+    footer = "Verwende /reg um dein Team anzumelden oder /wl für die Warteliste."
+    if event.id:
+        footer += f" Event-ID: {event.id}"
+    embed.set_footer(text=footer)
     
     return embed
 
@@ -313,30 +463,145 @@ def format_event_list(event):
         return "Kein aktives Event."
     
     # Prüfen, ob es ein echtes Event mit Inhalt ist
-    if not event.get('name') or not event.get('date'):
+    if not event.name or not event.date:
         return "Kein aktives Event."
     
-    text = f"**📅 Event: {event['name']}**\n"
-    text += f"📆 Datum: {event['date']}\n"
-    text += f"⏰ Uhrzeit: {event.get('time', 'keine Angabe')}\n"
-    text += f"📝 Beschreibung: {event.get('description', 'Keine Beschreibung verfügbar')}\n\n"
+    lines = [f"**📅 Event: {event.name}**"]
+    if event.id:
+        lines.append(f"🆔 Event-ID: {event.id}")
+    lines += [
+        f"📆 Datum: {event.date}",
+        f"⏰ Uhrzeit: {event.time or 'keine Angabe'}",
+        f"📝 Beschreibung: {event.description or 'Keine Beschreibung verfügbar'}",
+        "",
+        f"👥 Team-Anmeldungen: {event.slots_used}/{event.max_slots} Plätze belegt",
+        f"🔢 Max. Teamgröße: {event.max_team_size}",
+        "",
+        f"📋 Angemeldete Teams ({len(event.teams)}):"
+    ]
+    if event.teams:
+        lines += [f"• {team_name}: {persons(team.size)}" for team_name, team in event.teams.items()]
+    else:
+        lines.append("Noch keine Teams angemeldet.")
+    
+    if event.waitlist:
+        lines += ["", f"⏳ Warteliste ({len(event.waitlist)}):"]
+        lines += [f"{i}. {team_name}: {persons(size)}" for i, (team_name, size, _) in enumerate(event.waitlist, 1)]
+    
+    # Eine Nachricht darf höchstens 2000 Zeichen haben: sonst nur das erste Stück mit Hinweis
+    shown = chunk_lines(lines, MESSAGE_LIMIT - 100)[0]
+    hidden = len(lines) - (shown.count("\n") + 1)
+    if hidden:
+        return f"{shown}\n… und {hidden} weitere Zeilen - vollständige Liste mit /team_list\n"
+    return shown + "\n"
+
+def team_list_pages(event):
+    """
+    Teilt die Teamliste eines Events (/team_list) in Seiten auf
     
-    text += f"👥 Team-Anmeldungen: {event['slots_used']}/{event['max_slots']} Plätze belegt\n"
-    text += f"🔢 Max. Teamgröße: {event['max_team_size']}\n\n"
+    Parameters:
+    - event: Event (siehe models.py)
     
-    text += f"📋 Angemeldete Teams ({len(event['teams'])}):\n"
-    if event['teams']:
-        for team_name, size in event['teams'].items():
-            text += f"• {team_name}: {size} {'Person' if size == 1 else 'Personen'}\n"
-    else:
-        text += "Noch keine Teams angemeldet.\n"
+    Returns:
+    - Liste von Seiten, jede eine Liste von Feldern (Name, Wert) - siehe paging.paginate_sections
+    """
+    sections = [
+        (
+            f"📋 Angemeldete Teams ({event.slots_used}/{event.max_slots} Slots)",
+            [f"**{idx}.** {team_name.capitalize()} - {team.size} Mitglieder | ID: `{team.id}`"
+             for idx, (team_name, team) in enumerate(sorted(event.teams.items()), 1)],
+            "Noch keine Teams angemeldet."
+        ),
+        (
+            "⏳ Warteliste",
+            [f"**{idx}.** {team_name.capitalize()} - {size} Mitglieder | ID: `{team_id}`"
+             for idx, (team_name, size, team_id) in enumerate(event.waitlist, 1)],
+            "Keine Teams auf der Warteliste."
+        )
+    ]
+    # Ein Feld bleibt für die Statistik frei
+    return paginate_sections(sections, max_fields=FIELD_COUNT_LIMIT - 1)
+
+def format_team_list(event, fields, page=0, page_count=1):
+    """
+    Formatiert eine Seite der Teamliste eines Events (/team_list) als Embed
     
-    if event['waitlist']:
-        text += f"\n⏳ Warteliste ({len(event['waitlist'])}):\n"
-        for i, (team_name, size) in enumerate(event['waitlist']):
-            text += f"{i+1}. {team_name}: {size} {'Person' if size == 1 else 'Personen'}\n"
+    Parameters:
+    - event: Event (siehe models.py)
+    - fields: Felder der Seite (siehe team_list_pages)
+    - page: Nummer der Seite (ab 0)
+    - page_count: Anzahl der Seiten
     
-    return text
+    Returns:
+    - Discord-Embed mit den Teams der Seite und der Statistik
+    """
+    embed = Embed(
+        title=f"Teamliste für {event.name}",
+        description=f"Datum: {event.date} | Uhrzeit: {event.time}",
+        color=discord.Color.blue()
+    )
+    
+    for name, value in fields:
+        embed.add_field(name=name, value=value, inline=False)
+    
+    # Add statistics
+    available_slots = event.max_slots - event.slots_used
+    embed.add_field(
+        name="📊 Statistik",
+        value=f"Anzahl Teams: **{len(event.teams)}**\n"
+              f"Verfügbare Slots: **{available_slots}**\n"
+              f"Warteliste: **{len(event.waitlist)}** Teams\n"
+              f"Max. Teamgröße: **{event.max_team_size}**",
+        inline=False
+    )
+    
+    # Die Liste wird nur nach Änderungen neu erstellt, daher der Stand statt der Abrufzeit
+    footer = f"Stand: {datetime.now().strftime('%d.%m.%Y um %H:%M')} Uhr"
+    if page_count > 1:
+        footer = f"Seite {page + 1}/{page_count} · {footer}"
+    embed.set_footer(text=footer)
+    
+    return embed
+
+def waitlist_pages(event):
+    """
+    Teilt die vollständige Warteliste eines Events (/admin_waitlist) in Seiten auf
+    
+    Parameters:
+    - event: Event (siehe models.py)
+    
+    Returns:
+    - Liste von Beschreibungstexten, jeder höchstens 4096 Zeichen lang
+    """
+    lines = [f"**{idx}.** {team_name} ({size} Spieler, Team-ID: {team_id})"
+             for idx, (team_name, size, team_id) in enumerate(event.waitlist, 1)]
+    return chunk_lines(lines, DESCRIPTION_LIMIT - 100) or [""]
+
+def format_waitlist(event, text, page=0, page_count=1):
+    """
+    Formatiert eine Seite der Warteliste eines Events (/admin_waitlist) als Embed
+    
+    Parameters:
+    - event: Event mit nicht-leerer Warteliste
+    - text: Einträge der Seite (siehe waitlist_pages)
+    - page: Nummer der Seite (ab 0)
+    - page_count: Anzahl der Seiten
+    
+    Returns:
+    - Discord-Embed mit den Wartelisten-Einträgen der Seite
+    """
+    embed = Embed(
+        title=f"Warteliste für {event.name}",
+        description=f"## 📋 Warteliste\n\n{text}\n",
+        color=discord.Color.orange()
+    )
+    
+    footer = f"Insgesamt {len(event.waitlist)} Teams auf der Warteliste"
+    if page_count > 1:
+        footer = f"Seite {page + 1}/{page_count} · {footer}"
+    embed.set_footer(text=footer)
+    
+    return embed
 
 # Konstanten für Log-Verwaltung
 LOG_FILE_PATH = "discord_bot.log"
@@ -469,38 +734,3 @@ def import_log_file(file_content, append=True):
     except Exception as e:
         logger.error(f"Fehler beim Importieren der Log-Datei: {e}")
         return False
-
-
-# Hilfsfunktionen zur Formaterkennung
-
-def is_using_team_ids(event):
-    """
-    Prüft, ob das Team-Dictionary das erweiterte Format mit IDs verwendet
-    
-    Parameters:
-    - event: Das Event-Dictionary
-    
-    Returns:
-    - True, wenn Team-IDs verwendet werden, False sonst
-    """
-    if not event or not event.get("teams") or not isinstance(event["teams"], dict) or len(event["teams"]) == 0:
-        return False
-    
-    # Prüfe das Format der Team-Daten
-    return isinstance(next(iter(event["teams"].values())), dict)
-
-def is_using_waitlist_ids(event):
-    """
-    Prüft, ob die Warteliste das erweiterte Format mit IDs verwendet
-    
-    Parameters:
-    - event: Das Event-Dictionary
-    
-    Returns:
-    - True, wenn Waitlist-IDs verwendet werden, False sonst
-    """
-    if not event or not event.get("waitlist") or not isinstance(event["waitlist"], list) or len(event["waitlist"]) == 0:
-        return False
-    
-    # Prüfe das Format der Wartelisten-Einträge
-    return len(event["waitlist"][0]) > 2
\ No newline at end of file